@@ -35,6 +35,124 @@ sys.path.insert(0, os.path.join(BASE_DIR, 'config'))
 from agents.base_agent import BaseAgent
 
 
+class CollectionAssetIndex:
+    """
+    수집 자산 역량 인덱스 (CCIR 카테고리 → 순위가 매겨진 수집 자산)
+    
+    rules_ccir.yaml의 자산 타입은 로드 시 한 번 카테고리별로 정렬해 두고,
+    온톨로지 자산(Type + Capability 보유)은 그래프가 바뀔 때만 다시 적재합니다.
+    요청 처리 시에는 카테고리 키로 정렬된 목록을 바로 꺼내 씁니다.
+    """
+    
+    ANY_CATEGORY = "*"
+    MAX_ONTOLOGY_ASSETS = 10
+    
+    def __init__(self, asset_rules: Dict):
+        """
+        Args:
+            asset_rules: rules_ccir.yaml의 asset_recommendation 섹션
+        """
+        self.asset_types = [a for a in (asset_rules or {}).get("asset_types", []) if a.get("name")]
+        self.rule_assets: Dict[str, List[Dict]] = {}
+        self.ontology_assets: Dict[str, List[Dict]] = {}
+        self._graph_signature = None
+        
+        # 카테고리별 규칙 자산 (역량 점수 내림차순, 동점은 이름순 → 결정적 순서)
+        for asset in self.asset_types:
+            for category in asset.get("suitable_for", []):
+                self.rule_assets.setdefault(category, []).append(asset)
+        for assets in self.rule_assets.values():
+            assets.sort(key=lambda a: (-a.get("capability_score", 0.5), a.get("name", "")))
+    
+    def recommend(self, category: str, threat_level: Optional[float]) -> List[Dict]:
+        """카테고리 적합 자산 (위협 수준 보정 점수 포함, 적합성 점수 순)"""
+        # 보정 계수는 양수 상수이므로 사전 정렬 순서가 그대로 유지됨
+        factor = (0.7 + 0.3 * threat_level) if threat_level is not None else 1.0
+        return [
+            {
+                "name": asset.get("name", ""),
+                "suitability_score": round(asset.get("capability_score", 0.5) * factor, 2),
+                "coverage": asset.get("coverage", ""),
+                "category": category
+            }
+            for asset in self.rule_assets.get(category, [])
+        ]
+    
+    def get_ontology_assets(self, category: str) -> List[Dict]:
+        """카테고리에 맞는 온톨로지 자산 (규칙 자산과 매칭된 것 우선)"""
+        assets = self.ontology_assets.get(category)
+        if assets is None:
+            assets = self.ontology_assets.get(self.ANY_CATEGORY, [])
+        return list(assets)
+    
+    def refresh(self, ontology_manager) -> bool:
+        """
+        그래프가 바뀌었으면 온톨로지 자산 인덱스 재구성
+        
+        Returns:
+            재구성 여부
+        """
+        graph = getattr(ontology_manager, 'graph', None)
+        if not graph:
+            self.ontology_assets = {}
+            self._graph_signature = None
+            return False
+        
+        if hasattr(ontology_manager, 'get_graph_version'):
+            signature = (id(graph), ontology_manager.get_graph_version())
+        else:
+            signature = (id(graph), len(graph))
+        if signature == self._graph_signature:
+            return False
+        
+        ns = ontology_manager.ns
+        capabilities: Dict = {}
+        for s, o in graph.subject_objects(ns.Capability):
+            if s not in capabilities or str(o) < str(capabilities[s]):
+                capabilities[s] = o
+        
+        matched: Dict[str, List] = {}
+        unmatched = []
+        for s, o in graph.subject_objects(ns.Type):
+            capability = capabilities.get(s)
+            if capability is None:
+                continue
+            entry = {
+                "name": str(s).split("#")[-1],
+                "type": str(o).split("#")[-1],
+                "capability": str(capability).split("#")[-1]
+            }
+            rule_asset = self._match_rule_asset(entry)
+            if rule_asset is None:
+                unmatched.append((0.0, entry))
+                continue
+            for category in rule_asset.get("suitable_for", []):
+                matched.setdefault(category, []).append((rule_asset.get("capability_score", 0.5), entry))
+        
+        def _rank(scored: List) -> List[Dict]:
+            scored = sorted(scored, key=lambda x: (-x[0], x[1]["name"], x[1]["type"]))
+            return [entry for _, entry in scored]
+        
+        generic = _rank(unmatched)
+        ontology_assets = {self.ANY_CATEGORY: generic[:self.MAX_ONTOLOGY_ASSETS]}
+        for category in set(self.rule_assets) | set(matched):
+            ontology_assets[category] = (_rank(matched.get(category, [])) + generic)[:self.MAX_ONTOLOGY_ASSETS]
+        
+        self.ontology_assets = ontology_assets
+        self._graph_signature = signature
+        return True
+    
+    def _match_rule_asset(self, entry: Dict) -> Optional[Dict]:
+        """온톨로지 자산의 타입/역량/이름에 규칙 자산명이 포함되면 해당 규칙 자산 반환"""
+        text = f"{entry['type']} {entry['capability']} {entry['name']}"
+        best = None
+        for asset in self.asset_types:
+            if asset["name"] in text:
+                if best is None or asset.get("capability_score", 0.5) > best.get("capability_score", 0.5):
+                    best = asset
+        return best
+
+
 class CCIRRecommendationAgent(BaseAgent):
     """중요정보요구(CCIR) 추천 에이전트"""
     
@@ -50,6 +168,10 @@ class CCIRRecommendationAgent(BaseAgent):
         # CCIR 규칙 로드
         self.ccir_rules = self._load_ccir_rules()
         
+        # 카테고리별 수집 자산 인덱스 (규칙은 로드 시 컴파일, 온톨로지는 그래프 변경 시 갱신)
+        self.asset_index = CollectionAssetIndex(self.ccir_rules.get("asset_recommendation", {}))
+        self._refresh_asset_index()
+        
         # CCIR 요청 히스토리 (동적 갱신을 위해)
         self.ccir_history = []
     
@@ -69,6 +191,13 @@ class CCIRRecommendationAgent(BaseAgent):
             print(f"[WARN] Failed to load CCIR rules: {e}")
             return {}
     
+    def _refresh_asset_index(self):
+        """그래프 변경 시 온톨로지 자산 인덱스 갱신"""
+        try:
+            self.asset_index.refresh(self.core.ontology_manager)
+        except Exception as e:
+            print(f"[WARN] 온톨로지 자산 조회 실패: {e}")
+    
     def execute_reasoning(
         self,
         information_request: Optional[str] = None,
@@ -245,61 +374,14 @@ class CCIRRecommendationAgent(BaseAgent):
         Returns:
             자산 추천 결과
         """
-        asset_rules = self.ccir_rules.get("asset_recommendation", {})
-        asset_types = asset_rules.get("asset_types", [])
-        
         category = classification.get("category", "PIR")
-        recommended_assets = []
-        
-        # 카테고리에 적합한 자산 필터링
-        for asset in asset_types:
-            suitable_for = asset.get("suitable_for", [])
-            if category in suitable_for:
-                # 위협 수준에 따른 점수 조정
-                base_score = asset.get("capability_score", 0.5)
-                
-                if threat_level is not None:
-                    # 위협 수준이 높을수록 점수 증가
-                    adjusted_score = base_score * (0.7 + 0.3 * threat_level)
-                else:
-                    adjusted_score = base_score
-                
-                recommended_assets.append({
-                    "name": asset.get("name", ""),
-                    "suitability_score": round(adjusted_score, 2),
-                    "coverage": asset.get("coverage", ""),
-                    "category": category
-                })
-        
-        # 적합성 점수 순으로 정렬
-        recommended_assets.sort(
-            key=lambda x: x["suitability_score"],
-            reverse=True
-        )
         
-        # 온톨로지에서 실제 자산 정보 조회 (선택적)
-        ontology_assets = []
-        if hasattr(self.core.ontology_manager, 'graph') and self.core.ontology_manager.graph:
-            try:
-                # 그래프에서 직접 자산 정보 조회
-                graph = self.core.ontology_manager.graph
-                ns = self.core.ontology_manager.ns
-                
-                # Type 속성을 가진 모든 리소스 탐색
-                for s, p, o in graph.triples((None, ns.Type, None)):
-                    # Capability 속성도 조회
-                    capabilities = list(graph.objects(s, ns.Capability))
-                    if capabilities:
-                        ontology_assets.append({
-                            "name": str(s).split("#")[-1],
-                            "type": str(o).split("#")[-1],
-                            "capability": str(capabilities[0]).split("#")[-1]
-                        })
-                    
-                    if len(ontology_assets) >= 10:
-                        break
-            except Exception as e:
-                print(f"[WARN] 온톨로지 자산 조회 실패: {e}")
+        # 카테고리에 적합한 자산 (위협 수준이 높을수록 점수 증가, 적합성 점수 순)
+        recommended_assets = self.asset_index.recommend(category, threat_level)
+        
+        # 온톨로지에서 실제 자산 정보 조회 (그래프가 바뀐 경우에만 인덱스 재구성)
+        self._refresh_asset_index()
+        ontology_assets = self.asset_index.get_ontology_assets(category)
         
         return {
             "recommended_assets": recommended_assets[:5],  # 상위 5개
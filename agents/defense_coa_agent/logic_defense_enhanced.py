@@ -29,6 +29,7 @@ sys.path.insert(0, os.path.join(BASE_DIR, 'config'))
 from agents.base_agent import BaseAgent
 from agents.defense_coa_agent.rule_engine import RuleEngine
 from api.utils.code_label_mapper import get_mapper
+from core_pipeline.recommendation_history import RecommendationHistory
 
 
 def safe_print(msg, also_log_file: bool = True, logger_name: Optional[str] = None):
@@ -49,8 +50,10 @@ class EnhancedDefenseCOAAgent(BaseAgent):
         # 데이터 캐시 (data_manager를 통해 로드된 데이터 재사용)
         self._data_cache = None
         
-        # 추천 히스토리 (상황 변화 추적용)
-        self.recommendation_history = []
+        # 추천 히스토리 (상황 변화 추적용, 코어 파이프라인의 영속 히스토리 공유)
+        self.recommendation_history = getattr(core, 'recommendation_history', None)
+        if self.recommendation_history is None:
+            self.recommendation_history = RecommendationHistory.from_config(getattr(core, 'config', None))
         
         # 🔥 NEW: 체인 탐색 캐시 (성능 최적화)
         self._chain_cache = {}
@@ -832,6 +835,14 @@ class EnhancedDefenseCOAAgent(BaseAgent):
             # 히스토리 저장
             self._save_to_history(situation_id_for_history, result)
             
+            # 추천 의존성 등록 (EventStream 이벤트 시 영향받는 추천만 증분 재계산)
+            dependency_graph = getattr(self.core, 'recommendation_dependencies', None)
+            if dependency_graph is not None:
+                try:
+                    dependency_graph.register_result(result, situation_info)
+                except Exception as e:
+                    safe_print(f"[WARN] 추천 의존성 등록 실패: {e}")
+            
             return result
             
         except Exception as e:
@@ -2866,7 +2877,8 @@ class EnhancedDefenseCOAAgent(BaseAgent):
         safe_print(f"\n[DEBUG] _score_with_palantir_mode called for {len(strategies)} candidates")
         threat_type = self._extract_threat_type(situation_info)
         safe_print(f"[DEBUG] Scoring with Threat Type: {threat_type}")
-        self._chain_cache = {} # Force clear cache
+        # 체인 정보 캐시는 요청 단위 (경로 탐색 결과는 RelationshipChain 전역 캐시가 요청 간 재사용)
+        self._chain_cache = {}
 
         # 🔥 NEW: axis_states 빌드 (METT-C 평가를 위해 필요)
         axis_states = []
@@ -3748,16 +3760,16 @@ class EnhancedDefenseCOAAgent(BaseAgent):
             이전 추천 딕셔너리 또는 None
         """
         try:
-            if not hasattr(self, 'recommendation_history') or not self.recommendation_history:
+            # (situation_id, timestamp) 인덱스로 최신 항목 조회
+            entry = self.recommendation_history.get_latest_recommendation(situation_id)
+            if not entry:
                 return None
             
-            # 최신부터 역순으로 검색
-            for entry in reversed(self.recommendation_history):
-                entry_situation_id = entry.get("situation_id")
-                if entry_situation_id == situation_id:
-                    return entry
-            
-            return None
+            return {
+                "situation_id": entry.get("situation_id"),
+                "timestamp": entry.get("timestamp"),
+                "result": entry.get("recommendation", {})
+            }
             
         except Exception as e:
             safe_print(f"[WARN] 이전 추천 조회 오류: {e}")
@@ -3863,21 +3875,9 @@ class EnhancedDefenseCOAAgent(BaseAgent):
             result: 추천 결과 딕셔너리
         """
         try:
-            if not hasattr(self, 'recommendation_history'):
-                self.recommendation_history = []
-            
-            entry = {
-                "situation_id": situation_id,
-                "timestamp": pd.Timestamp.now().isoformat(),
-                "result": result.copy()  # 복사본 저장
-            }
-            
-            self.recommendation_history.append(entry)
-            
-            # 최대 100개만 유지 (메모리 관리)
-            if len(self.recommendation_history) > 100:
-                self.recommendation_history = self.recommendation_history[-100:]
-                safe_print(f"[INFO] 히스토리 최대 개수 도달. 오래된 항목 제거됨.")
+            # 이전 추천(previous_recommendation)은 이미 히스토리에 있으므로 제외하고 저장
+            stored = {key: value for key, value in result.items() if key != "previous_recommendation"}
+            self.recommendation_history.save_recommendation(situation_id, stored)
             
         except Exception as e:
             safe_print(f"[WARN] 히스토리 저장 오류: {e}")
@@ -3,11 +3,17 @@
 """
 Rule Engine
 YAML 규칙 파일 기반 동적 규칙 실행 엔진
+
+규칙 조건은 로드 시점에 한 번만 술어(predicate)로 컴파일하고,
+조건이 검사하는 컨텍스트 키별로 규칙을 색인하여 평가 시 문자열 파싱 없이
+현재 컨텍스트와 관련된 규칙만 평가합니다.
 """
 import os
+import re
 import sys
+import operator
 import yaml
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
 from pathlib import Path
 
 # Windows 콘솔 인코딩 문제 해결
@@ -34,6 +40,40 @@ def safe_print(msg, also_log_file: bool = True, logger_name: Optional[str] = Non
     _safe_print(msg, also_log_file=also_log_file, logger_name=logger_name)
 
 
+# 비교 연산자 (긴 연산자 우선 매칭)
+_COMPARATORS = [
+    (">=", operator.ge),
+    ("<=", operator.le),
+    ("==", operator.eq),
+    ("!=", operator.ne),
+    (">", operator.gt),
+    ("<", operator.lt),
+]
+
+_AND_SPLIT = re.compile(r"\s+and\s+", re.IGNORECASE)
+_OR_SPLIT = re.compile(r"\s+or\s+", re.IGNORECASE)
+
+Predicate = Callable[[Dict], bool]
+
+
+def _always_false(_context: Dict) -> bool:
+    return False
+
+
+class CompiledRule:
+    """컴파일된 규칙 (조건 술어 + 검사 대상 컨텍스트 키)"""
+    
+    __slots__ = ("index", "rule", "name", "action", "predicate", "required_keys")
+    
+    def __init__(self, index: int, rule: Dict, predicate: Predicate, required_keys: Set[str]):
+        self.index = index
+        self.rule = rule
+        self.name = rule.get("name", "Unknown")
+        self.action = rule.get("action", {})
+        self.predicate = predicate
+        self.required_keys = frozenset(required_keys)
+
+
 class RuleEngine:
     """규칙 엔진 클래스 - YAML 규칙 파일 기반 동적 규칙 실행"""
     
@@ -52,6 +92,11 @@ class RuleEngine:
         self.rules_path = rules_path
         self.rules: List[Dict] = []
         self.weights: Dict[str, float] = {}
+        self._compiled_rules: List[CompiledRule] = []
+        # 컨텍스트 키 → 해당 키를 검사하는 규칙 (결정 테이블 색인)
+        self._rules_by_key: Dict[str, List[CompiledRule]] = {}
+        # 조건이 없어 항상 매칭되는 규칙
+        self._unconditional_rules: List[CompiledRule] = []
         self._load_rules()
     
     def _load_rules(self):
@@ -85,126 +130,140 @@ class RuleEngine:
             traceback.print_exc()
             self.rules = []
             self.weights = {}
+        finally:
+            self._compile_rules()
     
     def reload_rules(self):
         """규칙 파일 재로드"""
         self._load_rules()
     
-    def evaluate_condition(self, condition: Dict, context: Dict) -> bool:
-        """
-        조건 평가 로직
+    def _compile_rules(self):
+        """로드된 규칙 조건을 술어로 컴파일하고 검사 키별로 색인"""
+        compiled_rules = []
+        rules_by_key: Dict[str, List[CompiledRule]] = {}
+        unconditional = []
         
-        Args:
-            condition: 조건 딕셔너리 (예: {"threat_level": "> 0.7"})
-            context: 컨텍스트 딕셔너리 (상황 정보 포함)
+        for idx, rule in enumerate(self.rules or []):
+            if not isinstance(rule, dict):
+                continue
+            condition = rule.get("condition") or {}
+            predicate, required_keys = self._compile_condition(condition)
+            compiled = CompiledRule(idx, rule, predicate, required_keys)
+            compiled_rules.append(compiled)
             
+            if not required_keys:
+                unconditional.append(compiled)
+            for key in required_keys:
+                rules_by_key.setdefault(key, []).append(compiled)
+        
+        self._compiled_rules = compiled_rules
+        self._rules_by_key = rules_by_key
+        self._unconditional_rules = unconditional
+    
+    def _compile_condition(self, condition: Dict) -> Tuple[Predicate, Set[str]]:
+        """
+        조건 딕셔너리를 술어로 컴파일
+        
         Returns:
-            조건 만족 여부
+            (context → bool 술어, 조건이 검사하는 최상위 컨텍스트 키 집합)
         """
         if not condition:
-            return True
+            return (lambda _context: True), set()
+        
+        checks: List[Tuple[str, Callable[[Any, Dict], bool]]] = []
+        required_keys: Set[str] = set()
         
         for key, value in condition.items():
-            # 컨텍스트에서 값 가져오기
-            context_value = context.get(key)
-            
-            if context_value is None:
-                # 키가 없으면 False (엄격한 평가)
-                return False
-            
-            # 조건 문자열 파싱 및 평가
+            required_keys.add(key)
             if isinstance(value, str):
                 # 문자열 조건 (예: "> 0.7", "<= 0.4", "> 0.4 and <= 0.7")
-                if not self._evaluate_string_condition(context_value, value):
-                    return False
-            elif isinstance(value, (int, float)):
-                # 숫자 비교 (기본적으로 ==)
-                if context_value != value:
-                    return False
+                value_check = self._compile_string_condition(value)
+                checks.append((key, lambda v, _ctx, f=value_check: f(v)))
             elif isinstance(value, dict):
-                # 중첩된 조건 (재귀적 평가)
-                if not self.evaluate_condition(value, context):
-                    return False
+                # 중첩된 조건 (같은 컨텍스트에 대해 평가)
+                nested, nested_keys = self._compile_condition(value)
+                required_keys.update(nested_keys)
+                checks.append((key, lambda _v, ctx, f=nested: f(ctx)))
             else:
-                # 기타 타입은 직접 비교
-                if context_value != value:
+                # 숫자 및 기타 타입은 직접 비교 (==)
+                checks.append((key, lambda v, _ctx, expected=value: v == expected))
+        
+        def predicate(context: Dict) -> bool:
+            for key, check in checks:
+                context_value = context.get(key)
+                if context_value is None:
+                    # 키가 없으면 False (엄격한 평가)
+                    return False
+                if not check(context_value, context):
                     return False
+            return True
         
-        return True
+        return predicate, required_keys
     
-    def _evaluate_string_condition(self, value: Any, condition_str: str) -> bool:
+    def _compile_string_condition(self, condition_str: str) -> Callable[[Any], bool]:
         """
-        문자열 조건 평가 (예: "> 0.7", "<= 0.4", "> 0.4 and <= 0.7")
+        문자열 조건을 값 술어로 컴파일 (예: "> 0.7", "<= 0.4", "> 0.4 and <= 0.7")
         
-        Args:
-            value: 평가할 값
-            condition_str: 조건 문자열
-            
-        Returns:
-            조건 만족 여부
+        형식이 잘못된 조건은 로드 시점에 한 번 경고하고 항상 False로 평가합니다.
         """
-        try:
+        if _AND_SPLIT.search(condition_str):
+            parts, combine = _AND_SPLIT.split(condition_str), all
+        elif _OR_SPLIT.search(condition_str):
+            parts, combine = _OR_SPLIT.split(condition_str), any
+        else:
+            parts, combine = [condition_str], all
+        
+        comparisons = []
+        for part in parts:
+            compiled = self._compile_single_condition(part.strip())
+            if compiled is None:
+                safe_print(f"[WARN] 알 수 없는 조건 형식: {condition_str}")
+                return lambda _value: False
+            comparisons.append(compiled)
+        
+        def evaluate(value: Any) -> bool:
             # 숫자로 변환 시도
             if isinstance(value, str):
                 try:
                     value = float(value)
                 except ValueError:
                     pass
-            
-            # "and" 또는 "or" 연산자 처리
-            if " and " in condition_str.lower():
-                parts = condition_str.split(" and ")
-                return all(self._evaluate_single_condition(value, part.strip()) for part in parts)
-            elif " or " in condition_str.lower():
-                parts = condition_str.split(" or ")
-                return any(self._evaluate_single_condition(value, part.strip()) for part in parts)
-            else:
-                return self._evaluate_single_condition(value, condition_str)
-                
-        except Exception as e:
-            safe_print(f"[WARN] 조건 평가 오류: {condition_str}, 값: {value}, 오류: {e}")
-            return False
+            try:
+                return combine(op(value, threshold) for op, threshold in comparisons)
+            except TypeError:
+                return False
+        
+        return evaluate
     
-    def _evaluate_single_condition(self, value: float, condition_str: str) -> bool:
+    @staticmethod
+    def _compile_single_condition(condition_str: str) -> Optional[Tuple[Callable[[Any, float], bool], float]]:
+        """단일 비교 조건을 (연산자, 기준값)으로 변환 (기본은 ==). 해석 불가면 None"""
+        for symbol, op in _COMPARATORS:
+            if condition_str.startswith(symbol):
+                condition_str = condition_str[len(symbol):].strip()
+                break
+        else:
+            op = operator.eq
+        try:
+            return op, float(condition_str)
+        except ValueError:
+            return None
+    
+    def evaluate_condition(self, condition: Dict, context: Dict) -> bool:
         """
-        단일 조건 평가 (예: "> 0.7", "<= 0.4")
+        조건 평가 로직
+        
+        로드된 규칙은 컴파일된 술어를 사용하므로, 이 메서드는 임의 조건을 평가할 때만 사용됩니다.
         
         Args:
-            value: 평가할 값 (숫자)
-            condition_str: 조건 문자열
+            condition: 조건 딕셔너리 (예: {"threat_level": "> 0.7"})
+            context: 컨텍스트 딕셔너리 (상황 정보 포함)
             
         Returns:
             조건 만족 여부
         """
-        condition_str = condition_str.strip()
-        
-        # 비교 연산자 추출
-        if condition_str.startswith(">="):
-            threshold = float(condition_str[2:].strip())
-            return value >= threshold
-        elif condition_str.startswith("<="):
-            threshold = float(condition_str[2:].strip())
-            return value <= threshold
-        elif condition_str.startswith(">"):
-            threshold = float(condition_str[1:].strip())
-            return value > threshold
-        elif condition_str.startswith("<"):
-            threshold = float(condition_str[1:].strip())
-            return value < threshold
-        elif condition_str.startswith("=="):
-            threshold = float(condition_str[2:].strip())
-            return value == threshold
-        elif condition_str.startswith("!="):
-            threshold = float(condition_str[2:].strip())
-            return value != threshold
-        else:
-            # 기본적으로 == 비교
-            try:
-                threshold = float(condition_str)
-                return value == threshold
-            except ValueError:
-                safe_print(f"[WARN] 알 수 없는 조건 형식: {condition_str}")
-                return False
+        predicate, _ = self._compile_condition(condition)
+        return predicate(context)
     
     def execute_action(self, action: Dict, context: Dict) -> Dict:
         """
@@ -238,13 +297,10 @@ class RuleEngine:
         """
         matching_rules = []
         
-        for rule in self.rules:
-            condition = rule.get("condition", {})
-            
-            if self.evaluate_condition(condition, context):
-                action = rule.get("action", {})
-                result = self.execute_action(action, context)
-                result["rule_name"] = rule.get("name", "Unknown")
+        for compiled in self._candidate_rules(context):
+            if compiled.predicate(context):
+                result = self.execute_action(compiled.action, context)
+                result["rule_name"] = compiled.name
                 matching_rules.append(result)
         
         # 우선순위 순으로 정렬 (낮은 숫자가 높은 우선순위)
@@ -252,6 +308,23 @@ class RuleEngine:
         
         return matching_rules
     
+    def _candidate_rules(self, context: Dict) -> List[CompiledRule]:
+        """
+        컨텍스트와 관련된 규칙만 선별 (규칙 파일 순서 유지)
+        
+        조건이 검사하는 키가 하나라도 컨텍스트에 없으면 해당 규칙은 매칭될 수 없으므로 제외합니다.
+        """
+        candidates = {c.index: c for c in self._unconditional_rules}
+        for key, rules in self._rules_by_key.items():
+            if context.get(key) is None:
+                continue
+            for compiled in rules:
+                if compiled.index in candidates:
+                    continue
+                if all(context.get(k) is not None for k in compiled.required_keys):
+                    candidates[compiled.index] = compiled
+        return [candidates[idx] for idx in sorted(candidates)]
+    
     def get_recommended_coa(self, context: Dict) -> Optional[Dict]:
         """
         컨텍스트에 맞는 최적의 COA 추천
@@ -299,6 +372,7 @@ class RuleEngine:
         # 가장 높은 우선순위 규칙 사용
         top_rule = matching_rules[0]
         recommended_coa = top_rule.get("coa")
+        recommended_coa_lower = recommended_coa.lower() if recommended_coa else None
         
         # 방책별 점수 조정
         for strategy in strategies:
@@ -307,7 +381,7 @@ class RuleEngine:
             combined_name = f"{coa_name} {coa_id}"
             
             # 규칙에서 추천된 COA와 일치하면 가산점
-            if recommended_coa and recommended_coa.lower() in combined_name:
+            if recommended_coa_lower and recommended_coa_lower in combined_name:
                 base_score = strategy.get('적합도점수', 0.5)
                 # 우선순위가 높을수록 더 큰 가산점 (priority가 낮을수록 높은 우선순위)
                 priority = top_rule.get("priority", 999)
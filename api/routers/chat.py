@@ -40,9 +40,11 @@ async def chat_completions(request: ChatRequest, orchestrator: Orchestrator = De
             try:
                 # PalantirSearch 사용 (질의 확장 및 가설 기반 검색 포함)
                 if hasattr(orchestrator.core, 'palantir_search'):
+                    stage_timings = {}
                     retrieved_docs = orchestrator.core.palantir_search.search(
-                        user_prompt, top_k=3, use_graph=True
+                        user_prompt, top_k=3, use_graph=True, stage_timings=stage_timings
                     )
+                    logger.info(f"[Chat] Search stage timings: {stage_timings}")
                 # Fallback: PalantirSearch가 없으면 기존 RAG 사용
                 elif orchestrator.core.rag_manager.embedding_model is not None:
                     logger.warning("PalantirSearch not found, falling back to basic RAG")
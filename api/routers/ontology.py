@@ -63,6 +63,17 @@ class GraphLink(BaseModel):
 class GraphDataResponse(BaseModel):
     nodes: List[GraphNode]
     links: List[GraphLink]
+    version: Optional[int] = None  # 그래프 버전 (/graph/delta의 since 값)
+    total_nodes: Optional[int] = None  # 페이지 적용 전 필터링된 전체 노드 수
+
+
+class GraphDeltaResponse(BaseModel):
+    version: int
+    full_reload: bool  # True면 델타 불가 → 전체 재조회 필요
+    upserted_nodes: List[GraphNode]
+    removed_nodes: List[str]
+    added_links: List[GraphLink]
+    removed_links: List[GraphLink]
 
 
 class ValidationIssue(BaseModel):
@@ -144,14 +155,20 @@ async def get_graph_data(
     groups: Optional[str] = Query(None, description="Comma-separated list of groups to filter"),
     relations: Optional[str] = Query(None, description="Comma-separated list of relations to filter"),
     search: Optional[str] = Query(None, description="Search term for node labels"),
-    include_inferred: bool = Query(False, description="Include OWL-RL inferred relations in graph")
+    include_inferred: bool = Query(False, description="Include OWL-RL inferred relations in graph"),
+    center: Optional[str] = Query(None, description="Center node ID for neighborhood subgraph"),
+    radius: int = Query(1, ge=0, le=5, description="Neighborhood radius (hops) around center node"),
+    offset: int = Query(0, ge=0, description="Node page offset"),
+    limit: Optional[int] = Query(None, ge=1, description="Node page size (None = all nodes)")
 ):
     """
     온톨로지 그래프 데이터를 조회합니다.
-    분석 모드 및 필터링 지원.
+    분석 모드 및 필터링, 이웃 반경(center/radius) 및 페이지(offset/limit) 단위 부분 조회 지원.
     
     Args:
         include_inferred: OWL-RL 추론 결과를 그래프에 포함할지 여부
+    
+    응답의 version은 /graph/delta 호출 시 since 값으로 사용합니다.
     """
     try:
         logger.info(f"======== GRAPH DATA REQUEST START (mode={mode}, include_inferred={include_inferred}) ========")
@@ -159,14 +176,14 @@ async def get_graph_data(
         ontology_manager = orchestrator.core.ontology_manager
         
         # 추론 포함 옵션이 활성화된 경우 추론된 그래프 사용
-        graph_to_use = ontology_manager.graph
+        graph_to_use = None
         if include_inferred:
             # [OPTIMIZATION] 캐시된 추론 그래프 사용
             from core_pipeline.owl_reasoner import OWLRL_AVAILABLE
             if OWLRL_AVAILABLE:
                 try:
-                    # 원본 그래프 해시 (변경 감지용 - 간단히 길이로 체크)
-                    current_source_hash = len(ontology_manager.graph)
+                    # 원본 그래프 버전 (크기가 같은 관계 수정도 감지)
+                    current_source_hash = ontology_manager.get_graph_version()
                     
                     if _inferred_graph_cache["source_hash"] == current_source_hash and _inferred_graph_cache["graph"] is not None:
                         graph_to_use = _inferred_graph_cache["graph"]
@@ -190,73 +207,74 @@ async def get_graph_data(
             else:
                 logger.warning("OWLRL not available, using original graph")
         
-        # Get full graph data (추론된 그래프 사용)
+        # 필터/반경/페이지 적용된 부분 그래프 조회 (추론 그래프는 self.graph 교체 없이 전달)
         logger.info(f"Fetching graph data (mode={mode})")
+        subgraph = ontology_manager.get_subgraph(
+            mode=mode,
+            groups=groups.split(",") if groups else None,
+            relations=relations.split(",") if relations else None,
+            search=search,
+            center=center,
+            radius=radius,
+            offset=offset,
+            limit=limit,
+            graph=graph_to_use
+        )
         
-        # 임시로 그래프를 교체하여 to_json 호출
-        original_graph = ontology_manager.graph
-        try:
-            ontology_manager.graph = graph_to_use
-            full_data = ontology_manager.to_json()
-        finally:
-            ontology_manager.graph = original_graph
-        
-        if not full_data or mode not in full_data:
-            logger.warning(f"No graph data available for mode={mode}")
-            return GraphDataResponse(nodes=[], links=[])
-        
-        # Parse filters
-        group_filter = set(groups.split(",")) if groups else None
-        relation_filter = set(relations.split(",")) if relations else None
-        
-        # Filter nodes
-        nodes = []
-        valid_node_ids = set()
-        for node_data in full_data[mode].get("nodes", []):
-            node_id = node_data.get("id")
-            node_label = node_data.get("label", "")
-            node_group = node_data.get("group", "Unknown")
-            
-            # Apply filters
-            if group_filter and node_group not in group_filter:
-                continue
-            if search and search.lower() not in node_label.lower():
-                continue
-            
-            nodes.append(GraphNode(
-                id=node_id,
-                label=node_label,
-                group=node_group
-            ))
-            valid_node_ids.add(node_id)
-        
-        # Filter links (only include links between valid nodes)
-        links = []
-        for link_data in full_data[mode].get("links", []):
-            source = link_data.get("source")
-            target = link_data.get("target")
-            relation = link_data.get("relation", "Unknown")
-            
-            if source not in valid_node_ids or target not in valid_node_ids:
-                continue
-            if relation_filter and relation not in relation_filter:
-                continue
-            
-            links.append(GraphLink(
-                source=source,
-                target=target,
-                relation=relation
-            ))
+        nodes = [
+            GraphNode(id=n.get("id"), label=n.get("label", ""), group=n.get("group", "Unknown"))
+            for n in subgraph["nodes"]
+        ]
+        links = [
+            GraphLink(source=l.get("source"), target=l.get("target"), relation=l.get("relation", "Unknown"))
+            for l in subgraph["links"]
+        ]
         
         logger.info(f"Returning {len(nodes)} nodes and {len(links)} links")
         
-        return GraphDataResponse(nodes=nodes, links=links)
+        return GraphDataResponse(
+            nodes=nodes,
+            links=links,
+            version=subgraph["version"],
+            total_nodes=subgraph["total_nodes"]
+        )
     
     except Exception as e:
         logger.error(f"Error fetching graph data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch graph data: {str(e)}")
 
 
+@router.get("/graph/delta", response_model=GraphDeltaResponse)
+async def get_graph_delta(
+    since: int = Query(..., ge=0, description="Graph version the client already has")
+):
+    """
+    클라이언트가 가진 그래프 버전 이후의 인스턴스 그래프 변경분을 조회합니다.
+    full_reload가 true이면 변경 이력이 남아있지 않으므로 /graph를 다시 조회해야 합니다.
+    """
+    try:
+        orchestrator = get_orchestrator()
+        ontology_manager = orchestrator.core.ontology_manager
+        
+        delta = ontology_manager.get_graph_delta(since)
+        
+        return GraphDeltaResponse(
+            version=delta["version"],
+            full_reload=delta["full_reload"],
+            upserted_nodes=[
+                GraphNode(id=n.get("id"), label=n.get("label", ""), group=n.get("group", "Unknown"))
+                for n in delta["upserted_nodes"]
+            ],
+            removed_nodes=delta["removed_nodes"],
+            added_links=[GraphLink(**l) for l in delta["added_links"]],
+            removed_links=[GraphLink(**l) for l in delta["removed_links"]]
+        )
+    
+    except Exception as e:
+        logger.error(f"Error fetching graph delta: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch graph delta: {str(e)}")
+
+
 from core_pipeline.ontology_validator import OntologyValidator
 
 
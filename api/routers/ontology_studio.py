@@ -92,8 +92,8 @@ async def get_studio_stats():
         # Use EnhancedOntologyManager if available
         om = getattr(orchestrator.core, 'enhanced_ontology_manager', orchestrator.core.ontology_manager)
         
-        full_data = om.to_json()
-        stats = full_data.get("stats", {})
+        # 전체 그래프 JSON 변환 없이 유지 중인 카운터 사용
+        stats = orchestrator.core.statistics.get_ontology_stats()
         
         return {
             "stats": stats,
@@ -332,7 +332,7 @@ async def run_owl_inference(request: OWLInferenceRequest):
         # 추론 통계 계산
         if inferred_graph is not None:
             original_triples_count = len(set(original_graph))
-            inferred_triples_count = len(set(inferred_graph))
+            inferred_triples_count = len(inferred_graph)
             reasoner.inference_stats = {
                 "original_triples": original_triples_count,
                 "inferred_triples": inferred_triples_count,
@@ -344,10 +344,10 @@ async def run_owl_inference(request: OWLInferenceRequest):
         # 추론 결과를 원본 그래프에 적용할지 여부
         applied_count = 0
         if request.apply_to_graph and inferred_graph is not None:
-            # 추론된 그래프의 새로운 트리플만 원본 그래프에 추가
-            original_triples = set(om.graph)
-            for triple in inferred_graph:
-                if triple not in original_triples:
+            # 추론된 그래프의 새로운 트리플(오버레이)만 원본 그래프에 추가
+            new_triples = list(getattr(inferred_graph, 'overlay', inferred_graph))
+            for triple in new_triples:
+                if triple not in om.graph:
                     om.graph.add(triple)
                     applied_count += 1
             
@@ -566,6 +566,7 @@ class RulesExecutionResponse(BaseModel):
     rule_results: Dict[str, Any]
     applied_to_graph: bool = False
     applied_count: int = 0
+    schedule: Dict[str, Any] = {}
 
 
 @router.get("/rules")
@@ -606,6 +607,7 @@ async def execute_inference_rules(request: RulesExecutionRequest):
     도메인 추론 규칙을 실행합니다.
     
     SWRL 스타일의 전술 도메인 규칙을 적용하여:
+    (독립 규칙은 병렬, 상호 의존 규칙만 고정점까지 반복 실행)
     - 교전 대상 추론
     - 위협 노출 분석
     - 화력 지원 가능 범위
@@ -621,10 +623,16 @@ async def execute_inference_rules(request: RulesExecutionRequest):
         namespace = str(om.ns) if hasattr(om, 'ns') and om.ns else None
         engine = InferenceRulesEngine(om.graph, namespace)
         
+        # DataWatcher가 증분 갱신해 온 규칙 결론이 있으면 재평가 없이 사용
+        materialized = None
+        if hasattr(om, 'get_materialized_inferences'):
+            materialized = om.get_materialized_inferences()
+        
         # 규칙 실행
         result = engine.execute_all_rules(
             categories=request.categories,
-            priority_filter=request.priority_filter
+            priority_filter=request.priority_filter,
+            materialized=materialized
         )
         
         applied_count = 0
@@ -640,7 +648,8 @@ async def execute_inference_rules(request: RulesExecutionRequest):
             inferred_by_category=stats.get("inferred_by_category", {}),
             rule_results=result.get("rule_results", {}),
             applied_to_graph=request.apply_to_graph,
-            applied_count=applied_count
+            applied_count=applied_count,
+            schedule=stats.get("schedule", {})
         )
         
     except Exception as e:
@@ -823,7 +832,10 @@ async def add_relation(triple: TripleModel):
                 o = Literal(triple.object_val)
                 print(f"[DEBUG] Object resolved as Literal: {o}")
             
-        om.graph.add((s, p, o))
+        if (s, p, o) not in om.graph:
+            om.graph.add((s, p, o))
+            if hasattr(om, 'record_graph_change'):
+                om.record_graph_change(added=[(s, p, o)])
         print(f"[DEBUG] Triple added to graph in memory. Total triples for this subject: {len(list(om.graph.triples((s, None, None))))}")
         
         om.save_graph()
@@ -854,7 +866,10 @@ async def delete_relation(subject: str, predicate: str, object_val: str):
             # Try literal if URI removal failed
             o = Literal(object_val)
         
-        om.graph.remove((s, p, o))
+        if (s, p, o) in om.graph:
+            om.graph.remove((s, p, o))
+            if hasattr(om, 'record_graph_change'):
+                om.record_graph_change(removed=[(s, p, o)])
         om.save_graph()
         
         return {"success": True, "message": "Relation deleted successfully"}
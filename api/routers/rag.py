@@ -5,13 +5,15 @@ RAG 관련 API 엔드포인트
 - 인덱스 상태 조회 및 재구축
 - 시맨틱 검색 테스트
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, File, Query
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 from core_pipeline.orchestrator import Orchestrator
 import logging
 import os
 import shutil
+import threading
+from datetime import datetime
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -129,84 +131,69 @@ async def list_documents():
         logger.error(f"Error listing documents: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# 재색인 작업 상태 (단일 작업만 허용)
+_reindex_lock = threading.Lock()
+_reindex_job: Dict[str, Any] = {"status": "idle"}
+
+
+def _run_reindex_job(orchestrator: Orchestrator, docs_path: Path, force_full: bool):
+    """재색인 작업 본체 (BackgroundTasks 스레드풀에서 실행 - 이벤트 루프 비차단)"""
+    from core_pipeline.rag_manifest import sync_documents
+    
+    try:
+        stats = sync_documents(orchestrator.core.rag_manager, docs_path, force_full=force_full)
+        # 새 인덱스 기준으로 COA별 과거 성공 사례 테이블 갱신
+        stats["historical_evidence_entries"] = orchestrator.core.refresh_historical_evidence()
+        _reindex_job.update({"status": "completed", "result": stats})
+    except Exception as e:
+        logger.error(f"Error rebuilding index: {str(e)}")
+        _reindex_job.update({"status": "failed", "error": str(e)})
+    finally:
+        _reindex_job["finished_at"] = datetime.now().isoformat()
+
+
 @router.post("/reindex")
-async def rebuild_index():
+async def rebuild_index(background_tasks: BackgroundTasks, full: bool = False):
     """
-    업로드된 문서들을 기반으로 RAG 인덱스를 재구축합니다.
+    업로드된 문서들을 기반으로 RAG 인덱스를 갱신합니다.
+    
+    문서 매니페스트로 신규/변경 문서만 청킹·색인하고 삭제된 문서는 tombstone 처리합니다
+    (full=true이면 전체 재구축). 작업은 백그라운드에서 실행되며 /reindex/status로 진행 상태를 조회합니다.
     """
     try:
         orchestrator = get_orchestrator()
-        rag_manager = orchestrator.core.rag_manager
         docs_path = get_rag_docs_path(orchestrator)
         
-        doc_files = list(docs_path.glob("*.*"))
-        doc_files = [f for f in doc_files if f.suffix.lower() in ['.txt', '.pdf', '.md', '.docx']]
-        
-        if not doc_files:
+        from core_pipeline.rag_manifest import list_documents
+        if not list_documents(docs_path):
             return {"status": "no_documents", "message": "No documents found to index"}
-
-        # 문서 로드 및 분류 (Streamlit 로직 마이그레이션)
-        doctrine_docs = []
-        doctrine_doc_names = []
-        general_docs = []
-        general_doc_names = []
-        
-        for doc_file in doc_files:
-            if doc_file.suffix.lower() in ['.txt', '.md']:
-                try:
-                    with open(doc_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if content.strip():
-                            is_doctrine = (
-                                doc_file.name.upper().startswith("DOCTRINE") or 
-                                "# Doctrine_ID:" in content
-                            )
-                            if is_doctrine:
-                                doctrine_docs.append(content)
-                                doctrine_doc_names.append(doc_file.name)
-                            else:
-                                general_docs.append(content)
-                                general_doc_names.append(doc_file.name)
-                except Exception as e:
-                    logger.warning(f"Failed to read {doc_file.name}: {e}")
-            else:
-                logger.warning(f"Unsupported format: {doc_file.suffix}")
-
-        all_chunks = []
         
-        # 1. 교리 문서 청킹 (특수 로직)
-        if doctrine_docs:
-            doctrine_chunks = rag_manager.chunk_doctrine_documents(
-                doctrine_docs, 
-                doc_names=doctrine_doc_names
-            )
-            all_chunks.extend(doctrine_chunks)
+        with _reindex_lock:
+            if _reindex_job.get("status") == "running":
+                return {"status": "running", "started_at": _reindex_job.get("started_at")}
+            _reindex_job.clear()
+            _reindex_job.update({
+                "status": "running",
+                "full": full,
+                "started_at": datetime.now().isoformat()
+            })
         
-        # 2. 일반 문서 청킹
-        if general_docs:
-            general_chunks = rag_manager.chunk_documents(
-                general_docs, 
-                doc_names=general_doc_names
-            )
-            all_chunks.extend(general_chunks)
-
-        if all_chunks:
-            # 인덱스 재구축 및 저장
-            rag_manager.build_index(all_chunks, use_faiss=True)
-            rag_manager.save_index()
-            return {
-                "status": "success", 
-                "total_chunks": len(all_chunks),
-                "doctrine_docs": len(doctrine_docs),
-                "general_docs": len(general_docs)
-            }
-        else:
-            return {"status": "no_chunks", "message": "No valid chunks generated from documents"}
+        background_tasks.add_task(_run_reindex_job, orchestrator, docs_path, full)
+        return {"status": "started", "full": full, "started_at": _reindex_job["started_at"]}
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error rebuilding index: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Reindexing failed: {str(e)}")
 
+@router.get("/reindex/status")
+async def get_reindex_status():
+    """
+    최근 재색인 작업 상태를 조회합니다. (idle | running | completed | failed)
+    """
+    return dict(_reindex_job)
+
 @router.post("/search", response_model=List[SearchResult])
 async def search_rag(request: SearchRequest):
     """
@@ -23,6 +23,20 @@ def initialize_system(
     background_tasks.add_task(state.initialize)
     return {"message": "시스템 초기화가 백그라운드에서 시작되었습니다."}
 
+@router.get("/readiness")
+def get_readiness(state: GlobalStateManager = Depends(get_global_state)):
+    """
+    구성요소별 초기화 준비 상태를 반환합니다.
+    지연(lazy) 구성요소는 최초 사용 전까지 deferred 상태로 표시됩니다.
+    """
+    orchestrator = state.orchestrator
+    if not orchestrator:
+        return {"ready": False, "components": {}}
+    
+    components = orchestrator.core.get_component_status()
+    ready = all(c.get("status") in ("ready", "deferred") for c in components.values())
+    return {"ready": ready, "components": components}
+
 @router.get("/docs")
 def list_documents():
     """docs 디렉토리의 문서 목록을 카테고리별로 반환합니다."""
@@ -74,18 +88,17 @@ def get_kpi_stats(state: GlobalStateManager = Depends(get_global_state)):
     if not orchestrator:
         return {"error": "오케스트레이터가 초기화되지 않았습니다."}
         
-    om = orchestrator.core.ontology_manager
     rm = orchestrator.core.rag_manager
-    dm = orchestrator.core.data_manager
+    statistics = orchestrator.core.statistics
     
-    # 온톨로지 지표
-    triple_count = len(om.graph) if hasattr(om, 'graph') else 0
+    # 온톨로지 지표 (유지 중인 카운터)
+    triple_count = statistics.get_ontology_stats().get("total_triples", 0)
     
     # RAG 지표
     chunk_count = len(rm.chunks) if hasattr(rm, 'chunks') else 0
     
-    # 위협 지표
-    threats = dm.load_all().get("threats", [])
+    # 위협 지표 (위협상황 테이블이 재로드된 경우에만 재집계)
+    threats = statistics.get_threat_stats()
     
     return {
         "ontology": {
@@ -96,9 +109,9 @@ def get_kpi_stats(state: GlobalStateManager = Depends(get_global_state)):
             "chunks": chunk_count,
             "status": "ready" if rm.is_available() else "loading"
         },
-        "threats": {
-            "total": len(threats),
-            "active": len([t for t in threats if t.get('status') != 'resolved'])
+        "threats": threats,
+        "data": {
+            "tables": statistics.get_table_stats()
         }
     }
 
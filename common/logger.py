@@ -6,6 +6,9 @@ Logger Module
 """
 import logging
 import os
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -46,6 +49,22 @@ def set_debug_mode(enabled: bool):
     global _DEBUG_MODE
     _DEBUG_MODE = enabled
 
+# 로거 이름 → 파일 기록용 QueueListener
+_listeners = {}
+
+
+def _stop_listener(name: str):
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+
+@atexit.register
+def _stop_all_listeners():
+    """종료 시 큐에 남은 로그 기록"""
+    for name in list(_listeners.keys()):
+        _stop_listener(name)
+
 def setup_logger(name: str = "DefenseAI", log_level: str = "INFO", log_path: Optional[str] = None) -> logging.Logger:
     """
     로거 설정
@@ -63,6 +82,7 @@ def setup_logger(name: str = "DefenseAI", log_level: str = "INFO", log_path: Opt
     
     # 기존 핸들러 제거
     logger.handlers = []
+    _stop_listener(name)
     
     # 포맷 설정
     formatter = logging.Formatter(
@@ -77,12 +97,21 @@ def setup_logger(name: str = "DefenseAI", log_level: str = "INFO", log_path: Opt
     logger.addHandler(console_handler)
     
     # 파일 핸들러 (선택적)
+    # 호출 스레드가 디스크 I/O를 기다리지 않도록 QueueHandler로 넣고 QueueListener가 기록
     if log_path:
         os.makedirs(os.path.dirname(log_path), exist_ok=True)
         file_handler = logging.FileHandler(log_path, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        
+        log_queue = queue.Queue(-1)
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setLevel(logging.DEBUG)
+        logger.addHandler(queue_handler)
+        
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
     
     return logger
 
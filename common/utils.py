@@ -7,6 +7,10 @@ Utility Functions
 import os
 import json
 import yaml
+import queue
+import time
+import atexit
+import logging
 import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -78,10 +82,170 @@ def ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
-# 로그 파일 쓰기용 락 (스레드 안전)
-_log_lock = threading.Lock()
-_log_file_handle = None
-_error_log_file_handle = None
+# 로그 레벨 (메시지 접두어 기준)
+_LEVEL_ORDER = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40, "FATAL": 50}
+
+
+def _detect_level(msg_str: str) -> str:
+    """메시지 접두어로 레벨 판단 (포맷팅 이전에 필터링하기 위해 가볍게 검사)"""
+    head = msg_str[:64]
+    if "[ERROR]" in head or "[FATAL]" in head:
+        return "ERROR"
+    if "[WARN" in head:
+        return "WARN"
+    if "[DEBUG]" in head:
+        return "DEBUG"
+    return "INFO"
+
+
+def _min_level() -> int:
+    """COA_LOG_LEVEL 환경변수 기준 최소 출력 레벨 (기본: DEBUG = 전부 출력)"""
+    level = os.environ.get("COA_LOG_LEVEL", "DEBUG").upper()
+    if level == "WARNING":
+        level = "WARN"
+    return _LEVEL_ORDER.get(level, 10)
+
+
+class _AsyncLogWriter:
+    """
+    비동기 배치 로그 파일 기록기
+    
+    safe_print 호출 스레드는 큐에 넣기만 하고, 백그라운드 스레드가 모아서 기록합니다.
+    
+    내구성 정책 (COA_LOG_DURABILITY 환경변수):
+    - buffered: OS 버퍼에 맡김 (배치마다 flush 하지 않음, 가장 빠름)
+    - flush: 배치마다 flush (기본값)
+    - fsync: 배치마다 flush + os.fsync (가장 안전, 배치 단위로만 디스크 동기화)
+    """
+    
+    BATCH_SIZE = 256
+    FLUSH_INTERVAL = 0.5  # 초
+    
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._file_handle = None
+        self._file_date = None
+        self._error_handle = None
+        self.durability = os.environ.get("COA_LOG_DURABILITY", "flush").lower()
+    
+    def submit(self, timestamp: datetime, msg_str: str):
+        self._ensure_started()
+        self._queue.put((timestamp, msg_str))
+    
+    def flush(self, timeout: float = 5.0):
+        """대기 중인 로그를 모두 기록할 때까지 대기"""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(("__flush__", done))
+        done.wait(timeout)
+    
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="safe-print-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.BATCH_SIZE and batch[-1][0] != "__flush__":
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+    
+    def _write_batch(self, batch):
+        waiters = []
+        lines_by_date = {}
+        for ts, payload in batch:
+            if ts == "__flush__":
+                waiters.append(payload)
+                continue
+            # 타임스탬프 포함 메시지 (UTF-8 인코딩 보장)
+            try:
+                payload.encode('utf-8')
+            except (UnicodeEncodeError, UnicodeDecodeError):
+                payload = payload.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
+            lines_by_date.setdefault(ts.strftime('%Y%m%d'), []).append(
+                f"{ts.strftime('%Y-%m-%d %H:%M:%S')} - {payload}\n"
+            )
+        
+        for date_str, lines in lines_by_date.items():
+            try:
+                handle = self._get_handle(date_str)
+                handle.write("".join(lines))
+                if self.durability in ("flush", "fsync"):
+                    handle.flush()
+                if self.durability == "fsync":
+                    os.fsync(handle.fileno())
+            except Exception as e:
+                self._write_error(e, lines)
+        
+        if waiters:
+            try:
+                if self._file_handle is not None and not self._file_handle.closed:
+                    self._file_handle.flush()
+            except Exception:
+                pass
+            for done in waiters:
+                done.set()
+    
+    def _get_handle(self, date_str: str):
+        # 날짜별 로그 파일 (날짜가 바뀌면 새 파일)
+        if self._file_handle is None or self._file_handle.closed or self._file_date != date_str:
+            if self._file_handle is not None and not self._file_handle.closed:
+                self._file_handle.close()
+            log_dir = get_project_root() / "logs"
+            log_dir.mkdir(exist_ok=True)
+            log_file_path = log_dir / f"system_{date_str}.log"
+            # 파일이 없으면 UTF-8 BOM으로 시작
+            if not log_file_path.exists():
+                with open(log_file_path, 'w', encoding='utf-8-sig') as f:
+                    f.write('')
+            self._file_handle = open(log_file_path, 'a', encoding='utf-8')
+            self._file_date = date_str
+        return self._file_handle
+    
+    def _write_error(self, error: Exception, lines):
+        # 로그 파일 쓰기 실패 시 error.log에 기록
+        try:
+            if self._error_handle is None or self._error_handle.closed:
+                log_dir = get_project_root() / "logs"
+                log_dir.mkdir(exist_ok=True)
+                error_log_file_path = log_dir / "error.log"
+                if not error_log_file_path.exists():
+                    with open(error_log_file_path, 'w', encoding='utf-8-sig') as f:
+                        f.write('')
+                self._error_handle = open(error_log_file_path, 'a', encoding='utf-8')
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self._error_handle.write(f"{timestamp} - [LOG_ERROR] 로그 파일 쓰기 실패: {error}\n")
+            for line in lines:
+                self._error_handle.write(f"{timestamp} - [LOG_ERROR] 원본 메시지: {line}")
+            self._error_handle.flush()
+        except Exception:
+            # error.log 쓰기도 실패하면 무시 (무한 루프 방지)
+            pass
+
+
+_log_writer = _AsyncLogWriter()
+
+
+def flush_logs(timeout: float = 5.0):
+    """safe_print 파일 로그 큐를 비움 (종료 직전 등)"""
+    _log_writer.flush(timeout)
+
 
 def safe_print(msg: str, also_log_file: bool = True, logger_name: Optional[str] = None):
     """
@@ -90,9 +254,9 @@ def safe_print(msg: str, also_log_file: bool = True, logger_name: Optional[str]
     개선 사항:
     - also_log_file 파라미터 추가 (기본값: True)
     - 타임스탬프 포함
-    - 스레드 안전 파일 쓰기 (_log_lock 사용)
-    - buffering=1과 flush()로 즉시 디스크 쓰기
-    - os.fsync()로 OS 버퍼까지 강제 쓰기
+    - 파일 기록은 비동기 배치 기록기(_AsyncLogWriter)에 위임 (호출 스레드는 디스크 I/O 대기 없음)
+    - 내구성 정책은 COA_LOG_DURABILITY (buffered | flush | fsync) 로 선택
+    - COA_LOG_LEVEL 미만 레벨은 포맷팅/출력 전에 버림
     - 오류 처리 강화 (별도 error.log 파일에 기록)
     - 로거 연동 (logger_name이 제공되면 로거에도 기록)
     
@@ -101,10 +265,13 @@ def safe_print(msg: str, also_log_file: bool = True, logger_name: Optional[str]
         also_log_file: 파일에도 기록할지 여부 (기본값: True)
         logger_name: 로거 이름 (제공되면 로거에도 기록)
     """
-    global _log_file_handle, _error_log_file_handle
-    
     msg_str = str(msg)
     
+    # 0. 레벨 필터링 (포맷팅 이전)
+    level = _detect_level(msg_str)
+    if _LEVEL_ORDER[level] < _min_level():
+        return
+    
     # 1. 로거 사용 (logger_name이 제공된 경우)
     # 🔥 개선: logger_name이 제공되면 로거가 파일에 기록하므로 중복 방지를 위해 also_log_file을 False로 설정
     if logger_name:
@@ -113,16 +280,17 @@ def safe_print(msg: str, also_log_file: bool = True, logger_name: Optional[str]
             logger = get_logger(logger_name)
             
             # 메시지 레벨 자동 감지
-            if "[ERROR]" in msg_str or "[FATAL]" in msg_str:
-                logger.error(msg_str.replace("[ERROR]", "").replace("[FATAL]", "").strip())
-            elif "[WARN]" in msg_str:
-                logger.warning(msg_str.replace("[WARN]", "").strip())
-            elif "[DEBUG]" in msg_str:
-                logger.debug(msg_str.replace("[DEBUG]", "").strip())
-            elif "[INFO]" in msg_str:
+            if level == "ERROR":
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error(msg_str.replace("[ERROR]", "").replace("[FATAL]", "").strip())
+            elif level == "WARN":
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(msg_str.replace("[WARN]", "").strip())
+            elif level == "DEBUG":
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(msg_str.replace("[DEBUG]", "").strip())
+            elif logger.isEnabledFor(logging.INFO):
                 logger.info(msg_str.replace("[INFO]", "").strip())
-            else:
-                logger.info(msg_str)
             
             # 🔥 개선: logger_name이 제공되면 로거가 이미 파일에 기록하므로 중복 방지
             # also_log_file이 명시적으로 True로 설정된 경우에만 파일 로깅 수행
@@ -151,62 +319,8 @@ def safe_print(msg: str, also_log_file: bool = True, logger_name: Optional[str]
         return
     
     try:
-        with _log_lock:
-            # 로그 파일 경로 설정
-            project_root = get_project_root()
-            log_dir = project_root / "logs"
-            log_dir.mkdir(exist_ok=True)
-            
-            # 날짜별 로그 파일
-            today = datetime.now().strftime('%Y%m%d')
-            log_file_path = log_dir / f"system_{today}.log"
-            error_log_file_path = log_dir / "error.log"
-            
-            # 타임스탬프 포함 메시지 (UTF-8 인코딩 보장)
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            # 메시지를 UTF-8로 명시적으로 인코딩 보장
-            try:
-                # 이미 UTF-8인지 확인
-                msg_str.encode('utf-8')
-            except (UnicodeEncodeError, UnicodeDecodeError):
-                # 인코딩 문제가 있으면 안전하게 처리
-                msg_str = msg_str.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-            log_msg = f"{timestamp} - {msg_str}\n"
-            
-            # 메인 로그 파일 쓰기
-            try:
-                if _log_file_handle is None or _log_file_handle.closed:
-                    # 파일이 없으면 UTF-8 BOM으로 시작
-                    if not log_file_path.exists():
-                        with open(log_file_path, 'w', encoding='utf-8-sig') as f:
-                            f.write('')  # BOM만 있는 빈 파일 생성
-                    # 🔥 수정: buffering=1 제거 (OS 버퍼링 사용), fsync 제거 -> 속도 최적화
-                    _log_file_handle = open(log_file_path, 'a', encoding='utf-8-sig')
-                
-                _log_file_handle.write(log_msg)
-                _log_file_handle.flush() # OS 버퍼링 사용 시에도 명시적 flush로 유실 방지
-                # os.fsync(_log_file_handle.fileno())  # 🔥 제거: 심각한 성능 저하 원인
-            except Exception as e:
-                # 로그 파일 쓰기 실패 시 error.log에 기록
-                try:
-                    if _error_log_file_handle is None or _error_log_file_handle.closed:
-                        # 파일이 없으면 UTF-8 BOM으로 시작
-                        if not error_log_file_path.exists():
-                            with open(error_log_file_path, 'w', encoding='utf-8-sig') as f:
-                                f.write('')  # BOM만 있는 빈 파일 생성
-                        # 🔥 수정: buffering=1 제거
-                        _error_log_file_handle = open(error_log_file_path, 'a', encoding='utf-8-sig')
-                    
-                    error_msg = f"{timestamp} - [LOG_ERROR] 로그 파일 쓰기 실패: {e}\n"
-                    error_msg += f"{timestamp} - [LOG_ERROR] 원본 메시지: {msg_str}\n"
-                    _error_log_file_handle.write(error_msg)
-                    # _error_log_file_handle.flush()
-                    # os.fsync(_error_log_file_handle.fileno())
-                except Exception:
-                    # error.log 쓰기도 실패하면 무시 (무한 루프 방지)
-                    pass
-                    
-    except Exception as e:
+        _log_writer.submit(datetime.now(), msg_str)
+    except Exception:
         # 전체 로깅 프로세스 실패 시에도 무시 (무한 루프 방지)
         # 터미널 출력은 이미 성공했으므로 계속 진행
         pass
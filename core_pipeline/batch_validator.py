@@ -3,11 +3,16 @@
 """
 배치 검증 모듈
 대량의 관계를 일괄적으로 검증
+
+노드 존재 판정은 GraphValidationIndex 조회(O(1))로 수행하며,
+incremental=True이면 인덱스 동기화에서 갱신된 노드(last_sync["touched"])에 걸린 관계만 다시 검증합니다.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from rdflib import Graph, URIRef
 from collections import defaultdict
 
+from core_pipeline.validation_index import get_validation_index
+
 class BatchValidator:
     """배치 검증 클래스"""
     
@@ -15,18 +20,26 @@ class BatchValidator:
         self.ontology_manager = ontology_manager
         self.graph = ontology_manager.graph if ontology_manager else None
         self.ns = ontology_manager.ns if ontology_manager else None
+        self.index = None
+        # 마지막 검증 결과 (증분 재검증용): 관계 트리플 → 검증 결과
+        self._last_results: Dict[Tuple, Dict] = {}
+        self._last_key = None
+        self._last_version: Optional[int] = None
     
-    def validate(self, scope: str, rules: List[str]) -> Dict:
+    def validate(self, scope: str, rules: List[str], incremental: bool = False) -> Dict:
         """
         배치 검증 실행
         
         Args:
             scope: "전체 관계", "특정 관계 유형", "특정 테이블", "사용자 지정 필터"
             rules: 검증 규칙 리스트
+            incremental: 마지막 검증 이후 변경된 관계만 재검증 (이력이 없으면 전체 검증)
         
         Returns:
-            검증 결과 딕셔너리
+            검증 결과 딕셔너리 (mode: full/incremental, revalidated: 재검증한 관계 수 포함)
         """
+        if self.ontology_manager is not None:
+            self.graph = self.ontology_manager.graph
         if not self.graph:
             return {
                 "total": 0,
@@ -39,23 +52,47 @@ class BatchValidator:
                 "warning_relationships": []
             }
         
-        # 검증 대상 관계 수집
-        relationships = self._collect_relationships(scope)
+        self.index = get_validation_index(self.ontology_manager)
+        key = (scope, tuple(rules), id(self.graph))
+        
+        # 재검증 대상 결정
+        touched = None
+        if incremental and key == self._last_key and self._last_version is not None:
+            touched = self._touched_nodes()
         
-        # 검증 실행
+        if touched is None:
+            mode = "full"
+            self._last_results = {}
+            to_validate = self._collect_relationships(scope)
+        else:
+            mode = "incremental"
+            to_validate = self._refresh_touched(touched)
+        
+        for rel in to_validate:
+            self._last_results[self._edge_key(rel)] = self._validate_relationship(rel, rules)
+        self._last_key = key
+        self._last_version = self.index.version
+        
+        # 검증 결과 집계
         results = {
-            "total": len(relationships),
+            "total": len(self._last_results),
             "passed": 0,
             "failed": 0,
             "warning": 0,
             "details": [],
             "passed_relationships": [],
             "failed_relationships": [],
-            "warning_relationships": []
+            "warning_relationships": [],
+            "mode": mode,
+            "revalidated": len(to_validate)
         }
         
-        for rel in relationships:
-            validation_result = self._validate_relationship(rel, rules)
+        for validation_result in self._last_results.values():
+            rel = {
+                "source": validation_result["source"],
+                "target": validation_result["target"],
+                "relation": validation_result["relation"]
+            }
             
             if validation_result["status"] == "PASSED":
                 results["passed"] += 1
@@ -80,18 +117,62 @@ class BatchValidator:
         
         # 전체 관계 수집
         for s, p, o in self.graph.triples((None, None, None)):
-            # 온톨로지 네임스페이스의 관계만
-            if str(p).startswith(str(self.ns)) and str(p) != str(self.ns.type):
-                # 리터럴이 아닌 URI만
-                if isinstance(o, URIRef):
-                    relationships.append({
-                        "source": str(s),
-                        "target": str(o),
-                        "relation": str(p).replace(str(self.ns), "")
-                    })
+            if self._is_target_relation(p, o):
+                relationships.append(self._to_relationship(s, p, o))
         
         return relationships
     
+    def _is_target_relation(self, p, o) -> bool:
+        # 온톨로지 네임스페이스의 관계 중 리터럴이 아닌 URI만
+        return str(p).startswith(str(self.ns)) and str(p) != str(self.ns.type) and isinstance(o, URIRef)
+    
+    def _to_relationship(self, s, p, o) -> Dict:
+        return {
+            "source": str(s),
+            "target": str(o),
+            "relation": str(p).replace(str(self.ns), "")
+        }
+    
+    @staticmethod
+    def _edge_key(relationship: Dict) -> Tuple:
+        return (relationship["source"], relationship["relation"], relationship["target"])
+    
+    def _touched_nodes(self) -> Optional[set]:
+        """
+        마지막 검증 이후 인덱스 동기화에서 갱신된 노드 (판단할 수 없으면 None → 전체 검증)
+        
+        다른 검증기가 사이에 동기화해 last_sync가 마지막 검증 버전부터의 변경이 아니면 전체 검증합니다.
+        """
+        if self.index.version == self._last_version:
+            return set()
+        last_sync = self.index.last_sync
+        if last_sync.get("touched") is None or last_sync.get("since") != self._last_version:
+            return None
+        return {str(node) for node in last_sync["touched"] if isinstance(node, URIRef)}
+    
+    def _refresh_touched(self, touched: set) -> List[Dict]:
+        """
+        변경된 노드에 걸린 관계만 다시 수집 (삭제된 관계는 이전 결과에서 제거)
+        
+        노드 존재/중복 판정이 노드 단위로 바뀌므로, 변경된 트리플뿐 아니라
+        변경된 노드를 소스/타겟으로 하는 관계를 모두 재검증합니다.
+        """
+        for edge_key in [k for k in self._last_results if k[0] in touched or k[2] in touched]:
+            del self._last_results[edge_key]
+        
+        relationships = {}
+        for node_uri in touched:
+            node = URIRef(node_uri)
+            for s, p, o in self.graph.triples((node, None, None)):
+                if self._is_target_relation(p, o):
+                    rel = self._to_relationship(s, p, o)
+                    relationships[self._edge_key(rel)] = rel
+            for s, p, o in self.graph.triples((None, None, node)):
+                if self._is_target_relation(p, o):
+                    rel = self._to_relationship(s, p, o)
+                    relationships[self._edge_key(rel)] = rel
+        return list(relationships.values())
+    
     def _validate_relationship(self, relationship: Dict, rules: List[str]) -> Dict:
         """개별 관계 검증"""
         source = relationship.get("source")
@@ -174,15 +255,12 @@ class BatchValidator:
         return {"status": "PASSED", "message": "규칙 통과"}
     
     def _node_exists(self, node_uri: str) -> bool:
-        """노드 존재 확인"""
+        """노드 존재 확인 (주어로 기술된 노드만 존재로 간주 - 미정의 참조는 실패)"""
         if not self.graph:
             return False
         try:
-            node_ref = URIRef(node_uri)
-            # 노드가 그래프에 존재하는지 확인
-            return len(list(self.graph.triples((node_ref, None, None)))) > 0 or \
-                   len(list(self.graph.triples((None, None, node_ref)))) > 0
-        except:
+            return self.index.is_defined(URIRef(node_uri))
+        except Exception:
             return False
     
     def _has_circular_reference(self, source: str, target: str) -> bool:
@@ -191,17 +269,9 @@ class BatchValidator:
         return False
     
     def _count_duplicate_relationships(self, source: str, target: str, relation: str) -> int:
-        """중복 관계 개수"""
+        """중복 관계 개수 (rdflib Graph는 트리플을 집합으로 저장하므로 최대 1)"""
         if not self.graph or not self.ns:
             return 0
         
-        count = 0
-        source_ref = URIRef(source)
-        target_ref = URIRef(target)
-        relation_ref = self.ns[relation] if self.ns else None
-        
-        if relation_ref:
-            count = len(list(self.graph.triples((source_ref, relation_ref, target_ref))))
-        
-        return count
+        return int((URIRef(source), self.ns[relation], URIRef(target)) in self.graph)
 
@@ -5,11 +5,97 @@ Enhanced COA Evaluator
 온톨로지/AI 기능이 통합된 COA 평가기
 **하이브리드 방식**: 규칙 기반 기본 점수 (60-70%) + 추론 보강 점수 (30-40%)
 """
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Set
 from core_pipeline.data_models import AxisState
 from core_pipeline.coa_engine.coa_models import COA
 from core_pipeline.coa_engine.coa_evaluator import COAEvaluator, COAEvaluationResult
 from core_pipeline.coa_engine.coa_llm_adapter import COALLMAdapter
+from core_pipeline.coa_engine.historical_evidence import (
+    DEFAULT_SUCCESS_RATE,
+    evidence_key,
+    get_historical_evidence,
+)
+
+ONTOLOGY_NS = "http://coa-agent-platform.org/ontology#"
+
+
+def _local(node) -> str:
+    text = str(node)
+    return text.split('#')[-1] if '#' in text else text
+
+
+class OntologyFeatureTable:
+    """
+    평가 배치 단위 온톨로지 특성 테이블
+    
+    후보 COA/축선 전체에 대해 프리디케이트별로 한 번씩만 그래프를 조회하여
+    COA→효과성, COA→적용가능지역, 축선→지형셀, 위협→COA 체인을 메모리에 적재합니다.
+    """
+    
+    def __init__(self, ontology_manager, relationship_chain=None):
+        self.ontology_manager = ontology_manager
+        self.relationship_chain = relationship_chain
+        self.coa_uris: Dict[str, str] = {}
+        self.effectiveness: Dict[str, str] = {}
+        self.applicable_regions: Dict[str, Set[str]] = {}
+        self.axis_cells: Dict[str, Set[str]] = {}
+        self._chains: Dict[str, List[Dict]] = {}
+    
+    def coa_uri(self, coa: COA) -> str:
+        """COA ID → 온톨로지 URI (COA_Library_ 접두어, URI-safe 변환)"""
+        coa_id = str(coa.coa_id)
+        uri = self.coa_uris.get(coa_id)
+        if uri is None:
+            # Extract ID if it's a URI
+            coa_id_raw = _local(coa_id)
+            safe_id = coa_id_raw if coa_id_raw.startswith("COA_Library_") else f"COA_Library_{coa_id_raw}"
+            if hasattr(self.ontology_manager, '_make_uri_safe'):
+                safe_id = self.ontology_manager._make_uri_safe(safe_id)
+            uri = f"{ONTOLOGY_NS}{safe_id}"
+            self.coa_uris[coa_id] = uri
+        return uri
+    
+    def load(self, coa_list: List[COA], axis_states: List[AxisState]) -> "OntologyFeatureTable":
+        """후보 COA/축선의 온톨로지 속성을 프리디케이트 단위 집합 조회로 적재"""
+        graph = getattr(self.ontology_manager, 'graph', None) if self.ontology_manager else None
+        if not graph:
+            return self
+        
+        from rdflib import URIRef
+        coa_nodes = {URIRef(self.coa_uri(coa)) for coa in coa_list}
+        axis_nodes = {
+            URIRef(f"{ONTOLOGY_NS}전장축선_{axis_state.axis_id}"): str(axis_state.axis_id)
+            for axis_state in axis_states if hasattr(axis_state, 'axis_id')
+        }
+        
+        for coa_node, value in graph.subject_objects(URIRef(f"{ONTOLOGY_NS}effectiveness")):
+            if coa_node in coa_nodes:
+                self.effectiveness.setdefault(str(coa_node), str(value))
+        
+        for coa_node, region in graph.subject_objects(URIRef(f"{ONTOLOGY_NS}적용가능지역")):
+            if coa_node in coa_nodes:
+                self.applicable_regions.setdefault(str(coa_node), set()).add(_local(region))
+        
+        for axis_id in axis_nodes.values():
+            self.axis_cells.setdefault(axis_id, set())
+        for axis_node, cell in graph.subject_objects(URIRef(f"{ONTOLOGY_NS}has지형셀")):
+            axis_id = axis_nodes.get(axis_node)
+            if axis_id is not None:
+                self.axis_cells[axis_id].add(_local(cell))
+        
+        return self
+    
+    def has_coa(self, coa: COA) -> bool:
+        return str(coa.coa_id) in self.coa_uris
+    
+    def get_chains(self, graph, threat_uri: str) -> List[Dict]:
+        """위협별 COA 체인 (배치 내 COA들이 공유)"""
+        chains = self._chains.get(threat_uri)
+        if chains is None:
+            chains = self.relationship_chain.find_coa_chains(graph, threat_uri) or []
+            self._chains[threat_uri] = chains
+        return chains
 
 
 class EnhancedCOAEvaluator(COAEvaluator):
@@ -69,6 +155,44 @@ class EnhancedCOAEvaluator(COAEvaluator):
             llm_manager=llm_manager,
             rag_manager=rag_manager
         )
+        
+        # 평가 배치별 온톨로지 특성 테이블 (동시 요청 간 분리)
+        self._batch = threading.local()
+
+    def evaluate_coas(
+        self,
+        mission_id: str,
+        axis_states: List[AxisState],
+        coa_list: List[COA]
+    ) -> List[COAEvaluationResult]:
+        """COA 리스트 평가 (후보 전체의 온톨로지 특성/과거 성공률을 먼저 한 번에 조회)"""
+        self._batch.features = OntologyFeatureTable(
+            self.ontology_manager, self.relationship_chain
+        ).load(coa_list, axis_states)
+        self._batch.historical = self._prefetch_historical_rates(coa_list)
+        try:
+            return super().evaluate_coas(mission_id, axis_states, coa_list)
+        finally:
+            self._batch.features = None
+            self._batch.historical = None
+    
+    def _prefetch_historical_rates(self, coa_list: List[COA]) -> Optional[Dict[str, float]]:
+        """후보 COA의 과거 성공률 조회 (사전 계산 테이블 + 미스분 배치 검색)"""
+        if not self.rag_manager or not self.rag_manager.is_available():
+            return None
+        try:
+            keys = [evidence_key(coa.coa_name, coa.coa_id) for coa in coa_list]
+            return get_historical_evidence(self.rag_manager).get_rates(keys)
+        except Exception as e:
+            print(f"[WARN] 과거 성공률 배치 조회 실패: {e}")
+            return None
+    
+    def _get_feature_table(self, coa: COA, axis_states: List[AxisState]) -> OntologyFeatureTable:
+        """현재 배치의 특성 테이블 (배치 밖 단일 평가면 해당 COA만 조회)"""
+        features = getattr(self._batch, 'features', None)
+        if features is not None and features.has_coa(coa):
+            return features
+        return OntologyFeatureTable(self.ontology_manager, self.relationship_chain).load([coa], axis_states)
 
     def evaluate_single_coa(
         self,
@@ -138,32 +262,14 @@ class EnhancedCOAEvaluator(COAEvaluator):
         
         if self.ontology_manager and self.ontology_manager.graph:
             try:
-                # SPARQL 쿼리로 COA 속성 조회 (기본 효과성)
+                # 배치 특성 테이블에서 COA 속성 조회 (기본 효과성)
                 coa_id = coa.coa_id
-                # Extract ID if it's a URI
-                coa_id_raw = str(coa_id).split('#')[-1] if '#' in str(coa_id) else str(coa_id)
-                
-                if not coa_id_raw.startswith("COA_Library_"):
-                    safe_id = f"COA_Library_{coa_id_raw}"
-                else:
-                    safe_id = coa_id_raw
-                    
-                coa_uri = f"http://coa-agent-platform.org/ontology#{safe_id}"
-                
-                # [NEW] ontology_manager가 있을 때 _make_uri_safe가 있다면 적용
-                if hasattr(self.ontology_manager, '_make_uri_safe'):
-                    # URI 자체를 safe하게 만드는 게 아니라 path를 safe하게
-                    safe_name = self.ontology_manager._make_uri_safe(safe_id)
-                    coa_uri = f"http://coa-agent-platform.org/ontology#{safe_name}"
+                features = self._get_feature_table(coa, axis_states)
+                coa_uri = features.coa_uri(coa)
                 
-                results = []
-                from rdflib import URIRef
-                coa_node = URIRef(coa_uri)
-                effectiveness_prop = URIRef("http://coa-agent-platform.org/ontology#effectiveness")
-                for val in self.ontology_manager.graph.objects(coa_node, effectiveness_prop):
-                    results.append({'effectiveness': str(val)})
-                if results and results[0].get('effectiveness'):
-                    effectiveness = float(results[0]['effectiveness'])
+                effectiveness_value = features.effectiveness.get(coa_uri)
+                if effectiveness_value:
+                    effectiveness = float(effectiveness_value)
                     # 0-100 범위를 0-1로 정규화
                     if effectiveness > 1.0:
                         effectiveness = effectiveness / 100.0
@@ -174,10 +280,9 @@ class EnhancedCOAEvaluator(COAEvaluator):
                 # 온톨로지 스튜디오에서 실행한 도메인 규칙 추론 결과를 반영합니다.
                 # RULE_COA_001, RULE_COA_002에 의해 ns:적용가능지역 관계가 추론됨
                 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-                applicable_regions_prop = URIRef("http://coa-agent-platform.org/ontology#적용가능지역")
-                applicable_regions = list(self.ontology_manager.graph.objects(coa_node, applicable_regions_prop))
+                applicable_set = features.applicable_regions.get(coa_uri)
                 
-                if applicable_regions:
+                if applicable_set:
                     # 현재 축선의 지형셀과 비교
                     current_terrain_cells = set()
                     for axis_state in axis_states:
@@ -185,22 +290,12 @@ class EnhancedCOAEvaluator(COAEvaluator):
                             for cell in axis_state.terrain_cells:
                                 cell_id = getattr(cell, 'terrain_cell_id', None) or str(cell)
                                 current_terrain_cells.add(cell_id)
-                        # 대안: axis_id에서 지형셀 추출 시도
+                        # 대안: 해당 축선의 지형셀 (온톨로지 그래프에서 미리 조회)
                         if hasattr(axis_state, 'axis_id'):
-                            # 해당 축선의 지형셀 조회 (온톨로지 그래프에서)
-                            axis_uri = URIRef(f"http://coa-agent-platform.org/ontology#전장축선_{axis_state.axis_id}")
-                            terrain_cell_prop = URIRef("http://coa-agent-platform.org/ontology#has지형셀")
-                            for cell in self.ontology_manager.graph.objects(axis_uri, terrain_cell_prop):
-                                cell_str = str(cell).split('#')[-1] if '#' in str(cell) else str(cell)
-                                current_terrain_cells.add(cell_str)
+                            current_terrain_cells.update(features.axis_cells.get(str(axis_state.axis_id), ()))
                     
                     if current_terrain_cells:
                         # 적용가능지역과 현재 지형셀 일치 비율 계산
-                        applicable_set = set()
-                        for region in applicable_regions:
-                            region_str = str(region).split('#')[-1] if '#' in str(region) else str(region)
-                            applicable_set.add(region_str)
-                        
                         matching_regions = applicable_set.intersection(current_terrain_cells)
                         if matching_regions:
                             # 일치하는 지역이 있으면 보너스 점수 (최대 0.2)
@@ -248,28 +343,20 @@ class EnhancedCOAEvaluator(COAEvaluator):
         coa: COA,
         axis_states: List[AxisState]
     ) -> float:
-        """RAG 기반 과거 성공률"""
+        """RAG 기반 과거 성공률 (COA별 사전 계산 테이블 조회)"""
         if not self.rag_manager or not self.rag_manager.is_available():
-            return 0.5  # 기본값
+            return DEFAULT_SUCCESS_RATE  # 기본값
+        
+        key = evidence_key(coa.coa_name, coa.coa_id)
+        historical = getattr(self._batch, 'historical', None)
+        if historical is not None and key in historical:
+            return historical[key]
         
         try:
-            # COA 관련 문서 검색
-            query = f"{coa.coa_name or coa.coa_id} 성공 사례"
-            results = self.rag_manager.retrieve_with_context(query, top_k=5)
-            
-            if results:
-                # 성공 키워드 비율 계산
-                success_keywords = ['성공', '효과적', '승리', '완료', '달성', '효과']
-                success_count = sum(
-                    1 for r in results
-                    if any(kw in str(r.get('text', '')).lower() for kw in success_keywords)
-                )
-                return success_count / len(results) if results else 0.5
-            
-            return 0.5
+            return get_historical_evidence(self.rag_manager).get_rate(key)
         except Exception as e:
             print(f"[WARN] 과거 성공률 계산 실패: {e}")
-            return 0.5
+            return DEFAULT_SUCCESS_RATE
     
     def _get_chain_score(
         self,
@@ -299,25 +386,14 @@ class EnhancedCOAEvaluator(COAEvaluator):
             # 위협 엔티티 URI 구성 (온톨로지의 '위협상황_' 접두어 반영)
             threat_uri = f"http://coa-agent-platform.org/ontology#위협상황_{threat_id}"
             
-            # COA 체인 탐색
-            chains = self.relationship_chain.find_coa_chains(graph, threat_uri)
+            # COA 체인 탐색 (같은 위협에 대한 탐색은 배치 내에서 한 번만 수행)
+            features = self._get_feature_table(coa, axis_states)
+            chains = features.get_chains(graph, threat_uri)
             
             # 체인 점수 계산
             if chains:
                 # 해당 COA와 관련된 체인 찾기
-                coa_id = coa.coa_id
-                # Extract ID if it's a URI
-                coa_id_raw = str(coa_id).split('#')[-1] if '#' in str(coa_id) else str(coa_id)
-                
-                if not coa_id_raw.startswith("COA_Library_"):
-                    safe_id = f"COA_Library_{coa_id_raw}"
-                else:
-                    safe_id = coa_id_raw
-                
-                if hasattr(self.ontology_manager, '_make_uri_safe'):
-                    safe_id = self.ontology_manager._make_uri_safe(safe_id)
-                
-                coa_uri = f"http://coa-agent-platform.org/ontology#{safe_id}"
+                coa_uri = features.coa_uri(coa)
                 coa_chains = [
                     c for c in chains
                     if coa_uri in str(c.get('target', '')) or coa.coa_id in str(c.get('target', ''))
@@ -0,0 +1,158 @@
+# core_pipeline/coa_engine/historical_evidence.py
+# -*- coding: utf-8 -*-
+"""
+Historical Evidence Table
+COA별 RAG 과거 성공 사례 신호 사전 계산 테이블
+
+평가 시마다 COA마다 "<COA명> 성공 사례"를 검색하던 방식을 대체합니다.
+- 인덱스 구축/재구축 시 COA 라이브러리 전체를 배치 검색으로 미리 계산
+- RAG 인덱스 버전이 바뀌면 자동 무효화
+- 테이블에 없는 COA는 평가 배치 단위로 모아 한 번에 검색 (fallback)
+"""
+import threading
+import weakref
+from typing import Dict, Iterable, List, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+SUCCESS_KEYWORDS = ['성공', '효과적', '승리', '완료', '달성', '효과']
+DEFAULT_SUCCESS_RATE = 0.5
+QUERY_TOP_K = 5
+
+
+def evidence_key(coa_name: Optional[str], coa_id: Optional[str] = None) -> str:
+    """테이블 키 (COA 명칭 우선, 없으면 COA ID)"""
+    return str(coa_name or coa_id or "")
+
+
+def success_rate(results: List[Dict]) -> float:
+    """검색 결과 중 성공 키워드를 포함한 문서 비율 (결과가 없으면 기본값)"""
+    if not results:
+        return DEFAULT_SUCCESS_RATE
+    success_count = sum(
+        1 for r in results
+        if any(kw in str(r.get('text', '')).lower() for kw in SUCCESS_KEYWORDS)
+    )
+    return success_count / len(results)
+
+
+class HistoricalEvidenceTable:
+    """
+    COA 키 → 과거 성공률 테이블 (RAGManager 인스턴스당 1개 공유)
+
+    값은 계산 당시의 RAG 인덱스 버전에 묶여 있으며, 버전이 바뀌면 비워집니다.
+    """
+
+    def __init__(self, rag_manager):
+        self.rag_manager = rag_manager
+        self._rates: Dict[str, float] = {}
+        self._version: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def _sync_version(self):
+        version = getattr(self.rag_manager, 'index_version', None)
+        if version != self._version:
+            self._rates = {}
+            self._version = version
+
+    def get_rates(self, keys: Iterable[str]) -> Dict[str, float]:
+        """
+        키별 과거 성공률 조회 (미계산 키는 한 번의 배치 검색으로 채움)
+
+        Args:
+            keys: evidence_key() 값 리스트
+
+        Returns:
+            {키: 성공률}
+        """
+        keys = [k for k in dict.fromkeys(keys) if k]
+        with self._lock:
+            self._sync_version()
+            missing = [k for k in keys if k not in self._rates]
+            if missing:
+                self._compute(missing)
+            return {k: self._rates.get(k, DEFAULT_SUCCESS_RATE) for k in keys}
+
+    def get_rate(self, key: str) -> float:
+        """단일 키 과거 성공률"""
+        if not key:
+            return DEFAULT_SUCCESS_RATE
+        return self.get_rates([key]).get(key, DEFAULT_SUCCESS_RATE)
+
+    def rebuild(self, keys: Iterable[str]) -> int:
+        """
+        테이블 재구축 (인덱스 구축/재구축 직후 호출)
+
+        Args:
+            keys: 사전 계산할 COA 키 리스트
+
+        Returns:
+            계산된 항목 수
+        """
+        keys = [k for k in dict.fromkeys(keys) if k]
+        with self._lock:
+            self._rates = {}
+            self._version = getattr(self.rag_manager, 'index_version', None)
+            if keys:
+                self._compute(keys)
+            return len(self._rates)
+
+    def _compute(self, keys: List[str]):
+        queries = [f"{key} 성공 사례" for key in keys]
+        batches = self.rag_manager.retrieve_batch(queries, top_k=QUERY_TOP_K)
+        for key, results in zip(keys, batches):
+            self._rates[key] = success_rate(results)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"과거 성공 사례 테이블: {len(keys)}개 COA 배치 검색 (index_version={self._version})")
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._rates), "index_version": self._version}
+
+
+_TABLES = weakref.WeakKeyDictionary()
+_TABLES_LOCK = threading.Lock()
+
+
+def get_historical_evidence(rag_manager) -> HistoricalEvidenceTable:
+    """RAGManager별 공유 테이블 반환 (평가기/재색인 경로가 같은 테이블을 사용)"""
+    with _TABLES_LOCK:
+        table = _TABLES.get(rag_manager)
+        if table is None:
+            table = HistoricalEvidenceTable(rag_manager)
+            _TABLES[rag_manager] = table
+        return table
+
+
+def load_library_keys(data_manager) -> List[str]:
+    """COA_Library 테이블에서 사전 계산 대상 키(명칭, 없으면 COA_ID) 추출"""
+    try:
+        df = data_manager.load_table('COA_Library')
+    except Exception as e:
+        logger.warning(f"COA_Library 로드 실패: {e}")
+        return []
+    if df is None or df.empty:
+        return []
+
+    keys = []
+    names = df['명칭'] if '명칭' in df.columns else [None] * len(df)
+    ids = df['COA_ID'] if 'COA_ID' in df.columns else [None] * len(df)
+    for name, coa_id in zip(names, ids):
+        name = None if name is None or str(name) == 'nan' else str(name).strip()
+        coa_id = None if coa_id is None or str(coa_id) == 'nan' else str(coa_id).strip()
+        key = evidence_key(name, coa_id)
+        if key:
+            keys.append(key)
+    return keys
+
+
+def refresh_historical_evidence(rag_manager, data_manager) -> int:
+    """COA 라이브러리 기준으로 과거 성공 사례 테이블 재구축"""
+    if rag_manager is None or not rag_manager.is_available():
+        return 0
+    keys = load_library_keys(data_manager) if data_manager is not None else []
+    count = get_historical_evidence(rag_manager).rebuild(keys)
+    logger.info(f"과거 성공 사례 테이블 재구축: {count}개 COA")
+    return count
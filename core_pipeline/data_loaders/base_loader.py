@@ -25,6 +25,7 @@ class BaseDataLoader(ABC):
         self._schema = None
         self._data = None
         self._last_mtime = None  # 파일 수정 시간 추적
+        self._data_version = 0  # 데이터 (재)로드 횟수 - 파생 캐시 무효화 기준
         
         # 상대 경로를 절대 경로로 변환
         if not self.data_path.is_absolute():
@@ -33,13 +34,29 @@ class BaseDataLoader(ABC):
     
     def load(self) -> pd.DataFrame:
         """데이터 로드 (파일 변경 시 자동 재로드)"""
+        self.ensure_loaded()
+        return self._data.copy()
+    
+    def ensure_loaded(self) -> int:
+        """
+        데이터를 최신 상태로 적재하고 데이터 버전 반환 (DataFrame 복사 없음)
+        
+        Returns:
+            데이터 버전 (파일 변경/캐시 무효화 후 재로드될 때마다 증가)
+        """
         if self.should_reload():
             self.invalidate_cache()
         
         if self._data is None:
             self._data = self._load_data()
             self._validate_data(self._data)
-        return self._data.copy()
+            self._data_version += 1
+        return self._data_version
+    
+    def row_count(self) -> int:
+        """현재 데이터 행 수 (DataFrame 복사 없음)"""
+        self.ensure_loaded()
+        return len(self._data)
     
     def invalidate_cache(self):
         """캐시 무효화 (파일 변경 시 호출)"""
@@ -5,8 +5,9 @@ Data Manager
 데이터 로딩 및 관리 모듈 (로더 기반 구조로 개선)
 """
 import os
+import threading
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 
 # 로더 모듈 임포트 (선택적, 없어도 동작)
@@ -43,6 +44,8 @@ class DataManager:
         self.data_paths = config.get("data_paths", {})
         self._loaders: Dict[str, BaseDataLoader] = {}
         self._use_loaders = LOADERS_AVAILABLE and config.get("use_data_loaders", True)
+        # 병렬 초기화 단계(온톨로지 구축, 상태 관리자 등)에서 로더 중복 생성 방지
+        self._loaders_lock = threading.RLock()
     
     def get_loader(self, table_name: str) -> Optional[BaseDataLoader]:
         """
@@ -57,6 +60,11 @@ class DataManager:
         if not self._use_loaders:
             return None
         
+        with self._loaders_lock:
+            return self._get_or_create_loader(table_name)
+    
+    def _get_or_create_loader(self, table_name: str) -> Optional[BaseDataLoader]:
+        """로더 조회/생성 (get_loader에서 잠금 하에 호출)"""
         if table_name not in self._loaders:
             # 1. 특수 로더가 있으면 사용 (선택적)
             loader_class_name = self.OPTIONAL_LOADER_MAP.get(table_name)
@@ -146,6 +154,51 @@ class DataManager:
         for table_name in list(self._loaders.keys()):
             self.invalidate_table_cache(table_name)
     
+    def get_table_version(self, name: str) -> Optional[int]:
+        """
+        테이블 데이터 버전 (파일 변경 시 증가, 파생 캐시 키로 사용)
+        
+        Args:
+            name: 데이터 테이블 이름
+            
+        Returns:
+            데이터 버전 (로더를 사용할 수 없으면 None → 캐시하지 말 것)
+        """
+        loader = self.get_loader(name)
+        if loader is None:
+            return None
+        try:
+            return loader.ensure_loaded()
+        except Exception:
+            return None
+    
+    def get_table_row_count(self, name: str) -> Optional[int]:
+        """
+        테이블 행 수 (로더 캐시 사용, 파일 변경 시에만 재로드)
+        
+        Args:
+            name: 데이터 테이블 이름
+            
+        Returns:
+            행 수 (로더를 사용할 수 없거나 로드 실패 시 None)
+        """
+        loader = self.get_loader(name)
+        if loader is None:
+            return None
+        try:
+            return loader.row_count()
+        except Exception:
+            return None
+    
+    def list_tables(self) -> List[str]:
+        """설정(data_paths)과 data_lake 폴더의 테이블명 목록"""
+        names = list(self.data_paths)
+        data_lake_dir = Path(self.config.get("data_lake_path", "./data_lake"))
+        if data_lake_dir.exists():
+            for excel_file in sorted(list(data_lake_dir.glob("*.xlsx")) + list(data_lake_dir.glob("*.xls"))):
+                names.append(excel_file.stem)
+        return list(dict.fromkeys(names))
+    
     def load_table(self, name: str) -> pd.DataFrame:
         """
         테이블 데이터 로드 (로더 우선 사용, 하위 호환성 유지)
@@ -3,13 +3,52 @@
 """
 Data Watcher
 데이터 변경 감지 및 자동 갱신 모듈
+
+- 이벤트 기반 감시 (watchdog: Linux inotify / Windows ReadDirectoryChangesW) 우선 사용
+- watchdog 미설치 또는 감시 실패 시 mtime 폴링으로 폴백
+- 엑셀 저장 시 연속 발생하는 이벤트는 디바운스하여 테이블당 1회만 처리
+- 이전 스냅샷과 비교한 행 단위 변경분(추가/삭제/수정 ID)을 변경 처리에 전달
 """
 import os
 import time
+import threading
 from threading import Thread
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+    Observer = None
+    FileSystemEventHandler = object
+
+
+# 감시 대상 데이터 파일 확장자
+WATCHED_SUFFIXES = (".xlsx", ".xls", ".csv")
+
+# 내용 변경으로 간주하는 파일 시스템 이벤트 종류
+WRITE_EVENT_TYPES = ("created", "modified", "moved", "closed")
+
+
+class _DataFileEventHandler(FileSystemEventHandler):
+    """파일 시스템 이벤트를 DataWatcher로 전달"""
+    
+    def __init__(self, watcher: "DataWatcher"):
+        super().__init__()
+        self.watcher = watcher
+    
+    def on_any_event(self, event):
+        # 열기/읽기 이벤트(opened, closed_no_write)는 무시 (자체 로드로 인한 재감지 방지)
+        if event.is_directory or event.event_type not in WRITE_EVENT_TYPES:
+            return
+        # 엑셀은 임시 파일 저장 후 rename 하므로 목적지 경로도 확인
+        for path in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if path:
+                self.watcher._on_file_event(os.fsdecode(path))
+
 
 class DataWatcher:
     """데이터 변경 감지 및 자동 갱신"""
@@ -24,13 +63,27 @@ class DataWatcher:
         self.data_manager = data_manager
         self.ontology_manager = ontology_manager
         self.status_manager = status_manager
+        
+        watcher_config = getattr(data_manager, 'config', {}).get("data_watcher", {}) or {}
+        self.backend = watcher_config.get("backend", "auto")  # auto | event | polling
+        self.watch_interval = watcher_config.get("watch_interval", 5)  # 폴링 주기 (초)
+        self.debounce_seconds = watcher_config.get("debounce_seconds", 1.0)  # 이벤트 병합 대기 시간 (초)
+        
         self.last_modified = {}
-        self.watch_interval = 5  # 5초마다 체크
+        # 첫 스캔(기준선 등록) 완료 여부 - 감시 대상 파일이 하나도 없어도 첫 스캔 이후 생긴 파일은 변경으로 보고
+        self._baseline_scanned = False
         self.watching = False
         self.watch_thread = None
+        self.active_backend = None  # 실제 사용 중인 백엔드 ("event" 또는 "polling")
+        self._observer = None
         self.change_callbacks = []  # 변경 감지 시 호출할 콜백 함수들
         # 이전 데이터 스냅샷 저장 (증분 업데이트를 위해)
         self.last_data_snapshot = {}
+        
+        # 디바운스 대기 중인 변경 {테이블명: (경로, 마지막 이벤트 시각)}
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
     
     def start_watching(self):
         """데이터 감시 시작"""
@@ -38,47 +91,144 @@ class DataWatcher:
             return
         
         self.watching = True
+        
+        # 현재 파일 상태를 기준선으로 등록 (기존 파일을 신규 변경으로 오인하지 않도록)
+        self._scan_for_changes()
+        
+        self.active_backend = "polling"
+        if self.backend in ("auto", "event"):
+            if self._start_event_observer():
+                self.active_backend = "event"
+            elif self.backend == "event":
+                print("[WARN] 이벤트 기반 감시를 시작할 수 없어 폴링 방식으로 대체합니다.")
+        
         self.watch_thread = Thread(target=self._watch_loop, daemon=True)
         self.watch_thread.start()
-        print("[INFO] 데이터 변경 감시 시작")
+        print(f"[INFO] 데이터 변경 감시 시작 (방식: {self.active_backend})")
     
     def stop_watching(self):
         """데이터 감시 중지"""
         self.watching = False
+        self._wake.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=1)
+            except Exception:
+                pass
+            self._observer = None
         if self.watch_thread:
             self.watch_thread.join(timeout=1)
         print("[INFO] 데이터 변경 감시 중지")
     
     def register_change_callback(self, callback):
-        """변경 감지 시 호출할 콜백 등록"""
+        """
+        변경 감지 시 호출할 콜백 등록
+        
+        콜백은 {테이블명: _handle_data_change 결과} 딕셔너리를 인자로 받습니다.
+        """
         self.change_callbacks.append(callback)
     
+    def _start_event_observer(self) -> bool:
+        """watchdog 옵저버 시작 (감시 디렉토리별 1개 watch)"""
+        if not WATCHDOG_AVAILABLE:
+            return False
+        
+        try:
+            directories = {str(Path(p).parent) for p in self._get_watch_targets().keys()}
+            data_lake_dir = self._get_data_lake_dir()
+            if data_lake_dir.exists():
+                directories.add(str(data_lake_dir))
+            directories = {d for d in directories if os.path.isdir(d)}
+            if not directories:
+                return False
+            
+            observer = Observer()
+            handler = _DataFileEventHandler(self)
+            for directory in directories:
+                observer.schedule(handler, directory, recursive=False)
+            observer.daemon = True
+            observer.start()
+            self._observer = observer
+            return True
+        except Exception as e:
+            print(f"[WARN] 이벤트 기반 데이터 감시 시작 실패: {e}")
+            self._observer = None
+            return False
+    
     def _watch_loop(self):
-        """감시 루프"""
+        """감시 루프 (이벤트 모드: 디바운스 디스패치, 폴링 모드: 주기적 mtime 스캔)"""
+        self.prime_snapshots()
+        next_scan = time.monotonic() + self.watch_interval
         while self.watching:
             try:
-                changes = self.watch_data_changes()
-                if changes:
-                    for callback in self.change_callbacks:
-                        try:
-                            callback(changes)
-                        except Exception as e:
-                            print(f"[WARN] 콜백 실행 실패: {e}")
-                time.sleep(self.watch_interval)
+                if self.active_backend == "polling" and time.monotonic() >= next_scan:
+                    for table_name, path in self._scan_for_changes().items():
+                        self._mark_pending(table_name, path)
+                    next_scan = time.monotonic() + self.watch_interval
+                
+                ready = self._pop_ready_changes()
+                if ready:
+                    self._process_changes(ready)
+                
+                # 대기 중인 변경이 있으면 디바운스 시간만큼, 없으면 이벤트/다음 스캔까지 대기
+                if self._pending:
+                    timeout = self.debounce_seconds
+                elif self.active_backend == "polling":
+                    timeout = max(0.0, next_scan - time.monotonic())
+                else:
+                    timeout = None
+                self._wake.wait(timeout)
+                self._wake.clear()
             except Exception as e:
                 print(f"[ERROR] 데이터 감시 오류: {e}")
                 time.sleep(self.watch_interval)
     
-    def watch_data_changes(self) -> Dict[str, bool]:
-        """
-        데이터 파일 변경 감지
-        
-        Returns:
-            {테이블명: 변경여부} 딕셔너리
-        """
-        changes = {}
+    def _on_file_event(self, path: str):
+        """파일 시스템 이벤트 수신 (watchdog 스레드에서 호출)"""
+        table_name = self._resolve_table_name(path)
+        if table_name:
+            self._mark_pending(table_name, path)
+    
+    def _mark_pending(self, table_name: str, path: str):
+        """변경 대기열에 추가 (같은 테이블의 연속 이벤트는 마지막 시각으로 병합)"""
+        with self._pending_lock:
+            self._pending[table_name] = (path, time.monotonic())
+        self._wake.set()
+    
+    def _pop_ready_changes(self) -> Dict[str, str]:
+        """디바운스 시간이 지난 변경만 대기열에서 꺼냄"""
+        now = time.monotonic()
+        ready = {}
+        with self._pending_lock:
+            for table_name, (path, last_event) in list(self._pending.items()):
+                if now - last_event >= self.debounce_seconds:
+                    ready[table_name] = path
+                    del self._pending[table_name]
+        return ready
+    
+    def _process_changes(self, changed_tables: Dict[str, str]) -> Dict[str, Dict]:
+        """변경된 테이블 처리 후 콜백 호출"""
+        results = {}
+        for table_name, path in changed_tables.items():
+            # 이벤트 경로로 처리한 변경은 폴링 기준선에도 반영 (중복 처리 방지)
+            try:
+                self.last_modified[table_name] = Path(path).stat().st_mtime
+            except OSError:
+                pass
+            results[table_name] = self._handle_data_change(table_name, path)
         
-        # data_paths에서 모든 테이블 확인
+        changes = {t: r for t, r in results.items() if r.get("changed")}
+        if changes:
+            for callback in self.change_callbacks:
+                try:
+                    callback(changes)
+                except Exception as e:
+                    print(f"[WARN] 콜백 실행 실패: {e}")
+        return results
+    
+    def _get_watch_targets(self) -> Dict[str, str]:
+        """설정된 data_paths의 {절대경로: 테이블명}"""
         # DataManager에서 data_paths 가져오기
         if hasattr(self.data_manager, 'config') and 'data_paths' in self.data_manager.config:
             data_paths = self.data_manager.config['data_paths']
@@ -87,57 +237,146 @@ class DataWatcher:
         else:
             data_paths = {}
         
+        targets = {}
+        base_dir = Path(__file__).parent.parent
         for table_name, path in data_paths.items():
-            try:
-                path_obj = Path(path)
-                if not path_obj.is_absolute():
-                    base_dir = Path(__file__).parent.parent
-                    path_obj = base_dir / path_obj
-                
-                if path_obj.exists():
-                    current_mtime = path_obj.stat().st_mtime
-                    
-                    if table_name in self.last_modified:
-                        if current_mtime > self.last_modified[table_name]:
-                            # 변경 감지
-                            changes[table_name] = True
-                            self._handle_data_change(table_name, str(path_obj))
-                    
-                    self.last_modified[table_name] = current_mtime
-            except Exception as e:
-                print(f"[WARN] {table_name} 변경 감지 실패: {e}")
-        
-        # 2. data_lake 폴더에서 새 파일 감지
+            path_obj = Path(path)
+            if not path_obj.is_absolute():
+                path_obj = base_dir / path_obj
+            targets[os.path.normcase(os.path.abspath(path_obj))] = table_name
+        return targets
+    
+    def _get_data_lake_dir(self) -> Path:
         data_lake_path = self.data_manager.config.get("data_lake_path", "./data_lake")
-        base_dir = Path(__file__).parent.parent.parent
-        data_lake_dir = base_dir / data_lake_path
+        data_lake_dir = Path(data_lake_path)
+        if not data_lake_dir.is_absolute():
+            data_lake_dir = Path(__file__).parent.parent / data_lake_dir
+        return data_lake_dir
+    
+    def _resolve_table_name(self, path: str) -> Optional[str]:
+        """파일 경로 → 테이블명 (엑셀 잠금/임시 파일은 무시)"""
+        path_obj = Path(path)
+        name = path_obj.name
+        if name.startswith("~$") or name.startswith(".~lock") or path_obj.suffix.lower() not in WATCHED_SUFFIXES:
+            return None
+        
+        normalized = os.path.normcase(os.path.abspath(path_obj))
+        table_name = self._get_watch_targets().get(normalized)
+        if table_name:
+            return table_name
+        
+        # data_lake 폴더의 엑셀 파일은 파일명(확장자 제외)이 테이블명
+        data_lake_dir = os.path.normcase(os.path.abspath(self._get_data_lake_dir()))
+        if os.path.dirname(normalized) == data_lake_dir and path_obj.suffix.lower() in (".xlsx", ".xls"):
+            return path_obj.stem
+        return None
+    
+    def _scan_for_changes(self) -> Dict[str, str]:
+        """
+        mtime 기반 변경 스캔 (폴링 백엔드 및 수동 체크용)
+        
+        처음 보는 파일은 기준선으로만 등록하며, 감시 시작 이후 새로 생긴 파일은 변경으로 보고합니다.
         
+        Returns:
+            {테이블명: 파일 경로}
+        """
+        changes = {}
+        baseline = not self._baseline_scanned
+        self._baseline_scanned = True
+        
+        candidates: List[Tuple[str, Path]] = [
+            (table_name, Path(path)) for path, table_name in self._get_watch_targets().items()
+        ]
+        # data_lake 폴더에서 새 파일 감지
+        data_lake_dir = self._get_data_lake_dir()
         if data_lake_dir.exists():
-            excel_files = list(data_lake_dir.glob("*.xlsx")) + list(data_lake_dir.glob("*.xls"))
-            
-            for excel_file in excel_files:
-                table_name = excel_file.stem
+            for excel_file in list(data_lake_dir.glob("*.xlsx")) + list(data_lake_dir.glob("*.xls")):
+                if not excel_file.name.startswith("~$"):
+                    candidates.append((excel_file.stem, excel_file))
+        
+        for table_name, path_obj in candidates:
+            try:
+                if not path_obj.exists():
+                    continue
+                current_mtime = path_obj.stat().st_mtime
+                previous = self.last_modified.get(table_name)
                 
-                try:
-                    current_mtime = excel_file.stat().st_mtime
-                    
-                    # 새 파일 감지
-                    if table_name not in self.last_modified:
-                        changes[table_name] = True
-                        self.last_modified[table_name] = current_mtime
+                if previous is None:
+                    if not baseline:
                         print(f"[INFO] 새 테이블 감지: {table_name}")
-                        self._handle_data_change(table_name, str(excel_file))
-                    else:
-                        # 기존 파일 변경 감지
-                        if current_mtime > self.last_modified[table_name]:
-                            changes[table_name] = True
-                            self._handle_data_change(table_name, str(excel_file))
-                            self.last_modified[table_name] = current_mtime
-                except Exception as e:
-                    print(f"[WARN] {table_name} 변경 감지 실패: {e}")
+                        changes[table_name] = str(path_obj)
+                elif current_mtime > previous:
+                    changes[table_name] = str(path_obj)
+                
+                self.last_modified[table_name] = max(current_mtime, previous or 0)
+            except Exception as e:
+                print(f"[WARN] {table_name} 변경 감지 실패: {e}")
         
         return changes
     
+    def watch_data_changes(self) -> Dict[str, Dict]:
+        """
+        데이터 파일 변경 감지 및 즉시 처리 (디바운스 없음)
+        
+        Returns:
+            {테이블명: _handle_data_change 결과} 딕셔너리
+        """
+        return self._process_changes(self._scan_for_changes())
+    
+    def _get_id_column(self, table_name: str, df) -> str:
+        """행 비교에 사용할 ID 컬럼"""
+        if hasattr(self.ontology_manager, 'get_id_column'):
+            try:
+                id_col = self.ontology_manager.get_id_column(table_name, list(df.columns))
+                if id_col in df.columns:
+                    return id_col
+            except Exception:
+                pass
+        return df.columns[0]
+    
+    def _diff_table(self, table_name: str, old_data, new_data) -> Dict:
+        """
+        이전/신규 데이터의 행 단위 변경분 계산
+        
+        Returns:
+            {"added": [ID], "removed": [ID], "modified": [ID], "schema_changed": bool, "full": bool}
+            full이 True면 비교할 이전 스냅샷이 없어 전체 변경으로 간주
+        """
+        id_col = self._get_id_column(table_name, new_data)
+        new_ids = new_data[id_col].astype(str)
+        
+        if old_data is None or old_data.empty or id_col not in old_data.columns:
+            return {
+                "added": new_ids.tolist(), "removed": [], "modified": [],
+                "schema_changed": old_data is not None and not old_data.empty,
+                "full": True
+            }
+        
+        old_indexed = old_data.assign(_row_id=old_data[id_col].astype(str)).drop_duplicates("_row_id", keep="last").set_index("_row_id")
+        new_indexed = new_data.assign(_row_id=new_ids).drop_duplicates("_row_id", keep="last").set_index("_row_id")
+        
+        old_keys = set(old_indexed.index)
+        new_keys = set(new_indexed.index)
+        added = sorted(new_keys - old_keys)
+        removed = sorted(old_keys - new_keys)
+        
+        shared_cols = [c for c in new_indexed.columns if c in old_indexed.columns]
+        schema_changed = set(old_indexed.columns) != set(new_indexed.columns)
+        
+        common = sorted(old_keys & new_keys)
+        modified = []
+        if common and shared_cols:
+            old_rows = old_indexed.loc[common, shared_cols].astype(object)
+            new_rows = new_indexed.loc[common, shared_cols].astype(object)
+            same = (old_rows == new_rows) | (old_rows.isna() & new_rows.isna())
+            changed_mask = ~same.all(axis=1)
+            modified = changed_mask[changed_mask].index.tolist()
+        
+        return {
+            "added": added, "removed": removed, "modified": modified,
+            "schema_changed": schema_changed, "full": False
+        }
+    
     def _handle_data_change(self, table_name: str, path: str) -> Dict:
         """
         데이터 변경 처리 (증분 업데이트 사용)
@@ -145,15 +384,13 @@ class DataWatcher:
         Args:
             table_name: 테이블명
             path: 파일 경로
-            
+        
         Returns:
-            처리 결과 딕셔너리
+            처리 결과 딕셔너리 (rows: 행 단위 변경분 포함)
         """
         print(f"[INFO] 데이터 변경 감지: {table_name}")
         
         try:
-            import pandas as pd
-            
             # 로더 캐시 무효화
             if hasattr(self.data_manager, 'invalidate_table_cache'):
                 self.data_manager.invalidate_table_cache(table_name)
@@ -169,15 +406,27 @@ class DataWatcher:
                     "error": "Empty data"
                 }
             
-            # 2. 이전 데이터 가져오기 (스냅샷)
+            # 2. 이전 데이터 가져오기 (스냅샷) 및 행 단위 변경분 계산
             old_data = self.last_data_snapshot.get(table_name)
+            row_changes = self._diff_table(table_name, old_data, new_data)
+            
+            if (not row_changes["full"] and not row_changes["schema_changed"] and
+                    not (row_changes["added"] or row_changes["removed"] or row_changes["modified"])):
+                # 저장만 되고 내용 변경이 없는 경우 (엑셀 재저장 등)
+                print(f"[INFO] {table_name} 내용 변경 없음 - 업데이트 건너뜀")
+                return {
+                    "changed": False,
+                    "table": table_name,
+                    "path": path,
+                    "rows": row_changes
+                }
             
             # 3. 상태 관리자 업데이트 (좌표 등 동적 데이터)
             if self.status_manager:
-                # 상태 관리자의 캐시 무효화
-                self.status_manager.invalidate_cache()
+                # 상태 관리자의 캐시 무효화 (변경된 테이블만)
+                self.status_manager.invalidate_cache(table_name)
                 print(f"[INFO] StatusManager 캐시 무효화 완료: {table_name}")
-
+            
             # 4. 온톨로지 업데이트 분기 처리
             # 좌표/상태 정보 테이블인 경우 온톨로지 전체 재구축 건너뜀 (성능 최적화)
             status_tables = ["위협상황", "아군부대현황", "적군부대현황"]
@@ -188,9 +437,9 @@ class DataWatcher:
                 # 필요한 경우 온톨로지의 특정 속성만 업데이트하는 가벼운 로직을 수행할 수 있음
             else:
                 # 지식 기반(스키마, 매핑 등) 변경인 경우 온톨로지 업데이트 수행
-                # 3. 온톨로지 그래프가 있고 이전 데이터가 있으면 증분 업데이트 사용
-                if (self.ontology_manager.graph is not None and 
-                    old_data is not None and 
+                # 온톨로지 그래프가 있고 이전 데이터가 있으면 증분 업데이트 사용
+                if (self.ontology_manager.graph is not None and
+                    old_data is not None and
                     not old_data.empty and
                     hasattr(self.ontology_manager, 'incremental_update')):
                     
@@ -226,7 +475,8 @@ class DataWatcher:
                 "path": path,
                 "timestamp": time.time(),
                 "incremental": not is_status_table and old_data is not None and not old_data.empty,
-                "status_only": is_status_table
+                "status_only": is_status_table,
+                "rows": row_changes
             }
         except Exception as e:
             print(f"[ERROR] 데이터 변경 처리 실패: {e}")
@@ -238,12 +488,32 @@ class DataWatcher:
                 "table": table_name
             }
     
-    def force_check(self) -> Dict[str, bool]:
+    def prime_snapshots(self):
+        """
+        감시 대상 테이블의 현재 데이터를 스냅샷으로 저장
+        
+        스냅샷이 있어야 첫 변경부터 행 단위 변경분을 계산할 수 있습니다.
+        """
+        tables = set(self._get_watch_targets().values())
+        data_lake_dir = self._get_data_lake_dir()
+        if data_lake_dir.exists():
+            tables.update(f.stem for f in data_lake_dir.glob("*.xlsx") if not f.name.startswith("~$"))
+        
+        for table_name in tables:
+            if table_name in self.last_data_snapshot:
+                continue
+            try:
+                df = self.data_manager.load_table(table_name)
+                if df is not None and not df.empty:
+                    self.last_data_snapshot[table_name] = df.copy()
+            except Exception as e:
+                print(f"[WARN] {table_name} 스냅샷 생성 실패: {e}")
+    
+    def force_check(self) -> Dict[str, Dict]:
         """
         강제로 변경 감지 체크 (수동 호출)
         
         Returns:
-            {테이블명: 변경여부} 딕셔너리
+            {테이블명: _handle_data_change 결과} 딕셔너리
         """
         return self.watch_data_changes()
-
@@ -0,0 +1,85 @@
+# core_pipeline/embedding_store.py
+# -*- coding: utf-8 -*-
+"""
+Embedding Store
+증분 추가가 가능한 임베딩 행렬 저장소
+
+np.concatenate처럼 추가할 때마다 전체 행렬을 다시 할당하지 않고,
+용량을 2배씩 늘리는 버퍼에 행을 이어 씁니다 (추가 비용 분할 상환 O(1)).
+- view(): 채워진 행까지의 뷰 (복사 없음)
+- reserve(): 예상 행 수를 알 때 미리 할당
+"""
+from typing import Optional
+
+import numpy as np
+
+MIN_CAPACITY = 256
+
+
+class EmbeddingStore:
+    """(행 수 × 차원) float32 임베딩 버퍼"""
+
+    def __init__(self, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        self._buffer: Optional[np.ndarray] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return None if self._buffer is None else self._buffer.shape[1]
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._buffer is None else self._buffer.shape[0]
+
+    def clear(self):
+        self._buffer = None
+        self._size = 0
+
+    def reset(self, embeddings: Optional[np.ndarray]):
+        """저장소 내용을 주어진 행렬로 교체 (None이면 비움)"""
+        self.clear()
+        if embeddings is not None:
+            self.append(embeddings)
+
+    def reserve(self, rows: int, dimension: Optional[int] = None):
+        """
+        최소 rows 행을 담을 수 있도록 용량 확보
+
+        Args:
+            rows: 필요한 총 행 수
+            dimension: 차원 (버퍼가 아직 없을 때만 필요)
+        """
+        dimension = dimension or self.dimension
+        if dimension is None or rows <= self.capacity:
+            return
+        capacity = max(rows, MIN_CAPACITY)
+        buffer = np.empty((capacity, dimension), dtype=self.dtype)
+        if self._size:
+            buffer[:self._size] = self._buffer[:self._size]
+        self._buffer = buffer
+
+    def append(self, rows: np.ndarray):
+        """행 추가 (용량이 부족하면 2배로 확장)"""
+        rows = np.asarray(rows, dtype=self.dtype)
+        if rows.ndim == 1:
+            rows = rows.reshape(1, -1)
+        if not len(rows):
+            return
+        if self.dimension is not None and rows.shape[1] != self.dimension:
+            raise ValueError(f"임베딩 차원 불일치: {rows.shape[1]} != {self.dimension}")
+
+        needed = self._size + len(rows)
+        if needed > self.capacity:
+            self.reserve(max(needed, self.capacity * 2), rows.shape[1])
+        self._buffer[self._size:needed] = rows
+        self._size = needed
+
+    def view(self) -> Optional[np.ndarray]:
+        """채워진 행까지의 뷰 (비어 있으면 None)"""
+        if not self._size:
+            return None
+        return self._buffer[:self._size]
@@ -3,9 +3,10 @@
 """
 Event Stream
 실시간 이벤트 스트리밍 시뮬레이터
+- 추천 의존성 그래프가 연결되면 이벤트에 영향받는 축선 상태/점수 요소/추천만 증분 재계산
 """
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from queue import Queue
 import threading
 import pandas as pd
@@ -15,17 +16,35 @@ from pathlib import Path
 class EventStream:
     """이벤트 스트리밍 시뮬레이터"""
     
-    def __init__(self, data_manager, ontology_manager):
+    def __init__(self, data_manager, ontology_manager, dependency_graph=None):
         """
         Args:
             data_manager: DataManager 인스턴스
             ontology_manager: OntologyManager 인스턴스
+            dependency_graph: RecommendationDependencyGraph 인스턴스 (선택)
         """
         self.data_manager = data_manager
         self.ontology_manager = ontology_manager
+        self.dependency_graph = dependency_graph
         self.event_queue = Queue()
         self.event_history = []
         self.processing = False
+        self._subscribers: List[Callable[[Dict], None]] = []
+    
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """
+        증분 재계산 결과 구독
+        
+        Args:
+            callback: 영향받은 추천이 있을 때 처리 결과 딕셔너리로 호출되는 함수
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[Dict], None]):
+        """구독 해제"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
     
     def simulate_threat_update(self, threat_id: str, new_threat_level: float) -> Dict:
         """
@@ -127,25 +146,29 @@ class EventStream:
                 self._update_ontology(event)
                 
                 # 3. 영향받는 추천 재계산
-                affected_recommendations = self._find_affected_recommendations(event)
+                updates = self._find_affected_recommendations(event)
                 
                 # 4. 이벤트 히스토리 저장
                 self.event_history.append(event)
                 
-                return {
+                return self._publish({
                     "processed": True,
-                    "affected_recommendations": affected_recommendations,
+                    "affected_recommendations": updates["recommendations"],
+                    "affected_axis_states": updates["axis_states"],
                     "event": event
-                }
+                })
             elif event["type"] == "resource_update":
                 # 자원 업데이트 처리
                 self._update_ontology(event)
+                updates = self._find_affected_recommendations(event)
                 self.event_history.append(event)
                 
-                return {
+                return self._publish({
                     "processed": True,
+                    "affected_recommendations": updates["recommendations"],
+                    "affected_axis_states": updates["axis_states"],
                     "event": event
-                }
+                })
         except Exception as e:
             print(f"[ERROR] 이벤트 처리 실패: {e}")
             import traceback
@@ -181,21 +204,55 @@ class EventStream:
             predicate_uri = URIRef(ns[field])
             
             # 기존 값 제거
-            self.ontology_manager.graph.remove((entity_uri, predicate_uri, None))
+            graph = self.ontology_manager.graph
+            removed = list(graph.triples((entity_uri, predicate_uri, None)))
+            for triple in removed:
+                graph.remove(triple)
             
             # 새 값 추가
-            self.ontology_manager.graph.add((entity_uri, predicate_uri, Literal(new_value)))
+            added = [(entity_uri, predicate_uri, Literal(new_value))]
+            graph.add(added[0])
+            
+            # 그래프 버전/변경 로그 갱신 (델타 응답용)
+            if hasattr(self.ontology_manager, 'record_graph_change'):
+                self.ontology_manager.record_graph_change(added=added, removed=removed)
             
             print(f"[INFO] 온톨로지 업데이트: {entity_id}.{field} = {new_value}")
         except Exception as e:
             print(f"[WARN] 온톨로지 업데이트 실패: {e}")
     
-    def _find_affected_recommendations(self, event: Dict) -> List[str]:
-        """영향받는 추천 찾기"""
-        # 해당 위협 상황을 사용하는 추천 찾기
-        affected = []
-        # 구현 필요: 추천 히스토리에서 해당 위협 상황 사용 추천 찾기
-        return affected
+    def _find_affected_recommendations(self, event: Dict) -> Dict[str, List[Dict]]:
+        """
+        영향받는 추천 찾기 및 증분 재계산
+        
+        의존성 그래프의 역색인으로 이벤트 엔티티에 의존한 추천만 찾아
+        변경된 점수 요소만 다시 계산합니다 (execute_reasoning 재실행 없음).
+        
+        Returns:
+            {"recommendations": [...], "axis_states": [...]}
+        """
+        if self.dependency_graph is None:
+            return {"recommendations": [], "axis_states": []}
+        
+        try:
+            if event["type"] == "threat_update":
+                return self.dependency_graph.apply_threat_update(event["entity_id"], event["new_value"])
+            if event["type"] == "resource_update":
+                return self.dependency_graph.apply_resource_update(event["entity_id"], event["new_value"])
+        except Exception as e:
+            print(f"[WARN] 영향받는 추천 재계산 실패: {e}")
+        
+        return {"recommendations": [], "axis_states": []}
+    
+    def _publish(self, result: Dict) -> Dict:
+        """영향받은 추천/축선이 있으면 구독자에게 전달"""
+        if result.get("affected_recommendations") or result.get("affected_axis_states"):
+            for callback in list(self._subscribers):
+                try:
+                    callback(result)
+                except Exception as e:
+                    print(f"[WARN] 이벤트 구독자 콜백 실패: {e}")
+        return result
     
     def get_event_history(self, limit: int = 10) -> List[Dict]:
         """
@@ -0,0 +1,446 @@
+# core_pipeline/incremental_inference.py
+# -*- coding: utf-8 -*-
+"""
+Incremental (Semi-Naive) Rule Materializer
+전술 규칙 증분 추론기
+
+tactical_rules.sparql의 CONSTRUCT 규칙과 InferenceRulesEngine 규칙을
+기본 그래프 위의 추론 오버레이 그래프로 유지합니다.
+- 추가된 트리플(델타)에 매칭되는 패턴으로 변수를 미리 바인딩해 규칙을 평가 (semi-naive)
+  → 새로 도출되는 결론만 계산, 비용은 전체 그래프가 아닌 델타 크기에 비례
+- 결론별 도출 근거(support) 트리플을 기록하여 원본 사실 삭제 시 결론을 철회
+- OPTIONAL/MINUS/NOT EXISTS 등 비단조 규칙은 변경 시 해당 규칙만 전체 재평가
+"""
+import re
+import time
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from rdflib import Graph, Literal, URIRef, Variable
+from rdflib.graph import ReadOnlyGraphAggregate
+from rdflib.plugins.sparql import prepareQuery
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PREFIXES = {
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+}
+
+# 규칙 결과가 단조 증가하지 않는(델타 평가 불가) 대수 연산자
+_NON_MONOTONIC_NODES = {"LeftJoin", "Minus", "AggregateJoin", "Builtin_NOTEXISTS", "Builtin_EXISTS"}
+
+_CONSTRUCT_PATTERN = re.compile(r'CONSTRUCT\s*\{(.*?)\}\s*WHERE\s*(\{.*)', re.IGNORECASE | re.DOTALL)
+
+
+class MaterializedRule:
+    """증분 평가용으로 준비된 규칙 (결론 템플릿 + 바디 SELECT 쿼리 + 바디 트리플 패턴)"""
+
+    def __init__(self, rule_id: str, prefixes: str, template_text: str, where_text: str):
+        self.id = rule_id
+        construct = prepareQuery(f"{prefixes}\nCONSTRUCT {{ {template_text} }} WHERE {where_text}")
+        self.template: List[Tuple] = list(construct.algebra["template"] or [])
+        self.query = prepareQuery(f"{prefixes}\nSELECT * WHERE {where_text}")
+        self.patterns: List[Tuple] = []
+        self.monotonic = True
+        self._collect(self.query.algebra)
+
+    def _collect(self, node):
+        """대수 트리에서 BGP 트리플 패턴 수집 및 비단조 연산자 탐지"""
+        if isinstance(node, dict):
+            name = getattr(node, "name", None)
+            if name in _NON_MONOTONIC_NODES:
+                self.monotonic = False
+            if name == "BGP":
+                self.patterns.extend(node.get("triples") or [])
+            for value in node.values():
+                self._collect(value)
+        elif isinstance(node, (list, tuple)):
+            for value in node:
+                self._collect(value)
+
+    def seeds(self, triple: Tuple) -> List[Dict[Variable, Any]]:
+        """델타 트리플이 매칭되는 바디 패턴별 초기 바인딩"""
+        result = []
+        for pattern in self.patterns:
+            bindings = {}
+            for term, value in zip(pattern, triple):
+                if isinstance(term, Variable):
+                    if bindings.setdefault(term, value) != value:
+                        break
+                elif term != value:
+                    break
+            else:
+                result.append(bindings)
+        return result
+
+    def instantiate(self, pattern: Tuple, row: Dict[Variable, Any]) -> Optional[Tuple]:
+        """패턴에 해(solution) 바인딩 적용 (미바인딩 변수가 있으면 None)"""
+        terms = []
+        for term in pattern:
+            if isinstance(term, Variable):
+                term = row.get(term)
+                if term is None:
+                    return None
+            terms.append(term)
+        if isinstance(terms[0], Literal) or not isinstance(terms[1], URIRef):
+            return None
+        return tuple(terms)
+
+
+def load_construct_rules(path: Path) -> List[MaterializedRule]:
+    """SPARQL CONSTRUCT 규칙 파일(tactical_rules.sparql 형식) 로드"""
+    content = Path(path).read_text(encoding='utf-8')
+
+    prefixes = '\n'.join(line.strip() for line in content.split('\n')
+                         if line.strip().upper().startswith('PREFIX'))
+
+    rules = []
+    for chunk in re.split(r'(?=CONSTRUCT)', content, flags=re.IGNORECASE):
+        match = _CONSTRUCT_PATTERN.search(chunk)
+        if not match:
+            continue
+        rule_id = f"{Path(path).stem}#{len(rules) + 1}"
+        try:
+            rules.append(MaterializedRule(rule_id, prefixes, match.group(1), match.group(2)))
+        except Exception as e:
+            logger.warning(f"Failed to prepare rule {rule_id}: {e}")
+    return rules
+
+
+def rules_from_inference_engine(rules: Iterable, namespace: str) -> List[MaterializedRule]:
+    """InferenceRulesEngine 규칙(InferenceRule)을 증분 평가 규칙으로 변환"""
+    prefixes = f"PREFIX ns: <{namespace}>\n" + '\n'.join(
+        f"PREFIX {p}: <{uri}>" for p, uri in _DEFAULT_PREFIXES.items())
+
+    result = []
+    for rule in rules:
+        if not getattr(rule, "enabled", True):
+            continue
+        try:
+            result.append(MaterializedRule(rule.id, prefixes, rule.conclusion_template + " .",
+                                           "{ " + rule.condition_sparql + " }"))
+        except Exception as e:
+            logger.warning(f"Failed to prepare rule {rule.id}: {e}")
+    return result
+
+
+class IncrementalRuleMaterializer:
+    """
+    규칙 결론을 기본 그래프와 분리된 오버레이 그래프로 유지하는 증분 추론기
+
+    사용 예:
+        materializer = IncrementalRuleMaterializer(rules)
+        materializer.bind_ontology_manager(ontology_manager)
+        materializer.sync()            # 최초: 전체 평가, 이후: 변경분만 평가
+        view = materializer.get_view() # 기본 + 추론 그래프 통합 뷰
+
+    도출 근거는 (규칙, 결론, 근거 트리플 집합) 단위로 기록하며, 결론은 남은 도출이
+    하나도 없을 때 철회됩니다. 결론끼리 서로를 근거로 하는 순환 규칙은 철회가
+    보장되지 않으므로 해당 경우 rebuild()를 사용합니다.
+    """
+
+    def __init__(self, rules: List[MaterializedRule], base_graph: Optional[Graph] = None,
+                 full_rebuild_ratio: float = 0.3):
+        """
+        Args:
+            rules: 증분 평가 규칙 목록
+            base_graph: 기본 그래프 (bind_ontology_manager 사용 시 생략)
+            full_rebuild_ratio: 변경분이 기본 그래프 대비 이 비율을 넘으면 전체 재평가
+        """
+        self.rules = rules
+        self.full_rebuild_ratio = full_rebuild_ratio
+        self.base: Optional[Graph] = base_graph
+        self.inferred = Graph()
+        self._ontology_manager = None
+        self._synced_version: Optional[int] = None
+        self._built = False
+        self._lock = threading.RLock()
+
+        # 도출 기록: key = (rule_id, 결론 트리플, 근거 트리플 집합)
+        self._derivations: Set[Tuple[str, Tuple, FrozenSet[Tuple]]] = set()
+        self._by_support: Dict[Tuple, Set[Tuple]] = {}
+        self._by_conclusion: Dict[Tuple, Set[Tuple]] = {}
+        self._by_rule: Dict[str, Set[Tuple]] = {}
+
+        self.last_stats: Dict[str, Any] = {}
+
+    def bind_ontology_manager(self, ontology_manager):
+        """온톨로지 매니저의 그래프/변경 이력을 동기화 대상으로 연결"""
+        self._ontology_manager = ontology_manager
+
+    def get_view(self) -> Graph:
+        """기본 그래프 + 추론 오버레이 통합 읽기 전용 뷰"""
+        return ReadOnlyGraphAggregate([self.base, self.inferred])
+
+    def get_conclusions(self, rule_ids: Optional[Iterable[str]] = None) -> Dict[str, Set[Tuple]]:
+        """
+        규칙별 현재 결론 트리플 (기본 그래프에 이미 있는 트리플 포함)
+
+        Args:
+            rule_ids: 조회할 규칙 ID 목록 (None = 전체)
+        """
+        with self._lock:
+            if rule_ids is None:
+                rule_ids = [rule.id for rule in self.rules]
+            return {rule_id: {key[1] for key in self._by_rule.get(rule_id, ())} for rule_id in rule_ids}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rules": len(self.rules),
+            "non_monotonic_rules": sum(1 for r in self.rules if not r.monotonic),
+            "inferred_triples": len(self.inferred),
+            "derivations": len(self._derivations),
+            "synced_version": self._synced_version,
+            "last_run": self.last_stats
+        }
+
+    # ------------------------------------------------------------------
+    # 동기화
+    # ------------------------------------------------------------------
+    def sync(self) -> Dict[str, Any]:
+        """
+        바인딩된 온톨로지 매니저의 현재 그래프와 추론 결과 동기화
+
+        - 변경 이력(record_graph_change)이 있으면 그 변경분만 반영
+        - 그래프 객체가 교체되었으면(전체 재구축) 이전/새 그래프 트리플 차이만 반영
+        - 그 외(추적되지 않은 변경)에는 전체 재평가
+        """
+        om = self._ontology_manager
+        if om is None or getattr(om, "graph", None) is None:
+            return {}
+
+        with self._lock:
+            graph = om.graph
+            version = om.get_graph_version()
+
+            if not self._built or self.base is None:
+                self.base = graph
+                stats = self.rebuild()
+            elif graph is not self.base:
+                old_base = self.base
+                old_triples = set(old_base)
+                new_triples = set(graph)
+                self.base = graph
+                stats = self.apply_changes(added=new_triples - old_triples,
+                                           removed=old_triples - new_triples)
+            elif version == self._synced_version:
+                return self.last_stats
+            else:
+                changes = None
+                if self._synced_version is not None and hasattr(om, "get_triple_changes"):
+                    changes = om.get_triple_changes(self._synced_version)
+                if changes is None:
+                    stats = self.rebuild()
+                else:
+                    stats = self.apply_changes(
+                        added=[t for t, is_added in changes.items() if is_added],
+                        removed=[t for t, is_added in changes.items() if not is_added])
+
+            self._synced_version = version
+            return stats
+
+    def rebuild(self) -> Dict[str, Any]:
+        """모든 규칙을 전체 그래프에 대해 평가하여 추론 결과 재구성"""
+        with self._lock:
+            start = time.time()
+            self.inferred = Graph()
+            self._derivations.clear()
+            self._by_support.clear()
+            self._by_conclusion.clear()
+            self._by_rule.clear()
+
+            if self.base is not None:
+                # 단조 규칙을 고정점까지 평가한 뒤 비단조 규칙 평가
+                new_facts = []
+                view = self.get_view()
+                for rule in self.rules:
+                    if rule.monotonic:
+                        new_facts.extend(self._evaluate(rule, view, [None]))
+                self._propagate(new_facts)
+                for rule in self.rules:
+                    if not rule.monotonic:
+                        self._propagate(self._evaluate(rule, self.get_view(), [None]))
+
+            self._built = True
+            self.last_stats = {
+                "mode": "full",
+                "inferred_added": len(self.inferred),
+                "inferred_removed": 0,
+                "seconds": round(time.time() - start, 4)
+            }
+            return self.last_stats
+
+    def apply_changes(self, added: Iterable[Tuple] = (), removed: Iterable[Tuple] = ()) -> Dict[str, Any]:
+        """
+        기본 그래프에 이미 반영된 트리플 변경분으로 추론 결과 갱신
+
+        Args:
+            added: 기본 그래프에 추가된 트리플
+            removed: 기본 그래프에서 삭제된 트리플
+        """
+        with self._lock:
+            added = [t for t in added if t in self.base]
+            removed = [t for t in removed if t not in self.base]
+            if not self._built:
+                return self.rebuild()
+            if not added and not removed:
+                return self.last_stats
+
+            if len(added) + len(removed) > max(1, len(self.base)) * self.full_rebuild_ratio:
+                return self.rebuild()
+
+            start = time.time()
+            before = len(self.inferred)
+
+            # 1. 삭제: 근거가 사라진 도출 철회 (연쇄)
+            retracted = self._retract(removed)
+
+            # 2. 추가: 델타 바인딩으로 새 결론만 도출 (semi-naive)
+            view = self.get_view()
+            new_facts = []
+            for rule in self.rules:
+                if rule.monotonic:
+                    new_facts.extend(self._evaluate(rule, view, self._seed_bindings(rule, added)))
+            self._propagate(new_facts)
+
+            # 3. 비단조 규칙은 전체 재평가 (결론 교체)
+            for rule in self.rules:
+                if not rule.monotonic:
+                    retracted += self._reset_rule(rule)
+                    self._propagate(self._evaluate(rule, self.get_view(), [None]))
+
+            self.last_stats = {
+                "mode": "incremental",
+                "delta_added": len(added),
+                "delta_removed": len(removed),
+                "inferred_added": len(self.inferred) - before + retracted,
+                "inferred_removed": retracted,
+                "seconds": round(time.time() - start, 4)
+            }
+            return self.last_stats
+
+    # ------------------------------------------------------------------
+    # 평가/기록
+    # ------------------------------------------------------------------
+    def _seed_bindings(self, rule: MaterializedRule, delta: List[Tuple]) -> List[Dict]:
+        """델타 트리플로부터 규칙의 중복 없는 초기 바인딩 목록 생성"""
+        seen = set()
+        result = []
+        for triple in delta:
+            for bindings in rule.seeds(triple):
+                key = frozenset(bindings.items())
+                if key not in seen:
+                    seen.add(key)
+                    result.append(bindings)
+        return result
+
+    def _evaluate(self, rule: MaterializedRule, view: Graph, seeds: List[Optional[Dict]]) -> List[Tuple]:
+        """
+        규칙 평가 후 도출 기록, 새로 참이 된 결론 반환
+
+        Args:
+            seeds: 초기 바인딩 목록 ([None] = 바인딩 없이 전체 평가)
+        """
+        new_facts = []
+        for bindings in seeds:
+            try:
+                results = view.query(rule.query, initBindings=bindings) if bindings else view.query(rule.query)
+                rows = [{Variable(k): v for k, v in row.asdict().items()} for row in results]
+            except Exception as e:
+                logger.warning(f"Incremental rule {rule.id} evaluation failed: {e}")
+                continue
+
+            for row in rows:
+                if bindings:
+                    row = {**bindings, **row}
+                supports = frozenset(
+                    t for t in (rule.instantiate(p, row) for p in rule.patterns)
+                    if t is not None and t in view
+                )
+                for pattern in rule.template:
+                    conclusion = rule.instantiate(pattern, row)
+                    if conclusion is None:
+                        continue
+                    if self._record(rule.id, conclusion, supports):
+                        new_facts.append(conclusion)
+        return new_facts
+
+    def _record(self, rule_id: str, conclusion: Tuple, supports: FrozenSet[Tuple]) -> bool:
+        """도출 기록. 결론이 새로 추론 그래프에 추가되면 True"""
+        key = (rule_id, conclusion, supports)
+        if key in self._derivations:
+            return False
+        self._derivations.add(key)
+        self._by_rule.setdefault(rule_id, set()).add(key)
+        self._by_conclusion.setdefault(conclusion, set()).add(key)
+        for support in supports:
+            self._by_support.setdefault(support, set()).add(key)
+
+        if conclusion in self.inferred:
+            return False
+        is_new = conclusion not in self.base
+        self.inferred.add(conclusion)
+        return is_new
+
+    def _forget(self, key: Tuple) -> Optional[Tuple]:
+        """도출 하나 삭제. 결론의 도출이 모두 사라지면 결론을 철회하고 반환"""
+        if key not in self._derivations:
+            return None
+        self._derivations.discard(key)
+        rule_id, conclusion, supports = key
+        self._by_rule.get(rule_id, set()).discard(key)
+        for support in supports:
+            keys = self._by_support.get(support)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_support[support]
+
+        keys = self._by_conclusion.get(conclusion)
+        if keys is not None:
+            keys.discard(key)
+            if keys:
+                return None
+            del self._by_conclusion[conclusion]
+        self.inferred.remove(conclusion)
+        return conclusion
+
+    def _retract(self, removed: List[Tuple]) -> int:
+        """삭제된 사실을 근거로 하는 결론을 연쇄 철회, 철회된 결론 수 반환"""
+        retracted = 0
+        queue = list(removed)
+        while queue:
+            fact = queue.pop()
+            # 다른 도출이 남아 있는 결론이면 여전히 참
+            if fact in self._by_conclusion:
+                continue
+            for key in list(self._by_support.get(fact, ())):
+                conclusion = self._forget(key)
+                if conclusion is None:
+                    continue
+                retracted += 1
+                # 기본 그래프에 명시된 사실이면 여전히 참
+                if conclusion not in self.base:
+                    queue.append(conclusion)
+        return retracted
+
+    def _reset_rule(self, rule: MaterializedRule) -> int:
+        """규칙의 모든 도출 삭제 (비단조 규칙 재평가 전)"""
+        retracted = [c for c in (self._forget(key) for key in list(self._by_rule.get(rule.id, ())))
+                     if c is not None]
+        return len(retracted) + self._retract([c for c in retracted if c not in self.base])
+
+    def _propagate(self, new_facts: List[Tuple]):
+        """새 결론을 델타로 하여 고정점까지 반복 (결론을 읽는 규칙 연쇄)"""
+        delta = new_facts
+        while delta:
+            view = self.get_view()
+            next_delta = []
+            for rule in self.rules:
+                if rule.monotonic:
+                    next_delta.extend(self._evaluate(rule, view, self._seed_bindings(rule, delta)))
+            delta = next_delta
@@ -10,8 +10,12 @@ OWL-RL이 처리하지 못하는 복잡한 도메인 규칙을 처리합니다.
 
 from typing import Dict, List, Optional, Set, Tuple, Any
 from rdflib import Graph, Namespace, URIRef, Literal, RDF, RDFS
+from rdflib.graph import ReadOnlyGraphAggregate
+from rdflib.plugins.sparql import prepareQuery
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import logging
+import threading
 import re
 
 logger = logging.getLogger(__name__)
@@ -19,6 +23,27 @@ logger = logging.getLogger(__name__)
 # 기본 네임스페이스
 NS = Namespace("http://coa-agent-platform.org/ontology#")
 
+# 규칙 조건에서 사용 가능한 접두사
+_PREFIXES = {
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+}
+
+# 변수 프리디케이트(?p) 등 모든 프리디케이트를 읽는 규칙 표시
+ANY_PREDICATE = "*"
+
+_FILTER_PATTERN = re.compile(r'FILTER\s*\((?:[^()]|\([^()]*\))*\)', re.IGNORECASE)
+_STATEMENT_SPLIT = re.compile(r'\s\.(?=\s|$)')
+
+# 재귀 규칙 고정점 반복 상한
+MAX_FIXPOINT_ITERATIONS = 10
+
+# 준비된(파싱/번역 완료) 규칙 쿼리 캐시: (namespace, condition) -> 쿼리
+# 엔진은 요청마다 생성되므로 모듈 전역으로 공유
+_PREPARED_QUERIES: Dict[Tuple[str, str], Any] = {}
+_PREPARED_LOCK = threading.Lock()
+
 
 @dataclass
 class InferenceRule:
@@ -33,6 +58,57 @@ class InferenceRule:
     enabled: bool = True
 
 
+def _expand_term(token: str, ns: str) -> Optional[str]:
+    """프리디케이트 토큰을 URI 문자열로 확장 (변수면 None)"""
+    if token == "a":
+        return str(RDF.type)
+    if token.startswith("?") or token.startswith("$"):
+        return None
+    if token.startswith("<") and token.endswith(">"):
+        return token[1:-1]
+    if ":" in token:
+        prefix, local = token.split(":", 1)
+        if prefix == "ns":
+            return f"{ns}{local}"
+        if prefix in _PREFIXES:
+            return f"{_PREFIXES[prefix]}{local}"
+    return token
+
+
+def analyze_rule_predicates(rule: InferenceRule, ns: str = str(NS)) -> Tuple[Set[str], Set[str]]:
+    """
+    규칙이 읽는/쓰는 프리디케이트 분석
+    
+    Args:
+        rule: 분석할 규칙
+        ns: 'ns:' 접두사 네임스페이스
+        
+    Returns:
+        (읽는 프리디케이트 집합, 쓰는 프리디케이트 집합)
+        변수 프리디케이트를 읽으면 읽기 집합에 ANY_PREDICATE 포함
+    """
+    reads: Set[str] = set()
+    body = _FILTER_PATTERN.sub(" ", rule.condition_sparql)
+    
+    for statement in _STATEMENT_SPLIT.split(body):
+        # ';' 로 주어를 공유하는 패턴: 첫 조각은 (s p o), 이후는 (p o)
+        for i, part in enumerate(statement.split(";")):
+            tokens = part.split()
+            index = 1 if i == 0 else 0
+            if len(tokens) <= index:
+                continue
+            predicate = _expand_term(tokens[index], ns)
+            reads.add(predicate if predicate is not None else ANY_PREDICATE)
+    
+    writes: Set[str] = set()
+    parts = rule.conclusion_template.strip().split()
+    if len(parts) == 3:
+        predicate = _expand_term(parts[1], ns)
+        writes.add(predicate if predicate is not None else ANY_PREDICATE)
+    
+    return reads, writes
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 전술 도메인 추론 규칙 정의
 # ═══════════════════════════════════════════════════════════════════════════
@@ -259,6 +335,98 @@ TACTICAL_RULES: List[InferenceRule] = [
 ]
 
 
+def build_rule_schedule(rules: List[InferenceRule], ns: str = str(NS)) -> List[List[List[InferenceRule]]]:
+    """
+    규칙 의존성 기반 실행 계획 생성
+    
+    규칙 B가 규칙 A가 쓰는 프리디케이트를 읽으면 B는 A에 의존합니다.
+    상호 의존(순환)하는 규칙은 하나의 컴포넌트로 묶어 고정점까지 반복하고,
+    컴포넌트는 의존 깊이(level)별로 묶어 같은 level끼리 병렬 실행합니다.
+    
+    Args:
+        rules: 실행할 규칙 (우선순위 순서 유지)
+        ns: 'ns:' 접두사 네임스페이스
+        
+    Returns:
+        levels[level][component] = 규칙 목록
+    """
+    if not rules:
+        return []
+    
+    io = [analyze_rule_predicates(rule, ns) for rule in rules]
+    n = len(rules)
+    
+    # 의존 간선: writer -> reader
+    edges: List[List[int]] = [[] for _ in range(n)]
+    for w in range(n):
+        writes = io[w][1]
+        for r in range(n):
+            reads = io[r][0]
+            if ANY_PREDICATE in reads or ANY_PREDICATE in writes or (writes & reads):
+                if writes:
+                    edges[w].append(r)
+    
+    # 강연결 요소 (Tarjan, 반복 구현)
+    index_of = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    comp_of = [-1] * n
+    components: List[List[int]] = []
+    counter = 0
+    
+    for root in range(n):
+        if index_of[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                index_of[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            recurse = False
+            for j in range(i, len(edges[v])):
+                w = edges[v][j]
+                if index_of[w] == -1:
+                    work.append((v, j + 1))
+                    work.append((w, 0))
+                    recurse = True
+                    break
+                if on_stack[w]:
+                    low[v] = min(low[v], index_of[w])
+            if recurse:
+                continue
+            if low[v] == index_of[v]:
+                members = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    comp_of[w] = len(components)
+                    members.append(w)
+                    if w == v:
+                        break
+                components.append(sorted(members))
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+    
+    # 컴포넌트 깊이 = 선행 컴포넌트 최대 깊이 + 1 (Tarjan은 역위상 순서로 컴포넌트를 생성)
+    depth = [0] * len(components)
+    for c in reversed(range(len(components))):
+        for v in components[c]:
+            for w in edges[v]:
+                target = comp_of[w]
+                if target != c:
+                    depth[target] = max(depth[target], depth[c] + 1)
+    
+    levels: List[List[List[InferenceRule]]] = [[] for _ in range(max(depth) + 1)]
+    for c in sorted(range(len(components)), key=lambda c: components[c][0]):
+        levels[depth[c]].append([rules[v] for v in components[c]])
+    return levels
+
+
 class InferenceRulesEngine:
     """
     SWRL 스타일 추론 규칙 엔진
@@ -266,15 +434,17 @@ class InferenceRulesEngine:
     OWL-RL이 처리하지 못하는 복잡한 도메인 규칙을 실행합니다.
     """
     
-    def __init__(self, graph: Graph, namespace: str = None):
+    def __init__(self, graph: Graph, namespace: str = None, max_workers: int = 4):
         """
         Args:
             graph: RDF 그래프
             namespace: 온톨로지 네임스페이스
+            max_workers: 독립 규칙 병렬 실행 스레드 수
         """
         self.graph = graph
         self.ns = Namespace(namespace) if namespace else NS
         self.rules = TACTICAL_RULES.copy()
+        self.max_workers = max(1, max_workers)
         self.execution_stats = {}
         
     def add_rule(self, rule: InferenceRule):
@@ -297,36 +467,25 @@ class InferenceRulesEngine:
         
         return filtered
     
-    def execute_rule(self, rule: InferenceRule) -> List[Dict[str, Any]]:
+    def execute_rule(self, rule: InferenceRule, graph: Graph = None) -> List[Dict[str, Any]]:
         """
         단일 규칙 실행
         
         Args:
             rule: 실행할 규칙
+            graph: 질의 대상 그래프 (None = self.graph)
             
         Returns:
             추론된 트리플 목록 [{"subject": ..., "predicate": ..., "object": ...}, ...]
         """
-        if self.graph is None:
+        graph = self.graph if graph is None else graph
+        if graph is None:
             return []
         
-        # SPARQL 쿼리 구성
-        sparql_query = f"""
-            PREFIX ns: <{self.ns}>
-            PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-            PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-            
-            SELECT DISTINCT *
-            WHERE {{
-                {rule.condition_sparql}
-            }}
-        """
-        
         inferred_triples = []
         
         try:
-            results = self.graph.query(sparql_query)
+            results = graph.query(self._prepare_query(rule))
             
             for row in results:
                 # 결론 템플릿 파싱 및 바인딩
@@ -340,13 +499,20 @@ class InferenceRulesEngine:
         return inferred_triples
     
     def execute_all_rules(self, categories: List[str] = None, 
-                          priority_filter: str = None) -> Dict[str, Any]:
+                          priority_filter: str = None,
+                          materialized: Optional[Dict[str, Set[Tuple]]] = None) -> Dict[str, Any]:
         """
         모든 규칙 실행
         
+        규칙별 읽기/쓰기 프리디케이트로 의존성을 분석하여 독립 규칙은
+        고정된 스냅샷(원본 그래프 + 이전 단계 추론 결과)에 대해 병렬 실행하고,
+        상호 의존 규칙만 고정점까지 반복합니다. 원본 그래프는 변경하지 않습니다.
+        
         Args:
             categories: 실행할 규칙 카테고리 (None = 전체)
             priority_filter: 우선순위 필터 (HIGH, MEDIUM, LOW)
+            materialized: 증분 추론기가 유지하는 규칙별 결론 트리플
+                          (지정 시 규칙을 다시 평가하지 않고 결과로 사용)
             
         Returns:
             실행 결과 딕셔너리
@@ -363,11 +529,49 @@ class InferenceRulesEngine:
         priority_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
         rules_to_execute.sort(key=lambda r: priority_order.get(r.priority, 3))
         
+        levels = build_rule_schedule(rules_to_execute, str(self.ns))
+        
+        # 규칙별 추론 결과 (우선순위 순서 유지)
+        inferred_by_rule: Dict[str, List[Dict]] = {r.id: [] for r in rules_to_execute}
+        iterations: Dict[str, int] = {}
+        # 이전 level의 추론 결과 (후속 level 규칙이 읽을 수 있도록 누적)
+        overlay = Graph()
+        
+        if materialized is not None:
+            for rule in rules_to_execute:
+                inferred_by_rule[rule.id] = [self._from_rdf_triple(t)
+                                             for t in sorted(materialized.get(rule.id, ()))]
+        elif self.graph is not None:
+            for components in levels:
+                view = self.graph if len(overlay) == 0 else ReadOnlyGraphAggregate([self.graph, overlay])
+                
+                # 같은 level의 컴포넌트는 서로 독립 → 병렬 실행
+                if len(components) == 1 or self.max_workers == 1:
+                    outputs = [self._run_component(c, view) for c in components]
+                else:
+                    # 쿼리 파싱은 스레드 안전하지 않을 수 있으므로 미리 준비
+                    for component in components:
+                        for rule in component:
+                            self._prepare_query(rule)
+                    with ThreadPoolExecutor(max_workers=min(self.max_workers, len(components)),
+                                            thread_name_prefix="rules") as executor:
+                        outputs = list(executor.map(lambda c: self._run_component(c, view), components))
+                
+                for component, (results, rounds) in zip(components, outputs):
+                    if self._is_recursive(component):
+                        iterations[component[0].id] = rounds
+                    for rule_id, inferred in results.items():
+                        inferred_by_rule[rule_id] = inferred
+                        for triple in inferred:
+                            rdf_triple = self._to_rdf_triple(triple)
+                            if rdf_triple is not None:
+                                overlay.add(rdf_triple)
+        
         all_inferred = []
         rule_results = {}
         
         for rule in rules_to_execute:
-            inferred = self.execute_rule(rule)
+            inferred = inferred_by_rule[rule.id]
             rule_results[rule.id] = {
                 "name": rule.name,
                 "description": rule.description,
@@ -382,7 +586,12 @@ class InferenceRulesEngine:
             "total_rules_executed": len(rules_to_execute),
             "total_inferred": len(all_inferred),
             "rules_by_category": self._count_by_category(rules_to_execute),
-            "inferred_by_category": self._group_inferred_by_category(rule_results)
+            "inferred_by_category": self._group_inferred_by_category(rule_results),
+            "schedule": {
+                "depth": len(levels),
+                "levels": [[[r.id for r in c] for c in components] for components in levels],
+                "fixpoint_iterations": iterations
+            }
         }
         
         return {
@@ -391,6 +600,87 @@ class InferenceRulesEngine:
             "all_inferred": all_inferred
         }
     
+    def _run_component(self, component: List[InferenceRule], view: Graph) -> Tuple[Dict[str, List[Dict]], int]:
+        """
+        규칙 컴포넌트 실행
+        
+        비재귀 규칙은 한 번만 실행하고, 재귀(상호 의존) 컴포넌트는 새 트리플이
+        나오지 않을 때까지 컴포넌트 전용 그래프에 결과를 쌓으며 반복합니다.
+        
+        Returns:
+            (규칙 ID별 추론 결과, 반복 횟수)
+        """
+        if not self._is_recursive(component):
+            rule = component[0]
+            return {rule.id: self.execute_rule(rule, view)}, 1
+        
+        local = Graph()
+        layers = list(view.graphs) if isinstance(view, ReadOnlyGraphAggregate) else [view]
+        working = ReadOnlyGraphAggregate(layers + [local])
+        results: Dict[str, List[Dict]] = {rule.id: [] for rule in component}
+        seen: Dict[str, Set[Tuple[str, str, str]]] = {rule.id: set() for rule in component}
+        
+        rounds = 0
+        while rounds < MAX_FIXPOINT_ITERATIONS:
+            rounds += 1
+            new_triples = []
+            for rule in component:
+                for triple in self.execute_rule(rule, working):
+                    key = (triple["subject"], triple["predicate"], triple["object"])
+                    if key in seen[rule.id]:
+                        continue
+                    seen[rule.id].add(key)
+                    results[rule.id].append(triple)
+                    new_triples.append(triple)
+            
+            # 이번 라운드 결과를 반영한 뒤 그래프가 더 자라지 않으면 고정점
+            added = 0
+            for triple in new_triples:
+                rdf_triple = self._to_rdf_triple(triple)
+                if rdf_triple is not None and rdf_triple not in working:
+                    local.add(rdf_triple)
+                    added += 1
+            if added == 0:
+                break
+        else:
+            logger.warning(f"Rules {[r.id for r in component]} did not reach fixpoint "
+                           f"in {MAX_FIXPOINT_ITERATIONS} iterations")
+        
+        return results, rounds
+    
+    def _is_recursive(self, component: List[InferenceRule]) -> bool:
+        """컴포넌트가 자신의 결과를 다시 읽는지 여부"""
+        if len(component) > 1:
+            return True
+        reads, writes = analyze_rule_predicates(component[0], str(self.ns))
+        return bool(writes) and (ANY_PREDICATE in reads or ANY_PREDICATE in writes or bool(reads & writes))
+    
+    def _prepare_query(self, rule: InferenceRule):
+        """규칙 조건을 SPARQL 쿼리로 파싱/번역 (모듈 캐시 재사용)"""
+        key = (str(self.ns), rule.condition_sparql)
+        query = _PREPARED_QUERIES.get(key)
+        if query is not None:
+            return query
+        
+        # SPARQL 쿼리 구성
+        sparql_query = f"""
+            PREFIX ns: <{self.ns}>
+            PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+            PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
+            
+            SELECT DISTINCT *
+            WHERE {{
+                {rule.condition_sparql}
+            }}
+        """
+        with _PREPARED_LOCK:
+            query = _PREPARED_QUERIES.get(key)
+            if query is None:
+                query = prepareQuery(sparql_query)
+                _PREPARED_QUERIES[key] = query
+        return query
+    
     def apply_inferences_to_graph(self, inferred_triples: List[Dict]) -> int:
         """
         추론된 트리플을 그래프에 추가
@@ -404,31 +694,47 @@ class InferenceRulesEngine:
         added_count = 0
         
         for triple in inferred_triples:
-            try:
-                s = URIRef(triple["subject"]) if triple["subject"].startswith("http") else URIRef(f"{self.ns}{triple['subject']}")
-                p = URIRef(triple["predicate"]) if triple["predicate"].startswith("http") else URIRef(f"{self.ns}{triple['predicate']}")
-                
-                # 객체 유형 판단 (URI vs Literal)
-                obj_val = triple["object"]
-                if obj_val.startswith("http"):
-                    o = URIRef(obj_val)
-                elif "^^" in obj_val:
-                    # 타입이 지정된 리터럴 (예: 'true'^^xsd:boolean)
-                    val, dtype = obj_val.split("^^")
-                    o = Literal(val.strip("'\""), datatype=URIRef(dtype.replace("xsd:", "http://www.w3.org/2001/XMLSchema#")))
-                else:
-                    o = URIRef(f"{self.ns}{obj_val}")
-                
-                # 중복 체크
-                if (s, p, o) not in self.graph:
-                    self.graph.add((s, p, o))
-                    added_count += 1
-                    
-            except Exception as e:
-                logger.warning(f"Failed to add triple: {triple}, error: {e}")
+            rdf_triple = self._to_rdf_triple(triple)
+            
+            # 중복 체크
+            if rdf_triple is not None and rdf_triple not in self.graph:
+                self.graph.add(rdf_triple)
+                added_count += 1
         
         return added_count
     
+    def _to_rdf_triple(self, triple: Dict) -> Optional[Tuple]:
+        """추론 트리플 딕셔너리를 RDF 트리플로 변환"""
+        try:
+            s = URIRef(triple["subject"]) if triple["subject"].startswith("http") else URIRef(f"{self.ns}{triple['subject']}")
+            p = URIRef(triple["predicate"]) if triple["predicate"].startswith("http") else URIRef(f"{self.ns}{triple['predicate']}")
+            
+            # 객체 유형 판단 (URI vs Literal)
+            obj_val = triple["object"]
+            if obj_val.startswith("http"):
+                o = URIRef(obj_val)
+            elif "^^" in obj_val:
+                # 타입이 지정된 리터럴 (예: 'true'^^xsd:boolean)
+                val, dtype = obj_val.split("^^")
+                o = Literal(val.strip("'\""), datatype=URIRef(dtype.replace("xsd:", "http://www.w3.org/2001/XMLSchema#")))
+            else:
+                o = URIRef(f"{self.ns}{obj_val}")
+            
+            return (s, p, o)
+            
+        except Exception as e:
+            logger.warning(f"Failed to add triple: {triple}, error: {e}")
+            return None
+    
+    def _from_rdf_triple(self, triple: Tuple) -> Dict[str, str]:
+        """RDF 트리플을 추론 트리플 딕셔너리로 변환 (_to_rdf_triple의 역변환)"""
+        s, p, o = triple
+        if isinstance(o, Literal) and o.datatype is not None:
+            obj = f"'{o}'^^{o.datatype}"
+        else:
+            obj = str(o)
+        return {"subject": str(s), "predicate": str(p), "object": obj}
+    
     def get_rule_explanation(self, rule_id: str) -> Optional[Dict]:
         """규칙 설명 조회"""
         for rule in self.rules:
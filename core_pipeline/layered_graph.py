@@ -0,0 +1,73 @@
+# core_pipeline/layered_graph.py
+# -*- coding: utf-8 -*-
+"""
+Layered Graph
+읽기 전용 기본 그래프 + 쓰기 가능한 추론 오버레이 그래프의 통합 뷰
+
+기본 그래프를 복사하지 않고 추론 결과만 오버레이에 쌓습니다.
+- 조회(triples, __contains__, SPARQL query)는 두 레이어를 합쳐서 수행
+- 추가(add)는 기본 그래프에 없는 트리플만 오버레이에 기록 (중복 없음 → len 정확)
+- 삭제(remove)는 오버레이에만 적용 (기본 그래프는 변경하지 않음)
+"""
+from typing import Iterable, Optional
+
+from rdflib import Graph
+from rdflib.graph import ReadOnlyGraphAggregate
+
+
+class LayeredGraph(ReadOnlyGraphAggregate):
+    """
+    기본 그래프 위에 추론 오버레이를 얹은 그래프 뷰
+
+    ConjunctiveGraph 계열이므로 owlrl 등은 default_context(= 오버레이)에 결과를 기록합니다.
+    """
+
+    def __init__(self, base: Graph, overlay: Optional[Graph] = None):
+        """
+        Args:
+            base: 읽기 전용으로 취급할 기본 그래프
+            overlay: 추론 결과를 기록할 그래프 (None이면 새로 생성)
+        """
+        self.overlay = overlay if overlay is not None else Graph()
+        super().__init__([base, self.overlay])
+        # rdflib Graph.__init__이 base(기준 URI) 속성을 None으로 초기화하므로 별도 이름 사용
+        self.base_graph = base
+
+        for prefix, namespace in base.namespaces():
+            self.overlay.bind(prefix, namespace, override=False)
+        self.namespace_manager = self.overlay.namespace_manager
+        self.default_context = self.overlay
+
+    def __repr__(self) -> str:
+        return f"<LayeredGraph: base={len(self.base_graph)} overlay={len(self.overlay)} triples>"
+
+    def add(self, triple):
+        """기본 그래프에 없는 트리플만 오버레이에 추가"""
+        s, p, o = triple[:3]
+        if (s, p, o) not in self.base_graph:
+            self.overlay.add((s, p, o))
+        return self
+
+    def addN(self, quads: Iterable):  # noqa: N802
+        for s, p, o, _ in quads:
+            self.add((s, p, o))
+        return self
+
+    def remove(self, triple):
+        """오버레이에서만 삭제 (기본 그래프 트리플은 유지)"""
+        self.overlay.remove(triple[:3])
+        return self
+
+    def bind(self, prefix, namespace, override: bool = True, replace: bool = False):
+        self.overlay.bind(prefix, namespace, override=override, replace=replace)
+
+    def materialize(self) -> Graph:
+        """기본 + 오버레이를 단일 Graph로 복사 (독립 그래프가 꼭 필요한 경우에만 사용)"""
+        graph = Graph()
+        for prefix, namespace in self.namespaces():
+            graph.bind(prefix, namespace)
+        for triple in self.base_graph:
+            graph.add(triple)
+        for triple in self.overlay:
+            graph.add(triple)
+        return graph
@@ -3,19 +3,46 @@
 """
 온톨로지 변경 히스토리 관리
 관계 변경 이력 추적 및 롤백 기능
+
+이력은 상태 저장소(SQLite)의 ontology_changes 컬렉션에 기록됩니다.
+- entry_id 키, (source, timestamp)/(target, timestamp) 인덱스로 조회·롤백 시 전체 로그를 읽지 않음
+- 기간 조회는 timestamp 인덱스 범위 검색
+- compact()로 보존 기간/최대 개수를 넘은 오래된 이력 정리
 """
-import json
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import uuid
 
+from core_pipeline.state_store import get_state_store, store_path_for, load_jsonl
+
 class OntologyHistory:
     """온톨로지 변경 히스토리 관리"""
     
-    def __init__(self, history_file: str = "metadata/ontology_history.jsonl"):
+    COLLECTION = "ontology_changes"
+    
+    def __init__(self, history_file: str = "metadata/ontology_history.jsonl",
+                 retention_days: Optional[float] = None, max_entries: Optional[int] = None,
+                 store=None):
+        """
+        Args:
+            history_file: 기존 JSONL 이력 파일 (최초 1회 저장소로 가져옴)
+            retention_days: 보존 기간(일), compact() 시 이보다 오래된 이력 삭제
+            max_entries: 최대 보관 개수, compact() 시 초과분(오래된 순) 삭제
+            store: 사용할 StateStore (기본: 이력 파일과 같은 디렉토리의 저장소)
+        """
         self.history_file = Path(history_file)
-        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+        self.max_entries = max_entries
+        self.store = store or get_state_store(store_path_for(self.history_file))
+        self.store.import_legacy(f"ontology_history:{self.history_file.name}", self.history_file,
+                                 self._import_entries, loader=load_jsonl)
+    
+    def _import_entries(self, entries: List[Dict]):
+        """기존 ontology_history.jsonl 가져오기"""
+        for entry in entries:
+            if entry.get("entry_id"):
+                self.store.put(self.COLLECTION, entry)
     
     def record_change(self, change_type: str, source: str, target: str, 
                      relation: str, old_value: Optional[Dict] = None,
@@ -48,11 +75,14 @@ class OntologyHistory:
             "user": user
         }
         
-        with open(self.history_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.store.put(self.COLLECTION, entry)
         
         return entry_id
     
+    def get_entry(self, entry_id: str) -> Optional[Dict]:
+        """항목 ID로 이력 조회"""
+        return self.store.get(self.COLLECTION, entry_id)
+    
     def get_history(self, source: Optional[str] = None, 
                    target: Optional[str] = None,
                    relation: Optional[str] = None,
@@ -63,47 +93,55 @@ class OntologyHistory:
         히스토리 조회
         
         Args:
-            source: 소스 노드 필터
-            target: 타겟 노드 필터
-            relation: 관계명 필터
-            date_from: 시작 날짜 (ISO 형식)
-            date_to: 종료 날짜 (ISO 형식)
+            source: 소스 노드 필터 (일치)
+            target: 타겟 노드 필터 (일치)
+            relation: 관계명 필터 (일치)
+            date_from: 시작 날짜 (ISO 형식, 포함)
+            date_to: 종료 날짜 (ISO 형식, 포함)
             limit: 최대 조회 개수
         
         Returns:
-            히스토리 항목 리스트
+            히스토리 항목 리스트 (최신순)
         """
-        entries = []
+        filters = {}
+        if source:
+            filters["source"] = source
+        if target:
+            filters["target"] = target
+        if relation:
+            filters["relation"] = relation
+        between = ("timestamp", date_from, date_to) if (date_from or date_to) else None
         
-        if not self.history_file.exists():
-            return entries
+        return self.store.find(self.COLLECTION, order_by="timestamp", descending=True,
+                               limit=limit, between=between, **filters)
+    
+    def count(self) -> int:
+        """전체 이력 수"""
+        return self.store.count(self.COLLECTION)
+    
+    def compact(self, retention_days: Optional[float] = None, max_entries: Optional[int] = None) -> int:
+        """
+        오래된 이력 정리
         
-        with open(self.history_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    entry = json.loads(line)
-                    
-                    # 필터링
-                    if source and source not in entry.get("source", ""):
-                        continue
-                    if target and target not in entry.get("target", ""):
-                        continue
-                    if relation and relation not in entry.get("relation", ""):
-                        continue
-                    if date_from and entry.get("timestamp", "") < date_from:
-                        continue
-                    if date_to and entry.get("timestamp", "") > date_to:
-                        continue
-                    
-                    entries.append(entry)
-                except json.JSONDecodeError:
-                    continue
+        Args:
+            retention_days: 보존 기간(일) (None이면 생성 시 설정값)
+            max_entries: 최대 보관 개수 (None이면 생성 시 설정값)
         
-        # 최신순 정렬 및 제한
-        entries.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        return entries[:limit]
+        Returns:
+            삭제된 항목 수
+        """
+        retention_days = retention_days if retention_days is not None else self.retention_days
+        max_entries = max_entries if max_entries is not None else self.max_entries
+        if retention_days is None and max_entries is None:
+            return 0
+        
+        before = None
+        if retention_days is not None:
+            before = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        removed = self.store.prune(self.COLLECTION, "timestamp", keep=max_entries, before=before)
+        if removed:
+            print(f"[INFO] 온톨로지 변경 이력 {removed}건 정리")
+        return removed
     
     def rollback(self, entry_id: str, ontology_manager: Any) -> bool:
         """
@@ -116,14 +154,8 @@ class OntologyHistory:
         Returns:
             성공 여부
         """
-        # 히스토리에서 항목 찾기
-        entries = self.get_history(limit=10000)
-        target_entry = None
-        
-        for entry in entries:
-            if entry.get("entry_id") == entry_id:
-                target_entry = entry
-                break
+        # 항목 ID로 바로 조회 (이력 개수와 무관)
+        target_entry = self.get_entry(entry_id)
         
         if not target_entry:
             return False
@@ -0,0 +1,216 @@
+# core_pipeline/ontology_lexicon.py
+# -*- coding: utf-8 -*-
+"""
+Ontology Lexicon
+레이블/별칭 → 엔티티 URI 사전 및 Aho-Corasick 매처
+
+그래프 버전마다 한 번 구축하여, 질의 텍스트를 한 번 선형 스캔하는 것만으로
+언급된 온톨로지 엔티티를 모두 찾습니다.
+- 표면형: rdfs:label, skos:prefLabel/altLabel, 고유명칭, URI 로컬명 및 ID 부분
+- 대소문자 무시, 겹치는 매칭은 가장 왼쪽-가장 긴 매칭 우선
+"""
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    from rdflib import RDF, RDFS, URIRef, Literal
+    from rdflib.namespace import SKOS
+    RDFLIB_AVAILABLE = True
+except ImportError:
+    RDFLIB_AVAILABLE = False
+
+DEFAULT_NAMESPACE = "http://coa-agent-platform.org/ontology#"
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 60
+
+
+class Mention(NamedTuple):
+    """질의 텍스트에서 찾은 엔티티 언급"""
+    start: int
+    end: int
+    surface: str
+    uris: Tuple[str, ...]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).split()).lower()
+
+
+class AhoCorasick:
+    """다중 패턴 문자열 매처 (패턴 수와 무관하게 텍스트 길이에 선형)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]  # 노드에서 끝나는 패턴 길이
+
+        for pattern in patterns:
+            self._insert(pattern)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        if len(pattern) not in self._output[node]:
+            self._output[node].append(len(pattern))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._output[child].extend(
+                    length for length in self._output[self._fail[child]]
+                    if length not in self._output[child]
+                )
+
+    def iter_matches(self, text: str):
+        """(시작, 끝) 위치의 모든 매칭을 생성"""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length in self._output[node]:
+                yield i + 1 - length, i + 1
+
+    @property
+    def size(self) -> int:
+        return len(self._goto)
+
+
+class OntologyLexicon:
+    """레이블/별칭 사전 + 매처 (그래프 1개 버전에 대한 불변 스냅샷)"""
+
+    def __init__(self, graph, namespace: str = DEFAULT_NAMESPACE,
+                 alias_predicates: Optional[Iterable] = None):
+        """
+        Args:
+            graph: RDF 그래프
+            namespace: 온톨로지 네임스페이스 (고유명칭 등 별칭 프리디케이트 해석용)
+            alias_predicates: 별칭으로 사용할 추가 프리디케이트 (기본: 고유명칭)
+        """
+        self.namespace = namespace
+        self.term_to_uris: Dict[str, Set[str]] = {}
+        self.uri_labels: Dict[str, List[str]] = {}
+
+        if RDFLIB_AVAILABLE and graph is not None:
+            self._load(graph, alias_predicates)
+        self.matcher = AhoCorasick(self.term_to_uris.keys())
+
+    def _add_term(self, term: str, uri: str):
+        term = _normalize(term)
+        if MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH:
+            self.term_to_uris.setdefault(term, set()).add(uri)
+
+    def _load(self, graph, alias_predicates):
+        label_predicates = [RDFS.label, SKOS.prefLabel, SKOS.altLabel]
+        if alias_predicates is None:
+            alias_predicates = [URIRef(f"{self.namespace}고유명칭")]
+
+        # 1. 레이블/별칭 (질의 확장용 표시 용어로도 사용)
+        for pred in list(label_predicates) + list(alias_predicates):
+            for s, o in graph.subject_objects(pred):
+                if not isinstance(s, URIRef) or not isinstance(o, Literal):
+                    continue
+                uri, label = str(s), str(o).strip()
+                if not label:
+                    continue
+                self._add_term(label, uri)
+                labels = self.uri_labels.setdefault(uri, [])
+                if label not in labels:
+                    labels.append(label)
+
+        # 2. 네임스페이스 인스턴스 로컬명과 ID 부분 (예: 전장축선_AXIS02 → AXIS02)
+        class_names = {str(c).split('#')[-1] for c in graph.objects(None, RDF.type) if isinstance(c, URIRef)}
+        for s in set(graph.subjects(RDF.type, None)):
+            uri = str(s)
+            if not isinstance(s, URIRef) or not uri.startswith(self.namespace):
+                continue
+            local = uri[len(self.namespace):]
+            self._add_term(local, uri)
+            for class_name in class_names:
+                if local.startswith(f"{class_name}_"):
+                    self._add_term(local[len(class_name) + 1:], uri)
+
+    def find_mentions(self, text: str) -> List[Mention]:
+        """
+        텍스트에서 언급된 엔티티 찾기 (한 번의 선형 스캔)
+
+        Returns:
+            겹치지 않는 언급 리스트 (가장 왼쪽-가장 긴 매칭 우선, 등장 순)
+        """
+        if not text or not self.term_to_uris:
+            return []
+        normalized = _normalize(text)
+        candidates = sorted(self.matcher.iter_matches(normalized), key=lambda m: (m[0], -(m[1] - m[0])))
+
+        mentions = []
+        cursor = 0
+        for start, end in candidates:
+            if start < cursor:
+                continue
+            surface = normalized[start:end]
+            mentions.append(Mention(start, end, surface, tuple(sorted(self.term_to_uris[surface]))))
+            cursor = end
+        return mentions
+
+    def mentioned_uris(self, text: str) -> List[str]:
+        """텍스트에서 언급된 엔티티 URI (등장 순, 중복 제거)"""
+        uris = []
+        for mention in self.find_mentions(text):
+            uris.extend(mention.uris)
+        return list(dict.fromkeys(uris))
+
+    def labels_of(self, uri: str) -> List[str]:
+        """엔티티의 레이블/별칭 목록"""
+        return self.uri_labels.get(uri, [])
+
+    def get_stats(self) -> Dict:
+        return {
+            "terms": len(self.term_to_uris),
+            "entities": len(self.uri_labels),
+            "automaton_nodes": self.matcher.size
+        }
+
+
+class LexiconCache:
+    """그래프 버전별 OntologyLexicon 캐시 (버전이 바뀔 때만 재구축)"""
+
+    def __init__(self, ontology_manager, namespace: str = DEFAULT_NAMESPACE):
+        self.ontology_manager = ontology_manager
+        self.namespace = namespace
+        self._lexicon: Optional[OntologyLexicon] = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def _current_signature(self, graph):
+        if hasattr(self.ontology_manager, 'get_graph_version'):
+            return (id(graph), self.ontology_manager.get_graph_version())
+        return (id(graph), len(graph))
+
+    def get(self) -> Optional[OntologyLexicon]:
+        """현재 그래프의 사전 (그래프가 없으면 None)"""
+        graph = getattr(self.ontology_manager, 'graph', None)
+        if graph is None or not RDFLIB_AVAILABLE:
+            return None
+        with self._lock:
+            signature = self._current_signature(graph)
+            if self._lexicon is None or signature != self._signature:
+                self._lexicon = OntologyLexicon(graph, self.namespace)
+                self._signature = signature
+            return self._lexicon
@@ -10,8 +10,9 @@ import json
 import re
 import hashlib
 import shutil
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Union, Any
+from typing import Dict, List, Optional, Set, Tuple, Union, Any
 import pandas as pd
 from pathlib import Path
 
@@ -231,6 +232,16 @@ class EnhancedOntologyManager:
         '방어': ['defensive', '방어']
     }
     
+    # 노드 그룹 결정 시 엔티티 타입 우선순위 (가장 구체적이고 사용자에게 친숙한 타입 우선)
+    NODE_TYPE_PRIORITY = [
+        "DefenseCOA", "OffensiveCOA", "CounterAttackCOA", "PreemptiveCOA",
+        "DeterrenceCOA", "ManeuverCOA", "InformationOpsCOA",
+        "COA", "COA_Library",
+        "아군부대현황", "적군부대현황", "아군가용자산", "위협상황", "임무정보", 
+        "전장축선", "지형셀", "기상상황", "제약조건", "민간인지역", "시나리오모음",
+        "위협유형_마스터", "임무별_자원할당"
+    ]
+    
     def __init__(self, config: Dict):
         """
         Args:
@@ -275,6 +286,16 @@ class EnhancedOntologyManager:
         # 추론 실행 여부 플래그 (중복 추론 방지)
         self._inference_performed = False
         
+        # [NEW] 그래프 버전 및 변경 이력 (증분/델타 그래프 API용)
+        # 추적되지 않은 변경(그래프 교체, 직접 add 등)은 전체 재구성으로 간주
+        self._graph_version = 0
+        self._graph_signature = None
+        self._graph_change_log = deque(maxlen=config.get("graph_change_log_size", 5000))
+        self._graph_change_log_floor = 0  # 변경 이력으로 델타를 만들 수 있는 최소 버전
+        
+        # [NEW] 전술 규칙 증분 추론기 (최초 사용 시 생성)
+        self._incremental_inference = None
+        
         # 스키마 레지스트리 로드
         self.schema_registry = self._load_schema_registry()
         
@@ -285,9 +306,10 @@ class EnhancedOntologyManager:
         self._relation_mappings = None
         self._relation_mappings_cache_time = {}  # 파일별 수정 시간 캐시
         
-        # [NEW] JSON 직렬화 캐시
-        self._json_cache = None
-        self._last_graph_hash = None
+        # [NEW] JSON 직렬화 캐시 {(id(graph), len(graph), version): json}
+        self._json_cache = {}
+        # [NEW] 서브그래프 조회용 인접 리스트 캐시 (id(json), mode) -> {node: set(neighbors)}
+        self._adjacency_cache = {}
 
     def _load_schema_registry(self) -> Dict:
         """Schema Registry 로드 (YAML)"""
@@ -2380,7 +2402,8 @@ class EnhancedOntologyManager:
             run_owl_reasoner: OWL-RL 추론기 실행 여부
         
         Returns:
-            추론 결과가 추가된 Graph 객체 (instances_reasoned.ttl로 저장될 그래프)
+            기본 그래프 + 추론 오버레이 통합 뷰(LayeredGraph) (instances_reasoned.ttl로 저장될 그래프)
+            기본 그래프(self.graph)는 복사하거나 변경하지 않습니다.
         """
         if not RDFLIB_AVAILABLE or self.graph is None:
             safe_print("[WARN] RDFLib not available or graph is None. Cannot generate reasoned graph.")
@@ -2390,16 +2413,9 @@ class EnhancedOntologyManager:
         start_total = time.time()
         
         try:
-            # 기존 그래프 복사 (추론 결과를 추가하기 위해)
-            reasoned_graph = Graph()
-            
-            # 네임스페이스 바인딩 복사
-            for prefix, namespace in self.graph.namespaces():
-                reasoned_graph.bind(prefix, namespace)
-            
-            # 기존 그래프의 모든 트리플 복사
-            for s, p, o in self.graph:
-                reasoned_graph.add((s, p, o))
+            # 기존 그래프를 복사하지 않고 추론 결과만 오버레이에 기록 (조회는 통합 뷰로 수행)
+            from core_pipeline.layered_graph import LayeredGraph
+            reasoned_graph = LayeredGraph(self.graph)
             
             safe_print("[INFO] 추론 그래프 생성 시작...")
             
@@ -2444,19 +2460,20 @@ class EnhancedOntologyManager:
                     
                     inferred_count = 0
                     start_semantic = time.time()
-                    for idx, (coa_subj, _, _) in enumerate(coa_instances[:process_count]):
-                        if idx > 0 and idx % 5 == 0:
-                            safe_print(f"  - 진행률: {idx}/{process_count}...")
-                        # [FIX] Subject URI에 공백이 있는 경우 처리
+                    # [FIX] Subject URI에 공백이 있는 경우 처리
+                    targets = []
+                    for coa_subj, _, _ in coa_instances[:process_count]:
                         coa_str = str(coa_subj)
                         if " " in coa_str:
                             coa_subj = URIRef(coa_str.replace(" ", "_"))
-                        
-                        coa_uri = str(coa_subj)
-                        coa_local = _localname(coa_subj)
-                        
-                        # 의미 기반 관계 추론
-                        relations = semantic_inference.infer_relations(self.graph, coa_local, max_depth=2)
+                        targets.append((coa_subj, _localname(coa_subj)))
+                    
+                    # 의미 기반 관계 추론 (전체 COA 일괄 처리, 공통 이웃 노드 인덱스 공유)
+                    batch_relations = semantic_inference.infer_relations_batch(
+                        self.graph, [coa_local for _, coa_local in targets], max_depth=2)
+                    
+                    for coa_subj, coa_local in targets:
+                        relations = batch_relations[coa_local]
                         
                         # 추론된 관계를 그래프에 추가
                         for rel in relations.get('direct', []) + relations.get('indirect', []):
@@ -2522,7 +2539,20 @@ class EnhancedOntologyManager:
             
             # 🔥 NEW: SPARQL 기반 전술적 유불리 추론 (hasAdvantage, hasDisadvantage)
             tactical_rules_path = Path(self.ontology_path) / "tactical_rules.sparql"
+            # 증분 추론기가 유지하는 결론이 있으면 재평가 없이 오버레이에 반영
+            materialized = None
             if run_tactical_rules and tactical_rules_path.exists():
+                materialized = self.get_materialized_inferences(rule_prefix=f"{tactical_rules_path.stem}#")
+            if materialized is not None:
+                start_tactical = time.time()
+                tactical_inferred_count = 0
+                for conclusions in materialized.values():
+                    for triple in conclusions:
+                        if triple not in reasoned_graph:
+                            reasoned_graph.add(triple)
+                            tactical_inferred_count += 1
+                safe_print(f"[INFO] 전술 추론 완료(증분 추론 결과 재사용): {tactical_inferred_count}개 유불리 관계 추가 (시간: {time.time() - start_tactical:.2f}초)")
+            elif run_tactical_rules and tactical_rules_path.exists():
                 start_tactical = time.time()
                 try:
                     safe_print(f"[INFO] 전술 추론 규칙 실행 중: {tactical_rules_path}")
@@ -2581,7 +2611,8 @@ class EnhancedOntologyManager:
                         safe_print(f"[INFO] OWL-RL 추론기 가동 중 (대상: {graph_size} triples, RDFS: {include_rdfs})...")
                         namespace = str(self.ns) if self.ns else None
                         reasoner = OWLReasoner(reasoned_graph, namespace)
-                        inferred_graph = reasoner.run_inference(include_rdfs=include_rdfs)
+                        # 통합 뷰를 직접 확장 → 새 트리플은 오버레이에만 기록됨
+                        inferred_graph = reasoner.run_inference(include_rdfs=include_rdfs, in_place=True)
                         
                         if inferred_graph is not None:
                             stats = reasoner.get_stats()
@@ -2589,8 +2620,6 @@ class EnhancedOntologyManager:
                                 owl_new_count = stats.get("new_inferences", 0)
                                 if owl_new_count > 0:
                                     safe_print(f"[INFO] OWL-RL 추론 완료: {owl_new_count}개 새로운 트리플 생성 (시간: {time.time() - start_owl:.2f}초)")
-                                    # OWL-RL 추론 결과를 reasoned_graph에 반영
-                                    reasoned_graph = inferred_graph
                                 else:
                                     safe_print(f"[INFO] OWL-RL 추론 완료: 새로운 트리플 없음 (시간: {time.time() - start_owl:.2f}초)")
                             else:
@@ -2602,12 +2631,9 @@ class EnhancedOntologyManager:
                     import traceback
                     traceback.print_exc()
             
-            # 추론된 그래프의 트리플 수 확인 (정확한 측정)
-            reasoned_triples_set = set(reasoned_graph)
-            reasoned_triples = len(reasoned_triples_set)
-            original_triples_set = set(self.graph)
-            original_triples = len(original_triples_set)
-            new_triples = reasoned_triples - original_triples
+            # 추론된 그래프의 트리플 수 확인 (오버레이는 기본 그래프와 중복되지 않으므로 len이 정확)
+            original_triples = len(self.graph)
+            reasoned_triples = len(reasoned_graph)
             
             safe_print(f"[INFO] 전체 추론 프로세스 완료: 원본 {original_triples}개 -> 최종 {reasoned_triples}개 (총 소요시간: {time.time() - start_total:.2f}초)")
             
@@ -2899,14 +2925,19 @@ class EnhancedOntologyManager:
             rows.append(row_dict)
         return rows
     
-    def to_json(self) -> Dict:
+    def to_json(self, graph: Optional["Graph"] = None) -> Dict:
         """
         그래프를 JSON 형식으로 변환 (기존 graph_loader.py의 반환 형식)
         
+        Args:
+            graph: 변환할 그래프 (None이면 self.graph). 추론 그래프 등 별도 그래프를
+                   self.graph 교체 없이 변환할 때 사용
+        
         Returns:
             {"instances": {"nodes": [...], "links": [...]}, "schema": {"nodes": [...], "links": [...]}}
         """
-        if not RDFLIB_AVAILABLE or self.graph is None:
+        g = graph if graph is not None else self.graph
+        if not RDFLIB_AVAILABLE or g is None:
             return {
                 "instances": {"nodes": [], "links": []}, 
                 "schema": {"nodes": [], "links": []},
@@ -2918,14 +2949,17 @@ class EnhancedOntologyManager:
         # safe_print(f"[DEBUG] to_json 시작")
         
         # [OPTIMIZATION] 캐시 확인
-        # 그래프 변경 감지를 위해 id와 사이즈 체크
-        current_graph_hash = (id(self.graph), len(self.graph))
-        if self._json_cache and self._last_graph_hash == current_graph_hash:
+        # 그래프 변경 감지를 위해 id, 사이즈, 그래프 버전 체크
+        # (버전은 크기가 같은 관계 수정도 감지하기 위함)
+        graph_version = self.get_graph_version() if g is self.graph else None
+        current_graph_hash = (id(g), len(g), graph_version)
+        cached = self._json_cache.get(current_graph_hash)
+        if cached is not None:
             # safe_print("[DEBUG] Using cached JSON data")
-            return self._json_cache
+            return cached
             
         # 변수 초기화 (Stats 생성용)
-        total_triples = len(self.graph)
+        total_triples = len(g)
         owl_class_count = 0
         owl_property_count = 0
         subClassOf_count = 0
@@ -2941,18 +2975,11 @@ class EnhancedOntologyManager:
         virtual_status = {}   # {uri: bool}
         
         # 엔티티 타입 우선순위 (가장 구체적이고 사용자에게 친숙한 타입 우선)
-        type_priority = [
-            "DefenseCOA", "OffensiveCOA", "CounterAttackCOA", "PreemptiveCOA",
-            "DeterrenceCOA", "ManeuverCOA", "InformationOpsCOA",
-            "COA", "COA_Library",
-            "아군부대현황", "적군부대현황", "아군가용자산", "위협상황", "임무정보", 
-            "전장축선", "지형셀", "기상상황", "제약조건", "민간인지역", "시나리오모음",
-            "위협유형_마스터", "임무별_자원할당"
-        ]
+        type_priority = self.NODE_TYPE_PRIORITY
         priority_set = set(type_priority)
         
         # 1. 타입 정보 수집 및 그룹 결정
-        for s, _, o in self.graph.triples((None, RDF.type, None)):
+        for s, _, o in g.triples((None, RDF.type, None)):
             if isinstance(s, BNode): continue
             
             local_type = _localname(o)
@@ -2981,13 +3008,13 @@ class EnhancedOntologyManager:
                     node_groups[s] = local_type
             
         # 2. 라벨 정보 수집
-        for s, _, o in self.graph.triples((None, RDFS.label, None)):
+        for s, _, o in g.triples((None, RDFS.label, None)):
             if isinstance(s, BNode): continue
             node_labels[s] = str(o)
             
         # 3. 가상 엔티티 정보 수집
         is_virtual_uri = URIRef(self.ns["isVirtualEntity"])
-        for s, _, o in self.graph.triples((None, is_virtual_uri, None)):
+        for s, _, o in g.triples((None, is_virtual_uri, None)):
             virtual_status[s] = str(o).lower() in ['true', '1']
 
         inst_nodes = {}
@@ -3037,7 +3064,7 @@ class EnhancedOntologyManager:
         # [NEW] 타겟 노드가 노드 리스트에 없는 경우 자동 추가 (고립 방지)
         missing_targets = set()
         
-        for u, p, a in self.graph.triples((None, None, None)):
+        for u, p, a in g.triples((None, None, None)):
             if str(p) in excluded_predicates:
                 continue
             if not isinstance(a, URIRef) and not isinstance(a, BNode): # 리터럴 제외
@@ -3077,13 +3104,13 @@ class EnhancedOntologyManager:
              if local not in inst_nodes:
                 # 라벨 가져오기 시도
                 label = local
-                for _, _, lbl in self.graph.triples((missing_uri, RDFS.label, None)):
+                for _, _, lbl in g.triples((missing_uri, RDFS.label, None)):
                     label = f"{local} ({str(lbl)})"
                     break
                 
                 # 타입 추론 (간단히 첫번째 타입 사용)
                 type_name = "기타"
-                for _, _, t in self.graph.triples((missing_uri, RDF.type, None)):
+                for _, _, t in g.triples((missing_uri, RDF.type, None)):
                     t_local = _localname(t)
                     if t_local not in ["NamedIndividual", "Thing"]:
                         type_name = t_local
@@ -3109,36 +3136,36 @@ class EnhancedOntologyManager:
         schema_property_count = 0
         
         # Table/Column 노드 (레거시)
-        for s, _, _ in self.graph.triples((None, RDF.type, self.ns.Table)):
-            sch_nodes[_localname(s)] = {"id": _localname(s), "label": _get_label(self.graph, self.ns, s), "group": "Table"}
-        for s, _, _ in self.graph.triples((None, RDF.type, self.ns.Column)):
-            sch_nodes[_localname(s)] = {"id": _localname(s), "label": _get_label(self.graph, self.ns, s), "group": "Column"}
+        for s, _, _ in g.triples((None, RDF.type, self.ns.Table)):
+            sch_nodes[_localname(s)] = {"id": _localname(s), "label": _get_label(g, self.ns, s), "group": "Table"}
+        for s, _, _ in g.triples((None, RDF.type, self.ns.Column)):
+            sch_nodes[_localname(s)] = {"id": _localname(s), "label": _get_label(g, self.ns, s), "group": "Column"}
         
         # OWL.Class 노드 추출 (ns와 ns_legacy 모두 확인)
-        for s, _, _ in self.graph.triples((None, RDF.type, OWL.Class)):
+        for s, _, _ in g.triples((None, RDF.type, OWL.Class)):
             s_str = str(s)
             if s_str.startswith(str(self.ns)) or s_str.startswith(str(self.ns_legacy)):
                 node_id = _localname(s)
                 if node_id not in sch_nodes:
-                    sch_nodes[node_id] = {"id": node_id, "label": _get_label(self.graph, self.ns, s), "group": "Class"}
+                    sch_nodes[node_id] = {"id": node_id, "label": _get_label(g, self.ns, s), "group": "Class"}
                     schema_class_count += 1
         
         # ObjectProperty 노드 추가
-        for s, _, _ in self.graph.triples((None, RDF.type, OWL.ObjectProperty)):
+        for s, _, _ in g.triples((None, RDF.type, OWL.ObjectProperty)):
             s_str = str(s)
             if s_str.startswith(str(self.ns)) or s_str.startswith(str(self.ns_legacy)):
                 node_id = _localname(s)
                 if node_id not in sch_nodes:
-                    sch_nodes[node_id] = {"id": node_id, "label": _get_label(self.graph, self.ns, s), "group": "Property"}
+                    sch_nodes[node_id] = {"id": node_id, "label": _get_label(g, self.ns, s), "group": "Property"}
                     schema_property_count += 1
         
         # DatatypeProperty 노드 추가
-        for s, _, _ in self.graph.triples((None, RDF.type, OWL.DatatypeProperty)):
+        for s, _, _ in g.triples((None, RDF.type, OWL.DatatypeProperty)):
             s_str = str(s)
             if s_str.startswith(str(self.ns)) or s_str.startswith(str(self.ns_legacy)):
                 node_id = _localname(s)
                 if node_id not in sch_nodes:
-                    sch_nodes[node_id] = {"id": node_id, "label": _get_label(self.graph, self.ns, s), "group": "Property"}
+                    sch_nodes[node_id] = {"id": node_id, "label": _get_label(g, self.ns, s), "group": "Property"}
                     schema_property_count += 1
         
         # 🔥 로그 최적화: 불필요한 DEBUG 로그 제거
@@ -3148,18 +3175,18 @@ class EnhancedOntologyManager:
         sch_links = []
         
         # hasColumn 관계 (기존)
-        for t, _, c in self.graph.triples((None, self.ns.hasColumn, None)):
+        for t, _, c in g.triples((None, self.ns.hasColumn, None)):
             t_local = _localname(t)
             c_local = _localname(c)
             if t_local not in sch_nodes:
-                sch_nodes[t_local] = {"id": t_local, "label": _get_label(self.graph, self.ns, t), "group": "Table"}
+                sch_nodes[t_local] = {"id": t_local, "label": _get_label(g, self.ns, t), "group": "Table"}
             if c_local not in sch_nodes:
-                sch_nodes[c_local] = {"id": c_local, "label": _get_label(self.graph, self.ns, c), "group": "Column"}
+                sch_nodes[c_local] = {"id": c_local, "label": _get_label(g, self.ns, c), "group": "Column"}
             sch_links.append({"source": t_local, "target": c_local, "relation": "컬럼"})
         
         # subClassOf 관계
         subClassOf_count = 0
-        for s, _, o in self.graph.triples((None, RDFS.subClassOf, None)):
+        for s, _, o in g.triples((None, RDFS.subClassOf, None)):
             s_local = _localname(s)
             o_local = _localname(o)
             s_str = str(s)
@@ -3170,15 +3197,15 @@ class EnhancedOntologyManager:
                 continue
             
             if s_local not in sch_nodes:
-                sch_nodes[s_local] = {"id": s_local, "label": _get_label(self.graph, self.ns, s), "group": "Class"}
+                sch_nodes[s_local] = {"id": s_local, "label": _get_label(g, self.ns, s), "group": "Class"}
             if o_local not in sch_nodes:
-                sch_nodes[o_local] = {"id": o_local, "label": _get_label(self.graph, self.ns, o), "group": "Class"}
+                sch_nodes[o_local] = {"id": o_local, "label": _get_label(g, self.ns, o), "group": "Class"}
             sch_links.append({"source": s_local, "target": o_local, "relation": "subClassOf"})
             subClassOf_count += 1
         
         # domain 관계 (Property -> Class)
         domain_count = 0
-        for prop, _, cls in self.graph.triples((None, RDFS.domain, None)):
+        for prop, _, cls in g.triples((None, RDFS.domain, None)):
             prop_local = _localname(prop)
             cls_local = _localname(cls)
             prop_str = str(prop)
@@ -3189,15 +3216,15 @@ class EnhancedOntologyManager:
                 continue
             
             if prop_local not in sch_nodes:
-                sch_nodes[prop_local] = {"id": prop_local, "label": _get_label(self.graph, self.ns, prop), "group": "Property"}
+                sch_nodes[prop_local] = {"id": prop_local, "label": _get_label(g, self.ns, prop), "group": "Property"}
             if cls_local not in sch_nodes:
-                sch_nodes[cls_local] = {"id": cls_local, "label": _get_label(self.graph, self.ns, cls), "group": "Class"}
+                sch_nodes[cls_local] = {"id": cls_local, "label": _get_label(g, self.ns, cls), "group": "Class"}
             sch_links.append({"source": prop_local, "target": cls_local, "relation": "domain"})
             domain_count += 1
         
         # range 관계 (Property -> Class)
         range_count = 0
-        for prop, _, cls in self.graph.triples((None, RDFS.range, None)):
+        for prop, _, cls in g.triples((None, RDFS.range, None)):
             prop_local = _localname(prop)
             cls_local = _localname(cls)
             prop_str = str(prop)
@@ -3208,9 +3235,9 @@ class EnhancedOntologyManager:
                 continue
             
             if prop_local not in sch_nodes:
-                sch_nodes[prop_local] = {"id": prop_local, "label": _get_label(self.graph, self.ns, prop), "group": "Property"}
+                sch_nodes[prop_local] = {"id": prop_local, "label": _get_label(g, self.ns, prop), "group": "Property"}
             if cls_local not in sch_nodes:
-                sch_nodes[cls_local] = {"id": cls_local, "label": _get_label(self.graph, self.ns, cls), "group": "Class"}
+                sch_nodes[cls_local] = {"id": cls_local, "label": _get_label(g, self.ns, cls), "group": "Class"}
             sch_links.append({"source": prop_local, "target": cls_local, "relation": "range"})
             range_count += 1
         
@@ -3222,12 +3249,12 @@ class EnhancedOntologyManager:
         
         # 상세 통계 계산
         # rdf:type triples (인스턴스 타입 선언)
-        instance_type_triples = len(list(self.graph.triples((None, RDF.type, None))))
+        instance_type_triples = len(list(g.triples((None, RDF.type, None))))
         # rdfs:label triples
-        label_triples = len(list(self.graph.triples((None, RDFS.label, None))))
+        label_triples = len(list(g.triples((None, RDFS.label, None))))
         # Literal 값이 있는 triples (엣지로 변환되지 않음)
         literal_triples = 0
-        for s, p, o in self.graph.triples((None, None, None)):
+        for s, p, o in g.triples((None, None, None)):
             if isinstance(o, Literal):
                 literal_triples += 1
         
@@ -3291,12 +3318,386 @@ class EnhancedOntologyManager:
             "stats": stats
         }
         
-        # [OPTIMIZATION] 캐시 저장
-        self._json_cache = result
-        self._last_graph_hash = current_graph_hash
+        # [OPTIMIZATION] 캐시 저장 (기본 그래프 + 추론 그래프 정도만 유지)
+        if len(self._json_cache) >= 2:
+            self._json_cache.pop(next(iter(self._json_cache)))
+        self._json_cache[current_graph_hash] = result
         
         return result
 
+    # ------------------------------------------------------------------
+    # 그래프 버전 관리 및 증분(델타)/부분 그래프 조회
+    # ------------------------------------------------------------------
+    def get_graph_version(self) -> int:
+        """
+        현재 그래프 버전 반환
+        
+        record_graph_change()를 거치지 않은 변경(그래프 교체, graph.add 직접 호출 등)이
+        감지되면 버전을 올리고 변경 이력을 비웁니다 (이전 버전 클라이언트는 전체 재조회).
+        """
+        if not RDFLIB_AVAILABLE or self.graph is None:
+            return self._graph_version
+        
+        signature = (id(self.graph), len(self.graph))
+        if signature != self._graph_signature:
+            self._graph_version += 1
+            self._graph_change_log.clear()
+            self._graph_change_log_floor = self._graph_version
+            self._graph_signature = signature
+        return self._graph_version
+    
+    def record_graph_change(self, added: Optional[List[Tuple]] = None,
+                            removed: Optional[List[Tuple]] = None) -> int:
+        """
+        그래프에 실제로 반영된 트리플 변경을 기록하고 새 버전을 반환
+        
+        Args:
+            added: 추가된 트리플 목록 (graph.add 이후 호출)
+            removed: 삭제된 트리플 목록 (graph.remove 이후 호출)
+        
+        Returns:
+            변경 후 그래프 버전
+        """
+        added = list(added or [])
+        removed = list(removed or [])
+        if not RDFLIB_AVAILABLE or self.graph is None:
+            return self._graph_version
+        
+        # 이번 변경 이전의 시그니처가 마지막 기록과 다르면 그 사이에 추적되지 않은 변경이 있었던 것
+        expected_before = (id(self.graph), len(self.graph) - len(added) + len(removed))
+        if expected_before != self._graph_signature:
+            self._graph_version += 1
+            self._graph_change_log.clear()
+            self._graph_change_log_floor = self._graph_version
+        
+        self._graph_version += 1
+        self._graph_change_log.append({
+            "version": self._graph_version,
+            "added": added,
+            "removed": removed
+        })
+        self._graph_signature = (id(self.graph), len(self.graph))
+        
+        # 변경 이력이 maxlen을 넘어 잘려나간 경우 델타 가능 최소 버전 갱신
+        oldest = self._graph_change_log[0]["version"]
+        if oldest - 1 > self._graph_change_log_floor:
+            self._graph_change_log_floor = oldest - 1
+        
+        return self._graph_version
+    
+    def _build_node_entry(self, uri) -> Dict[str, Any]:
+        """to_json()과 동일한 규칙으로 단일 인스턴스 노드 JSON 생성"""
+        local_name = _localname(uri)
+        
+        group = None
+        best_idx = len(self.NODE_TYPE_PRIORITY)
+        for t in self.graph.objects(uri, RDF.type):
+            t_local = _localname(t)
+            if t_local in self.NODE_TYPE_PRIORITY:
+                idx = self.NODE_TYPE_PRIORITY.index(t_local)
+                if idx < best_idx:
+                    best_idx = idx
+                    group = t_local
+            elif group is None and t_local not in ["NamedIndividual", "Thing", "Resource"]:
+                group = t_local
+        
+        rdfs_label = self.graph.value(uri, RDFS.label)
+        if rdfs_label is not None and str(rdfs_label) != local_name:
+            display_label = f"{local_name} ({rdfs_label})"
+        else:
+            display_label = local_name
+        
+        is_virtual = str(self.graph.value(uri, self.ns["isVirtualEntity"])).lower() in ['true', '1']
+        
+        return {
+            "id": local_name,
+            "label": display_label,
+            "group": group or "기타",
+            "is_virtual": is_virtual
+        }
+    
+    def get_graph_delta(self, since_version: int) -> Dict[str, Any]:
+        """
+        클라이언트가 가진 그래프 버전 이후의 인스턴스 그래프 변경분 반환
+        
+        Args:
+            since_version: 클라이언트가 마지막으로 받은 그래프 버전
+        
+        Returns:
+            {"version", "full_reload", "upserted_nodes", "removed_nodes", "added_links", "removed_links"}
+            full_reload가 True이면 변경 이력이 없으므로 전체 그래프를 다시 받아야 함
+        """
+        current = self.get_graph_version()
+        delta = {
+            "version": current,
+            "full_reload": False,
+            "upserted_nodes": [],
+            "removed_nodes": [],
+            "added_links": [],
+            "removed_links": []
+        }
+        if since_version >= current or not RDFLIB_AVAILABLE or self.graph is None:
+            return delta
+        net_changes = self.get_triple_changes(since_version)
+        if net_changes is None:
+            delta["full_reload"] = True
+            return delta
+        
+        excluded_predicates = {RDF.type, RDFS.label}
+        touched_nodes = set()
+        for (s, p, o), is_added in net_changes.items():
+            if isinstance(s, BNode):
+                continue
+            touched_nodes.add(s)
+            if not isinstance(o, URIRef):
+                # 리터럴 변경은 링크가 아니지만 라벨/타입 등 노드 표시 정보에 영향
+                continue
+            if p in excluded_predicates:
+                continue
+            touched_nodes.add(o)
+            link = {"source": _localname(s), "target": _localname(o), "relation": _localname(p)}
+            if is_added:
+                delta["added_links"].append(link)
+            else:
+                delta["removed_links"].append(link)
+        
+        for node in touched_nodes:
+            if (node, None, None) in self.graph or (None, None, node) in self.graph:
+                delta["upserted_nodes"].append(self._build_node_entry(node))
+            else:
+                delta["removed_nodes"].append(_localname(node))
+        
+        return delta
+    
+    def get_triple_changes(self, since_version: int) -> Optional[Dict[Tuple, bool]]:
+        """
+        since_version 이후 트리플별 최종 변경 상태 (True: 추가됨, False: 삭제됨)
+        
+        Returns:
+            {트리플: 추가 여부}. 변경 이력이 없어 알 수 없으면 None (전체 재구성 필요)
+        """
+        entries = self.get_graph_change_entries(since_version)
+        if entries is None:
+            return None
+        
+        # 트리플별 최종 상태로 병합 (추가 후 삭제된 트리플은 상쇄)
+        net_changes = {}
+        for entry in entries:
+            for triple in entry["removed"]:
+                net_changes[triple] = False
+            for triple in entry["added"]:
+                net_changes[triple] = True
+        return net_changes
+    
+    def get_graph_change_entries(self, since_version: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        since_version 이후 변경 이력 (적용 순서대로, 병합하지 않음)
+        
+        추가 후 삭제 등 중간 상태까지 반영해야 하는 카운터 갱신용입니다.
+        
+        Returns:
+            [{"version", "added", "removed"}] 리스트. 변경 이력이 없어 알 수 없으면 None
+        """
+        current = self.get_graph_version()
+        if since_version >= current:
+            return []
+        if since_version < self._graph_change_log_floor:
+            return None
+        return [entry for entry in self._graph_change_log if entry["version"] > since_version]
+    
+    def get_incremental_inference(self):
+        """
+        전술 규칙 증분 추론기 반환 (최초 호출 시 규칙 준비)
+        
+        tactical_rules.sparql의 CONSTRUCT 규칙과 InferenceRulesEngine 규칙을 대상으로 하며,
+        결론은 기본 그래프가 아닌 별도 오버레이 그래프에 유지됩니다.
+        """
+        if not RDFLIB_AVAILABLE:
+            return None
+        if self._incremental_inference is None:
+            from core_pipeline.incremental_inference import (
+                IncrementalRuleMaterializer, load_construct_rules, rules_from_inference_engine
+            )
+            from core_pipeline.inference_rules import TACTICAL_RULES
+            
+            rules = []
+            tactical_rules_path = Path(self.ontology_path) / "tactical_rules.sparql"
+            if tactical_rules_path.exists():
+                rules.extend(load_construct_rules(tactical_rules_path))
+            rules.extend(rules_from_inference_engine(TACTICAL_RULES, str(self.ns)))
+            
+            materializer = IncrementalRuleMaterializer(
+                rules, full_rebuild_ratio=self.config.get("incremental_inference_rebuild_ratio", 0.3))
+            materializer.bind_ontology_manager(self)
+            self._incremental_inference = materializer
+        return self._incremental_inference
+    
+    def update_incremental_inference(self) -> Dict[str, Any]:
+        """
+        마지막 동기화 이후 그래프 변경분만으로 규칙 추론 결과 갱신
+        
+        Returns:
+            실행 통계 (mode: full/incremental, inferred_added, inferred_removed, seconds)
+        """
+        materializer = self.get_incremental_inference()
+        if materializer is None or self.graph is None:
+            return {}
+        stats = materializer.sync()
+        if stats:
+            safe_print(f"[INFO] 증분 규칙 추론({stats.get('mode')}): +{stats.get('inferred_added', 0)} "
+                       f"/ -{stats.get('inferred_removed', 0)} (시간: {stats.get('seconds', 0):.2f}초)")
+        return stats
+    
+    def get_materialized_inferences(self, rule_prefix: Optional[str] = None) -> Optional[Dict[str, Set[Tuple]]]:
+        """
+        증분 추론기가 유지하는 규칙별 결론 (현재 그래프와 동기화 후 반환)
+        
+        추론 그래프 생성/규칙 실행 API가 규칙을 처음부터 다시 평가하지 않고
+        DataWatcher가 갱신해 온 오버레이를 재사용하기 위한 진입점입니다.
+        
+        Args:
+            rule_prefix: 규칙 ID 접두사 필터 (예: "tactical_rules#")
+        
+        Returns:
+            {규칙 ID: 결론 트리플 집합}. 증분 추론이 비활성화되었거나 사용할 수 없으면 None
+        """
+        if not self.config.get("enable_incremental_inference", True):
+            return None
+        try:
+            materializer = self.get_incremental_inference()
+            if materializer is None or self.graph is None:
+                return None
+            materializer.sync()
+            rule_ids = [rule.id for rule in materializer.rules
+                        if rule_prefix is None or rule.id.startswith(rule_prefix)]
+            return materializer.get_conclusions(rule_ids)
+        except Exception as e:
+            safe_print(f"[WARN] 증분 규칙 추론 결과 조회 실패: {e}")
+            return None
+    
+    def get_changed_nodes(self, since_version: int) -> Optional[Set[str]]:
+        """
+        since_version 이후 트리플 변경이 있었던 노드 URI 집합 (캐시 선택적 무효화용)
+        
+        Returns:
+            변경된 노드 URI 문자열 집합. 변경 이력이 없어 알 수 없으면 None (전체 무효화 필요)
+        """
+        current = self.get_graph_version()
+        if since_version >= current:
+            return set()
+        if since_version < self._graph_change_log_floor:
+            return None
+        
+        changed = set()
+        for entry in self._graph_change_log:
+            if entry["version"] <= since_version:
+                continue
+            for s, p, o in list(entry["removed"]) + list(entry["added"]):
+                changed.add(str(s))
+                if isinstance(o, URIRef):
+                    changed.add(str(o))
+        return changed
+    
+    def get_subgraph(self, mode: str = "instances",
+                     groups: Optional[List[str]] = None,
+                     relations: Optional[List[str]] = None,
+                     search: Optional[str] = None,
+                     center: Optional[str] = None,
+                     radius: int = 1,
+                     offset: int = 0,
+                     limit: Optional[int] = None,
+                     graph: Optional["Graph"] = None) -> Dict[str, Any]:
+        """
+        필터/이웃 반경/페이지 단위로 잘라낸 부분 그래프 반환
+        
+        Args:
+            mode: "instances" 또는 "schema"
+            groups: 포함할 노드 그룹 목록
+            relations: 포함할 관계명 목록
+            search: 노드 라벨 검색어
+            center: 이웃 탐색 기준 노드 ID (지정 시 radius 홉 이내 노드만 포함)
+            radius: 기준 노드로부터의 최대 홉 수
+            offset: 페이지 시작 위치 (노드 기준)
+            limit: 페이지 크기 (None이면 전체)
+            graph: 대상 그래프 (None이면 self.graph)
+        
+        Returns:
+            {"nodes", "links", "total_nodes", "version"}
+        """
+        full_data = self.to_json(graph)
+        version = self.get_graph_version()
+        mode_data = full_data.get(mode) or {"nodes": [], "links": []}
+        
+        group_filter = set(groups) if groups else None
+        relation_filter = set(relations) if relations else None
+        search_lower = search.lower() if search else None
+        
+        # 이웃 반경 필터 (인접 리스트는 JSON 캐시 단위로 재사용)
+        neighborhood = None
+        if center:
+            adjacency = self._get_adjacency(full_data, mode)
+            neighborhood = {center}
+            frontier = {center}
+            for _ in range(max(radius, 0)):
+                next_frontier = set()
+                for node_id in frontier:
+                    next_frontier.update(adjacency.get(node_id, ()))
+                next_frontier -= neighborhood
+                if not next_frontier:
+                    break
+                neighborhood |= next_frontier
+                frontier = next_frontier
+        
+        nodes = []
+        for node_data in mode_data.get("nodes", []):
+            node_id = node_data.get("id")
+            if neighborhood is not None and node_id not in neighborhood:
+                continue
+            if group_filter and node_data.get("group", "Unknown") not in group_filter:
+                continue
+            if search_lower and search_lower not in node_data.get("label", "").lower():
+                continue
+            nodes.append(node_data)
+        
+        total_nodes = len(nodes)
+        if limit is not None:
+            nodes = nodes[offset:offset + limit]
+        elif offset:
+            nodes = nodes[offset:]
+        
+        valid_node_ids = {n.get("id") for n in nodes}
+        links = [
+            l for l in mode_data.get("links", [])
+            if l.get("source") in valid_node_ids and l.get("target") in valid_node_ids
+            and (not relation_filter or l.get("relation", "Unknown") in relation_filter)
+        ]
+        
+        return {
+            "nodes": nodes,
+            "links": links,
+            "total_nodes": total_nodes,
+            "version": version
+        }
+    
+    def _get_adjacency(self, full_data: Dict, mode: str) -> Dict[str, set]:
+        """to_json 결과로부터 무방향 인접 리스트 생성 (JSON 캐시 단위로 재사용)"""
+        cache_key = (id(full_data), mode)
+        adjacency = self._adjacency_cache.get(cache_key)
+        if adjacency is not None:
+            return adjacency
+        
+        adjacency = {}
+        for link in full_data.get(mode, {}).get("links", []):
+            source, target = link.get("source"), link.get("target")
+            adjacency.setdefault(source, set()).add(target)
+            adjacency.setdefault(target, set()).add(source)
+        
+        # 이전 JSON에 대한 인접 리스트는 더 이상 유효하지 않으므로 정리
+        valid_ids = {id(v) for v in self._json_cache.values()}
+        self._adjacency_cache = {k: v for k, v in self._adjacency_cache.items() if k[0] in valid_ids}
+        self._adjacency_cache[cache_key] = adjacency
+        return adjacency
+
     def get_node_details(self, node_id: str) -> Dict[str, Any]:
         """
         특정 노드의 상세 정보(모든 속성)를 조회합니다.
@@ -3827,12 +4228,15 @@ class EnhancedOntologyManager:
             
             # 관계 추가
             self.graph.add((source_uri, relation_uri, target_uri))
+            added = [(source_uri, relation_uri, target_uri)]
             
             # 관계명이 OWL ObjectProperty로 정의되어 있는지 확인하고 없으면 추가
             if (relation_uri, RDF.type, OWL.ObjectProperty) not in self.graph:
                 self.graph.add((relation_uri, RDF.type, OWL.ObjectProperty))
+                added.append((relation_uri, RDF.type, OWL.ObjectProperty))
                 safe_print(f"[INFO] 새로운 관계 Property 생성: {relation_name}")
             
+            self.record_graph_change(added=added)
             safe_print(f"[INFO] 관계 추가 완료: {source_node_id} -[{relation_name}]-> {target_node_id}")
             return True
         except Exception as e:
@@ -3892,6 +4296,7 @@ class EnhancedOntologyManager:
             
             # 관계 삭제
             self.graph.remove((source_uri, relation_uri, target_uri))
+            self.record_graph_change(removed=[(source_uri, relation_uri, target_uri)])
             safe_print(f"[INFO] 관계 삭제 완료: {source_node_id} -[{relation_name}]-> {target_node_id}")
             return True
         except Exception as e:
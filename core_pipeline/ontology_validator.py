@@ -3,12 +3,17 @@
 """
 Ontology Validator
 온톨로지 스키마 준수 여부 및 데이터 건전성(Health)을 검증하는 모듈
+
+클래스별 개수, 고립 노드, 미정의 참조는 GraphValidationIndex
+(단일 순회 구축 + 변경분 갱신)에서 읽습니다.
 """
 import pandas as pd
 from typing import Dict, List, Tuple, Any
 from rdflib import Graph, URIRef, RDF, RDFS, OWL
 from rdflib.plugins.sparql import prepareQuery
 
+from core_pipeline.validation_index import get_validation_index
+
 class OntologyValidator:
     def __init__(self, ontology_manager):
         """
@@ -16,6 +21,11 @@ class OntologyValidator:
             ontology_manager: EnhancedOntologyManager Instance
         """
         self.om = ontology_manager
+    
+    @property
+    def index(self):
+        """동기화된 검증 인덱스 (마지막 검증 이후 변경된 트리플만 반영)"""
+        return get_validation_index(self.om)
         
     def validate_schema_compliance(self) -> Dict[str, Any]:
         """
@@ -56,18 +66,13 @@ class OntologyValidator:
             "message": f"총 {count}개의 전장축선 객체가 식별됨" if count > 0 else "전장축선 객체가 없음"
         })
         
-        # 2. Axis - Terrain 연결 확인
-        # 방법 1: has지형셀 관계 직접 확인
+        # 2. Axis - Terrain 연결 확인 (전장축선 객체에서의 관계만 카운트)
         has_terrain_prop = ns.has지형셀
-        link_count = len(list(self.om.graph.triples((None, has_terrain_prop, None))))
-        
-        # 전장축선 객체에서의 관계만 카운트 (더 정확한 검증)
-        axis_terrain_links = []
-        for axis in self.om.graph.subjects(RDF.type, ns.전장축선):
-            for terrain in self.om.graph.objects(axis, has_terrain_prop):
-                axis_terrain_links.append((axis, terrain))
-        
-        link_count = len(axis_terrain_links)
+        link_count = sum(
+            1
+            for axis in self.om.graph.subjects(RDF.type, ns.전장축선)
+            for _ in self.om.graph.objects(axis, has_terrain_prop)
+        )
         checks.append({
             "name": "축선-지형 연결성",
             "desc": "전장축선이 지형 정보와 공간적으로 연결되어 있는지 확인",
@@ -96,32 +101,16 @@ class OntologyValidator:
         return counts
 
     def _check_connectivity(self) -> Dict[str, Any]:
-        """데이터 연결 건전성 확인 (Orphan Node 등)"""
+        """데이터 연결 건전성 확인 (Orphan Node, 미정의 참조 등)"""
         ns = self.om.ns
+        index = self.index
         checks = []
         
-    def _check_connectivity(self) -> Dict[str, Any]:
-        """데이터 연결 건전성 확인 (Orphan Node 등)"""
-        ns = self.om.ns
-        checks = []
-        
-        # 1. 고립된 노드 (Orphan Nodes) 확인 - Native Python/rdflib 집합 연산으로 최적화 (SPARQL보다 훨씬 빠름)
-        all_subjects = set(self.om.graph.subjects())
-        all_objects = set(self.om.graph.objects())
-        
-        # type(rdf:type) 이외의 실질적인 속성을 가진 주체들 추출
-        subjects_with_real_props = set()
-        for s, p, o in self.om.graph:
-            if p != RDF.type:
-                subjects_with_real_props.add(s)
-        
+        # 1. 고립된 노드 (Orphan Nodes) 확인
         # 고립 노드 정의: 
         # (1) 어떤 다른 노드의 목적어(Object)로도 쓰이지 않으면서 
-        # (2) 주어(Subject)로 쓰일 때도 오직 rdf:type 정보만 가지고 있는 노드
-        orphans = (all_subjects - all_objects) - subjects_with_real_props
-        
-        # BNode(공백 노드) 제외하고 URIRef만 계산
-        orphan_count = len([o for o in orphans if isinstance(o, URIRef)])
+        # (2) 주어(Subject)로 쓰일 때도 오직 rdf:type 정보만 가지고 있는 노드 (URIRef만)
+        orphan_count = len(index.orphans)
         
         checks.append({
             "name": "고립 노드(Orphan) 점검",
@@ -131,20 +120,18 @@ class OntologyValidator:
             "message": f"발견된 고립 노드: {orphan_count}개" if orphan_count > 0 else "고립 노드 없음"
         })
         
-        # 2. 필수 관계 확인 - 위협-방책 매핑
-        # 이 부분은 특정 패턴이므로 SPARQL이 유리할 수 있으나, 건수가 많지 않으므로 그대로 유지하거나 최적화
-        query_threat_no_coa = f"""
-        SELECT (COUNT(?s) as ?count) WHERE {{
-            ?s a <{ns.위협상황}> .
-            # THR 패턴을 가진 실제 위협 상황만 대상으로 함 (추론된 타 클래스 인스턴스 제외)
-            FILTER(CONTAINS(STR(?s), "THR") || CONTAINS(STR(?s), "위협상황"))
-            FILTER NOT EXISTS {{
-                ?s <{ns.has위협유형}> ?type .
-                ?coa <{ns.respondsTo}> ?type .
-            }}
-        }}
-        """
-        no_coa_count = self._run_sparql_count(query_threat_no_coa)
+        # 2. 미정의 참조 (Dangling Reference) 확인
+        dangling_count = len(index.dangling)
+        checks.append({
+            "name": "미정의 참조(Dangling) 점검",
+            "desc": "관계의 대상으로 참조되지만 어떤 속성도 정의되지 않은 노드 확인",
+            "status": "PASS" if dangling_count == 0 else "WARNING",
+            "count": dangling_count,
+            "message": f"미정의 참조 노드: {dangling_count}개" if dangling_count > 0 else "미정의 참조 없음"
+        })
+        
+        # 3. 필수 관계 확인 - 위협-방책 매핑
+        no_coa_count = self._count_threats_without_coa()
         
         checks.append({
             "name": "위협-방책 매핑 완전성",
@@ -156,15 +143,29 @@ class OntologyValidator:
         
         return {"checks": checks}
 
+    def _count_threats_without_coa(self) -> int:
+        """대응 방책(respondsTo)이 있는 위협유형에 연결되지 않은 위협 상황 수"""
+        ns = self.om.ns
+        graph = self.om.graph
+        try:
+            covered_types = set(graph.objects(None, ns.respondsTo))
+            count = 0
+            for threat in set(graph.subjects(RDF.type, ns.위협상황)):
+                # THR 패턴을 가진 실제 위협 상황만 대상으로 함 (추론된 타 클래스 인스턴스 제외)
+                name = str(threat)
+                if "THR" not in name and "위협상황" not in name:
+                    continue
+                if not any(t in covered_types for t in graph.objects(threat, ns.has위협유형)):
+                    count += 1
+            return count
+        except Exception as e:
+            print(f"[OntologyValidator] Count Error: {e}")
+            return 0
+
     def _check_reasoning_capability(self) -> Dict[str, Any]:
         """추론 엔진 동작 확인"""
         ns = self.om.ns
-        query_inferred = f"""
-        SELECT (COUNT(?s) as ?count) WHERE {{
-            ?s <{ns.hasAdvantage}> ?o .
-        }}
-        """
-        count = self._run_sparql_count(query_inferred)
+        count = self.index.count_predicate(ns.hasAdvantage)
         
         return {
             "checks": [{
@@ -177,9 +178,9 @@ class OntologyValidator:
         }
 
     def _get_count(self, class_uri: URIRef) -> int:
-        """Helper to get instance count using graph API (more reliable for special chars)"""
+        """Helper to get instance count from the validation index"""
         try:
-            return len(list(self.om.graph.triples((None, RDF.type, class_uri))))
+            return self.index.count_instances(class_uri)
         except Exception as e:
             print(f"[OntologyValidator] Count Error: {e}")
             return 0
@@ -4,13 +4,14 @@
 온톨로지 생명주기 워크플로우 관리
 순환형 워크플로우 상태 관리 및 전환 제어
 """
-import json
 import os
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
+from core_pipeline.state_store import get_state_store, store_path_for
+
 class WorkflowPhase(Enum):
     """워크플로우 단계"""
     PREPARATION = "preparation"  # 준비 단계
@@ -33,23 +34,29 @@ class StepStatus(Enum):
     NEEDS_REVISION = "needs_revision"
 
 class OntologyWorkflowManager:
-    """온톨로지 워크플로우 관리자"""
+    """
+    온톨로지 워크플로우 관리자
+
+    상태는 상태 저장소에 나누어 저장됩니다.
+    - workflow_steps: 단계별 상태 (단계 갱신 시 해당 단계만 저장)
+    - workflow_meta: current_phase, last_transition, feedback_loop_count
+    - 로그 스트림: 히스토리 (추가 전용)
+    """
+    
+    HISTORY_STREAM = "ontology_workflow"
     
-    def __init__(self, workflow_file: str = "metadata/ontology_workflow.json"):
+    def __init__(self, workflow_file: str = "metadata/ontology_workflow.json", store=None):
         self.workflow_file = Path(workflow_file)
-        self.workflow_file.parent.mkdir(parents=True, exist_ok=True)
-        self.workflow_state = self._load_workflow_state()
+        self.store = store or get_state_store(store_path_for(self.workflow_file))
+        self.store.import_legacy(f"ontology_workflow:{self.workflow_file.name}", self.workflow_file,
+                                 self._write_state)
+        with self.store.transaction():
+            if not self.store.exists("workflow_meta", "current_phase"):
+                self._write_state(self._initial_state())
     
-    def _load_workflow_state(self) -> Dict:
-        """워크플로우 상태 로드"""
-        if self.workflow_file.exists():
-            try:
-                with open(self.workflow_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[WARN] 워크플로우 상태 로드 실패: {e}")
-        
-        # 초기 상태
+    @staticmethod
+    def _initial_state() -> Dict:
+        """초기 워크플로우 상태"""
         return {
             "current_phase": WorkflowPhase.PREPARATION.value,
             "steps": {
@@ -106,21 +113,48 @@ class OntologyWorkflowManager:
             "feedback_loop_count": 0
         }
     
-    def _save_workflow_state(self):
-        """워크플로우 상태 저장"""
-        try:
-            with open(self.workflow_file, 'w', encoding='utf-8') as f:
-                json.dump(self.workflow_state, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[ERROR] 워크플로우 상태 저장 실패: {e}")
+    def _write_state(self, state: Dict):
+        """워크플로우 상태 dict(기존 JSON 형식)를 저장소에 기록"""
+        for step_name, step in state.get("steps", {}).items():
+            self.store.put("workflow_steps", step, key=step_name)
+        for entry in state.get("history", []):
+            self.store.append_log(self.HISTORY_STREAM, entry)
+        self._set_meta("current_phase", state.get("current_phase", WorkflowPhase.PREPARATION.value))
+        self._set_meta("feedback_loop_count", state.get("feedback_loop_count", 0))
+        if state.get("last_transition"):
+            self._set_meta("last_transition", state["last_transition"])
+    
+    def _get_meta(self, name: str, default=None):
+        doc = self.store.get("workflow_meta", name)
+        return doc.get("value", default) if doc else default
+    
+    def _set_meta(self, name: str, value):
+        self.store.put("workflow_meta", {"name": name, "value": value})
+    
+    def _get_step(self, step_name: str) -> Dict:
+        return self.store.get("workflow_steps", step_name) or {}
+    
+    @property
+    def workflow_state(self) -> Dict:
+        """전체 워크플로우 상태 (기존 JSON 형식의 조회용 스냅샷)"""
+        state = {
+            "current_phase": self._get_meta("current_phase", WorkflowPhase.PREPARATION.value),
+            "steps": dict(self.store.items("workflow_steps")),
+            "history": self.store.read_log(self.HISTORY_STREAM),
+            "feedback_loop_count": self._get_meta("feedback_loop_count", 0)
+        }
+        last_transition = self._get_meta("last_transition")
+        if last_transition:
+            state["last_transition"] = last_transition
+        return state
     
     def get_current_phase(self) -> WorkflowPhase:
         """현재 단계 반환"""
-        return WorkflowPhase(self.workflow_state["current_phase"])
+        return WorkflowPhase(self._get_meta("current_phase", WorkflowPhase.PREPARATION.value))
     
     def get_step_status(self, step_name: str) -> StepStatus:
         """단계별 상태 반환"""
-        step = self.workflow_state["steps"].get(step_name, {})
+        step = self._get_step(step_name)
         status_str = step.get("status", StepStatus.NOT_STARTED.value)
         try:
             return StepStatus(status_str)
@@ -130,28 +164,25 @@ class OntologyWorkflowManager:
     def update_step_status(self, step_name: str, status: StepStatus, 
                           metadata: Optional[Dict] = None):
         """단계 상태 업데이트"""
-        if step_name not in self.workflow_state["steps"]:
-            self.workflow_state["steps"][step_name] = {}
-        
-        step = self.workflow_state["steps"][step_name]
-        step["status"] = status.value
-        step["updated_at"] = datetime.now().isoformat()
-        
-        if status == StepStatus.COMPLETED:
-            step["completed_at"] = datetime.now().isoformat()
-        
-        if metadata:
-            step.update(metadata)
-        
-        # 히스토리 기록
-        self.workflow_state["history"].append({
-            "timestamp": datetime.now().isoformat(),
-            "step": step_name,
-            "status": status.value,
-            "metadata": metadata or {}
-        })
-        
-        self._save_workflow_state()
+        with self.store.transaction():
+            step = self._get_step(step_name)
+            step["status"] = status.value
+            step["updated_at"] = datetime.now().isoformat()
+            
+            if status == StepStatus.COMPLETED:
+                step["completed_at"] = datetime.now().isoformat()
+            
+            if metadata:
+                step.update(metadata)
+            self.store.put("workflow_steps", step, key=step_name)
+            
+            # 히스토리 기록 (로그에 1건 추가)
+            self.store.append_log(self.HISTORY_STREAM, {
+                "timestamp": datetime.now().isoformat(),
+                "step": step_name,
+                "status": status.value,
+                "metadata": metadata or {}
+            })
     
     def can_proceed_to_phase(self, target_phase: WorkflowPhase) -> Tuple[bool, str]:
         """다음 단계로 진행 가능 여부 확인"""
@@ -213,19 +244,18 @@ class OntologyWorkflowManager:
         if not can_proceed:
             return False, message
         
-        previous_phase = self.get_current_phase()
-        self.workflow_state["current_phase"] = target_phase.value
-        self.workflow_state["last_transition"] = {
-            "from": previous_phase.value,
-            "to": target_phase.value,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # 피드백 루프 카운트
-        if target_phase == WorkflowPhase.PREPARATION and previous_phase == WorkflowPhase.IMPROVEMENT:
-            self.workflow_state["feedback_loop_count"] = self.workflow_state.get("feedback_loop_count", 0) + 1
-        
-        self._save_workflow_state()
+        with self.store.transaction():
+            previous_phase = self.get_current_phase()
+            self._set_meta("current_phase", target_phase.value)
+            self._set_meta("last_transition", {
+                "from": previous_phase.value,
+                "to": target_phase.value,
+                "timestamp": datetime.now().isoformat()
+            })
+            
+            # 피드백 루프 카운트
+            if target_phase == WorkflowPhase.PREPARATION and previous_phase == WorkflowPhase.IMPROVEMENT:
+                self._set_meta("feedback_loop_count", self._get_meta("feedback_loop_count", 0) + 1)
         return True, f"{previous_phase.value} → {target_phase.value} 전환 완료"
     
     def get_workflow_summary(self) -> Dict:
@@ -234,10 +264,10 @@ class OntologyWorkflowManager:
             "current_phase": self.get_current_phase().value,
             "steps_status": {
                 name: step.get("status", StepStatus.NOT_STARTED.value)
-                for name, step in self.workflow_state["steps"].items()
+                for name, step in self.store.items("workflow_steps")
             },
-            "feedback_loop_count": self.workflow_state.get("feedback_loop_count", 0),
-            "last_transition": self.workflow_state.get("last_transition")
+            "feedback_loop_count": self._get_meta("feedback_loop_count", 0),
+            "last_transition": self._get_meta("last_transition")
         }
     
     def check_actual_step_status(self, step_name: str, config: Optional[Dict] = None) -> StepStatus:
@@ -302,14 +332,14 @@ class OntologyWorkflowManager:
         
         elif step_name == "quality_validation":
             # 검증 결과 메타데이터 확인
-            step = self.workflow_state["steps"].get(step_name, {})
+            step = self._get_step(step_name)
             if step.get("validation_results"):
                 return StepStatus.VALIDATED
             return self.get_step_status(step_name)
         
         elif step_name == "approval_deployment":
             # 배포 정보 확인
-            step = self.workflow_state["steps"].get(step_name, {})
+            step = self._get_step(step_name)
             if step.get("deployed_at"):
                 return StepStatus.DEPLOYED
             elif step.get("approved_at"):
@@ -22,7 +22,10 @@ from core_pipeline.relationship_chain import RelationshipChain
 from core_pipeline.data_watcher import DataWatcher
 from core_pipeline.event_stream import EventStream
 from core_pipeline.recommendation_history import RecommendationHistory
+from core_pipeline.recommendation_dependency import RecommendationDependencyGraph
 from core_pipeline.status_manager import StatusManager
+from core_pipeline.startup_scheduler import StartupScheduler
+from core_pipeline.statistics_service import StatisticsService
 
 # Enhanced Ontology Manager (현재 시스템 통합)
 try:
@@ -101,18 +104,33 @@ class CorePipeline:
         
         self.semantic_inference = SemanticInference(config)
         self.relationship_chain = RelationshipChain(config)
+        self.relationship_chain.bind_ontology_manager(self.ontology_manager)
         # PalantirSearch는 나중에 초기화 (순환 참조 방지)
         self.palantir_search = None
         
         # 실시간 기능 추가
         self.data_watcher = DataWatcher(self.data_manager, self.ontology_manager, self.status_manager)
-        self.event_stream = EventStream(self.data_manager, self.ontology_manager)
-        self.recommendation_history = RecommendationHistory()
+        # 데이터 변경 시 전술 규칙 추론 결과를 변경분(델타)만으로 갱신
+        if (self.config.get("enable_incremental_inference", True) and
+                hasattr(self.ontology_manager, 'update_incremental_inference')):
+            self.data_watcher.register_change_callback(
+                lambda changes: self.ontology_manager.update_incremental_inference())
+        self.recommendation_dependencies = RecommendationDependencyGraph()
+        self.event_stream = EventStream(self.data_manager, self.ontology_manager,
+                                        dependency_graph=self.recommendation_dependencies)
+        # 추천 히스토리 (상태 저장소에 영속화, 워커 프로세스 간 공유)
+        self.recommendation_history = RecommendationHistory.from_config(config)
+        # 대시보드 통계 카운터 (그래프 변경분/테이블 재로드만 반영)
+        self.statistics = StatisticsService(self.ontology_manager, self.data_manager)
     
     def initialize(self, progress_callback=None):
         """
         파이프라인 초기화
         
+        의존성 그래프에 따라 독립적인 단계(LLM 확인, 임베딩, 온톨로지, 상태 관리자 등)를
+        병렬로 실행합니다. config의 startup.lazy_components에 지정된 무거운 구성요소는
+        최초 사용 시점(ensure_component)까지 로드를 지연합니다.
+        
         Args:
             progress_callback: 진행 상황 업데이트 콜백 함수 (optional)
         """
@@ -129,6 +147,74 @@ class CorePipeline:
             if progress_callback:
                 progress_callback("Ontology Manager 확인 완료")
         
+        startup_config = self.config.get("startup", {}) or {}
+        lazy_components = set(startup_config.get("lazy_components", []))
+        
+        scheduler = StartupScheduler(max_workers=startup_config.get("max_workers", 4))
+        scheduler.add_stage("gpu_probe", lambda: self._probe_gpu(progress_callback),
+                            description="GPU 및 시스템 리소스 확인")
+        scheduler.add_stage("llm", lambda: self._init_llm(progress_callback),
+                            depends_on=["gpu_probe"], lazy="llm" in lazy_components,
+                            description="LLM 모델 가용성 확인/로드")
+        scheduler.add_stage("embeddings", lambda: self._load_embedding_model(progress_callback),
+                            lazy="embeddings" in lazy_components,
+                            description="RAG 임베딩 모델 로드")
+        scheduler.add_stage("palantir_search", self._init_palantir_search,
+                            description="PalantirSearch 초기화")
+        scheduler.add_stage("rag_index", self._prepare_rag_index,
+                            depends_on=["embeddings"],
+                            description="RAG 인덱스 확인 및 구축")
+        scheduler.add_stage("ontology_graph", self._build_ontology_graph_if_needed,
+                            description="지식 그래프(Ontology) 구축")
+        scheduler.add_stage("status_manager", self.status_manager.initialize,
+                            description="상태 관리자 초기화")
+        if self.config.get("enable_realtime_watching", False):
+            # 그래프/상태 캐시가 준비된 뒤에 변경 감시 시작
+            scheduler.add_stage("data_watcher", self.data_watcher.start_watching,
+                                depends_on=["ontology_graph", "status_manager"],
+                                description="실시간 데이터 감시 시작")
+        self.startup_scheduler = scheduler
+        
+        # 지연된 임베딩/인덱스는 최초 RAG 검색 시 로드
+        if scheduler.is_deferred("rag_index"):
+            self.rag_manager.lazy_loader = lambda: scheduler.ensure("rag_index")
+        
+        scheduler.run(progress_callback=progress_callback)
+        
+        # 지연 구성요소 백그라운드 웜업 (설정 시)
+        if startup_config.get("warmup_lazy_components", False):
+            scheduler.start_deferred_in_background()
+        
+        # 초기화 완료 플래그 설정
+        self._initialized = True
+        if progress_callback:
+            progress_callback("시스템 코어 초기화 완료")
+    
+    def ensure_component(self, name: str, timeout: Optional[float] = None) -> bool:
+        """
+        구성요소 준비 보장 (지연 구성요소는 최초 호출 시 로드)
+        
+        Args:
+            name: 단계명 (예: "embeddings", "rag_index", "llm")
+            timeout: 다른 스레드가 로드 중일 때 최대 대기 시간(초)
+        
+        Returns:
+            준비 완료 여부
+        """
+        scheduler = getattr(self, 'startup_scheduler', None)
+        if scheduler is None:
+            return False
+        return scheduler.ensure(name, timeout)
+    
+    def get_component_status(self) -> Dict[str, Dict]:
+        """구성요소별 준비 상태 (system 라우터 readiness 보고용)"""
+        scheduler = getattr(self, 'startup_scheduler', None)
+        if scheduler is None:
+            return {}
+        return scheduler.get_status()
+    
+    def _probe_gpu(self, progress_callback=None):
+        """GPU 메모리 확인 및 로딩 전략 결정"""
         try:
             import torch
             HAS_TORCH = True
@@ -137,8 +223,8 @@ class CorePipeline:
             print("[WARN] torch가 설치되지 않았습니다. CPU 모드로 강제 설정합니다.")
         
         # GPU 메모리 확인 및 로딩 전략 결정
-        use_gpu_for_llm = False
-        use_gpu_for_embedding = False
+        self._use_gpu_for_llm = False
+        self._use_gpu_for_embedding = False
         
         if progress_callback:
             progress_callback("GPU 및 시스템 리소스 확인 중...")
@@ -153,23 +239,24 @@ class CorePipeline:
                 # GPU 메모리가 3GB 미만이면 LLM만 GPU에 로드, Embedding은 CPU
                 if gpu_memory_free < 3.0:
                     print("[WARN] GPU 메모리 부족 감지. LLM만 GPU에 로드하고 Embedding은 CPU에 유지합니다.")
-                    use_gpu_for_llm = True
-                    use_gpu_for_embedding = False
+                    self._use_gpu_for_llm = True
+                    self._use_gpu_for_embedding = False
                 else:
                     # 충분한 메모리가 있으면 둘 다 GPU에 로드 시도
-                    use_gpu_for_llm = True
-                    use_gpu_for_embedding = True
+                    self._use_gpu_for_llm = True
+                    self._use_gpu_for_embedding = True
             except Exception as e:
                 print(f"[WARN] GPU 정보 확인 중 오류 발생: {e}. CPU 모드로 폴백합니다.")
-                use_gpu_for_llm = False
-                use_gpu_for_embedding = False
+                self._use_gpu_for_llm = False
+                self._use_gpu_for_embedding = False
         else:
             if HAS_TORCH:
                 logger.info("CUDA 사용 불가 또는 torch 미설치. CPU 모드로 로드합니다.")
-            use_gpu_for_llm = False
-            use_gpu_for_embedding = False
-        
-        # LLM 모델 로드 (조건부: 외부 모델 또는 사내망 모델 사용 가능하면 로컬 모델 로드 스킵)
+    
+    def _init_llm(self, progress_callback=None):
+        """LLM 모델 로드 (조건부: 외부 모델 또는 사내망 모델 사용 가능하면 로컬 모델 로드 스킵)"""
+        use_gpu_for_llm = getattr(self, '_use_gpu_for_llm', False)
+        load_failed = False
         try:
             if progress_callback:
                 progress_callback("LLM 모델 가용성 확인 중...")
@@ -209,6 +296,7 @@ class CorePipeline:
                         progress_callback("⚠️ 로컬 LLM 모델 로드 실패 (제한된 기능으로 실행)")
                     # 의존성 확인
                     self._check_llm_dependencies()
+                    load_failed = True
                 else:
                     logger.info("LLM 모델 로드 완료")
                     if progress_callback:
@@ -221,82 +309,57 @@ class CorePipeline:
             traceback.print_exc()
             # 의존성 확인
             self._check_llm_dependencies()
+            raise
+        
+        if load_failed:
+            # 스케줄러/readiness에 실패로 보고
+            raise RuntimeError("로컬 LLM 모델 로드 실패")
+    
+    def _load_embedding_model(self, progress_callback=None):
+        """RAG 임베딩 모델 로드 (CPU 우선 정책 강제 적용, 최종 실패 시 예외로 단계 실패 보고)"""
+        # CPU 우선 정책: 안정성을 위해 항상 CPU로 로드
+        logger.info("임베딩 모델 로드 중 (RAG 인덱스 최적화)...")
+        if progress_callback:
+            progress_callback("RAG 임베딩 모델 로드 중...")
         
-        # RAG 임베딩 모델 로드 (CPU 우선 정책 강제 적용)
         try:
-            # CPU 우선 정책: 안정성을 위해 항상 CPU로 로드
-            logger.info("임베딩 모델 로드 중 (RAG 인덱스 최적화)...")
-            if progress_callback:
-                progress_callback("RAG 임베딩 모델 로드 중...")
-            
             self.rag_manager.load_embeddings(device='cpu')
-            
-            # 로드 확인
-            if self.rag_manager.embedding_model is None:
-                print("[WARN] 임베딩 모델 로드 재시도...")
-                # 재시도: CPU 모드로 강제
-                self.rag_manager.load_embeddings(device='cpu')
-            
-            if self.rag_manager.embedding_model:
-                logger.info("임베딩 모델 로드 완료")
-                if progress_callback:
-                    progress_callback("RAG 임베딩 모델 로드 완료")
         except Exception as e:
             print(f"[WARN] 임베딩 로드 오류: {e}")
             import traceback
             traceback.print_exc()
-            # 최종 재시도
+        
+        # 로드 확인
+        if self.rag_manager.embedding_model is None:
+            print("[WARN] 임베딩 모델 로드 재시도...")
+            # 재시도: CPU 모드로 강제
             try:
                 self.rag_manager.load_embeddings(device='cpu')
-            except Exception as e2:
-                print(f"[ERROR] Embedding 모델 로드 최종 실패: {e2}")
+            except Exception as e:
+                print(f"[ERROR] Embedding 모델 로드 최종 실패: {e}")
+                raise
+        
+        if self.rag_manager.embedding_model is None:
+            raise RuntimeError("임베딩 모델 로드 실패")
         
-        # PalantirSearch 초기화
+        logger.info("임베딩 모델 로드 완료")
+        if progress_callback:
+            progress_callback("RAG 임베딩 모델 로드 완료")
+    
+    def _init_palantir_search(self):
+        """PalantirSearch 초기화"""
         try:
             from core_pipeline.palantir_search import PalantirSearch
             self.palantir_search = PalantirSearch(
                 self.rag_manager,
                 self.ontology_manager,
                 self.semantic_inference,
-                self.reasoning_engine
+                self.reasoning_engine,
+                stage_timeout=self.config.get("palantir_search_stage_timeout", 5.0)
             )
         except Exception as e:
             print(f"[WARN] PalantirSearch initialization failed: {e}")
-        
-        # RAG 인덱스 자동 구축 (인덱스가 없는 경우)
-        if progress_callback:
-            progress_callback("RAG 인덱스 확인 및 구축 중...")
-        self._build_rag_index_if_needed()
-        
-        # 온톨로지 그래프 자동 구축 (그래프가 비어있는 경우)
-        if progress_callback:
-            progress_callback("지식 그래프(Ontology) 구축 중...")
-        self._build_ontology_graph_if_needed()
-        
-        # 상태 관리자 초기화 (캐시 로드)
-        try:
-            if progress_callback:
-                progress_callback("상태 관리자 초기화 중...")
-            self.status_manager.initialize()
-            logger.info("StatusManager 초기화 완료")
-        except Exception as e:
-            print(f"[WARN] StatusManager 초기화 실패: {e}")
-        
-        # 데이터 감시 시작 (옵션)
-        enable_watching = self.config.get("enable_realtime_watching", False)
-        if enable_watching:
-            try:
-                if progress_callback:
-                    progress_callback("실시간 데이터 감시 시작...")
-                self.data_watcher.start_watching()
-                logger.info("실시간 데이터 감시 활성화")
-            except Exception as e:
-                print(f"[WARN] 실시간 데이터 감시 활성화 실패: {e}")
-        
-        # 초기화 완료 플래그 설정
-        self._initialized = True
-        if progress_callback:
-            progress_callback("시스템 코어 초기화 완료")
+            raise
     
     def _check_llm_dependencies(self):
         """LLM 의존성 확인"""
@@ -340,6 +403,27 @@ class CorePipeline:
         
         print()
     
+    def _prepare_rag_index(self):
+        """RAG 인덱스 준비 후 COA별 과거 성공 사례 테이블 사전 계산"""
+        self._build_rag_index_if_needed()
+        if self.config.get("precompute_historical_evidence", True):
+            self.refresh_historical_evidence()
+    
+    def refresh_historical_evidence(self) -> int:
+        """
+        COA 라이브러리 전체의 과거 성공 사례 신호를 배치 검색으로 재계산
+        (인덱스 구축/재구축 직후 호출)
+        
+        Returns:
+            계산된 COA 수
+        """
+        try:
+            from core_pipeline.coa_engine.historical_evidence import refresh_historical_evidence
+            return refresh_historical_evidence(self.rag_manager, self.data_manager)
+        except Exception as e:
+            print(f"[WARN] 과거 성공 사례 테이블 계산 실패: {e}")
+            return 0
+    
     def _build_rag_index_if_needed(self):
         """RAG 인덱스가 없으면 자동 구축"""
         # 임베딩 모델이 없으면 인덱스 구축 불가
@@ -374,60 +458,19 @@ class CorePipeline:
             return
         
         try:
-            docs = []
-            doc_files = list(rag_docs_path.glob("*.txt")) + list(rag_docs_path.glob("*.md"))
+            from core_pipeline.rag_manifest import list_documents, sync_documents
             
-            if not doc_files:
+            if not list_documents(rag_docs_path):
                 logger.info(f"RAG 문서가 없습니다: {rag_docs_path}")
                 return
             
-            doctrine_docs = []
-            doctrine_doc_names = []
-            general_docs = []
-            general_doc_names = []
-            
-            for doc_file in doc_files:
-                try:
-                    with open(doc_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if content.strip():
-                            # 파일명으로 교리 문서 여부 판단 (DOCTRINE-*)
-                            if doc_file.name.upper().startswith("DOCTRINE") or "# Doctrine_ID:" in content:
-                                doctrine_docs.append(content)
-                                doctrine_doc_names.append(doc_file.name)
-                            else:
-                                general_docs.append(content)
-                                general_doc_names.append(doc_file.name)
-                except Exception as e:
-                    print(f"[WARN] 문서 로드 실패 {doc_file}: {e}")
-            
-            if doctrine_docs or general_docs:
-                logger.info(f"RAG 인덱스 자동 구축 시작: 교리 {len(doctrine_docs)}개, 일반 {len(general_docs)}개")
-                
-                all_chunks = []
-                
-                # 1. 교리 문서 청킹 (특수 로직)
-                if doctrine_docs:
-                    print(f"  - 교리 문서 청킹 중... ({len(doctrine_docs)}개 파일)")
-                    doctrine_chunks = self.rag_manager.chunk_doctrine_documents(doctrine_docs, doc_names=doctrine_doc_names)
-                    all_chunks.extend(doctrine_chunks)
-                    print(f"  - 교리 청크 {len(doctrine_chunks)}개 생성")
-                
-                # 2. 일반 문서 청킹
-                if general_docs:
-                    print(f"  - 일반 문서 청킹 중... ({len(general_docs)}개 파일)")
-                    general_chunks = self.rag_manager.chunk_documents(general_docs, doc_names=general_doc_names)
-                    all_chunks.extend(general_chunks)
-                    print(f"  - 일반 청크 {len(general_chunks)}개 생성")
-                
-                # 3. 인덱스 구축
-                if all_chunks:
-                    self.rag_manager.build_index(all_chunks)
-                    # 인덱스 저장 (다음 초기화 시 재사용)
-                    self.rag_manager.save_index()
-                    logger.info(f"RAG 인덱스 자동 구축 완료: 총 {len(all_chunks)}개 청크 (저장 경로: {self.rag_manager.embedding_path})")
-                else:
-                    print("[WARN] 생성된 청크가 없습니다.")
+            # 전체 구축 + 문서 매니페스트 기록 (이후 /rag/reindex는 변경분만 처리)
+            stats = sync_documents(self.rag_manager, rag_docs_path, force_full=True)
+            if stats["total_chunks"]:
+                logger.info(
+                    f"RAG 인덱스 자동 구축 완료: 교리 {stats['doctrine_docs']}개, 일반 {stats['general_docs']}개, "
+                    f"총 {stats['total_chunks']}개 청크 (저장 경로: {self.rag_manager.embedding_path})"
+                )
             else:
                 logger.info("인덱싱할 유효한 문서 내용이 없습니다.")
         except Exception as e:
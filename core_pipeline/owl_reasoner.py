@@ -54,12 +54,14 @@ class OWLReasoner:
         self.inference_stats = {}
         self._inference_performed = False
         
-    def run_inference(self, include_rdfs: bool = True) -> Optional[Graph]:
+    def run_inference(self, include_rdfs: bool = True, in_place: bool = False) -> Optional[Graph]:
         """
         OWL-RL 추론 실행
         
         Args:
             include_rdfs: RDFS 추론 포함 여부 (기본: True, 대규모 그래프에서는 False 권장)
+            in_place: 복사본을 만들지 않고 원본 그래프를 직접 확장
+                      (LayeredGraph를 전달하면 결과는 오버레이에만 기록됨)
         
         Returns:
             추론 결과가 포함된 Graph 객체
@@ -82,8 +84,7 @@ class OWLReasoner:
         start_time = time.time()
         
         # 원본 그래프의 트리플 수 측정
-        original_triples_set = set(self.original_graph)
-        original_count = len(original_triples_set)
+        original_count = len(self.original_graph) if in_place else len(set(self.original_graph))
         logger.info(f"OWL-RL 추론 시작: 원본 트리플 수 = {original_count}")
         
         # [PERFORMANCE] 대규모 그래프 체크 및 자동 조정 권장
@@ -91,21 +92,24 @@ class OWLReasoner:
             logger.warning(f"대규모 그래프 감지 ({original_count} 트리플). RDFS 추론은 매우 느릴 수 있습니다. "
                            "성능 문제가 발생하면 `include_rdfs=False`로 설정하는 것을 고려하세요.")
         
-        # 새로운 그래프 생성 및 데이터 복사
-        self.inferred_graph = Graph()
-        for triple in self.original_graph:
-            self.inferred_graph.add(triple)
-        
-        # 네임스페이스 수동 바인딩
-        for prefix, uri in self.original_graph.namespaces():
-            self.inferred_graph.bind(prefix, uri)
+        if in_place:
+            self.inferred_graph = self.original_graph
+        else:
+            # 새로운 그래프 생성 및 데이터 복사
+            self.inferred_graph = Graph()
+            for triple in self.original_graph:
+                self.inferred_graph.add(triple)
+            
+            # 네임스페이스 수동 바인딩
+            for prefix, uri in self.original_graph.namespaces():
+                self.inferred_graph.bind(prefix, uri)
         
         try:
             # 1. RDFS 추론 (선택적)
             if include_rdfs:
                 logger.info("RDFS 추론 실행 중...")
                 DeductiveClosure(RDFS_Semantics).expand(self.inferred_graph)
-                rdfs_count = len(set(self.inferred_graph))
+                rdfs_count = len(self.inferred_graph) if in_place else len(set(self.inferred_graph))
                 logger.info(f"RDFS 추론 완료: {rdfs_count} triples")
             
             # 2. OWL-RL 추론
@@ -113,8 +117,7 @@ class OWLReasoner:
             DeductiveClosure(OWLRL_Semantics).expand(self.inferred_graph)
             
             # 추론 후 결과 측정
-            inferred_triples_set = set(self.inferred_graph)
-            inferred_count = len(inferred_triples_set)
+            inferred_count = len(self.inferred_graph) if in_place else len(set(self.inferred_graph))
             new_triples = inferred_count - original_count
             elapsed_time = time.time() - start_time
             
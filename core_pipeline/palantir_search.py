@@ -4,34 +4,127 @@
 Palantir Search
 팔란티어 방식 검색: RAG + 그래프 하이브리드 검색 (Enhanced)
 """
-from typing import Dict, List, Optional, Set
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Set
+import logging
 import re
+import threading
+import time
+
+from core_pipeline.ontology_lexicon import AhoCorasick, LexiconCache, OntologyLexicon
+
+logger = logging.getLogger(__name__)
+
+
+class StructuredSnippets:
+    """
+    구조화 테이블 1개 버전의 사전 렌더링 결과
+    
+    - 행별 컨텍스트 라인과 기본 블록(상위 N행)을 한 번만 렌더링
+    - 셀 값 → 행 인덱스 매처로 질의에 언급된 행을 한 번의 선형 스캔으로 선택
+    """
+    
+    MIN_TERM_LENGTH = 2
+    COMMON_VALUE_RATIO = 0.5  # 절반 이상의 행에 나오는 값(예: '가용')은 선택 기준에서 제외
+    
+    def __init__(self, df, format_fn: Callable):
+        """
+        Args:
+            df: 테이블 DataFrame
+            format_fn: DataFrame → 행당 한 줄 텍스트 렌더링 함수
+        """
+        self.lines: List[str] = []
+        for pos in range(len(df)):
+            self.lines.append(format_fn(df.iloc[pos:pos + 1]))
+        self._default_blocks: Dict[int, str] = {}
+        
+        term_rows: Dict[str, Set[int]] = {}
+        for pos, row in enumerate(df.itertuples(index=False)):
+            for value in row:
+                if value is None or (isinstance(value, float) and value != value):
+                    continue
+                term = " ".join(str(value).split()).lower()
+                if len(term) >= self.MIN_TERM_LENGTH:
+                    term_rows.setdefault(term, set()).add(pos)
+        
+        max_rows = max(1, int(len(df) * self.COMMON_VALUE_RATIO))
+        self.term_rows = {
+            term: rows for term, rows in term_rows.items()
+            if len(df) <= 1 or len(rows) <= max_rows
+        }
+        self.matcher = AhoCorasick(self.term_rows.keys())
+    
+    @property
+    def is_empty(self) -> bool:
+        return not self.lines
+    
+    def select_rows(self, query: str, limit: int) -> List[int]:
+        """질의에 값이 언급된 행 (매칭된 값 수 내림차순, 동점은 원래 순서)"""
+        normalized = " ".join(query.split()).lower()
+        hits: Dict[int, Set[str]] = {}
+        for start, end in self.matcher.iter_matches(normalized):
+            term = normalized[start:end]
+            for pos in self.term_rows.get(term, ()):
+                hits.setdefault(pos, set()).add(term)
+        ranked = sorted(hits, key=lambda pos: (-len(hits[pos]), pos))
+        return ranked[:limit]
+    
+    def render(self, query: str, limit: int) -> str:
+        """질의에 맞는 행 블록 (언급된 행이 없으면 상위 limit행 기본 블록)"""
+        rows = self.select_rows(query, limit)
+        if rows:
+            return "\n".join(self.lines[pos] for pos in rows)
+        block = self._default_blocks.get(limit)
+        if block is None:
+            block = "\n".join(self.lines[:limit])
+            self._default_blocks[limit] = block
+        return block
 
 
 class PalantirSearch:
     """팔란티어 방식 검색 클래스 (고도화됨)"""
     
-    def __init__(self, rag_manager, ontology_manager, semantic_inference, reasoning_engine=None):
+    MAX_EXPANSION_TERMS = 5     # 질의 확장 용어 최대 개수
+    MAX_AMBIGUOUS_URIS = 3      # 이보다 많은 엔티티가 공유하는 용어는 확장/바인딩하지 않음
+    
+    def __init__(self, rag_manager, ontology_manager, semantic_inference, reasoning_engine=None,
+                 stage_timeout: float = 5.0, max_workers: int = 8):
         """
         Args:
             rag_manager: RAG Manager 인스턴스
             ontology_manager: Ontology Manager 인스턴스
             semantic_inference: Semantic Inference 인스턴스
             reasoning_engine: Reasoning Engine 인스턴스 (가설 수립용)
+            stage_timeout: 동시 검색 단계 마감시간(초) - 초과한 분기는 결과에서 제외
+            max_workers: 검색 분기 스레드 풀 크기
         """
         self.rag_manager = rag_manager
         self.ontology_manager = ontology_manager
         self.semantic_inference = semantic_inference
         self.reasoning_engine = reasoning_engine
+        self.stage_timeout = stage_timeout
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # 마감시간을 넘겨 아직 실행 중인 분기 {단계명: Future} - 분기별 최대 1개만 풀을 점유
+        self._stragglers: Dict[str, Future] = {}
+        # 레이블/별칭 → 엔티티 사전 (그래프 버전별 1회 구축)
+        self.lexicon_cache = LexiconCache(ontology_manager)
+        # 구조화 데이터 렌더링 캐시 {의도: (테이블 버전, StructuredSnippets)}
+        self._snippet_cache: Dict[str, tuple] = {}
+        self._snippet_lock = threading.Lock()
     
-    def search(self, query: str, top_k: int = 5, use_graph: bool = True) -> List[Dict]:
+    def search(self, query: str, top_k: int = 5, use_graph: bool = True,
+               stage_timings: Optional[Dict[str, Dict]] = None) -> List[Dict]:
         """
         팔란티어 방식 검색: RAG + 그래프 통합
         
         절차:
         1. 온톨로지 기반 질의 확장 (Query Expansion)
-        2. 전술적 가설 수립 (Tactical Hypothesis)
-        3. RAG 검색 (확장된 쿼리 활용)
+        2. 독립 검색 분기 동시 실행 (단계 마감시간 적용)
+           - 전술적 가설 수립 / SPARQL / 구조화 데이터 / RAG 검색 (확장된 쿼리 활용)
+        3. 도착한 분기 결과 병합
         4. 그래프 엔티티 매칭 및 보강
         5. 결과 통합 및 재순위화
         
@@ -39,116 +132,222 @@ class PalantirSearch:
             query: 검색 쿼리
             top_k: 반환할 상위 k개 결과
             use_graph: 그래프 검색 사용 여부
+            stage_timings: 단계별 소요 시간을 기록할 딕셔너리 (선택적)
+                {단계명: {"elapsed_ms": float, "status": "ok"|"timeout"|"error"|"skipped"}}
         
         Returns:
             통합 검색 결과 리스트
         """
-        # 1. 온톨로지 기반 질의 확장 & 가설 수립
-        expanded_query = query
-        tactical_hypothesis = []
-        
-        if use_graph and self.ontology_manager.graph is not None:
-            try:
-                # 질의 확장
-                expanded_terms = self._expand_query_with_ontology(query)
-                if expanded_terms:
-                    # 원본 쿼 뒤에 확장 용어 추가 (가중치는 낮을 수 있음)
-                    expanded_query = f"{query} {' '.join(expanded_terms)}"
-                
-                # 가설 수립
-                tactical_hypothesis = self._generate_tactical_hypotheses(query)
-            except Exception as e:
-                print(f"[WARN] Ontology preprocessing failed: {e}")
+        timings = stage_timings if stage_timings is not None else {}
+        search_start = time.perf_counter()
+        use_ontology = use_graph and self.ontology_manager.graph is not None
         
-        # 2. SPARQL 기반 온톨로지 검색 (관계 추론)
-        sparql_results = self._search_with_sparql(query)
-        
-        # 3. 구조화된 데이터 검색 (부대 현황 등)
-        structured_results = self._search_structured_entities(query)
-        
-        # 3. RAG 검색 (문서 기반)
+        # 1. 온톨로지 기반 질의 확장 (RAG 분기가 확장된 쿼리에 의존하므로 먼저 수행)
+        expanded_query = query
+        if use_ontology:
+            with self._timed(timings, "query_expansion"):
+                try:
+                    expanded_terms = self._expand_query_with_ontology(query)
+                    if expanded_terms:
+                        # 원본 쿼 뒤에 확장 용어 추가 (가중치는 낮을 수 있음)
+                        expanded_query = f"{query} {' '.join(expanded_terms)}"
+                except Exception as e:
+                    print(f"[WARN] Ontology preprocessing failed: {e}")
+        
+        # 2. 독립 검색 분기 동시 실행 (분기별로 자신이 의존하는 구성요소가 있을 때만 실행)
+        branches = {}
+        if self.rag_manager is not None and self.rag_manager.is_available():
+            branches["rag"] = lambda: self.rag_manager.retrieve_with_context(expanded_query, top_k=top_k)
+        if use_ontology:
+            # SPARQL 기반 온톨로지 검색 (관계 추론)
+            branches["sparql"] = lambda: self._search_with_sparql(query)
+        if getattr(self.ontology_manager, 'data_manager', None):
+            # 구조화된 데이터 검색 (부대 현황 등)
+            branches["structured"] = lambda: self._search_structured_entities(query)
+        if use_ontology and self.reasoning_engine:
+            branches["hypothesis"] = lambda: self._generate_tactical_hypotheses(query)
+        branch_results = self._run_branches(branches, timings)
+        
+        # 3. 도착한 결과 병합 (RAG → SPARQL → 구조화 데이터 → 가설 순)
         rag_results = []
-        if self.rag_manager.is_available():
-            try:
-                # 확장된 쿼리로 검색
-                rag_results = self.rag_manager.retrieve_with_context(expanded_query, top_k=top_k)
-                
-                # SPARQL 결과 추가 (LLM 참조용)
-                if sparql_results:
-                    for res in sparql_results:
-                        rag_results.append(res)
-                
-                # 구조화된 데이터 결과 추가 (LLM 참조용)
-                if structured_results:
-                    for res in structured_results:
-                         rag_results.append(res)
-                
-                # 가설 정보를 메타데이터에 추가 (LLM 참조용)
-                if tactical_hypothesis:
-                    hypothesis_text = "\n".join(tactical_hypothesis)
-                    # 가짜 검색 결과로 추가하여 LLM에 전달
-                    rag_results.append({
-                        "text": f"[전술적 추론 가설]\n{hypothesis_text}",
-                        "score": 0.9, # 높은 신뢰도 부여
-                        "metadata": {
-                            "source": "ReasoningEngine",
-                            "type": "hypothesis",
-                            "title": "전술적 추론 가설",
-                            "doc_name": "전술적 추론 가설"
-                        }
-                    })
-            except Exception as e:
-                print(f"[WARN] RAG search failed: {e}")
+        rag_results.extend(branch_results.get("rag") or [])
+        
+        # SPARQL 결과 추가 (LLM 참조용)
+        rag_results.extend(branch_results.get("sparql") or [])
+        
+        # 구조화된 데이터 결과 추가 (LLM 참조용)
+        rag_results.extend(branch_results.get("structured") or [])
+        
+        # 가설 정보를 메타데이터에 추가 (LLM 참조용)
+        tactical_hypothesis = branch_results.get("hypothesis") or []
+        if tactical_hypothesis:
+            hypothesis_text = "\n".join(tactical_hypothesis)
+            # 가짜 검색 결과로 추가하여 LLM에 전달
+            rag_results.append({
+                "text": f"[전술적 추론 가설]\n{hypothesis_text}",
+                "score": 0.9, # 높은 신뢰도 부여
+                "metadata": {
+                    "source": "ReasoningEngine",
+                    "type": "hypothesis",
+                    "title": "전술적 추론 가설",
+                    "doc_name": "전술적 추론 가설"
+                }
+            })
         
         # 4. RAG 결과에서 엔티티 추출
         entities = self._extract_entities_from_text(rag_results)
         
         # 5. 그래프에서 관련 엔티티 찾기
         graph_results = []
-        if use_graph and self.ontology_manager.graph is not None:
-            graph_results = self._find_graph_entities(query, entities)
+        if use_ontology:
+            with self._timed(timings, "graph_entities"):
+                graph_results = self._find_graph_entities(query, entities)
         
         # 6. 통합 점수 계산 및 정렬
         combined_results = self._combine_results(rag_results, graph_results, query)
         
+        timings["total"] = {
+            "elapsed_ms": round((time.perf_counter() - search_start) * 1000, 1),
+            "status": "ok"
+        }
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"PalantirSearch stage timings: {timings}")
+        
         # 상위 k개 반환
         return sorted(combined_results, key=lambda x: -x['combined_score'])[:top_k]
 
+    @contextmanager
+    def _timed(self, timings: Dict[str, Dict], stage: str):
+        """동기 단계 소요 시간 기록"""
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            timings[stage] = {
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+                "status": status
+            }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """검색 분기용 공유 스레드 풀 (마감시간 초과 작업이 요청을 붙잡지 않도록 요청 간 공유)"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="palantir-search"
+                )
+            return self._executor
+
+    def _run_branches(self, branches: Dict[str, Callable[[], List]],
+                      timings: Dict[str, Dict]) -> Dict[str, List]:
+        """
+        독립 검색 분기를 동시에 실행하고 단계 마감시간까지 도착한 결과만 반환
+        
+        Args:
+            branches: {단계명: 결과 리스트를 반환하는 호출 가능 객체}
+            timings: 단계별 소요 시간 기록 대상
+        
+        Returns:
+            {단계명: 결과 리스트} (시간 초과/실패 분기는 제외)
+        
+        실행 중인 스레드는 중단할 수 없으므로, 이전 검색에서 마감시간을 넘긴 같은 분기가
+        아직 실행 중이면 이번 검색에서는 해당 분기를 건너뜁니다 (status "skipped").
+        느린 분기가 요청마다 쌓여 공유 풀을 모두 점유하는 것을 막습니다.
+        """
+        if not branches:
+            return {}
+        
+        start = time.perf_counter()
+        finished_at: Dict[str, float] = {}
+        
+        def _run(name: str, fn: Callable[[], List]):
+            try:
+                return fn()
+            finally:
+                finished_at[name] = time.perf_counter()
+        
+        executor = self._get_executor()
+        futures = {}
+        with self._executor_lock:
+            for name, fn in branches.items():
+                straggler = self._stragglers.get(name)
+                if straggler is not None and not straggler.done():
+                    timings[name] = {"elapsed_ms": 0.0, "status": "skipped"}
+                    print(f"[WARN] PalantirSearch: 이전 '{name}' 단계가 아직 실행 중이어서 건너뜁니다.")
+                    continue
+                self._stragglers.pop(name, None)
+                futures[executor.submit(_run, name, fn)] = name
+        if not futures:
+            return {}
+        done, not_done = wait(futures, timeout=self.stage_timeout)
+        
+        results = {}
+        for future, name in futures.items():
+            if future in not_done:
+                # 아직 시작하지 않은 작업은 취소, 이미 실행 중이면 끝날 때까지 같은 분기 제출 보류
+                if not future.cancel():
+                    with self._executor_lock:
+                        self._stragglers[name] = future
+                timings[name] = {
+                    "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+                    "status": "timeout"
+                }
+                print(f"[WARN] PalantirSearch: '{name}' 단계가 {self.stage_timeout}s 내에 완료되지 않아 제외합니다.")
+                continue
+            
+            elapsed_ms = round((finished_at.get(name, time.perf_counter()) - start) * 1000, 1)
+            try:
+                results[name] = future.result()
+                timings[name] = {"elapsed_ms": elapsed_ms, "status": "ok"}
+            except Exception as e:
+                timings[name] = {"elapsed_ms": elapsed_ms, "status": "error"}
+                print(f"[WARN] PalantirSearch: '{name}' 단계 실패: {e}")
+        
+        return results
+
+    # 구조화 데이터 의도 매핑 (Intent-to-Table)
+    STRUCTURED_INTENTS = {
+        "friendly_unit": {
+            "keywords": ["아군", "우리 부대", "부대 현황", "부대 정보", "유닛", "자산", "친선", "우리 측"],
+            "table": "아군부대현황",
+            "title": "아군 부대 현황",
+            "format_fn": "_format_friendly_unit"
+        },
+        "threat_situation": {
+            "keywords": ["위협", "적군", "적군 부대", "침투", "공격", "위험", "상황"],
+            "table": "위협상황",
+            "title": "현재 위협 상황",
+            "format_fn": "_format_threat_situation"
+        },
+        "terrain_cell": {
+            "keywords": ["지형", "지역", "지질", "축선", "지형 정보"],
+            "table": "지형셀",
+            "title": "지형 정보 (셀 단위)",
+            "format_fn": "_format_terrain_cell"
+        },
+        "friendly_asset": {
+            "keywords": ["가용 자산", "장비", "무기", "화력"],
+            "table": "아군가용자산",
+            "title": "아군 가용 자산",
+            "format_fn": "_format_friendly_asset"
+        }
+    }
+    MAX_STRUCTURED_ROWS = 10
+
     def _search_structured_entities(self, query: str) -> List[Dict]:
         """
         사용자 질의에서 구조화된 엔티티(부대, 자산, 위협, 지형 등) 관련 키워드 감지 시 DB/Excel 직접 조회
         이는 온톨로지의 원천 데이터를 검색하여 팩트 기반 답변을 보장함
+        
+        테이블별 렌더링 결과(행 단위 라인 + 기본 블록)는 테이블 버전이 바뀔 때만 다시 만들고,
+        질의에 행 값(부대명, 위협ID 등)이 언급되면 해당 행을 우선 선택합니다.
         """
         results = []
         
-        # 키워드 매핑 정의 (Intent-to-Table)
-        intent_map = {
-            "friendly_unit": {
-                "keywords": ["아군", "우리 부대", "부대 현황", "부대 정보", "유닛", "자산", "친선", "우리 측"],
-                "table": "아군부대현황",
-                "title": "아군 부대 현황",
-                "format_fn": self._format_friendly_unit
-            },
-            "threat_situation": {
-                "keywords": ["위협", "적군", "적군 부대", "침투", "공격", "위험", "상황"],
-                "table": "위협상황",
-                "title": "현재 위협 상황",
-                "format_fn": self._format_threat_situation
-            },
-            "terrain_cell": {
-                "keywords": ["지형", "지역", "지질", "축선", "지형 정보"],
-                "table": "지형셀",
-                "title": "지형 정보 (셀 단위)",
-                "format_fn": self._format_terrain_cell
-            },
-            "friendly_asset": {
-                "keywords": ["가용 자산", "장비", "무기", "화력"],
-                "table": "아군가용자산",
-                "title": "아군 가용 자산",
-                "format_fn": self._format_friendly_asset
-            }
-        }
-        
         try:
             # OntologyManager를 통해 DataManager에 접근
             if not (hasattr(self.ontology_manager, 'data_manager') and self.ontology_manager.data_manager):
@@ -156,32 +355,50 @@ class PalantirSearch:
 
             dm = self.ontology_manager.data_manager
             
-            for intent, config in intent_map.items():
+            for intent, config in self.STRUCTURED_INTENTS.items():
                 if any(kw in query for kw in config["keywords"]):
-                    table_df = dm.load_table(config["table"])
-                    if table_df is not None and not table_df.empty:
-                        # 데이터가 너무 많으면 상위 N개만 추출 또는 요약
-                        display_df = table_df.head(10)
-                        
-                        formatted_text = config["format_fn"](display_df)
-                        
-                        results.append({
-                            "text": f"[{config['title']} (시스템 실시간 데이터)]\n{formatted_text}",
-                            "score": 1.0,
-                            "metadata": {
-                                "type": f"structured_{intent}",
-                                "source": "system_database",
-                                "title": config["title"],
-                                "doc_name": config["title"]
-                            }
-                        })
-                        print(f"[INFO] PalantirSearch: Injected structured data from '{config['table']}'")
+                    snippets = self._get_structured_snippets(dm, intent, config)
+                    if snippets is None or snippets.is_empty:
+                        continue
+                    
+                    formatted_text = snippets.render(query, self.MAX_STRUCTURED_ROWS)
+                    
+                    results.append({
+                        "text": f"[{config['title']} (시스템 실시간 데이터)]\n{formatted_text}",
+                        "score": 1.0,
+                        "metadata": {
+                            "type": f"structured_{intent}",
+                            "source": "system_database",
+                            "title": config["title"],
+                            "doc_name": config["title"]
+                        }
+                    })
+                    print(f"[INFO] PalantirSearch: Injected structured data from '{config['table']}'")
                         
         except Exception as e:
             print(f"[WARN] Structured search failed: {e}")
                 
         return results
 
+    def _get_structured_snippets(self, dm, intent: str, config: Dict) -> Optional["StructuredSnippets"]:
+        """의도별 렌더링 캐시 조회 (테이블 버전이 같으면 재사용)"""
+        version = dm.get_table_version(config["table"]) if hasattr(dm, 'get_table_version') else None
+        if version is not None:
+            with self._snippet_lock:
+                cached = self._snippet_cache.get(intent)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        
+        table_df = dm.load_table(config["table"])
+        if table_df is None or table_df.empty:
+            return None
+        snippets = StructuredSnippets(table_df, getattr(self, config["format_fn"]))
+        
+        if version is not None:
+            with self._snippet_lock:
+                self._snippet_cache[intent] = (version, snippets)
+        return snippets
+
     def _format_friendly_unit(self, df) -> str:
         lines = []
         for _, row in df.iterrows():
@@ -292,6 +509,20 @@ class PalantirSearch:
         
         # 패턴 1: "X의 상급부대는?" or "X 상급부대"
         if "상급부대" in query or "상급 부대" in query:
+            # 사전으로 부대 엔티티를 바로 찾으면 레이블 FILTER 없이 URI 바인딩
+            unit_values = self._mentioned_entities_values(query, f"{ns}아군부대현황")
+            if unit_values:
+                return f"""
+PREFIX def: <{ns}>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+SELECT ?unit ?unitName ?superior WHERE {{
+  VALUES ?unit {{ {unit_values} }}
+  ?unit a def:아군부대현황 .
+  ?unit rdfs:label ?unitName .
+  ?unit def:상급부대 ?superior .
+}}
+"""
+            
             # 부대명 추출 시도
             unit_name = None
             patterns = [r"([가-힣0-9]+(?:사단|여단|대대|중대|연대|군단))", r"([가-힣]+부대)"]
@@ -315,6 +546,20 @@ SELECT ?unit ?unitName ?superior WHERE {{
         
         # 패턴 2: "X에 배치된 부대" or "X 축선의 부대"
         if "배치된" in query or "축선" in query:
+            axis_values = self._mentioned_entities_values(query, f"{ns}전장축선")
+            if axis_values:
+                return f"""
+PREFIX def: <{ns}>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+SELECT ?unit ?unitName ?axisName WHERE {{
+  VALUES ?axis {{ {axis_values} }}
+  ?unit a def:아군부대현황 .
+  ?unit rdfs:label ?unitName .
+  ?unit def:has전장축선 ?axis .
+  ?axis rdfs:label ?axisName .
+}}
+"""
+            
             axis_match = re.search(r"([가-힣]+축선|AXIS\d+)", query)
             if axis_match:
                 axis_name = axis_match.group(1)
@@ -360,37 +605,73 @@ SELECT ?unit ?unitName ?type ?role ?superior WHERE {{
         
         return None
     
+    def _mentioned_entities_values(self, query: str, class_uri: str) -> Optional[str]:
+        """
+        질의에 언급된 엔티티 중 지정 클래스 인스턴스를 SPARQL VALUES 항목으로 반환
+        
+        Returns:
+            "<uri1> <uri2>" 형식 문자열 (해당 엔티티가 없으면 None)
+        """
+        lexicon = self._get_lexicon()
+        graph = self.ontology_manager.graph
+        if lexicon is None or graph is None:
+            return None
+        
+        from rdflib import RDF, URIRef
+        class_ref = URIRef(class_uri)
+        uris = []
+        for mention in lexicon.find_mentions(query):
+            if len(mention.uris) > self.MAX_AMBIGUOUS_URIS:
+                continue
+            uris.extend(uri for uri in mention.uris if (URIRef(uri), RDF.type, class_ref) in graph)
+        uris = list(dict.fromkeys(uris))
+        return " ".join(f"<{uri}>" for uri in uris) if uris else None
+    
     def _expand_query_with_ontology(self, query: str) -> List[str]:
 
         """
         온톨로지를 활용한 질의 확장
         질문 속 키워드와 연관된 온톨로지 용어(Label, Alias)를 찾음
         """
-        expanded_terms = set()
+        expanded_terms = {}  # 삽입 순서 유지 (dict를 순서 있는 집합으로 사용)
         keywords = self._extract_keywords(query)
         
         if not self.ontology_manager.graph:
             return []
-            
-        # 간단한 매칭 로직 (향후 SPARQL이나 벡터 검색으로 고도화 가능)
-        # 여기서는 SemanticInference의 키워드 매핑 활용
+        
+        # 1. 온톨로지 레이블/별칭 사전: 질의에 언급된 엔티티의 다른 이름
+        lexicon = self._get_lexicon()
+        if lexicon is not None:
+            for mention in lexicon.find_mentions(query):
+                # 여러 엔티티가 공유하는 일반 용어(예: 기상 '맑음')는 확장하지 않음
+                if len(mention.uris) > self.MAX_AMBIGUOUS_URIS:
+                    continue
+                for uri in mention.uris:
+                    for label in lexicon.labels_of(uri):
+                        expanded_terms[label] = None
+        
+        # 2. 사전 정의된 매핑 확인 (SemanticInference의 키워드 매핑)
         for kw in keywords:
-            # 1. 사전 정의된 매핑 확인
             for cat, synonyms in self.semantic_inference.keyword_mappings.items():
                 if kw in synonyms or kw == cat:
-                    expanded_terms.add(cat)
-                    expanded_terms.update(synonyms)
-            
-            # 2. 온톨로지 레이블 검색 (간단 구현)
-            # 실제로는 SPARQL로 rdfs:label이나 skos:altLabel을 검색해야 함
-            # 여기서는 성능을 위해 생략하고 SemanticInference 매핑에 의존
-        
-        # 원본 키워드 제외
-        for kw in keywords:
-            if kw in expanded_terms:
-                expanded_terms.remove(kw)
-                
-        return list(expanded_terms)[:5] # 최대 5개로 제한
+                    expanded_terms[cat] = None
+                    expanded_terms.update(dict.fromkeys(synonyms))
+        
+        # 원본 키워드/질의에 이미 있는 용어 제외
+        query_lower = query.lower()
+        terms = [
+            term for term in expanded_terms
+            if term not in keywords and term.lower() not in query_lower
+        ]
+        return terms[:self.MAX_EXPANSION_TERMS]
+    
+    def _get_lexicon(self) -> Optional[OntologyLexicon]:
+        """현재 그래프 버전의 레이블/별칭 사전"""
+        try:
+            return self.lexicon_cache.get()
+        except Exception as e:
+            print(f"[WARN] Ontology lexicon build failed: {e}")
+            return None
 
     def _generate_tactical_hypotheses(self, query: str) -> List[str]:
         """
@@ -447,15 +728,27 @@ SELECT ?unit ?unitName ?type ?role ?superior WHERE {{
             # 쿼리에서 키워드 추출
             query_keywords = self._extract_keywords(query)
             
+            # 질의에서 직접 언급된 온톨로지 엔티티를 먼저 (사전 매칭, 선형 스캔 1회)
+            lexicon = self._get_lexicon()
+            if lexicon is not None:
+                mentioned = [
+                    uri for mention in lexicon.find_mentions(query)
+                    if len(mention.uris) <= self.MAX_AMBIGUOUS_URIS
+                    for uri in mention.uris
+                ]
+                entities = list(dict.fromkeys(mentioned + list(entities)))
+            
+            # 의미 기반 관계 추론 (엔티티 전체를 배치로, 그래프 인덱스 공유)
+            relations_by_entity = self.semantic_inference.infer_relations_batch(
+                self.ontology_manager.graph,
+                entities,
+                max_depth=1
+            )
+            
             # 각 엔티티에 대해 그래프 검색
             for entity in entities:
                 try:
-                    # 의미 기반 관계 추론
-                    relations = self.semantic_inference.infer_relations(
-                        self.ontology_manager.graph,
-                        entity,
-                        max_depth=1
-                    )
+                    relations = relations_by_entity.get(entity) or {}
                     
                     # 직접 관계의 관련 엔티티
                     for rel in relations.get('direct', []):
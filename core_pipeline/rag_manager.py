@@ -8,11 +8,14 @@ Retrieval-Augmented Generation 관리 모듈
 import os
 import re
 import sys
+import threading
 import numpy as np
 import logging
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 from pathlib import Path
 
+from core_pipeline.embedding_store import EmbeddingStore
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -75,10 +78,36 @@ class RAGManager:
         self.config = config
         self.index = {}
         self.chunks = []
-        self.embeddings = None
+        # 청크 임베딩 (청크 ID = 행 번호, 증분 추가 시 전체 재할당 없음)
+        self._embedding_store = EmbeddingStore()
         self.embedding_model = None
         self.embedding_path = config.get("embedding_path", "./knowledge/embeddings")
         self.faiss_index = None
+        # 지연 초기화 훅 (임베딩/인덱스 로드를 최초 검색 시점까지 미룰 때 CorePipeline이 설정)
+        self.lazy_loader: Optional[Callable[[], None]] = None
+        # 스레드별 지연 로더 실행 여부 (로더 내부에서의 재진입 감지)
+        self._lazy_state = threading.local()
+        # 인덱스 버전 (build/add/load 시 증가) - 검색 결과 파생 캐시의 무효화 기준
+        self.index_version = 0
+        # (index_version, [(idx, chunk, Counter, 토큰 수)]) - TF-IDF용 청크 토큰 캐시
+        self._token_cache = None
+        # 삭제 표시된 청크 ID (증분 재색인 시 변경/삭제 문서의 청크, 전체 재구축 시 정리)
+        self.tombstones = set()
+        # 청크/인덱스/tombstone/FAISS 변경과 검색 간 동기화 (백그라운드 재색인 중 검색 보호)
+        self.index_lock = threading.RLock()
+        # 진행 중인 전체 재구축 수 (재구축 중에는 디스크 인덱스 자동 로드 금지)
+        self._rebuilding = 0
+        # 색인 시 한 번에 임베딩할 청크 수 (피크 메모리 상한)
+        self.ingest_batch_size = int(config.get("ingest_batch_size", 64))
+    
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        """청크 임베딩 행렬 뷰 (없으면 None)"""
+        return self._embedding_store.view()
+    
+    @embeddings.setter
+    def embeddings(self, value: Optional[np.ndarray]):
+        self._embedding_store.reset(value)
     
     def chunk_documents(self, docs: List[str], chunk_size: int = 500, overlap: int = 50, 
                        min_chunk_size: int = 100, use_sentence_chunking: bool = True,
@@ -97,32 +126,48 @@ class RAGManager:
         Returns:
             청크 리스트 [{"text": str, "start": int, "end": int, "doc_index": int, "source": str, ...}]
         """
-        all_chunks = []
-        
         # doc_names가 없으면 None으로 채움
-        if doc_names is None:
-            doc_names = [None] * len(docs)
-        elif len(doc_names) != len(docs):
+        if doc_names is not None and len(doc_names) != len(docs):
             logger.warning(f"문서 수({len(docs)})와 파일명 수({len(doc_names)})가 일치하지 않습니다.")
-            doc_names = [None] * len(docs)
+            doc_names = None
+        
+        return list(self.iter_document_chunks(
+            docs, chunk_size=chunk_size, overlap=overlap, min_chunk_size=min_chunk_size,
+            use_sentence_chunking=use_sentence_chunking, doc_names=doc_names
+        ))
+    
+    def iter_document_chunks(self, docs: Iterable[str], chunk_size: int = 500, overlap: int = 50,
+                             min_chunk_size: int = 100, use_sentence_chunking: bool = True,
+                             doc_names: Optional[Iterable[Optional[str]]] = None) -> Iterator[Dict]:
+        """
+        문서 스트림을 청크 스트림으로 변환 (chunk_documents의 제너레이터 버전)
+        
+        문서는 하나씩 소비되므로 한 번에 문서 1개 분량의 청크만 메모리에 유지됩니다.
+        
+        Args:
+            docs: 문서 이터러블 (제너레이터 가능)
+            doc_names: docs와 같은 순서의 문서 파일명 이터러블 (옵션)
+        
+        Yields:
+            청크 {"text": str, "start": int, "end": int, "doc_index": int, "source": str, ...}
+        """
+        names = iter(doc_names) if doc_names is not None else None
         
         for doc_idx, doc in enumerate(docs):
+            doc_name = next(names, None) if names is not None else None
             if use_sentence_chunking:
                 chunks = self._chunk_text_by_sentences(doc, chunk_size, overlap, min_chunk_size)
             else:
                 chunks = self._chunk_text_simple(doc, chunk_size, overlap, min_chunk_size)
             
             # 메타데이터 추가
-            doc_name = doc_names[doc_idx]
             for i, chunk in enumerate(chunks):
                 chunk["doc_index"] = doc_idx
                 chunk["chunk_index"] = i
                 chunk["total_chunks"] = len(chunks)
                 if doc_name:
                     chunk["source"] = doc_name
-                all_chunks.append(chunk)
-        
-        return all_chunks
+                yield chunk
     
     def _chunk_text_by_sentences(self, text: str, chunk_size: int, overlap: int, min_chunk_size: int) -> List[Dict]:
         """문장 단위로 청킹"""
@@ -224,6 +269,10 @@ class RAGManager:
                     "end": end
                 })
             
+            # 문서 끝에 도달하면 종료 (overlap만큼 되돌아가면 같은 구간을 무한 반복)
+            if end >= text_length:
+                break
+            
             start = end - overlap if overlap > 0 else end
             if start >= end:
                 start = end
@@ -259,17 +308,28 @@ class RAGManager:
                 ...
             }]
         """
-        import re
-        all_chunks = []
-        
-        if doc_names is None:
-            doc_names = [None] * len(docs)
-        elif len(doc_names) != len(docs):
+        if doc_names is not None and len(doc_names) != len(docs):
             print(f"[WARN] 문서 수({len(docs)})와 파일명 수({len(doc_names)})가 일치하지 않습니다.")
-            doc_names = [None] * len(docs)
+            doc_names = None
+        
+        return list(self.iter_doctrine_chunks(docs, doc_names=doc_names))
+    
+    def iter_doctrine_chunks(self, docs: Iterable[str],
+                             doc_names: Optional[Iterable[Optional[str]]] = None) -> Iterator[Dict]:
+        """
+        교리 문서 스트림을 교리 문장 청크 스트림으로 변환 (chunk_doctrine_documents의 제너레이터 버전)
+        
+        Args:
+            docs: 교리 문서 이터러블 (제너레이터 가능)
+            doc_names: docs와 같은 순서의 문서 파일명 이터러블 (옵션)
+            
+        Yields:
+            교리 문장 청크 (chunk_doctrine_documents와 동일한 형식)
+        """
+        names = iter(doc_names) if doc_names is not None else None
         
         for doc_idx, doc in enumerate(docs):
-            doc_name = doc_names[doc_idx] or f"doc_{doc_idx}"
+            doc_name = (next(names, None) if names is not None else None) or f"doc_{doc_idx}"
             
             # 교리 문서 헤더 파싱
             doctrine_id_match = re.search(r'#\s*Doctrine_ID:\s*(DOCTRINE-[\w-]+)', doc, re.IGNORECASE)
@@ -284,16 +344,13 @@ class RAGManager:
             statement_pattern = r'###\s*Doctrine_Statement_ID:\s*(D-[\w-]+-\d+)'
             
             statements = []
-            for match in re.finditer(statement_pattern, doc):
+            matches = list(re.finditer(statement_pattern, doc))
+            for match_idx, match in enumerate(matches):
                 statement_id = match.group(1)
                 start_pos = match.end()
                 
-                # 다음 문장 ID까지 또는 문서 끝까지
-                next_match = None
-                for next_match_iter in re.finditer(statement_pattern, doc):
-                    if next_match_iter.start() > start_pos:
-                        next_match = next_match_iter
-                        break
+                # 다음 문장 ID까지 또는 문서 끝까지 (문서를 문장마다 다시 스캔하지 않음)
+                next_match = next((m for m in matches[match_idx + 1:] if m.start() > start_pos), None)
                 
                 end_pos = next_match.start() if next_match else len(doc)
                 statement_block = doc[start_pos:end_pos].strip()
@@ -345,97 +402,259 @@ class RAGManager:
                     "doc_index": doc_idx,
                     "chunk_type": "doctrine_statement"
                 }
-                all_chunks.append(chunk)
-        
-        return all_chunks
+                yield chunk
     
-    def build_index(self, chunks: List[Dict], use_faiss: bool = True):
+    def build_index(self, chunks: Iterable, use_faiss: bool = True):
         """
         청크 인덱스 구축 (FAISS 지원 추가)
         
+        청크는 ingest_batch_size 단위로 임베딩되어 바로 인덱스에 추가되므로,
+        제너레이터를 넘기면 전체 청크/임베딩을 한 번에 메모리에 올리지 않습니다.
+        
+        새 청크/인덱스/임베딩/FAISS는 별도 객체에 구축한 뒤 index_lock 안에서 한 번에 교체하므로,
+        구축 중에도 검색은 이전 인덱스를 그대로 사용합니다.
+        
         Args:
-            chunks: 청크 리스트 (Dict 또는 str)
+            chunks: 청크 이터러블 (Dict 또는 str, 제너레이터 가능)
             use_faiss: FAISS 인덱스 사용 여부
         """
-        # chunks를 문자열 리스트로 변환
-        # chunks를 문자열 리스트로 변환 (임베딩 생성을 위해)
-        self.chunks = chunks # 원본(Dict 리스트) 유지
-        
-        # 임베딩용 텍스트 리스트 추출
-        if chunks and isinstance(chunks[0], dict):
-            text_chunks = [chunk.get("text", "") for chunk in chunks]
-        else:
-            text_chunks = [str(chunk) for chunk in chunks]
-            # 구형 데이터 호환성을 위해 dict로 변환하여 저장
-            self.chunks = [{"text": str(chunk)} for chunk in chunks]
-        
-        self.index = {i: chunk for i, chunk in enumerate(text_chunks)}
+        new_chunks: List[Dict] = []
+        new_index: Dict[int, str] = {}
+        store = EmbeddingStore()
+        faiss_index = None
+        embed = use_faiss and FAISS_AVAILABLE and self.embedding_model is not None
+        
+        with self.index_lock:
+            self._rebuilding += 1
+        try:
+            batch_size = max(1, self.ingest_batch_size)
+            batch = []
+            for chunk in chunks:
+                # 구형 데이터 호환성을 위해 dict로 변환하여 저장
+                batch.append(chunk if isinstance(chunk, dict) else {"text": str(chunk)})
+                if len(batch) < batch_size:
+                    continue
+                embed, faiss_index = self._build_batch(batch, new_chunks, new_index, store, faiss_index, embed)
+                batch = []
+            if batch:
+                embed, faiss_index = self._build_batch(batch, new_chunks, new_index, store, faiss_index, embed)
+            
+            with self.index_lock:
+                self.chunks = new_chunks
+                self.index = new_index
+                self.tombstones = set()
+                self.faiss_index = faiss_index
+                self._embedding_store = store
+                self.index_version += 1
+        finally:
+            with self.index_lock:
+                self._rebuilding -= 1
+        
+        if faiss_index is not None:
+            logger.info(f"FAISS index built: {len(new_chunks)} chunks, dimension {store.dimension}")
+    
+    def _build_batch(self, batch: List[Dict], chunks: List[Dict], index: Dict[int, str],
+                     store: EmbeddingStore, faiss_index, embed: bool):
+        """
+        전체 재구축용 배치 추가 (검색 중인 인덱스가 아닌 구축 중인 객체에 추가)
         
-        # FAISS 인덱스 구축
-        if use_faiss and FAISS_AVAILABLE and self.embedding_model is not None:
-            try:
-                # 텍스트 리스트로 임베딩 계산
-                embeddings = self.compute_embeddings(text_chunks)
-                if embeddings is not None:
-                    dimension = embeddings.shape[1]
-                    self.faiss_index = faiss.IndexFlatL2(dimension)
-                    self.faiss_index.add(embeddings.astype('float32'))
-                    self.embeddings = embeddings
-                    logger.info(f"FAISS index built: {len(text_chunks)} chunks, dimension {dimension}")
-            except Exception as e:
-                logger.warning(f"FAISS index build failed: {e}")
-                self.faiss_index = None
-        else:
-            self.faiss_index = None
+        Returns:
+            (다음 배치도 임베딩할지 여부, FAISS 인덱스 - 임베딩 실패 시 None)
+        """
+        start_idx = len(chunks)
+        texts = []
+        for offset, chunk in enumerate(batch):
+            text = chunk.get("text", "")
+            chunks.append(chunk)
+            index[start_idx + offset] = text
+            texts.append(text)
+        
+        if not embed:
+            return False, faiss_index
+        try:
+            embeddings = self._embed_batch(texts)
+            if faiss_index is None:
+                faiss_index = faiss.IndexFlatL2(embeddings.shape[1])
+            store.append(embeddings)
+            faiss_index.add(embeddings)
+            return True, faiss_index
+        except Exception as e:
+            logger.warning(f"FAISS index build failed: {e}")
+            store.clear()
+            return False, None
     
-    def add_to_index(self, new_chunks: List[Dict]):
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """청크 텍스트 배치 임베딩 (실패 시 예외)"""
+        embeddings = self.compute_embeddings(texts)
+        if embeddings is None:
+            raise ValueError("Failed to compute embeddings for new chunks")
+        return np.asarray(embeddings, dtype='float32')
+    
+    def add_to_index(self, new_chunks: Iterable):
         """
         기존 인덱스에 새로운 청크 추가 (증분 색인)
         
         Args:
-            new_chunks: 추가할 청크 리스트
+            new_chunks: 추가할 청크 이터러블 (제너레이터 가능)
         """
-        if not new_chunks:
-            return
-
-        # 1. 텍스트 추출 및 chunks 업데이트
-        if new_chunks and isinstance(new_chunks[0], dict):
-            new_text_chunks = [chunk.get("text", "") for chunk in new_chunks]
-        else:
-            new_text_chunks = [str(chunk) for chunk in new_chunks]
-            new_chunks = [{"text": str(chunk)} for chunk in new_chunks] # 메타데이터 정규화
+        added = self.ingest_chunks(new_chunks, use_faiss=True)
+        if added and self.faiss_index is not None:
+            logger.info(f"Added {added} chunks to FAISS index. Total: {self.faiss_index.ntotal}")
+    
+    def ingest_chunks(self, chunks: Iterable, use_faiss: bool = True,
+                      batch_size: Optional[int] = None) -> int:
+        """
+        청크 스트림 색인 (청크 → 임베딩 마이크로 배치 → 인덱스 추가)
+        
+        한 번에 batch_size개 청크의 텍스트/임베딩만 임시로 유지하며,
+        임베딩은 EmbeddingStore에 이어 쓰므로 기존 행렬을 다시 할당하지 않습니다.
+        
+        Args:
+            chunks: 청크 이터러블 (Dict 또는 str)
+            use_faiss: FAISS 인덱스 사용 여부
+            batch_size: 임베딩 배치 크기 (None이면 ingest_batch_size)
             
-        # 기존 청크에 추가
-        start_idx = len(self.chunks)
-        self.chunks.extend(new_chunks) # 메타데이터 포함 청크 리스트 확장
+        Returns:
+            추가된 청크 수
+        """
+        batch_size = max(1, batch_size or self.ingest_batch_size)
+        embed = use_faiss and FAISS_AVAILABLE and self.embedding_model is not None
+        if embed:
+            with self.index_lock:
+                embed = self._prepare_vector_index()
+        
+        added = 0
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                embed = self._append_chunk_batch(batch, embed)
+                added += len(batch)
+                batch = []
+        if batch:
+            embed = self._append_chunk_batch(batch, embed)
+            added += len(batch)
+        
+        if added:
+            with self.index_lock:
+                self.index_version += 1
+        return added
+    
+    def _prepare_vector_index(self) -> bool:
+        """추가 전에 임베딩 행과 청크 ID를 맞춤 (맞출 수 없으면 False)"""
+        try:
+            if self.faiss_index is not None:
+                if len(self._embedding_store) != self.faiss_index.ntotal:
+                    # 디스크에서 로드한 인덱스는 임베딩 행렬이 없으므로 FAISS에서 복원
+                    self.embeddings = self.faiss_index.reconstruct_n(0, self.faiss_index.ntotal)
+            elif self.chunks:
+                # 임베딩 없이 구축된 기존 청크를 먼저 임베딩해야 FAISS ID와 청크 ID가 일치
+                self._embed_existing_chunks()
+                if self.embeddings is None:
+                    return False
+                self.faiss_index = faiss.IndexFlatL2(self._embedding_store.dimension)
+                self.faiss_index.add(self.embeddings)
+            return True
+        except Exception as e:
+            logger.warning(f"FAISS index update failed: {e}")
+            self._drop_vector_index()
+            return False
+    
+    def _append_chunk_batch(self, batch: List, embed: bool) -> bool:
+        """
+        청크 배치를 인덱스에 추가하고 (embed이면) 임베딩/FAISS에도 추가
+        
+        Returns:
+            다음 배치도 임베딩할지 여부 (임베딩 실패 시 벡터 인덱스를 비활성화하고 False)
+        
+        임베딩 계산은 잠금 밖에서 수행하고, 청크/인덱스/FAISS 추가만 잠금 안에서 한 번에 반영합니다.
+        """
+        # 구형 데이터 호환성을 위해 dict로 변환하여 저장
+        chunks = [chunk if isinstance(chunk, dict) else {"text": str(chunk)} for chunk in batch]
+        texts = [chunk.get("text", "") for chunk in chunks]
+        
+        embeddings = None
+        error = None
+        if embed:
+            try:
+                embeddings = self._embed_batch(texts)
+            except Exception as e:
+                error = e
         
-        # 인덱스 맵 업데이트
-        for i, chunk_text in enumerate(new_text_chunks):
-            self.index[start_idx + i] = chunk_text
+        with self.index_lock:
+            start_idx = len(self.chunks)
+            for offset, (chunk, text) in enumerate(zip(chunks, texts)):
+                self.chunks.append(chunk)
+                self.index[start_idx + offset] = text
+            
+            if not embed:
+                return False
             
-        # 2. FAISS 인덱스 업데이트
-        if FAISS_AVAILABLE and self.embedding_model is not None:
             try:
-                # 새 청크에 대한 임베딩 계산
-                new_embeddings = self.compute_embeddings(new_text_chunks)
-                
-                if new_embeddings is not None:
-                    # FAISS 인덱스가 없으면 새로 생성
-                    if self.faiss_index is None:
-                        dimension = new_embeddings.shape[1]
-                        self.faiss_index = faiss.IndexFlatL2(dimension)
-                        self.embeddings = new_embeddings
-                    else:
-                        # 기존 임베딩에 추가
-                        self.embeddings = np.concatenate((self.embeddings, new_embeddings), axis=0)
-                    
-                    # FAISS에 추가
-                    self.faiss_index.add(new_embeddings.astype('float32'))
-                    logger.info(f"Added {len(new_chunks)} chunks to FAISS index. Total: {self.faiss_index.ntotal}")
-                else:
-                    logger.warning("Failed to compute embeddings for new chunks")
+                if error is not None:
+                    raise error
+                if self.faiss_index is None:
+                    self.faiss_index = faiss.IndexFlatL2(embeddings.shape[1])
+                self._embedding_store.append(embeddings)
+                self.faiss_index.add(embeddings)
+                return True
             except Exception as e:
-                logger.warning(f"Failed to update FAISS index: {e}")
+                logger.warning(f"FAISS index update failed: {e}")
+                self._drop_vector_index()
+                return False
+    
+    def _drop_vector_index(self):
+        """FAISS/임베딩 비활성화 (행 번호가 청크 ID와 어긋난 채로 남지 않도록)"""
+        self.faiss_index = None
+        self._embedding_store.clear()
+    
+    def _embed_existing_chunks(self):
+        """현재 청크 전체를 배치 단위로 임베딩 (삭제 표시된 청크는 빈 텍스트로 행 번호 유지)"""
+        self._embedding_store.clear()
+        total = len(self.chunks)
+        for start in range(0, total, self.ingest_batch_size):
+            texts = [self.index.get(i, "") for i in range(start, min(start + self.ingest_batch_size, total))]
+            embeddings = self.compute_embeddings(texts)
+            if embeddings is None:
+                self._embedding_store.clear()
+                return
+            self._embedding_store.append(embeddings)
+    
+    def remove_chunks(self, chunk_ids) -> int:
+        """
+        청크 삭제 표시 (tombstone) - 검색에서 제외, 다음 전체 재구축 시 정리
+        
+        청크 ID(위치)는 그대로 유지되므로 FAISS/임베딩 행렬을 다시 만들 필요가 없습니다.
+        
+        Args:
+            chunk_ids: 삭제할 청크 ID 목록
+            
+        Returns:
+            새로 삭제 표시된 청크 수
+        """
+        removed = 0
+        with self.index_lock:
+            for chunk_id in chunk_ids:
+                chunk_id = int(chunk_id)
+                if chunk_id in self.tombstones or not 0 <= chunk_id < len(self.chunks):
+                    continue
+                self.index.pop(chunk_id, None)
+                self.chunks[chunk_id] = {"text": "", "tombstone": True}
+                self.tombstones.add(chunk_id)
+                removed += 1
+            if removed:
+                self.index_version += 1
+        return removed
+    
+    def _rank_scores(self, scores: np.ndarray, top_k: int) -> np.ndarray:
+        """유사도 상위 인덱스 (삭제 표시된 청크 제외)"""
+        if self.tombstones:
+            dead = [i for i in self.tombstones if i < len(scores)]
+            if dead:
+                scores = scores.copy()
+                scores[dead] = -np.inf
+                top_k = min(top_k, len(scores) - len(dead))
+        return np.argsort(scores)[::-1][:top_k]
     
     def load_embeddings(self, model_path: Optional[str] = None, device: Optional[str] = None):
         """
@@ -640,113 +859,178 @@ class RAGManager:
         Returns:
             [{"text": str, "score": float}] 리스트
         """
-        # 인덱스가 비어있으면 로드 시도 (Self-healing)
-        if not self.index:
-            try:
-                logger.info("RAG 인덱스가 비어있어 로드를 시도합니다...")
-                self.load_index()
-            except Exception as e:
-                logger.warning(f"RAG 인덱스 자동 로드 실패: {e}")
-
-        if not self.index:
-            logger.warning("RAG 인덱스가 여전히 비어있습니다. 검색 결과 없음.")
+        if not self._ensure_index_ready():
+            return []
+        
+        # 재색인 스레드가 청크/인덱스/tombstone을 바꾸는 도중의 상태를 읽지 않도록 잠금
+        with self.index_lock:
+            # 하이브리드 검색 (TF-IDF + Vector)
+            if use_hybrid and self.embedding_model is not None:
+                try:
+                    # Vector 검색 (임베딩 기반)
+                    vector_results = self._vector_search(query, top_k)
+                    
+                    # TF-IDF 검색 (키워드 기반)
+                    tfidf_results = self._tfidf_search(query, top_k)
+                    
+                    return self._merge_hybrid(vector_results, tfidf_results, top_k)
+                    
+                except Exception as e:
+                    logger.warning(f"Hybrid search failed: {e}. Using simple retrieval.")
+            
+            # 단순 임베딩 검색
+            if self.embedding_model is not None:
+                try:
+                    query_embedding = self.embedding_model.encode([query], show_progress_bar=False)[0]
+                    
+                    if self.embeddings is None:
+                        self._embed_existing_chunks()
+                    
+                    if self.embeddings is not None:
+                        # FAISS 인덱스 사용
+                        if self.faiss_index is not None:
+                            query_emb = query_embedding.reshape(1, -1).astype('float32')
+                            distances, indices = self.faiss_index.search(query_emb, top_k + len(self.tombstones))
+                            
+                            results = []
+                            for i, idx in enumerate(indices[0]):
+                                if len(results) >= top_k:
+                                    break
+                                if 0 <= idx < len(self.chunks) and int(idx) not in self.tombstones:
+                                    # 거리를 유사도로 변환 (1 / (1 + distance))
+                                    score = 1.0 / (1.0 + float(distances[0][i]))
+                                    results.append({
+                                        "text": self.chunks[idx],
+                                        "score": score,
+                                        "index": int(idx)
+                                    })
+                            return results
+                        else:
+                            # 코사인 유사도 계산
+                            scores = np.dot(self.embeddings, query_embedding) / (
+                                np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding)
+                            )
+                            
+                            top_indices = self._rank_scores(scores, top_k)
+                            
+                            results = []
+                            for idx in top_indices:
+                                results.append({
+                                    "text": self.index[idx],
+                                    "score": float(scores[idx]),
+                                    "index": int(idx)
+                                })
+                            return results
+                except Exception as e:
+                    logger.warning(f"Embedding-based retrieval failed: {e}. Using keyword retrieval.")
+            
+            # 키워드 기반 검색 (fallback)
+            return self._tfidf_search(query, top_k)
+    
+    def retrieve_batch(self, queries: List[str], top_k: int = 3, use_hybrid: bool = True) -> List[List[Dict]]:
+        """
+        여러 쿼리를 한 번에 검색 (retrieve와 동일한 결과, 쿼리 임베딩은 1회 배치 인코딩)
+        
+        Args:
+            queries: 검색 쿼리 리스트
+            top_k: 쿼리별 반환할 상위 k개 결과
+            use_hybrid: 하이브리드 검색 사용 여부 (TF-IDF + Vector)
+            
+        Returns:
+            쿼리 순서대로 [{"text": str, "score": float, "index": int}] 리스트의 리스트
+        """
+        if not queries:
             return []
+        if not self._ensure_index_ready():
+            return [[] for _ in queries]
         
-        # 하이브리드 검색 (TF-IDF + Vector)
         if use_hybrid and self.embedding_model is not None:
             try:
-                # Vector 검색 (임베딩 기반)
-                vector_results = self._vector_search(query, top_k)
-                
-                # TF-IDF 검색 (키워드 기반)
-                tfidf_results = self._tfidf_search(query, top_k)
-                
-                # 하이브리드 점수 결합 (0.3 * TF-IDF + 0.7 * Vector)
-                merged = {}
-                for r in vector_results:
-                    idx = r.get("index", -1)
-                    if idx >= 0:
-                        merged[idx] = {
-                            "text": r.get("text", ""),
-                            "vector_score": r.get("score", 0.0),
-                            "tfidf_score": 0.0
-                        }
-                
-                for r in tfidf_results:
-                    idx = r.get("index", -1)
-                    if idx >= 0:
-                        if idx in merged:
-                            merged[idx]["tfidf_score"] = r.get("score", 0.0)
-                        else:
-                            merged[idx] = {
-                                "text": r.get("text", ""),
-                                "vector_score": 0.0,
-                                "tfidf_score": r.get("score", 0.0)
-                            }
-                
-                # 최종 점수 계산
-                final_results = []
-                for idx, data in merged.items():
-                    final_score = 0.3 * data["tfidf_score"] + 0.7 * data["vector_score"]
-                    final_results.append({
-                        "text": data["text"],
-                        "score": final_score,
-                        "index": idx
-                    })
-                
-                final_results.sort(key=lambda x: -x["score"])
-                return final_results[:top_k]
-                
+                with self.index_lock:
+                    vector_batches = self._vector_search_batch(queries, top_k)
+                    return [
+                        self._merge_hybrid(vector_results, self._tfidf_search(query, top_k), top_k)
+                        for query, vector_results in zip(queries, vector_batches)
+                    ]
             except Exception as e:
-                logger.warning(f"Hybrid search failed: {e}. Using simple retrieval.")
+                logger.warning(f"Batch hybrid search failed: {e}. Falling back to per-query retrieval.")
+        
+        return [self.retrieve(query, top_k=top_k, use_hybrid=use_hybrid) for query in queries]
+    
+    def _run_lazy_loader(self):
+        """
+        지연된 임베딩 모델/인덱스 로드 (다른 스레드가 로드 중이면 완료까지 대기)
+        
+        로더(지연 단계) 실행 중 같은 스레드가 is_available()/retrieve() 등으로 다시 들어오면
+        자기 자신의 완료를 기다리게 되므로 그대로 반환합니다.
+        """
+        loader = self.lazy_loader
+        if loader is None or getattr(self._lazy_state, "loading", False):
+            return
+        self._lazy_state.loading = True
+        try:
+            loader()
+        except Exception as e:
+            logger.warning(f"RAG 지연 초기화 실패: {e}")
+        finally:
+            self._lazy_state.loading = False
+            self.lazy_loader = None
+    
+    def _ensure_index_ready(self) -> bool:
+        """지연 초기화/자동 로드를 수행하고 검색 가능한 인덱스가 있는지 반환"""
+        # 지연된 임베딩 모델/인덱스 로드 (최초 검색 시 1회)
+        self._run_lazy_loader()
         
-        # 단순 임베딩 검색
-        if self.embedding_model is not None:
+        # 인덱스가 비어있으면 로드 시도 (Self-healing, 전체 재구축 중에는 구축 결과로 교체되므로 제외)
+        if not self.index and not self._rebuilding:
             try:
-                query_embedding = self.embedding_model.encode([query], show_progress_bar=False)[0]
-                
-                if self.embeddings is None:
-                    chunk_texts = list(self.index.values())
-                    self.embeddings = self.compute_embeddings(chunk_texts)
-                
-                if self.embeddings is not None:
-                    # FAISS 인덱스 사용
-                    if self.faiss_index is not None:
-                        query_emb = query_embedding.reshape(1, -1).astype('float32')
-                        distances, indices = self.faiss_index.search(query_emb, top_k)
-                        
-                        results = []
-                        for i, idx in enumerate(indices[0]):
-                            if idx < len(self.chunks):
-                                # 거리를 유사도로 변환 (1 / (1 + distance))
-                                score = 1.0 / (1.0 + float(distances[0][i]))
-                                results.append({
-                                    "text": self.chunks[idx],
-                                    "score": score,
-                                    "index": int(idx)
-                                })
-                        return results
-                    else:
-                        # 코사인 유사도 계산
-                        scores = np.dot(self.embeddings, query_embedding) / (
-                            np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding)
-                        )
-                        
-                        top_indices = np.argsort(scores)[::-1][:top_k]
-                        
-                        results = []
-                        for idx in top_indices:
-                            results.append({
-                                "text": self.index[idx],
-                                "score": float(scores[idx]),
-                                "index": int(idx)
-                            })
-                        return results
+                logger.info("RAG 인덱스가 비어있어 로드를 시도합니다...")
+                self.load_index()
             except Exception as e:
-                logger.warning(f"Embedding-based retrieval failed: {e}. Using keyword retrieval.")
+                logger.warning(f"RAG 인덱스 자동 로드 실패: {e}")
+
+        if not self.index:
+            logger.warning("RAG 인덱스가 여전히 비어있습니다. 검색 결과 없음.")
+            return False
+        return True
+    
+    @staticmethod
+    def _merge_hybrid(vector_results: List[Dict], tfidf_results: List[Dict], top_k: int) -> List[Dict]:
+        """하이브리드 점수 결합 (0.3 * TF-IDF + 0.7 * Vector)"""
+        merged = {}
+        for r in vector_results:
+            idx = r.get("index", -1)
+            if idx >= 0:
+                merged[idx] = {
+                    "text": r.get("text", ""),
+                    "vector_score": r.get("score", 0.0),
+                    "tfidf_score": 0.0
+                }
         
-        # 키워드 기반 검색 (fallback)
-        return self._tfidf_search(query, top_k)
+        for r in tfidf_results:
+            idx = r.get("index", -1)
+            if idx >= 0:
+                if idx in merged:
+                    merged[idx]["tfidf_score"] = r.get("score", 0.0)
+                else:
+                    merged[idx] = {
+                        "text": r.get("text", ""),
+                        "vector_score": 0.0,
+                        "tfidf_score": r.get("score", 0.0)
+                    }
+        
+        # 최종 점수 계산
+        final_results = []
+        for idx, data in merged.items():
+            final_score = 0.3 * data["tfidf_score"] + 0.7 * data["vector_score"]
+            final_results.append({
+                "text": data["text"],
+                "score": final_score,
+                "index": idx
+            })
+        
+        final_results.sort(key=lambda x: -x["score"])
+        return final_results[:top_k]
     
     def _vector_search(self, query: str, top_k: int) -> List[Dict]:
         """벡터 검색"""
@@ -759,7 +1043,7 @@ class RAGManager:
                 np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding)
             )
             
-            top_indices = np.argsort(scores)[::-1][:top_k]
+            top_indices = self._rank_scores(scores, top_k)
             results = []
             for idx in top_indices:
                 results.append({
@@ -771,23 +1055,53 @@ class RAGManager:
         except Exception:
             return []
     
-    def _tfidf_search(self, query: str, top_k: int) -> List[Dict]:
-        """TF-IDF 기반 키워드 검색"""
+    def _vector_search_batch(self, queries: List[str], top_k: int) -> List[List[Dict]]:
+        """벡터 검색 (쿼리 임베딩 1회 배치 인코딩, 청크 norm 1회 계산)"""
+        if self.embedding_model is None or self.embeddings is None:
+            return [[] for _ in queries]
+        
+        query_embeddings = self.embedding_model.encode(list(queries), show_progress_bar=False)
+        chunk_norms = np.linalg.norm(self.embeddings, axis=1)
+        
+        batches = []
+        for query_embedding in query_embeddings:
+            # _vector_search와 동일한 연산 순서 (동점 순위까지 동일하게 유지)
+            scores = np.dot(self.embeddings, query_embedding) / (
+                chunk_norms * np.linalg.norm(query_embedding)
+            )
+            top_indices = self._rank_scores(scores, top_k)
+            batches.append([
+                {"text": self.index[idx], "score": float(scores[idx]), "index": int(idx)}
+                for idx in top_indices
+            ])
+        return batches
+    
+    def _chunk_token_stats(self) -> List[tuple]:
+        """청크별 토큰 카운터 (인덱스 버전이 바뀔 때만 재계산)"""
         from collections import Counter
         
+        cache = self._token_cache
+        if cache is not None and cache[0] == self.index_version:
+            return cache[1]
+        
+        stats = []
+        for idx, chunk in self.index.items():
+            chunk_tokens = re.findall(r"[\w가-힣_-]+", chunk.lower())
+            if chunk_tokens:
+                stats.append((idx, chunk, Counter(chunk_tokens), len(chunk_tokens)))
+        self._token_cache = (self.index_version, stats)
+        return stats
+    
+    def _tfidf_search(self, query: str, top_k: int) -> List[Dict]:
+        """TF-IDF 기반 키워드 검색"""
         query_tokens = re.findall(r"[\w가-힣_-]+", query.lower())
         if not query_tokens:
             return []
         
         scored = []
-        for idx, chunk in self.index.items():
-            chunk_tokens = re.findall(r"[\w가-힣_-]+", chunk.lower())
-            if not chunk_tokens:
-                continue
-            
+        for idx, chunk, chunk_counter, token_count in self._chunk_token_stats():
             # 간단한 TF-IDF 점수 계산
-            chunk_counter = Counter(chunk_tokens)
-            score = sum(chunk_counter.get(token, 0) for token in query_tokens) / max(len(chunk_tokens), 1)
+            score = sum(chunk_counter.get(token, 0) for token in query_tokens) / max(token_count, 1)
             
             if score > 0:
                 scored.append({
@@ -814,7 +1128,8 @@ class RAGManager:
         import json
         index_data = {
             "chunks": self.chunks,
-            "index": self.index
+            "index": self.index,
+            "tombstones": sorted(self.tombstones)
         }
         
         with open(path, 'w', encoding='utf-8') as f:
@@ -842,6 +1157,8 @@ class RAGManager:
         # 이미 로드된 경우 중복 로드 방지
         if self.faiss_index is not None and len(self.chunks) > 0:
             return  # 이미 로드되었으므로 재로드 불필요
+        # 파일을 읽는 동안 인덱스가 재구축/갱신되면 디스크의 이전 인덱스로 덮어쓰지 않음
+        start_version = self.index_version
         
         if path is None:
             path = os.path.join(self.embedding_path, "rag_index.json")
@@ -883,26 +1200,38 @@ class RAGManager:
         with open(path, 'r', encoding='utf-8') as f:
             index_data = json.load(f)
         
-        self.chunks = index_data.get("chunks", [])
-        self.index = {int(k): v for k, v in index_data.get("index", {}).items()}
+        chunks = index_data.get("chunks", [])
         
-        # FAISS 인덱스 로드
+        # FAISS 인덱스 로드 (파일 읽기는 잠금 밖에서 수행)
+        faiss_index = None
         if has_faiss_file:
             try:
                 # Windows에서 한글 경로 처리
                 faiss_path_normalized = _get_windows_short_path(faiss_path)
-                self.faiss_index = faiss.read_index(faiss_path_normalized)
+                faiss_index = faiss.read_index(faiss_path_normalized)
                 logger.info(f"FAISS index loaded: {faiss_path}")
                 
                 # FAISS 인덱스 크기와 청크 수 일치 확인
-                faiss_size = self.faiss_index.ntotal
-                chunks_size = len(self.chunks)
+                faiss_size = faiss_index.ntotal
+                chunks_size = len(chunks)
                 if faiss_size != chunks_size:
                     logger.warning(f"FAISS 인덱스 크기({faiss_size})와 청크 수({chunks_size})가 일치하지 않습니다.")
                     logger.warning(f"인덱스 재구축을 권장합니다.")
             except Exception as e:
                 logger.warning(f"FAISS index load failed: {e}")
-                self.faiss_index = None
+                faiss_index = None
+        
+        # 청크/인덱스/tombstone/FAISS를 한 번에 교체
+        with self.index_lock:
+            if self._rebuilding or self.index_version != start_version:
+                logger.info("인덱스 재구축/갱신 중이어서 저장된 인덱스 로드를 건너뜁니다.")
+                return
+            self.chunks = chunks
+            self.index = {int(k): v for k, v in index_data.get("index", {}).items()}
+            self.tombstones = set(index_data.get("tombstones", []))
+            if has_faiss_file:
+                self.faiss_index = faiss_index
+            self.index_version += 1
     
     def retrieve_with_context(self, query: str, top_k: int = 3) -> List[Dict]:
         """
@@ -916,6 +1245,11 @@ class RAGManager:
         Returns:
             [{"doc_id": int, "text": str, "score": float, "index": int, "metadata": dict}] 리스트
         """
+        # 검색 결과의 청크 ID로 메타데이터를 읽으므로 같은 인덱스 상태에서 수행
+        with self.index_lock:
+            return self._retrieve_with_context(query, top_k)
+    
+    def _retrieve_with_context(self, query: str, top_k: int) -> List[Dict]:
         # 기본 검색 수행
         results = self.retrieve(query, top_k=top_k, use_hybrid=True)
         
@@ -979,6 +1313,9 @@ class RAGManager:
         Returns:
             사용 가능 여부 (임베딩 모델과 인덱스가 있는 경우 True)
         """
+        # 지연 로드 대상이면 최초 확인 시 로드 (호출부는 is_available()로 RAG 사용 여부를 판단)
+        self._run_lazy_loader()
+        
         # 임베딩 모델이 있고, 인덱스가 있으면 사용 가능
         has_model = self.embedding_model is not None
         has_index = len(self.chunks) > 0 or (self.faiss_index is not None and FAISS_AVAILABLE)
@@ -0,0 +1,280 @@
+# core_pipeline/rag_manifest.py
+# -*- coding: utf-8 -*-
+"""
+RAG Document Manifest
+RAG 문서 매니페스트 기반 증분 재색인
+
+문서별 (크기, 수정시각, 내용 해시 → 청크 ID)를 기록해 두고 재색인 시
+- 신규/변경 문서만 청킹·임베딩·색인 (문서 → 청크 → 임베딩 배치 스트리밍)
+- 변경/삭제 문서의 기존 청크는 tombstone 처리
+- tombstone 비율이 커지거나 매니페스트와 인덱스가 어긋나면 전체 재구축
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "rag_manifest.json"
+SUPPORTED_SUFFIXES = ('.txt', '.md')
+CANDIDATE_SUFFIXES = ('.txt', '.pdf', '.md', '.docx')
+DEFAULT_COMPACTION_RATIO = 0.3
+
+# 동시에 두 재색인이 같은 인덱스를 수정하지 않도록 보호
+_SYNC_LOCK = threading.Lock()
+
+
+def is_doctrine_document(name: str, content: str) -> bool:
+    """파일명(DOCTRINE-*) 또는 헤더(# Doctrine_ID:)로 교리 문서 여부 판단"""
+    return name.upper().startswith("DOCTRINE") or "# Doctrine_ID:" in content
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RAGDocumentManifest:
+    """문서명 → {size, mtime, sha256, doctrine, chunk_ids} 매니페스트"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.documents: Dict[str, Dict] = {}
+        self.chunk_count: Optional[int] = None
+
+    @classmethod
+    def for_rag_manager(cls, rag_manager) -> "RAGDocumentManifest":
+        """RAG 인덱스와 같은 경로(embedding_path)에 저장되는 매니페스트"""
+        return cls(os.path.join(rag_manager.embedding_path, MANIFEST_FILENAME)).load()
+
+    def load(self) -> "RAGDocumentManifest":
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.documents = data.get("documents", {})
+                self.chunk_count = data.get("chunk_count")
+            except Exception as e:
+                logger.warning(f"RAG 매니페스트 로드 실패 (전체 재구축 필요): {e}")
+                self.documents = {}
+                self.chunk_count = None
+        return self
+
+    def save(self, chunk_count: int):
+        self.chunk_count = chunk_count
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "updated_at": datetime.now().isoformat(),
+            "chunk_count": chunk_count,
+            "documents": self.documents
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def matches_index(self, rag_manager) -> bool:
+        """매니페스트가 현재 인덱스를 기술하는지 (다른 경로로 재구축되었으면 False)"""
+        return bool(self.documents) and self.chunk_count == len(rag_manager.chunks)
+
+    def classify(self, files: List[Path]) -> Tuple[List[Path], List[Path], List[str], int]:
+        """
+        문서 변경 분류 (크기/수정시각이 같으면 해시 생략)
+
+        Returns:
+            (신규, 변경, 삭제된 문서명, 변경 없음 수)
+        """
+        added, modified = [], []
+        unchanged = 0
+        current = set()
+        for path in files:
+            current.add(path.name)
+            entry = self.documents.get(path.name)
+            if entry is None:
+                added.append(path)
+                continue
+            stat = path.stat()
+            if entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+                unchanged += 1
+                continue
+            if entry.get("sha256") == _file_hash(path):
+                # 내용은 같고 메타데이터만 바뀜 (touch, 복사 등)
+                entry["size"], entry["mtime"] = stat.st_size, stat.st_mtime
+                unchanged += 1
+                continue
+            modified.append(path)
+        deleted = [name for name in self.documents if name not in current]
+        return added, modified, deleted, unchanged
+
+    def record(self, path: Path, doctrine: bool, chunk_ids: List[int]):
+        stat = path.stat()
+        self.documents[path.name] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": _file_hash(path),
+            "doctrine": doctrine,
+            "chunk_ids": chunk_ids
+        }
+
+
+def list_documents(docs_dir) -> List[Path]:
+    """색인 대상 문서 목록 (지원하지 않는 형식은 경고 후 제외)"""
+    docs_path = Path(docs_dir)
+    if not docs_path.exists():
+        return []
+    files = []
+    for path in sorted(docs_path.glob("*.*")):
+        suffix = path.suffix.lower()
+        if suffix in SUPPORTED_SUFFIXES:
+            files.append(path)
+        elif suffix in CANDIDATE_SUFFIXES:
+            logger.warning(f"Unsupported format: {path.suffix}")
+    return files
+
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception as e:
+        logger.warning(f"Failed to read {path.name}: {e}")
+        return None
+
+
+def _classify_documents(files: List[Path]) -> List[Tuple[Path, bool]]:
+    """비어 있지 않은 문서와 교리 문서 여부 (내용은 보관하지 않음)"""
+    documents = []
+    for path in files:
+        content = _read_text(path)
+        if content and content.strip():
+            documents.append((path, is_doctrine_document(path.name, content)))
+    return documents
+
+
+def _iter_chunks(rag_manager, documents: List[Tuple[Path, bool]], start_id: int,
+                 chunk_ids: Dict[str, List[int]]) -> Iterator[Dict]:
+    """
+    교리 → 일반 문서 순으로 문서를 하나씩 읽어 청크 스트림 생성 (전체 구축과 동일한 순서)
+
+    Args:
+        start_id: 첫 청크에 부여될 청크 ID
+        chunk_ids: 문서명 → 청크 ID 리스트 (생성하면서 기록)
+    """
+    next_id = start_id
+    for doctrine in (True, False):
+        paths = [path for path, is_doc in documents if is_doc == doctrine]
+        if not paths:
+            continue
+        texts = (_read_text(path) or "" for path in paths)
+        names = (path.name for path in paths)
+        chunker = rag_manager.iter_doctrine_chunks if doctrine else rag_manager.iter_document_chunks
+        for chunk in chunker(texts, doc_names=names):
+            chunk_ids.setdefault(chunk.get("source"), []).append(next_id)
+            next_id += 1
+            yield chunk
+
+
+def _record_documents(manifest: RAGDocumentManifest, documents: List[Tuple[Path, bool]],
+                      chunk_ids: Dict[str, List[int]]):
+    for path, doctrine in documents:
+        manifest.record(path, doctrine, chunk_ids.get(path.name, []))
+
+
+def sync_documents(rag_manager, docs_dir, force_full: bool = False,
+                   compaction_ratio: float = DEFAULT_COMPACTION_RATIO) -> Dict:
+    """
+    문서 디렉토리와 RAG 인덱스 동기화 (증분 우선, 필요 시 전체 재구축)
+
+    Args:
+        rag_manager: RAGManager 인스턴스
+        docs_dir: 문서 디렉토리
+        force_full: 전체 재구축 강제
+        compaction_ratio: tombstone 비율이 이 값을 넘으면 전체 재구축
+
+    Returns:
+        {"mode", "added", "modified", "deleted", "unchanged", "new_chunks", "removed_chunks", "total_chunks"}
+    """
+    with _SYNC_LOCK:
+        files = list_documents(docs_dir)
+        manifest = RAGDocumentManifest.for_rag_manager(rag_manager)
+
+        if not force_full and manifest.matches_index(rag_manager):
+            added, modified, deleted, unchanged = manifest.classify(files)
+            stale = len(rag_manager.tombstones) + sum(
+                len(manifest.documents[name].get("chunk_ids", []))
+                for name in deleted + [p.name for p in modified]
+            )
+            if stale <= compaction_ratio * max(len(rag_manager.chunks), 1):
+                return _apply_incremental(rag_manager, manifest, added, modified, deleted, unchanged)
+            logger.info("RAG tombstone 비율이 높아 전체 재구축합니다.")
+
+        return _rebuild_all(rag_manager, manifest, files)
+
+
+def _apply_incremental(rag_manager, manifest, added, modified, deleted, unchanged) -> Dict:
+    removed = 0
+    for name in deleted + [p.name for p in modified]:
+        entry = manifest.documents.pop(name, {})
+        removed += rag_manager.remove_chunks(entry.get("chunk_ids", []))
+
+    documents = _classify_documents(added + modified)
+    chunk_ids: Dict[str, List[int]] = {}
+    start_id = len(rag_manager.chunks)
+    if documents:
+        rag_manager.add_to_index(_iter_chunks(rag_manager, documents, start_id, chunk_ids))
+    new_chunks = len(rag_manager.chunks) - start_id
+    _record_documents(manifest, documents, chunk_ids)
+
+    if added or modified or deleted:
+        rag_manager.save_index()
+    manifest.save(len(rag_manager.chunks))
+
+    stats = {
+        "mode": "incremental",
+        "added": len(added),
+        "modified": len(modified),
+        "deleted": len(deleted),
+        "unchanged": unchanged,
+        "new_chunks": new_chunks,
+        "removed_chunks": removed,
+        "total_chunks": len(rag_manager.chunks) - len(rag_manager.tombstones)
+    }
+    logger.info(f"RAG 증분 재색인 완료: {stats}")
+    return stats
+
+
+def _rebuild_all(rag_manager, manifest, files: List[Path]) -> Dict:
+    documents = _classify_documents(files)
+    chunk_ids: Dict[str, List[int]] = {}
+
+    manifest.documents = {}
+    if documents:
+        rag_manager.build_index(_iter_chunks(rag_manager, documents, 0, chunk_ids), use_faiss=True)
+        rag_manager.save_index()
+        _record_documents(manifest, documents, chunk_ids)
+        manifest.save(len(rag_manager.chunks))
+    new_chunks = len(rag_manager.chunks) if documents else 0
+
+    stats = {
+        "mode": "full",
+        "added": len(documents),
+        "modified": 0,
+        "deleted": 0,
+        "unchanged": 0,
+        "new_chunks": new_chunks,
+        "removed_chunks": 0,
+        "total_chunks": new_chunks,
+        "doctrine_docs": sum(1 for _, doctrine in documents if doctrine),
+        "general_docs": sum(1 for _, doctrine in documents if not doctrine)
+    }
+    logger.info(f"RAG 전체 재구축 완료: {stats}")
+    return stats
@@ -3,107 +3,92 @@
 """
 실시간 협업 및 알림 시스템
 """
-import json
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
+from core_pipeline.state_store import get_state_store, store_path_for
+
+# 활성 사용자로 보는 최근 활동 시간
+ACTIVE_WINDOW = timedelta(minutes=5)
+# 이 시간 이상 유지된 리소스 잠금은 자동 해제
+LOCK_TIMEOUT = timedelta(minutes=10)
+
 
 class RealtimeCollaboration:
-    """실시간 협업 및 알림 시스템"""
+    """실시간 협업 및 알림 시스템 (상태 저장소의 sessions/notifications 컬렉션 사용)"""
     
     def __init__(
         self,
         active_sessions_file: str = "data/collaboration/active_sessions.json",
-        notifications_file: str = "data/collaboration/notifications.json"
+        notifications_file: str = "data/collaboration/notifications.json",
+        store=None
     ):
         self.active_sessions_file = Path(active_sessions_file)
         self.notifications_file = Path(notifications_file)
+        self.store = store or get_state_store(store_path_for(self.active_sessions_file))
         
-        # 디렉토리 생성
-        self.active_sessions_file.parent.mkdir(parents=True, exist_ok=True)
-        self.notifications_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        self.active_sessions = self._load_active_sessions()
-        self.notifications = self._load_notifications()
+        # 기존 JSON 파일은 최초 1회만 가져옴
+        self.store.import_legacy(
+            f"sessions:{self.active_sessions_file.name}", self.active_sessions_file, self._import_sessions
+        )
+        self.store.import_legacy(
+            f"notifications:{self.notifications_file.name}", self.notifications_file, self._import_notifications
+        )
     
-    def _load_active_sessions(self) -> Dict:
-        """활성 세션 로드"""
-        if self.active_sessions_file.exists():
-            try:
-                with open(self.active_sessions_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[WARN] 활성 세션 파일 로드 실패: {e}")
-                return {}
-        return {}
+    def _import_sessions(self, sessions: Dict):
+        """기존 active_sessions.json 가져오기"""
+        for session_id, session_data in sessions.items():
+            self.store.put("sessions", {**session_data, "session_id": session_id})
     
-    def _save_active_sessions(self):
-        """활성 세션 저장"""
-        try:
-            with open(self.active_sessions_file, 'w', encoding='utf-8') as f:
-                json.dump(self.active_sessions, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[ERROR] 활성 세션 파일 저장 실패: {e}")
+    def _import_notifications(self, notifications: List[Dict]):
+        """기존 notifications.json 가져오기 (read 값이 없던 알림은 읽지 않음으로 저장)"""
+        for notification in notifications:
+            if notification.get("notification_id"):
+                # read 컬럼이 NULL이면 get_unread_notifications(read=False)에서 누락되므로 기본값 지정
+                self.store.insert_unique("notifications", {**notification, "read": bool(notification.get("read"))})
     
-    def _load_notifications(self) -> List[Dict]:
-        """알림 목록 로드"""
-        if self.notifications_file.exists():
-            try:
-                with open(self.notifications_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[WARN] 알림 파일 로드 실패: {e}")
-                return []
-        return []
+    @property
+    def active_sessions(self) -> Dict:
+        """세션 ID → 세션 정보 (조회용 스냅샷)"""
+        return {session["session_id"]: session for session in self.store.all("sessions")}
     
-    def _save_notifications(self):
-        """알림 목록 저장"""
-        try:
-            with open(self.notifications_file, 'w', encoding='utf-8') as f:
-                json.dump(self.notifications, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[ERROR] 알림 파일 저장 실패: {e}")
+    @property
+    def notifications(self) -> List[Dict]:
+        """전체 알림 목록 (조회용 스냅샷)"""
+        return self.store.all("notifications")
     
     def register_active_session(self, session_id: str, user_info: Dict):
         """활성 세션 등록 (사용자 로그인 시)"""
-        self.active_sessions[session_id] = {
+        self.store.put("sessions", {
             **user_info,
             "last_activity": datetime.now().isoformat(),
             "session_id": session_id
-        }
-        self._save_active_sessions()
+        })
     
     def update_user_activity(self, user_id: str):
         """사용자 활동 업데이트"""
-        # session_id로 찾기
-        for session_id, session_data in self.active_sessions.items():
-            if session_data.get("user_id") == user_id:
+        # 사용자 ID 인덱스로 세션 찾기 (해당 세션 1건만 갱신)
+        with self.store.transaction():
+            sessions = self.store.find("sessions", user_id=user_id, limit=1)
+            if sessions:
+                session_data = sessions[0]
                 session_data["last_activity"] = datetime.now().isoformat()
-                self._save_active_sessions()
-                return
+                self.store.put("sessions", session_data)
     
     def get_active_users(self) -> List[Dict]:
         """현재 활성 사용자 목록 (같은 네트워크의 모든 사용자)"""
-        # 5분 이내 활동한 사용자만
-        cutoff = datetime.now() - timedelta(minutes=5)
-        active = []
-        
-        for session_id, session_data in self.active_sessions.items():
-            last_activity_str = session_data.get("last_activity", "2000-01-01T00:00:00")
-            try:
-                last_activity = datetime.fromisoformat(last_activity_str)
-                if last_activity > cutoff:
-                    active.append({
-                        "user_id": session_data.get("user_id"),
-                        "username": session_data.get("username"),
-                        "role": session_data.get("role"),
-                        "last_activity": last_activity_str
-                    })
-            except Exception:
-                continue
-        
-        return active
+        # 5분 이내 활동한 사용자만 (ISO 시각 문자열 비교, last_activity 인덱스 사용)
+        cutoff = (datetime.now() - ACTIVE_WINDOW).isoformat()
+        return [
+            {
+                "user_id": session_data.get("user_id"),
+                "username": session_data.get("username"),
+                "role": session_data.get("role"),
+                "last_activity": session_data.get("last_activity")
+            }
+            for session_data in self.store.find("sessions", after=("last_activity", cutoff))
+        ]
     
     def send_notification(
         self,
@@ -113,9 +98,8 @@ class RealtimeCollaboration:
         data: Dict = None
     ) -> str:
         """알림 전송 (특정 사용자에게)"""
-        notification_id = f"NOTIF_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
         notification = {
-            "notification_id": notification_id,
+            "notification_id": f"NOTIF_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}",
             "user_id": user_id,
             "type": notification_type,
             "message": message,
@@ -124,10 +108,7 @@ class RealtimeCollaboration:
             "created_at": datetime.now().isoformat()
         }
         
-        self.notifications.append(notification)
-        self._save_notifications()
-        
-        return notification_id
+        return self.store.insert_unique("notifications", notification)
     
     def send_notification_by_role(
         self,
@@ -146,7 +127,7 @@ class RealtimeCollaboration:
         # 활성 사용자가 없으면 모든 사용자 중에서 찾기
         if not target_users:
             from core_pipeline.user_manager import UserManager
-            user_manager = UserManager()
+            user_manager = UserManager(store=self.store)
             all_users = user_manager.get_users_by_role(target_role)
             target_users = [{"user_id": u.get("user_id")} for u in all_users]
         
@@ -238,64 +219,46 @@ class RealtimeCollaboration:
     
     def get_unread_notifications(self, user_id: str) -> List[Dict]:
         """읽지 않은 알림 조회"""
-        return [
-            n for n in self.notifications
-            if n.get("user_id") == user_id and not n.get("read", False)
-        ]
+        return self.store.find("notifications", order_by="created_at", user_id=user_id, read=False)
     
     def mark_notification_read(self, notification_id: str):
         """알림 읽음 처리"""
-        for n in self.notifications:
-            if n.get("notification_id") == notification_id:
-                n["read"] = True
-                n["read_at"] = datetime.now().isoformat()
-                self._save_notifications()
-                break
+        def mark_read(n: Dict):
+            n["read"] = True
+            n["read_at"] = datetime.now().isoformat()
+        
+        self.store.update("notifications", notification_id, mark_read)
     
     def lock_resource(
         self,
         resource_id: str,
         user_id: str
     ) -> bool:
-        """리소스 잠금 (동시 편집 방지)"""
-        lock_file = Path(f"data/collaboration/locks/{resource_id}.lock")
-        lock_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # 이미 잠금이 있는지 확인
-        if lock_file.exists():
-            try:
-                lock_data = json.loads(lock_file.read_text())
-                lock_owner = lock_data.get("user_id")
-                lock_time_str = lock_data.get("locked_at", "2000-01-01T00:00:00")
-                lock_time = datetime.fromisoformat(lock_time_str)
+        """리소스 잠금 (동시 편집 방지, 확인과 설정을 한 트랜잭션에서 수행)"""
+        now = datetime.now()
+        with self.store.transaction():
+            lock_data = self.store.get("resource_locks", resource_id)
+            if lock_data:
+                try:
+                    lock_time = datetime.fromisoformat(lock_data.get("locked_at", "2000-01-01T00:00:00"))
+                except ValueError:
+                    lock_time = None  # 손상된 잠금은 덮어씀
                 
                 # 10분 이상 잠금이면 자동 해제
-                if datetime.now() - lock_time > timedelta(minutes=10):
-                    lock_file.unlink()
-                elif lock_owner != user_id:
+                if lock_time and now - lock_time <= LOCK_TIMEOUT and lock_data.get("user_id") != user_id:
                     return False  # 다른 사용자가 잠금 중
-            except Exception:
-                # 파일이 손상된 경우 삭제
-                lock_file.unlink()
-        
-        # 잠금 설정
-        lock_data = {
-            "user_id": user_id,
-            "resource_id": resource_id,
-            "locked_at": datetime.now().isoformat()
-        }
-        lock_file.write_text(json.dumps(lock_data))
+            
+            # 잠금 설정
+            self.store.put("resource_locks", {
+                "user_id": user_id,
+                "resource_id": resource_id,
+                "locked_at": now.isoformat()
+            })
         return True
     
     def unlock_resource(self, resource_id: str, user_id: str):
         """리소스 잠금 해제"""
-        lock_file = Path(f"data/collaboration/locks/{resource_id}.lock")
-        if lock_file.exists():
-            try:
-                lock_data = json.loads(lock_file.read_text())
-                if lock_data.get("user_id") == user_id:
-                    lock_file.unlink()
-            except Exception:
-                pass
-
-
+        with self.store.transaction():
+            lock_data = self.store.get("resource_locks", resource_id)
+            if lock_data and lock_data.get("user_id") == user_id:
+                self.store.delete("resource_locks", resource_id)
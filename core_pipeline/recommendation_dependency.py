@@ -0,0 +1,424 @@
+# core_pipeline/recommendation_dependency.py
+# -*- coding: utf-8 -*-
+"""
+Recommendation Dependency Graph
+추천 결과의 의존성 그래프 (증분 재계산용 데이터플로우 계층)
+- 각 추천이 의존한 그래프 엔티티(위협, 축선, 자원, 방책)와 점수 요소를 기록
+- 엔티티 → 추천 역색인으로 이벤트 영향 범위를 즉시 조회
+- 위협/자원 이벤트 발생 시 영향받는 축선 상태, 점수 요소, 추천만 재계산
+"""
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from common.situation_converter import SituationInfoConverter
+from core_pipeline.threat_scoring import ThreatScorer
+
+
+# 엔티티 유형
+ENTITY_THREAT = "threat"
+ENTITY_AXIS = "axis"
+ENTITY_RESOURCE = "resource"
+ENTITY_COA = "coa"
+
+# 필요자원 문자열의 부가 표기 (예: "K9 자주포(필수)", "RES001 [예비]")
+_RESOURCE_ANNOTATION = re.compile(r"\s*[\(\[（][^\)\]）]*[\)\]）]")
+
+
+class RecommendationNode:
+    """추천 1건의 의존성 및 점수 요소 스냅샷"""
+
+    def __init__(self, situation_id: str, coa_id: str, coa_name: str,
+                 score: float, factors: Dict[str, float], weights: Dict[str, float]):
+        self.situation_id = situation_id
+        self.coa_id = coa_id
+        self.coa_name = coa_name
+        self.score = score
+        self.factors = factors
+        self.weights = weights
+        self.rank = 0
+        self.threat_id: Optional[str] = None
+        self.axis_id: Optional[str] = None
+        # 자원별 자원 점수 기여분과 현재 가용 여부
+        self.resource_shares: Dict[str, float] = {}
+        self.resource_available: Dict[str, bool] = {}
+        # 역색인에 연결된 엔티티 (등록 해제용)
+        self.entities: List[Tuple[str, str]] = []
+        self.updated_at = datetime.now().isoformat()
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.situation_id, self.coa_id)
+
+    def to_dict(self) -> Dict:
+        return {
+            "situation_id": self.situation_id,
+            "coa_id": self.coa_id,
+            "coa_name": self.coa_name,
+            "score": round(self.score, 4),
+            "rank": self.rank,
+            "factors": {k: round(v, 4) for k, v in self.factors.items()},
+            "threat_id": self.threat_id,
+            "axis_id": self.axis_id,
+            "resources": sorted(self.resource_shares.keys()),
+            "updated_at": self.updated_at
+        }
+
+
+class AxisNode:
+    """축선 상태(AxisState) 중 위협 요약 부분의 증분 재계산용 노드"""
+
+    def __init__(self, axis_id: str):
+        self.axis_id = axis_id
+        # 추적하지 않는 위협들의 점수 합 (등록 시점 AxisState 기준)
+        self.base_score = 0.0
+        # 위협ID → 위협점수 (수준점수 × 유형가중치)
+        self.threat_scores: Dict[str, float] = {}
+        self.threat_type_weights: Dict[str, float] = {}
+
+    @property
+    def threat_score_total(self) -> float:
+        return self.base_score + sum(self.threat_scores.values())
+
+    @property
+    def threat_level(self) -> str:
+        return ThreatScorer.determine_threat_level(self.threat_score_total)
+
+    def to_dict(self) -> Dict:
+        return {
+            "axis_id": self.axis_id,
+            "threat_score_total": round(self.threat_score_total, 4),
+            "threat_level": self.threat_level,
+            "threat_ids": sorted(self.threat_scores.keys())
+        }
+
+
+class RecommendationDependencyGraph:
+    """
+    추천 의존성 그래프
+
+    사용 예:
+        graph = RecommendationDependencyGraph()
+        graph.register_result(agent_result, situation_info)
+        updates = graph.apply_threat_update("THR001", 0.9)
+        updates = graph.apply_resource_update("RES003", 0)
+
+    점수 재계산은 등록 시점의 요소 점수와 가중치(score_breakdown.reasoning)를 기준으로
+    변경된 요소의 가중 기여분만 반영합니다 (new = old + Σ weight × Δfactor).
+    """
+
+    def __init__(self):
+        self._nodes: Dict[Tuple[str, str], RecommendationNode] = {}
+        self._axes: Dict[str, AxisNode] = {}
+        # (엔티티 유형, 엔티티 ID) → 추천 키 집합
+        self._index: Dict[Tuple[str, str], Set[Tuple[str, str]]] = {}
+        # 상황 ID → 추천 키 목록
+        self._by_situation: Dict[str, List[Tuple[str, str]]] = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 등록
+    # ------------------------------------------------------------------
+    def register_result(self, result: Dict, situation_info: Optional[Dict] = None):
+        """
+        Agent 추천 결과의 의존성 등록 (같은 상황의 이전 등록은 교체)
+
+        Args:
+            result: execute_reasoning() 결과
+            situation_info: 추천에 사용된 상황 정보
+        """
+        situation_info = situation_info or result.get("situation_info") or {}
+        situation_id = str(result.get("situation_id")
+                           or situation_info.get("위협ID")
+                           or situation_info.get("ID")
+                           or "UNKNOWN")
+        threat_id = situation_info.get("위협ID") or situation_info.get("threat_id")
+        axis_id = situation_info.get("관련축선ID") or situation_info.get("주요축선ID") or situation_info.get("axis_id")
+
+        with self._lock:
+            self._unregister_situation(situation_id)
+
+            keys = []
+            for rank, rec in enumerate(result.get("recommendations", []) or [], 1):
+                coa_id = str(rec.get("coa_id") or "Unknown")
+                breakdown = rec.get("score_breakdown") or {}
+                node = RecommendationNode(
+                    situation_id=situation_id,
+                    coa_id=coa_id,
+                    coa_name=rec.get("coa_name") or coa_id,
+                    score=self._to_float(rec.get("score"), 0.0),
+                    factors=self._extract_factors(breakdown),
+                    weights=self._extract_weights(breakdown)
+                )
+                node.rank = rank
+                node.threat_id = str(threat_id) if threat_id else None
+                node.axis_id = str(axis_id) if axis_id else None
+
+                resources = self._extract_resources(rec.get("required_resources"))
+                if resources:
+                    share = node.factors.get("resources", 0.0) / len(resources)
+                    for res in resources:
+                        node.resource_shares[res] = share
+                        node.resource_available[res] = True
+
+                self._nodes[node.key] = node
+                keys.append(node.key)
+
+                self._link((ENTITY_COA, coa_id), node)
+                if node.threat_id:
+                    self._link((ENTITY_THREAT, node.threat_id), node)
+                if node.axis_id:
+                    self._link((ENTITY_AXIS, node.axis_id), node)
+                for res in resources:
+                    self._link((ENTITY_RESOURCE, res), node)
+
+            self._by_situation[situation_id] = keys
+
+            if axis_id and threat_id:
+                self._register_axis(str(axis_id), str(threat_id), situation_info,
+                                    result.get("axis_states") or [])
+
+    def _register_axis(self, axis_id: str, threat_id: str, situation_info: Dict,
+                       axis_states: List):
+        axis = self._axes.get(axis_id)
+        if axis is None:
+            axis = AxisNode(axis_id)
+            self._axes[axis_id] = axis
+
+        type_code = str(situation_info.get("위협유형코드")
+                        or situation_info.get("위협유형")
+                        or situation_info.get("threat_type") or "").strip()
+        type_weight = ThreatScorer.THREAT_TYPE_WEIGHTS.get(type_code, 1.0)
+        _, _, label = SituationInfoConverter.normalize_threat_level(
+            situation_info.get("심각도") or situation_info.get("위협수준") or situation_info.get("threat_level")
+        )
+        axis.threat_type_weights[threat_id] = type_weight
+        axis.threat_scores[threat_id] = self._threat_event_score(label, type_weight)
+
+        # AxisState가 함께 전달되었으면 추적하지 않는 위협의 점수를 기준값으로 사용
+        for state in axis_states:
+            state_dict = state if isinstance(state, dict) else getattr(state, "__dict__", {})
+            if str(state_dict.get("axis_id")) != axis_id:
+                continue
+            total = self._to_float(state_dict.get("threat_score_total"), None)
+            if total is not None:
+                axis.base_score = max(0.0, total - sum(axis.threat_scores.values()))
+            break
+
+    def _unregister_situation(self, situation_id: str):
+        for key in self._by_situation.pop(situation_id, []):
+            node = self._nodes.pop(key, None)
+            if node is None:
+                continue
+            for entity in node.entities:
+                keys = self._index.get(entity)
+                if keys is None:
+                    continue
+                keys.discard(key)
+                if not keys:
+                    del self._index[entity]
+
+    def _link(self, entity: Tuple[str, str], node: RecommendationNode):
+        self._index.setdefault(entity, set()).add(node.key)
+        node.entities.append(entity)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def affected(self, entity_type: str, entity_id: str) -> List[Tuple[str, str]]:
+        """엔티티에 의존하는 추천 키 목록"""
+        with self._lock:
+            if entity_type == ENTITY_RESOURCE:
+                entity_id = self._normalize_resource_id(entity_id)
+            return sorted(self._index.get((entity_type, str(entity_id)), ()))
+
+    def get_recommendation(self, situation_id: str, coa_id: str) -> Optional[Dict]:
+        with self._lock:
+            node = self._nodes.get((str(situation_id), str(coa_id)))
+            return node.to_dict() if node else None
+
+    def get_axis_state(self, axis_id: str) -> Optional[Dict]:
+        with self._lock:
+            axis = self._axes.get(str(axis_id))
+            return axis.to_dict() if axis else None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "recommendations": len(self._nodes),
+                "situations": len(self._by_situation),
+                "axes": len(self._axes),
+                "indexed_entities": len(self._index)
+            }
+
+    # ------------------------------------------------------------------
+    # 증분 재계산
+    # ------------------------------------------------------------------
+    def apply_threat_update(self, threat_id: str, new_threat_level) -> Dict:
+        """
+        위협 수준 변경 반영
+
+        Returns:
+            {"recommendations": [...변경된 추천...], "axis_states": [...변경된 축선...]}
+        """
+        threat_id = str(threat_id)
+        normalized, _, label = SituationInfoConverter.normalize_threat_level(new_threat_level)
+
+        with self._lock:
+            axis_updates = []
+            for axis in self._axes.values():
+                if threat_id not in axis.threat_scores:
+                    continue
+                old_level = axis.threat_level
+                old_total = axis.threat_score_total
+                axis.threat_scores[threat_id] = self._threat_event_score(
+                    label, axis.threat_type_weights.get(threat_id, 1.0)
+                )
+                if axis.threat_score_total != old_total:
+                    update = axis.to_dict()
+                    update["previous_threat_level"] = old_level
+                    update["previous_threat_score_total"] = round(old_total, 4)
+                    axis_updates.append(update)
+
+            changed = []
+            for key in self.affected(ENTITY_THREAT, threat_id):
+                node = self._nodes.get(key)
+                if node is not None:
+                    update = self._update_factors(node, {"threat": normalized})
+                    if update:
+                        changed.append(update)
+
+            return {
+                "recommendations": self._rerank(changed),
+                "axis_states": axis_updates
+            }
+
+    def apply_resource_update(self, resource_id: str, new_quantity) -> Dict:
+        """
+        자원 가용 수량 변경 반영 (수량 0 이하 → 해당 자원의 자원 점수 기여분 제외)
+
+        Returns:
+            {"recommendations": [...변경된 추천...], "axis_states": []}
+        """
+        resource_id = self._normalize_resource_id(resource_id)
+        available = self._to_float(new_quantity, 0.0) > 0
+
+        with self._lock:
+            changed = []
+            for key in self.affected(ENTITY_RESOURCE, resource_id):
+                node = self._nodes.get(key)
+                if node is None:
+                    continue
+                share = node.resource_shares.get(resource_id)
+                if share is None or node.resource_available.get(resource_id, True) == available:
+                    continue
+                node.resource_available[resource_id] = available
+                new_resource_factor = node.factors.get("resources", 0.0) + (share if available else -share)
+                update = self._update_factors(node, {"resources": max(0.0, new_resource_factor)})
+                if update:
+                    changed.append(update)
+
+            return {
+                "recommendations": self._rerank(changed),
+                "axis_states": []
+            }
+
+    def _update_factors(self, node: RecommendationNode, new_factors: Dict[str, float]) -> Optional[Dict]:
+        """변경된 요소의 가중 기여분만 총점에 반영"""
+        delta = 0.0
+        changed_factors = {}
+        for factor, new_value in new_factors.items():
+            old_value = node.factors.get(factor)
+            if old_value is None or abs(new_value - old_value) < 1e-9:
+                continue
+            delta += node.weights.get(factor, 0.0) * (new_value - old_value)
+            node.factors[factor] = new_value
+            changed_factors[factor] = {"old": round(old_value, 4), "new": round(new_value, 4)}
+
+        if not changed_factors:
+            return None
+
+        old_score = node.score
+        node.score = min(1.0, max(0.0, node.score + delta))
+        node.updated_at = datetime.now().isoformat()
+        return {
+            "situation_id": node.situation_id,
+            "coa_id": node.coa_id,
+            "coa_name": node.coa_name,
+            "old_score": round(old_score, 4),
+            "new_score": round(node.score, 4),
+            "changed_factors": changed_factors
+        }
+
+    def _rerank(self, changed: List[Dict]) -> List[Dict]:
+        """변경이 있었던 상황만 순위 재산정"""
+        for situation_id in {c["situation_id"] for c in changed}:
+            nodes = [self._nodes[k] for k in self._by_situation.get(situation_id, []) if k in self._nodes]
+            nodes.sort(key=lambda n: (n.score, n.coa_id), reverse=True)
+            for rank, node in enumerate(nodes, 1):
+                node.rank = rank
+        for update in changed:
+            node = self._nodes.get((update["situation_id"], update["coa_id"]))
+            if node is not None:
+                update["rank"] = node.rank
+        return changed
+
+    # ------------------------------------------------------------------
+    # 헬퍼
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _threat_event_score(label: str, type_weight: float) -> float:
+        level_score = ThreatScorer.THREAT_LEVEL_SCORES.get(str(label).capitalize(), 2)
+        return level_score * type_weight
+
+    @staticmethod
+    def _extract_factors(breakdown: Dict) -> Dict[str, float]:
+        factors = {}
+        for key, value in breakdown.items():
+            if isinstance(value, bool):
+                continue
+            if isinstance(value, (int, float)):
+                factors[key] = float(value)
+        return factors
+
+    @staticmethod
+    def _extract_weights(breakdown: Dict) -> Dict[str, float]:
+        weights = {}
+        for item in breakdown.get("reasoning", []) or []:
+            if isinstance(item, dict) and item.get("factor") is not None:
+                try:
+                    weights[item["factor"]] = float(item.get("weight", 0.0))
+                except (TypeError, ValueError):
+                    continue
+        return weights
+
+    @staticmethod
+    def _extract_resources(required) -> List[str]:
+        if not required:
+            return []
+        if isinstance(required, str):
+            items = [r.strip() for r in required.replace(";", ",").split(",")]
+        elif isinstance(required, (list, tuple, set)):
+            items = []
+            for r in required:
+                if isinstance(r, dict):
+                    r = r.get("resource") or r.get("resource_id") or r.get("자원ID") or r.get("resource_name")
+                if r:
+                    items.append(str(r).strip())
+        else:
+            items = [str(required).strip()]
+        normalized = (RecommendationDependencyGraph._normalize_resource_id(i) for i in items)
+        return list(dict.fromkeys(i for i in normalized if i))
+
+    @staticmethod
+    def _normalize_resource_id(value) -> str:
+        """필요자원 문자열을 자원 ID로 정규화 (괄호 부가 표기 제거, 공백 정리)"""
+        return " ".join(_RESOURCE_ANNOTATION.sub("", str(value)).split())
+
+    @staticmethod
+    def _to_float(value, default):
+        try:
+            return float(str(value).replace(',', ''))
+        except (TypeError, ValueError):
+            return default
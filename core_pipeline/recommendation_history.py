@@ -4,21 +4,70 @@
 Recommendation History
 추천 히스토리 관리 모듈
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import json
+
+from core_pipeline.state_store import get_state_store
+
+DEFAULT_HISTORY_PATH = "data/history/state.db"
+# 보존 정책(최대 개수) 적용 주기 (저장 횟수)
+PRUNE_INTERVAL = 50
 
 
 class RecommendationHistory:
-    """추천 히스토리 관리"""
+    """
+    추천 히스토리 관리 (상태 저장소 영속화)
+
+    (situation_id, timestamp) 인덱스로 상황별 최신/이전 추천을 조회하므로
+    히스토리 크기와 무관하게 빠르며, 재시작 후나 여러 워커 프로세스 간에도 공유됩니다.
+    """
+    
+    COLLECTION = "recommendations"
     
-    def __init__(self, max_history: int = 100):
+    def __init__(self, max_history: Optional[int] = 100, retention_days: Optional[float] = None,
+                 path: str = DEFAULT_HISTORY_PATH, store=None):
         """
         Args:
-            max_history: 최대 히스토리 개수
+            max_history: 최대 히스토리 개수 (None이면 제한 없음)
+            retention_days: 보존 기간(일), 이보다 오래된 추천은 삭제 (None이면 제한 없음)
+            path: 저장소 파일 경로
+            store: 사용할 StateStore (지정 시 path 무시)
         """
-        self.history: List[Dict] = []
         self.max_history = max_history
+        self.retention_days = retention_days
+        self.store = store or get_state_store(path)
+        self._saves_since_prune = 0
+        self.apply_retention()
+    
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "RecommendationHistory":
+        """config의 recommendation_history 섹션으로 생성"""
+        options = (config or {}).get("recommendation_history", {}) or {}
+        return cls(
+            max_history=options.get("max_history", 100),
+            retention_days=options.get("retention_days"),
+            path=options.get("path", DEFAULT_HISTORY_PATH)
+        )
+    
+    @property
+    def history(self) -> List[Dict]:
+        """전체 히스토리 (오래된 순, 조회용 스냅샷)"""
+        return self.get_all_history()
+    
+    def apply_retention(self) -> int:
+        """
+        보존 정책 적용 (최대 개수/보존 기간)
+        
+        Returns:
+            삭제된 항목 수
+        """
+        before = None
+        if self.retention_days is not None:
+            before = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+        self._saves_since_prune = 0
+        if before is None and self.max_history is None:
+            return 0
+        return self.store.prune(self.COLLECTION, "timestamp", keep=self.max_history, before=before)
     
     def save_recommendation(self, situation_id: str, recommendation: Dict):
         """
@@ -28,32 +77,36 @@ class RecommendationHistory:
             situation_id: 상황 ID
             recommendation: 추천 결과 딕셔너리
         """
+        timestamp = datetime.now().isoformat()
         entry = {
+            "entry_id": f"REC_{situation_id}_{timestamp}",
             "situation_id": situation_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "recommendation": recommendation,
             "situation_info": recommendation.get("situation_info", {})
         }
-        self.history.append(entry)
+        self.store.insert_unique(self.COLLECTION, entry)
         
-        # 최대 개수 제한
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
+        # 최대 개수 제한 (매 저장마다가 아니라 주기적으로 적용)
+        self._saves_since_prune += 1
+        if self._saves_since_prune >= PRUNE_INTERVAL:
+            self.apply_retention()
     
-    def get_recommendation_history(self, situation_id: str) -> List[Dict]:
+    def get_recommendation_history(self, situation_id: str, limit: Optional[int] = None) -> List[Dict]:
         """
         특정 상황의 추천 히스토리
         
         Args:
             situation_id: 상황 ID
+            limit: 최신 limit개만 (None이면 전체)
             
         Returns:
-            해당 상황의 추천 히스토리 리스트
+            해당 상황의 추천 히스토리 리스트 (오래된 순)
         """
-        return [
-            entry for entry in self.history
-            if entry["situation_id"] == situation_id
-        ]
+        entries = self.store.find(self.COLLECTION, order_by="timestamp", descending=True,
+                                  limit=limit, situation_id=situation_id)
+        entries.reverse()
+        return entries
     
     def get_latest_recommendation(self, situation_id: str) -> Optional[Dict]:
         """
@@ -65,7 +118,7 @@ class RecommendationHistory:
         Returns:
             최신 추천 딕셔너리 또는 None
         """
-        entries = self.get_recommendation_history(situation_id)
+        entries = self.get_recommendation_history(situation_id, limit=1)
         return entries[-1] if entries else None
     
     def get_previous_recommendation(self, situation_id: str) -> Optional[Dict]:
@@ -78,7 +131,7 @@ class RecommendationHistory:
         Returns:
             이전 추천 딕셔너리 또는 None
         """
-        entries = self.get_recommendation_history(situation_id)
+        entries = self.get_recommendation_history(situation_id, limit=2)
         return entries[-2] if len(entries) >= 2 else None
     
     def compare_recommendations(self, situation_id: str) -> Optional[Dict]:
@@ -91,7 +144,7 @@ class RecommendationHistory:
         Returns:
             비교 결과 딕셔너리 또는 None
         """
-        entries = self.get_recommendation_history(situation_id)
+        entries = self.get_recommendation_history(situation_id, limit=2)
         if len(entries) < 2:
             return None
         
@@ -173,7 +226,7 @@ class RecommendationHistory:
     
     def get_all_history(self) -> List[Dict]:
         """전체 히스토리 가져오기"""
-        return self.history.copy()
+        return self.store.find(self.COLLECTION, order_by="timestamp")
     
     def clear_history(self, situation_id: Optional[str] = None):
         """
@@ -183,11 +236,6 @@ class RecommendationHistory:
             situation_id: 상황 ID (None이면 전체 삭제)
         """
         if situation_id:
-            self.history = [
-                entry for entry in self.history
-                if entry["situation_id"] != situation_id
-            ]
+            self.store.delete_where(self.COLLECTION, situation_id=situation_id)
         else:
-            self.history = []
-
-
+            self.store.delete_where(self.COLLECTION)
@@ -4,9 +4,153 @@
 Relationship Chain
 다단계 관계 체인 탐색 모듈
 팔란티어 방식: 간접 관계를 통한 COA 추천
+
+탐색 특성:
+- 노드 단위 전역 방문 상태로 허브 노드(공유 지형셀, 위협유형 등)에서의 경로 폭발 방지
+- 시작/목표가 정해진 경우 양방향(meet-in-the-middle) 탐색으로 거리 하한을 구해 가지치기
+- 노드 확장 횟수 및 경과 시간 예산으로 최악 지연 시간 제한
+- max_paths는 짧은 경로부터 k개(k-shortest simple paths)를 의미
+- 요청 간 공유되는 그래프 버전 기반 LRU 경로 캐시 (변경 노드에 의존한 항목만 무효화)
 """
-from typing import Dict, List, Optional, Set, Tuple
-from collections import deque
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from collections import deque, OrderedDict
+
+
+ONTOLOGY_NS = "http://coa-agent-platform.org/ontology#"
+
+# 예산 초과로 중단된 탐색 표시 (부분 결과는 캐시하지 않음)
+_INCOMPLETE = "__incomplete__"
+
+
+class _SearchBudget:
+    """탐색 1회의 노드 확장/경과 시간 예산"""
+    
+    def __init__(self, max_expansions: int, time_budget: float):
+        self.max_expansions = max_expansions
+        self.deadline = time.monotonic() + time_budget if time_budget > 0 else None
+        self.expansions = 0
+        self.exhausted = False
+    
+    def tick(self) -> bool:
+        """확장 1회 소비. 예산이 남아 있으면 True"""
+        if self.exhausted:
+            return False
+        self.expansions += 1
+        if self.max_expansions > 0 and self.expansions > self.max_expansions:
+            self.exhausted = True
+        elif self.deadline is not None and (self.expansions & 0x3F) == 0 and time.monotonic() > self.deadline:
+            self.exhausted = True
+        return not self.exhausted
+
+
+class _PathCache:
+    """
+    프로세스 전역 LRU 경로 캐시
+    
+    항목마다 탐색 중 확장/확인한 노드를 의존성으로 기록하고 노드 → 항목 역색인을 유지하여,
+    관계 추가/삭제 시 해당 노드에 의존한 항목만 무효화합니다.
+    """
+    
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[List[Dict], Set[str]]]" = OrderedDict()
+        # (그래프 id, 노드 URI) → 항목 키 집합
+        self._node_index: Dict[Tuple[int, str], Set[Tuple]] = {}
+        # 그래프 id → 캐시가 동기화된 그래프 버전
+        self._graph_versions: Dict[int, int] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Tuple, chains: List[Dict], deps: Set[str]):
+        graph_id = key[0]
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (chains, deps)
+            for node in deps:
+                self._node_index.setdefault((graph_id, node), set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+    
+    def sync_version(self, graph_id: int, version: int,
+                     changed_nodes_fn: Callable[[int], Optional[Set[str]]]):
+        """그래프 버전이 바뀌었으면 변경 노드에 의존한 항목만 무효화 (이력 없으면 그래프 전체)"""
+        with self._lock:
+            synced = self._graph_versions.get(graph_id)
+            if synced == version:
+                return
+            self._graph_versions[graph_id] = version
+            if synced is None:
+                self.invalidate_graph(graph_id)
+                return
+            changed = changed_nodes_fn(synced)
+            if changed is None:
+                self.invalidate_graph(graph_id)
+            else:
+                self.invalidate_nodes(graph_id, changed)
+    
+    def synced_version(self, graph_id: int) -> Optional[int]:
+        return self._graph_versions.get(graph_id)
+    
+    def invalidate_nodes(self, graph_id: int, nodes: Set[str]):
+        with self._lock:
+            for node in nodes:
+                for key in list(self._node_index.get((graph_id, node), ())):
+                    self._discard(key)
+                    self.invalidations += 1
+    
+    def invalidate_graph(self, graph_id: int):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == graph_id]:
+                self._discard(key)
+                self.invalidations += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._node_index.clear()
+            self._graph_versions.clear()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "invalidations": self.invalidations
+            }
+    
+    def _discard(self, key: Tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        graph_id = key[0]
+        for node in entry[1]:
+            keys = self._node_index.get((graph_id, node))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._node_index[(graph_id, node)]
+
+
+# 모든 RelationshipChain 인스턴스가 공유하는 경로 캐시
+_PATH_CACHE = _PathCache()
 
 
 class RelationshipChain:
@@ -33,6 +177,230 @@ class RelationshipChain:
         self.config = config or {}
         self.max_depth = self.config.get("max_chain_depth", 3)
         self.max_paths = self.config.get("max_paths", 10)
+        # 탐색 1회당 예산 (0 이하이면 제한 없음)
+        self.max_expansions = self.config.get("chain_search_max_expansions", 20000)
+        self.time_budget = self.config.get("chain_search_time_budget", 1.0)
+        # 그래프 버전/변경 이력 제공자 (bind_ontology_manager로 연결)
+        self.ontology_manager = None
+        self.cache_enabled = self.config.get("chain_cache_enabled", True)
+        _PATH_CACHE.max_entries = self.config.get("chain_cache_size", _PATH_CACHE.max_entries)
+        # (그래프 토큰 + 버전, [(소문자 로컬 이름, URI)]) - 이름 포함 매칭 목표 해석용 노드 인덱스
+        self._local_name_index: Optional[Tuple[Tuple, List[Tuple[str, str]]]] = None
+        self._local_name_lock = threading.Lock()
+    
+    def bind_ontology_manager(self, ontology_manager):
+        """
+        경로 캐시를 온톨로지 매니저의 그래프 버전에 연동
+        
+        연결된 그래프는 add_relationship/remove_relationship 등으로 기록된 변경 노드에
+        의존한 캐시 항목만 무효화합니다. 버전을 추적할 수 없는 그래프는 캐시하지 않습니다.
+        """
+        self.ontology_manager = ontology_manager
+    
+    @staticmethod
+    def get_cache_stats() -> Dict:
+        """프로세스 전역 경로 캐시 통계"""
+        return _PATH_CACHE.stats()
+    
+    @staticmethod
+    def clear_cache():
+        _PATH_CACHE.clear()
+    
+    def _graph_token(self, graph) -> Tuple[Optional[Tuple], Optional[int]]:
+        """
+        캐시 키의 그래프 부분과 탐색 시작 시점 버전
+        
+        (id, 트리플 수)는 같은 크기의 변경이나 id 재사용을 구분하지 못하므로
+        온톨로지 매니저가 버전을 관리하는 그래프만 캐시 대상으로 합니다.
+        
+        Returns:
+            (그래프 토큰, 버전). 버전 추적이 안 되는 그래프면 (None, None)
+        """
+        om = self.ontology_manager
+        if om is not None and graph is getattr(om, 'graph', None) and hasattr(om, 'get_graph_version'):
+            version = om.get_graph_version()
+            _PATH_CACHE.sync_version(id(graph), version, om.get_changed_nodes)
+            return (id(graph),), version
+        return None, None
+    
+    def _cached(self, graph, key: Tuple, compute: Callable[[Set[str]], List[Dict]]) -> List[Dict]:
+        """경로 캐시 조회, 미스면 탐색 후 의존 노드와 함께 저장"""
+        if not self.cache_enabled:
+            return compute(set())
+        
+        token, version = self._graph_token(graph)
+        if token is None:
+            return compute(set())
+        full_key = token + key
+        cached = _PATH_CACHE.get(full_key)
+        if cached is not None:
+            return [dict(chain) for chain in cached]
+        
+        touched: Set[str] = set()
+        chains = compute(touched)
+        
+        # 예산 초과로 부분 결과이거나 탐색 도중 그래프가 바뀌었으면 저장하지 않음
+        if _INCOMPLETE in touched:
+            return chains
+        if self.ontology_manager.get_graph_version() == version:
+            _PATH_CACHE.put(full_key, [dict(chain) for chain in chains], touched)
+        return chains
+    
+    def _new_budget(self) -> _SearchBudget:
+        return _SearchBudget(self.max_expansions, self.time_budget)
+    
+    def _to_uri(self, entity: str) -> str:
+        """로컬 이름이면 온톨로지 네임스페이스 URI로 변환"""
+        entity = str(entity)
+        if entity.startswith('http://'):
+            return entity
+        return f"{ONTOLOGY_NS}{self._make_uri_safe(entity)}"
+    
+    def _neighbor_fn(self, graph, budget: _SearchBudget,
+                     touched: Optional[Set[str]] = None) -> Callable[[str], List[Tuple[str, str]]]:
+        """
+        탐색 1회 동안 재사용하는 이웃 조회 함수 (노드별 1회만 그래프 조회)
+        
+        Args:
+            touched: 지정 시 확장한 노드와 그 이웃 URI를 기록 (경로 캐시 무효화 의존성)
+        
+        Returns:
+            node → [(이웃 엔티티, 프레디케이트)] 함수. 예산 소진 시 빈 리스트
+        """
+        memo: Dict[str, List[Tuple[str, str]]] = {}
+        
+        def neighbors(node: str) -> List[Tuple[str, str]]:
+            cached = memo.get(node)
+            if cached is not None:
+                return cached
+            if not budget.tick():
+                return []
+            result = []
+            seen = set()
+            for rel in self._find_relations(graph, node):
+                entity = rel.get('entity', '')
+                if not entity:
+                    continue
+                pair = (entity, rel.get('predicate', ''))
+                if pair not in seen:
+                    seen.add(pair)
+                    result.append(pair)
+            memo[node] = result
+            if touched is not None:
+                touched.add(self._to_uri(node))
+                touched.update(self._to_uri(entity) for entity, _ in result)
+            return result
+        
+        return neighbors
+    
+    @staticmethod
+    def _bfs_distances(neighbors, sources: Set[str], radius: int,
+                       stop_at: Optional[Callable[[str], bool]] = None) -> Dict[str, int]:
+        """
+        전역 방문 상태 BFS (각 노드 1회 확장)
+        
+        Args:
+            neighbors: 이웃 조회 함수
+            sources: 시작 노드 집합
+            radius: 최대 거리
+            stop_at: True인 노드는 거리만 기록하고 확장하지 않음 (목표 노드 등)
+        """
+        dist = {node: 0 for node in sources}
+        frontier = list(sources)
+        for depth in range(1, radius + 1):
+            next_frontier = []
+            for node in frontier:
+                if stop_at is not None and depth > 1 and stop_at(node):
+                    continue
+                for entity, _ in neighbors(node):
+                    if entity not in dist:
+                        dist[entity] = depth
+                        next_frontier.append(entity)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return dist
+    
+    def _k_shortest_paths(self, graph, start_uri: str, is_target: Callable[[str], bool],
+                          exact_targets: Optional[Set[str]], max_depth: int,
+                          max_paths: int, touched: Optional[Set[str]] = None) -> List[Tuple[List[str], List[str]]]:
+        """
+        시작 노드에서 목표 노드까지 짧은 순서로 최대 max_paths개의 단순 경로 탐색
+        
+        1) 목표를 정확히 알면 목표 쪽에서 역방향 BFS (반경 max_depth//2),
+           모르면 정방향 BFS로 목표 후보를 찾은 뒤 역방향 BFS
+        2) 목표까지의 거리 하한(역방향 BFS 거리 또는 반경+1)으로 가지치기하며
+           길이 1부터 max_depth까지 반복 심화 DFS
+        
+        목표 노드를 통과하는 경로는 확장하지 않습니다 (기존 BFS와 동일).
+        
+        Returns:
+            [(경로 노드 리스트, 프레디케이트 리스트)]
+        """
+        budget = self._new_budget()
+        neighbors = self._neighbor_fn(graph, budget, touched)
+        
+        if exact_targets:
+            targets = set(exact_targets)
+            # 정방향 반경 안에서 만나는 노드가 없으면 경로 없음
+            forward = self._bfs_distances(neighbors, {start_uri}, max_depth - max_depth // 2, stop_at=is_target)
+        else:
+            forward = self._bfs_distances(neighbors, {start_uri}, max_depth, stop_at=is_target)
+            targets = {node for node in forward if node != start_uri and is_target(node)}
+        
+        if not targets:
+            return []
+        
+        back_radius = max_depth // 2
+        backward = self._bfs_distances(neighbors, targets, back_radius)
+        if exact_targets and not any(
+            forward[node] + backward[node] <= max_depth for node in forward.keys() & backward.keys()
+        ):
+            return []
+        
+        def lower_bound(node: str) -> int:
+            return backward.get(node, back_radius + 1)
+        
+        results: List[Tuple[List[str], List[str]]] = []
+        path = [start_uri]
+        predicates: List[str] = []
+        on_path = {start_uri}
+        
+        def dfs(node: str, length: int, goal: int):
+            if len(results) >= max_paths or not budget.tick():
+                return
+            for entity, predicate in neighbors(node):
+                if entity in on_path:
+                    continue
+                if is_target(entity):
+                    if length + 1 == goal:
+                        results.append((path + [entity], predicates + [predicate]))
+                        if len(results) >= max_paths:
+                            return
+                    continue
+                if length + 1 + lower_bound(entity) > goal:
+                    continue
+                path.append(entity)
+                predicates.append(predicate)
+                on_path.add(entity)
+                dfs(entity, length + 1, goal)
+                on_path.discard(entity)
+                predicates.pop()
+                path.pop()
+                if len(results) >= max_paths or budget.exhausted:
+                    return
+        
+        for goal in range(max(1, lower_bound(start_uri)), max_depth + 1):
+            dfs(start_uri, 0, goal)
+            if len(results) >= max_paths or budget.exhausted:
+                break
+        
+        if budget.exhausted:
+            if touched is not None:
+                touched.add(_INCOMPLETE)
+            print(f"[WARN] 체인 탐색 예산 초과 ({budget.expansions}회 확장): "
+                  f"{start_uri.split('#')[-1]} → {len(results)}개 경로까지만 반환")
+        return results
     
     def find_relationship_chains(self, graph, start_entity: str, target_type: str, 
                                 max_depth: Optional[int] = None) -> List[Dict]:
@@ -60,28 +428,32 @@ class RelationshipChain:
         if max_depth is None:
             max_depth = self.max_depth
         
+        key = ("type", self._to_uri(start_entity), target_type, max_depth, self.max_paths)
+        return self._cached(graph, key, lambda touched: self._search_relationship_chains(
+            graph, start_entity, target_type, max_depth, touched))
+    
+    def _search_relationship_chains(self, graph, start_entity: str, target_type: str,
+                                    max_depth: int, touched: Set[str]) -> List[Dict]:
+        """find_relationship_chains 탐색 본체 (캐시 미스 시 실행)"""
         chains = []
         visited = set()
+        budget = self._new_budget()
+        neighbors = self._neighbor_fn(graph, budget, touched)
         
-        # BFS로 체인 탐색
+        # BFS로 체인 탐색 (각 노드는 한 번만 확장, 짧은 체인부터 발견)
         queue = deque([(start_entity, [start_entity], [], 0)])
         visited.add(start_entity)
         
-        while queue and len(chains) < self.max_paths:
+        while queue and len(chains) < self.max_paths and not budget.exhausted:
             current, path, predicates, depth = queue.popleft()
             
             if depth >= max_depth:
                 continue
             
             # 현재 엔티티의 관계 탐색
-            relations = self._find_relations(graph, current)
-            
-            for rel in relations:
-                related_entity = rel.get('entity', '')
-                predicate = rel.get('predicate', '')
-                
-                if not related_entity:
-                    continue
+            for related_entity, predicate in neighbors(current):
+                if len(chains) >= self.max_paths:
+                    break
                 
                 # 목표 타입 확인
                 if self._is_target_type(graph, related_entity, target_type):
@@ -111,6 +483,9 @@ class RelationshipChain:
                             depth + 1
                         ))
         
+        if budget.exhausted:
+            touched.add(_INCOMPLETE)
+        
         # 점수 순으로 정렬
         chains.sort(key=lambda x: -x['score'])
         
@@ -238,95 +613,97 @@ class RelationshipChain:
             
         if max_depth is None:
             max_depth = self.max_depth
-            
-        # 목표 엔티티가 명확하므로 BFS로 도달 가능한 모든 경로 탐색
-        chains = []
-        visited = set()
         
-        # URI 정규화
-        from rdflib import URIRef
-        
-        # start_entity URI
-        if not start_entity.startswith('http://'):
-            safe_start = self._make_uri_safe(start_entity)
-            start_uri = f"http://coa-agent-platform.org/ontology#{safe_start}"
-        else:
-            start_uri = start_entity
-            
-        # target_entity URI
-        if not target_entity.startswith('http://'):
-            safe_target = self._make_uri_safe(target_entity)
-            target_uri = f"http://coa-agent-platform.org/ontology#{safe_target}"
-        else:
-            target_uri = target_entity
-            
-        # BFS (경로 추적 포함)
-        queue = deque([(start_uri, [start_uri], [], 0)])
-        visited.add(start_uri)
+        key = ("path", self._to_uri(start_entity), self._to_uri(target_entity), max_depth, self.max_paths)
+        return self._cached(graph, key, lambda touched: self._search_path(
+            graph, start_entity, target_entity, max_depth, touched))
+    
+    def _search_path(self, graph, start_entity: str, target_entity: str,
+                     max_depth: int, touched: Set[str]) -> List[Dict]:
+        """find_path 탐색 본체 (캐시 미스 시 실행)"""
+        start_uri = self._to_uri(start_entity)
+        target_uri = self._to_uri(target_entity)
+        touched.update((start_uri, target_uri))
         
         # 목표 URI의 로컬 이름 (비교 용이성을 위해)
-        target_local_name = target_uri.split('#')[-1].split('/')[-1].lower()
+        target_local_name = self._local_name(target_uri)
+        
+        def is_target(entity: str) -> bool:
+            # 목표 도달 확인 (정확한 URI 매칭 또는 이름 포함 매칭)
+            if entity == target_uri:
+                return True
+            # URI 불일치 시 로컬 이름으로 비교 (COA ID가 포함된 경우 포함)
+            related_local = entity.split('#')[-1].split('/')[-1].lower()
+            return bool(target_local_name) and target_local_name in related_local
+        
+        # 목표 노드가 그래프에 실제로 있으면 해당 노드와 이름 포함 매칭 노드를 미리 해석해
+        # 목표 집합으로 양방향 탐색, 없으면 이름 매칭으로 목표 후보를 찾아 탐색
+        if self._has_node(graph, target_uri):
+            exact_targets = {target_uri} | self._nodes_by_local_name(graph, target_local_name)
+            exact_targets.discard(start_uri)
+            match = lambda entity: entity in exact_targets
+        else:
+            exact_targets = None
+            match = is_target
         
-        while queue and len(chains) < self.max_paths:
-            current, path, predicates, depth = queue.popleft()
-            
-            if depth >= max_depth:
-                continue
-            
-            # 현재 엔티티의 관계 탐색
-            relations = self._find_relations(graph, str(current))
-            
-            for rel in relations:
-                related_entity = rel.get('entity', '')
-                predicate = rel.get('predicate', '')
-                
-                if not related_entity:
-                    continue
-                
-                # 목표 도달 확인 (정확한 URI 매칭 또는 이름 포함 매칭)
-                is_target = False
-                if related_entity == target_uri:
-                    is_target = True
-                else:
-                    # URI 불일치 시 로컬 이름으로 비교 (유연성)
-                    related_local = related_entity.split('#')[-1].split('/')[-1].lower()
-                    if related_local == target_local_name:
-                        is_target = True
-                    # COA ID 매칭 (ID가 포함된 경우)
-                    elif target_local_name in related_local:
-                        is_target = True
-                
-                if is_target:
-                    # 경로 발견
-                    chain_path = path + [related_entity]
-                    chain_predicates = predicates + [predicate]
-                    
-                    score = self._calculate_chain_score(
-                        chain_path, chain_predicates, depth + 1
-                    )
-                    
-                    chains.append({
-                        'path': chain_path,
-                        'target': related_entity,
-                        'depth': depth + 1,
-                        'predicates': chain_predicates,
-                        'score': score
-                    })
-                else:
-                    # 순환 방지
-                    if related_entity not in path and depth + 1 < max_depth:
-                        # visited를 전체 공유하면 다른 경로를 못 찾으므로, 
-                        # 현재 경로 내에서의 순환만 체크 (path check)
-                        queue.append((
-                            related_entity,
-                            path + [related_entity],
-                            predicates + [predicate],
-                            depth + 1
-                        ))
+        chains = []
+        for chain_path, chain_predicates in self._k_shortest_paths(
+            graph, start_uri, match, exact_targets, max_depth, self.max_paths, touched
+        ):
+            depth = len(chain_predicates)
+            chains.append({
+                'path': chain_path,
+                'target': chain_path[-1],
+                'depth': depth,
+                'predicates': chain_predicates,
+                'score': self._calculate_chain_score(chain_path, chain_predicates, depth)
+            })
         
         # 점수 순 정렬
         chains.sort(key=lambda x: -x['score'])
         return chains
+    
+    @staticmethod
+    def _local_name(uri: str) -> str:
+        return uri.split('#')[-1].split('/')[-1].lower()
+    
+    def _nodes_by_local_name(self, graph, local_name: str) -> Set[str]:
+        """
+        로컬 이름에 local_name이 포함된 그래프 URI 노드
+        
+        노드 목록은 버전을 추적하는 그래프면 버전별로 한 번만 수집합니다.
+        """
+        if not local_name:
+            return set()
+        token, version = self._graph_token(graph)
+        key = None if token is None else token + (version,)
+        with self._local_name_lock:
+            cached = self._local_name_index
+        if key is not None and cached is not None and cached[0] == key:
+            nodes = cached[1]
+        else:
+            from rdflib import URIRef
+            uris = {str(node) for node in graph.subjects() if isinstance(node, URIRef)}
+            uris.update(str(node) for node in graph.objects() if isinstance(node, URIRef))
+            nodes = [(self._local_name(uri), uri) for uri in uris]
+            if key is not None:
+                with self._local_name_lock:
+                    self._local_name_index = (key, nodes)
+        return {uri for name, uri in nodes if local_name in name}
+    
+    @staticmethod
+    def _has_node(graph, uri: str) -> bool:
+        """URI가 그래프에 주어 또는 목적어로 존재하는지 확인"""
+        try:
+            from rdflib import URIRef
+            node = URIRef(uri)
+            for _ in graph.triples((node, None, None)):
+                return True
+            for _ in graph.triples((None, None, node)):
+                return True
+        except Exception:
+            pass
+        return False
 
     def find_coa_chains(self, graph, threat_entity: str, target_coa: Optional[str] = None) -> List[Dict]:
         """
@@ -438,7 +815,15 @@ class RelationshipChain:
         """
         if graph is None:
             return []
-            
+        
+        key = ("common", self._to_uri(start_entity), self._to_uri(target_entity))
+        return self._cached(graph, key, lambda touched: self._search_common_nodes(
+            graph, start_entity, target_entity, touched))
+    
+    def _search_common_nodes(self, graph, start_entity: str, target_entity: str,
+                             touched: Set[str]) -> List[Dict]:
+        """find_common_node_chains 탐색 본체 (캐시 미스 시 실행)"""
+        touched.update((self._to_uri(start_entity), self._to_uri(target_entity)))
         chains = []
         
         # 1. Start Entity의 1-hop 관계 조회
@@ -5,9 +5,12 @@ Semantic Inference
 의미 기반 관계 추론 모듈
 팔란티어 방식: 키워드 유사도 기반 관계 발견
 """
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 
 class SemanticInference:
     """의미 기반 관계 추론 클래스"""
@@ -18,7 +21,14 @@ class SemanticInference:
             config: 설정 딕셔너리
         """
         self.config = config or {}
-        self.similarity_threshold = config.get("similarity_threshold", 0.3)
+        self.similarity_threshold = self.config.get("similarity_threshold", 0.3)
+        
+        # 그래프 버전별 인덱스 (노드 → 직접 관계, 노드 → 키워드)
+        self._graph_signature = None
+        self._direct_cache: Dict[str, List[Dict]] = {}
+        self._keyword_cache: Dict[str, frozenset] = {}
+        self._similarity_cache: Dict[Tuple[frozenset, frozenset], bool] = {}
+        self._synonym_groups: Optional[Dict[str, Set[str]]] = None
         
         # 키워드 매핑 (의미적으로 유사한 키워드)
         self.keyword_mappings = {
@@ -32,6 +42,16 @@ class SemanticInference:
             '방책': ['coa', 'course', 'action', '전략', 'strategy']
         }
     
+    @property
+    def keyword_mappings(self) -> Dict[str, List[str]]:
+        return self._keyword_mappings
+    
+    @keyword_mappings.setter
+    def keyword_mappings(self, mappings: Dict[str, List[str]]):
+        self._keyword_mappings = mappings
+        self._synonym_groups = None
+        self._similarity_cache = {}
+    
     def infer_relations(self, graph, entity: str, max_depth: int = 2) -> Dict:
         """
         의미 기반 관계 추론
@@ -57,6 +77,8 @@ class SemanticInference:
                 'confidence': 0.0
             }
         
+        self._sync_graph(graph)
+        
         # 1단계: 직접 관계 찾기
         direct_relations = self._find_direct_relations(graph, entity)
         
@@ -77,15 +99,70 @@ class SemanticInference:
             'confidence': confidence
         }
     
+    def infer_relations_batch(self, graph, entities: Iterable[str], max_depth: int = 2) -> Dict[str, Dict]:
+        """
+        여러 엔티티(예: 후보 COA 전체)의 의미 기반 관계를 한 번에 추론
+        
+        직접 관계/키워드/유사도 결과를 그래프 버전 단위 인덱스로 공유하므로
+        여러 엔티티가 같은 이웃 노드를 거칠 때 반복 탐색하지 않습니다.
+        
+        Args:
+            graph: RDF 그래프 객체
+            entities: 엔티티 URI 또는 로컬 이름 목록
+            max_depth: 최대 탐색 깊이
+        
+        Returns:
+            {엔티티: infer_relations() 결과}
+        """
+        entities = list(dict.fromkeys(entities))
+        if graph is None:
+            return {entity: self.infer_relations(None, entity, max_depth) for entity in entities}
+        
+        self._sync_graph(graph)
+        
+        # 1단계: 모든 엔티티의 직접 관계 (인덱스에 적재)
+        direct_by_entity = {entity: self._find_direct_relations(graph, entity) for entity in entities}
+        
+        results = {}
+        for entity in entities:
+            direct_relations = direct_by_entity[entity]
+            indirect_relations = []
+            if max_depth > 1:
+                indirect_relations = self._find_indirect_relations(
+                    graph, entity, direct_relations, max_depth - 1
+                )
+            results[entity] = {
+                'direct': direct_relations,
+                'indirect': indirect_relations,
+                'depth': max_depth,
+                'confidence': self._calculate_confidence(entity, direct_relations, indirect_relations)
+            }
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Batch semantic inference: {len(entities)} entities, "
+                         f"{len(self._direct_cache)} indexed nodes")
+        return results
+    
+    def _sync_graph(self, graph):
+        """그래프가 바뀌었으면(객체 교체 또는 트리플 수 변경) 그래프 인덱스 초기화"""
+        signature = (id(graph), len(graph))
+        if signature != self._graph_signature:
+            self._graph_signature = signature
+            self._direct_cache = {}
+    
     def _find_direct_relations(self, graph, entity: str) -> List[Dict]:
-        """직접 관계 찾기"""
+        """직접 관계 찾기 (그래프 버전별 인덱스에 캐시)"""
+        cached = self._direct_cache.get(entity)
+        if cached is not None:
+            return cached
+        
         relations = []
         
         try:
             from rdflib import URIRef
             
-            print(f"[DEBUG] _find_direct_relations called with entity: {entity}")
-            print(f"[DEBUG] Graph has {len(graph)} triples")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"_find_direct_relations called with entity: {entity} (graph: {len(graph)} triples)")
             
             # URI 변환
             if not entity.startswith('http://'):
@@ -99,7 +176,11 @@ class SemanticInference:
                 safe_entity = re.sub(r'\s+', '_', entity)
                 entity_uri = URIRef(safe_entity)
             
-            print(f"[DEBUG] Searching for entity_uri: {entity_uri}")
+            # 로컬 이름/URI 표기가 달라도 같은 노드면 인덱스 재사용
+            cached = self._direct_cache.get(str(entity_uri))
+            if cached is not None:
+                self._direct_cache[entity] = cached
+                return cached
             
             # [FIX] SPARQL 쿼리 파싱 오류 방지를 위해 graph.triples() 사용
             for s, p, o in graph.triples((entity_uri, None, None)):
@@ -122,7 +203,11 @@ class SemanticInference:
             if len(relations) > 50:
                 relations = relations[:50]
             
-            print(f"[DEBUG] Found {len(relations)} direct relations")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Found {len(relations)} direct relations for {entity_uri}")
+            
+            self._direct_cache[str(entity_uri)] = relations
+            self._direct_cache[entity] = relations
         
         except Exception as e:
             print(f"[WARN] Direct relation search failed: {e}")
@@ -153,7 +238,7 @@ class SemanticInference:
                 second_level = self._find_direct_relations(graph, related_entity)
                 
                 for second_rel in second_level:
-                    second_entity = second_rel.get('entity', '')
+                    second_entity = second_rel['entity']
                     
                     # 중복 및 자기 참조 제거
                     if second_entity != entity and second_entity != related_entity:
@@ -188,7 +273,11 @@ class SemanticInference:
 
     
     def _extract_keywords(self, text: str) -> Set[str]:
-        """텍스트에서 키워드 추출"""
+        """텍스트에서 키워드 추출 (노드 라벨별 캐시)"""
+        cached = self._keyword_cache.get(text)
+        if cached is not None:
+            return cached
+        
         keywords = set()
         
         # URI에서 로컬 이름 추출
@@ -203,10 +292,12 @@ class SemanticInference:
         keywords.update([w.lower() for w in english_words])
         keywords.update(numbers)  # [FIX] 숫자 추가
         
+        keywords = frozenset(keywords)
+        self._keyword_cache[text] = keywords
         return keywords
     
     def _has_semantic_similarity(self, keywords1: Set[str], keywords2: Set[str]) -> bool:
-        """키워드 유사도 확인"""
+        """키워드 유사도 확인 (키워드 집합 쌍별 캐시)"""
         if not keywords1 or not keywords2:
             return False
         
@@ -214,23 +305,30 @@ class SemanticInference:
         if keywords1 & keywords2:
             return True
         
-        # 매핑 기반 유사도 확인
-        for kw1 in keywords1:
-            for kw2 in keywords2:
-                if self._are_similar_keywords(kw1, kw2):
-                    return True
+        key = (frozenset(keywords1), frozenset(keywords2))
+        cached = self._similarity_cache.get(key)
+        if cached is not None:
+            return cached
         
-        return False
+        # 매핑 기반 유사도 확인
+        result = any(self._are_similar_keywords(kw1, kw2) for kw1 in keywords1 for kw2 in keywords2)
+        self._similarity_cache[key] = result
+        return result
     
     def _are_similar_keywords(self, kw1: str, kw2: str) -> bool:
         """두 키워드가 의미적으로 유사한지 확인"""
-        # 키워드 매핑에서 확인
-        for category, synonyms in self.keyword_mappings.items():
-            if kw1 in synonyms and kw2 in synonyms:
-                return True
-            if kw1 == category and kw2 in synonyms:
-                return True
-            if kw2 == category and kw1 in synonyms:
+        # 키워드 매핑에서 확인 (키워드 → 소속 카테고리 인덱스)
+        if self._synonym_groups is None:
+            groups: Dict[str, Set[str]] = {}
+            for category, synonyms in self.keyword_mappings.items():
+                for word in [category] + list(synonyms):
+                    groups.setdefault(word, set()).add(category)
+            self._synonym_groups = groups
+        
+        groups1 = self._synonym_groups.get(kw1)
+        if groups1:
+            groups2 = self._synonym_groups.get(kw2)
+            if groups2 and groups1 & groups2:
                 return True
         
         # 부분 문자열 매칭
@@ -278,6 +376,8 @@ class SemanticInference:
         if category not in self.keyword_mappings:
             self.keyword_mappings[category] = []
         self.keyword_mappings[category].extend(synonyms)
+        self._synonym_groups = None
+        self._similarity_cache = {}
 
 
 
@@ -0,0 +1,229 @@
+# core_pipeline/startup_scheduler.py
+# -*- coding: utf-8 -*-
+"""
+Startup Scheduler
+의존성 기반 초기화 단계 스케줄러
+- 서로 독립적인 단계는 병렬 실행 (콜드 스타트 시간 = 가장 느린 경로)
+- 무거운 선택 구성요소(로컬 LLM, 임베딩 등)는 최초 사용 시점까지 지연
+- 구성요소별 준비 상태(readiness) 보고
+"""
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 단계 상태
+STAGE_PENDING = "pending"
+STAGE_RUNNING = "running"
+STAGE_READY = "ready"
+STAGE_FAILED = "failed"
+STAGE_DEFERRED = "deferred"
+STAGE_SKIPPED = "skipped"
+
+
+class StartupStage:
+    """초기화 단계 정의 및 실행 상태"""
+
+    def __init__(self, name: str, func: Callable[[], None],
+                 depends_on: Iterable[str] = (), lazy: bool = False,
+                 description: str = ""):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.lazy = lazy
+        self.description = description or name
+        self.status = STAGE_PENDING
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done_event = threading.Event()
+        self.thread_id: Optional[int] = None  # 실행 중인 스레드 (재진입 감지용)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+    def to_dict(self) -> Dict:
+        return {
+            "status": self.status,
+            "description": self.description,
+            "depends_on": self.depends_on,
+            "lazy": self.lazy,
+            "duration_sec": round(self.duration, 3) if self.duration is not None else None,
+            "error": self.error
+        }
+
+
+class StartupScheduler:
+    """
+    의존성 그래프 기반 초기화 스케줄러
+
+    사용 예:
+        scheduler = StartupScheduler(max_workers=4)
+        scheduler.add_stage("embeddings", load_embeddings, lazy=True)
+        scheduler.add_stage("rag_index", build_index, depends_on=["embeddings"])
+        scheduler.run()                 # 비지연 단계만 실행
+        scheduler.ensure("rag_index")   # 최초 사용 시 지연 단계 실행
+
+    지연(lazy) 단계에 의존하는 단계는 자동으로 지연 단계가 됩니다.
+    실패한 단계에 의존하는 단계는 실행하지 않고 skipped로 표시합니다.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+        self._stages: Dict[str, StartupStage] = {}
+        self._lock = threading.RLock()
+
+    def add_stage(self, name: str, func: Callable[[], None],
+                  depends_on: Iterable[str] = (), lazy: bool = False,
+                  description: str = "") -> StartupStage:
+        """초기화 단계 등록 (의존 단계는 먼저 등록되어 있어야 함)"""
+        depends_on = list(depends_on)
+        for dep in depends_on:
+            if dep not in self._stages:
+                raise ValueError(f"Unknown dependency '{dep}' for stage '{name}'")
+
+        # 지연 단계에 의존하면 자신도 지연
+        if any(self._stages[dep].lazy for dep in depends_on):
+            lazy = True
+
+        stage = StartupStage(name, func, depends_on, lazy, description)
+        if lazy:
+            stage.status = STAGE_DEFERRED
+        self._stages[name] = stage
+        return stage
+
+    def run(self, progress_callback: Optional[Callable[[str], None]] = None):
+        """
+        비지연 단계를 의존성 순서에 따라 병렬 실행하고 모두 끝날 때까지 대기
+
+        Args:
+            progress_callback: 단계 시작/완료 시 호출되는 진행 콜백
+        """
+        started = time.time()
+        eager = [s for s in self._stages.values() if not s.lazy]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="startup") as executor:
+            running = {}
+            remaining = list(eager)
+
+            while remaining or running:
+                # 의존성이 모두 끝난 단계 제출
+                for stage in list(remaining):
+                    deps = [self._stages[d] for d in stage.depends_on]
+                    if not all(d.done_event.is_set() for d in deps):
+                        continue
+                    remaining.remove(stage)
+
+                    failed = [d.name for d in deps if d.status in (STAGE_FAILED, STAGE_SKIPPED)]
+                    if failed:
+                        self._finish(stage, STAGE_SKIPPED, f"dependency not ready: {', '.join(failed)}")
+                        continue
+
+                    if progress_callback:
+                        progress_callback(f"{stage.description} 시작...")
+                    running[executor.submit(self._execute, stage)] = stage
+
+                if not running:
+                    if remaining:
+                        # 순환 의존성 등으로 더 이상 진행 불가
+                        for stage in remaining:
+                            self._finish(stage, STAGE_SKIPPED, "unresolvable dependencies")
+                        remaining = []
+                    continue
+
+                done, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    if progress_callback:
+                        if stage.status == STAGE_READY:
+                            progress_callback(f"{stage.description} 완료 ({stage.duration:.1f}s)")
+                        else:
+                            progress_callback(f"⚠️ {stage.description} 실패: {stage.error}")
+
+        logger.info(f"Startup stages finished in {time.time() - started:.2f}s: "
+                    + ", ".join(f"{s.name}={s.status}" for s in self._stages.values()))
+
+    def ensure(self, name: str, timeout: Optional[float] = None) -> bool:
+        """
+        단계가 준비되었는지 확인하고, 지연 단계면 (의존 단계 포함) 지금 실행
+
+        다른 스레드가 이미 실행 중이면 완료를 기다립니다. 단계 함수가 (간접적으로)
+        자기 자신을 ensure하면 기다리지 않고 아직 준비되지 않음(False)을 반환합니다.
+
+        Returns:
+            준비 완료 여부
+        """
+        stage = self._stages.get(name)
+        if stage is None:
+            return False
+
+        for dep in stage.depends_on:
+            if not self.ensure(dep, timeout):
+                with self._lock:
+                    if stage.status == STAGE_DEFERRED:
+                        self._finish(stage, STAGE_SKIPPED, f"dependency not ready: {dep}")
+                return False
+
+        run_here = False
+        with self._lock:
+            if stage.status == STAGE_DEFERRED:
+                stage.status = STAGE_PENDING
+                run_here = True
+            elif stage.status == STAGE_RUNNING and stage.thread_id == threading.get_ident():
+                return False
+
+        if run_here:
+            logger.info(f"Deferred startup stage triggered on first use: {name}")
+            self._execute(stage)
+        else:
+            stage.done_event.wait(timeout)
+
+        return stage.status == STAGE_READY
+
+    def start_deferred_in_background(self, names: Optional[List[str]] = None):
+        """지연 단계를 백그라운드 스레드에서 미리 준비 (웜업)"""
+        targets = names or [s.name for s in self._stages.values() if s.status == STAGE_DEFERRED]
+        for name in targets:
+            threading.Thread(target=self.ensure, args=(name,),
+                             name=f"warmup-{name}", daemon=True).start()
+
+    def is_deferred(self, name: str) -> bool:
+        stage = self._stages.get(name)
+        return stage is not None and stage.status == STAGE_DEFERRED
+
+    def is_ready(self, name: str) -> bool:
+        stage = self._stages.get(name)
+        return stage is not None and stage.status == STAGE_READY
+
+    def get_status(self) -> Dict[str, Dict]:
+        """구성요소별 준비 상태"""
+        return {name: stage.to_dict() for name, stage in self._stages.items()}
+
+    def _execute(self, stage: StartupStage):
+        stage.thread_id = threading.get_ident()
+        stage.status = STAGE_RUNNING
+        stage.started_at = time.time()
+        try:
+            stage.func()
+        except Exception as e:
+            logger.warning(f"Startup stage '{stage.name}' failed: {e}")
+            self._finish(stage, STAGE_FAILED, str(e))
+            return
+        self._finish(stage, STAGE_READY)
+
+    def _finish(self, stage: StartupStage, status: str, error: Optional[str] = None):
+        stage.status = status
+        stage.error = error
+        stage.finished_at = time.time()
+        if stage.started_at is None:
+            stage.started_at = stage.finished_at
+        stage.done_event.set()
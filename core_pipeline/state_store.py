@@ -0,0 +1,438 @@
+# core_pipeline/state_store.py
+# -*- coding: utf-8 -*-
+"""
+State Store
+협업/워크플로우 상태용 내장 트랜잭션 저장소 (SQLite, WAL 모드)
+
+사용자·세션·알림·승인 요청·온톨로지 워크플로우 상태·추천/온톨로지 변경 히스토리를 변경할 때마다
+JSON 파일 전체를 다시 쓰지 않고, 문서 단위로 저장합니다.
+- 컬렉션별 테이블 (키 + 조회용 인덱스 컬럼 + JSON 문서)
+- WAL 모드 + busy_timeout으로 여러 uvicorn 워커 프로세스가 동시에 읽기/쓰기
+- 읽기-수정-쓰기는 BEGIN IMMEDIATE 트랜잭션으로 프로세스 간 직렬화
+- 기존 JSON 파일은 최초 1회 가져오기(import) 후 더 이상 쓰지 않음
+"""
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+STORE_FILENAME = "state.db"
+BUSY_TIMEOUT_MS = 5000
+
+# 컬렉션명 → (키 필드, 인덱스 필드)
+COLLECTIONS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "users": ("user_id", ("username", "role")),
+    "sessions": ("session_id", ("user_id", "role", "last_activity")),
+    "notifications": ("notification_id", ("user_id", "read", "created_at")),
+    "approval_requests": ("request_id", ("recommendation_id", "requester_id", "approver_id",
+                                         "status", "created_at")),
+    "resource_locks": ("resource_id", ("user_id",)),
+    "workflow_steps": ("step_name", ()),
+    "workflow_meta": ("name", ()),
+    "recommendations": ("entry_id", ("situation_id", "timestamp")),
+    "ontology_changes": ("entry_id", ("timestamp", "source", "target", "relation", "change_type")),
+}
+
+# 복합 인덱스 (컬렉션명, 필드들)
+COMPOSITE_INDEXES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("notifications", ("user_id", "read")),
+    ("recommendations", ("situation_id", "timestamp")),
+    ("ontology_changes", ("source", "timestamp")),
+    ("ontology_changes", ("target", "timestamp")),
+)
+
+
+def _json_default(value):
+    """numpy/pandas 값 등 JSON 기본 타입이 아닌 값 변환"""
+    if hasattr(value, "item") and callable(value.item) and getattr(value, "ndim", None) == 0:
+        return value.item()  # numpy 스칼라
+    if hasattr(value, "tolist"):
+        return value.tolist()  # numpy 배열
+    if hasattr(value, "isoformat"):
+        return value.isoformat()  # datetime, pandas Timestamp
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def _dumps(doc) -> str:
+    return json.dumps(doc, ensure_ascii=False, default=_json_default)
+
+
+def _load_json(path: Path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_jsonl(path: Path) -> List[Dict]:
+    """JSONL 파일 로드 (손상된 줄은 건너뜀)"""
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def _column_value(value):
+    if isinstance(value, bool):
+        return int(value)
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+class StateStore:
+    """
+    컬렉션(문서) + 로그 저장소
+
+    문서는 JSON으로 저장되고, COLLECTIONS에 선언된 필드는 별도 컬럼으로 인덱싱되어
+    find(user_id=..., status=...) 같은 조회가 전체 스캔 없이 처리됩니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._init_schema()
+
+    # ------------------------------------------------------------------
+    # 연결/트랜잭션
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        """스레드별 연결 (sqlite3 연결은 스레드 간 공유하지 않음)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT_MS / 1000,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        쓰기 트랜잭션 (BEGIN IMMEDIATE)
+
+        시작 시점에 쓰기 잠금을 잡으므로 트랜잭션 안의 조회-수정-저장이
+        다른 프로세스의 쓰기와 섞이지 않습니다. 중첩 호출은 바깥 트랜잭션에 합류합니다.
+        """
+        conn = self._connect()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.depth = 0
+
+    def _init_schema(self):
+        with self.transaction() as conn:
+            for name, (_, fields) in COLLECTIONS.items():
+                columns = "".join(f", {field}" for field in fields)
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} (key TEXT PRIMARY KEY{columns}, data TEXT NOT NULL)"
+                )
+                for field in fields:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{field} ON {name}({field})")
+            for name, fields in COMPOSITE_INDEXES:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{name}_{'_'.join(fields)} ON {name}({', '.join(fields)})"
+                )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS logs (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "stream TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_stream ON logs(stream, seq)")
+            conn.execute("CREATE TABLE IF NOT EXISTS imports (source TEXT PRIMARY KEY, imported_at TEXT)")
+
+    # ------------------------------------------------------------------
+    # 컬렉션
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _schema(collection: str) -> Tuple[str, Tuple[str, ...]]:
+        if collection not in COLLECTIONS:
+            raise KeyError(f"알 수 없는 컬렉션: {collection}")
+        return COLLECTIONS[collection]
+
+    def get(self, collection: str, key: str) -> Optional[Dict]:
+        self._schema(collection)
+        row = self._connect().execute(
+            f"SELECT data FROM {collection} WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, collection: str, doc: Dict, key: Optional[str] = None) -> str:
+        """문서 저장 (키가 같으면 교체, 삽입 순서는 유지)"""
+        key_field, fields = self._schema(collection)
+        key = key if key is not None else doc[key_field]
+        columns = ("key",) + fields + ("data",)
+        values = [key] + [_column_value(doc.get(field)) for field in fields]
+        values.append(_dumps(doc))
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        with self.transaction() as conn:
+            conn.execute(
+                f"INSERT INTO {collection} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(key) DO UPDATE SET {updates}",
+                values
+            )
+        return key
+
+    def insert_unique(self, collection: str, doc: Dict) -> str:
+        """
+        새 문서 추가 (키 충돌 시 '_1', '_2' ... 접미사를 붙여 고유 키 부여)
+
+        Returns:
+            실제 저장된 키 (문서의 키 필드도 같은 값으로 갱신)
+        """
+        key_field, _ = self._schema(collection)
+        base = doc[key_field]
+        with self.transaction():
+            key, suffix = base, 0
+            while self.exists(collection, key):
+                suffix += 1
+                key = f"{base}_{suffix}"
+            doc[key_field] = key
+            self.put(collection, doc)
+        return key
+
+    def update(self, collection: str, key: str, mutate: Callable[[Dict], Any]) -> Optional[Dict]:
+        """
+        문서 조회-수정-저장을 한 트랜잭션으로 수행
+
+        Args:
+            mutate: 문서를 제자리에서 수정하는 함수
+
+        Returns:
+            수정된 문서 (없으면 None)
+        """
+        with self.transaction():
+            doc = self.get(collection, key)
+            if doc is None:
+                return None
+            mutate(doc)
+            self.put(collection, doc, key=key)
+        return doc
+
+    def delete(self, collection: str, key: str) -> bool:
+        self._schema(collection)
+        with self.transaction() as conn:
+            cursor = conn.execute(f"DELETE FROM {collection} WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def delete_where(self, collection: str, **filters) -> int:
+        """인덱스 필드 조건에 맞는 문서 삭제 (조건이 없으면 전체)"""
+        where, params = self._where(collection, filters)
+        with self.transaction() as conn:
+            cursor = conn.execute(f"DELETE FROM {collection}{where}", params)
+        return cursor.rowcount
+
+    def prune(self, collection: str, order_by: str, keep: Optional[int] = None,
+              before: Optional[Any] = None) -> int:
+        """
+        보존 정책 적용 (order_by 필드 기준 오래된 문서 삭제)
+
+        Args:
+            keep: 최신 keep개만 유지
+            before: order_by 값이 이보다 작은 문서 삭제
+
+        Returns:
+            삭제된 문서 수
+        """
+        self._check_field(collection, order_by)
+        removed = 0
+        with self.transaction() as conn:
+            if before is not None:
+                removed += conn.execute(
+                    f"DELETE FROM {collection} WHERE {order_by} < ?", (_column_value(before),)
+                ).rowcount
+            if keep is not None:
+                removed += conn.execute(
+                    f"DELETE FROM {collection} WHERE key IN (SELECT key FROM {collection} "
+                    f"ORDER BY {order_by} DESC LIMIT -1 OFFSET ?)", (int(keep),)
+                ).rowcount
+        return removed
+
+    def exists(self, collection: str, key: str) -> bool:
+        self._schema(collection)
+        row = self._connect().execute(
+            f"SELECT 1 FROM {collection} WHERE key = ?", (key,)
+        ).fetchone()
+        return row is not None
+
+    def count(self, collection: str, **filters) -> int:
+        where, params = self._where(collection, filters)
+        row = self._connect().execute(f"SELECT COUNT(*) FROM {collection}{where}", params).fetchone()
+        return row[0]
+
+    def find(self, collection: str, order_by: Optional[str] = None, descending: bool = False,
+             limit: Optional[int] = None, after: Optional[Tuple[str, Any]] = None,
+             between: Optional[Tuple[str, Any, Any]] = None, **filters) -> List[Dict]:
+        """
+        인덱스 필드 조건으로 문서 조회
+
+        Args:
+            order_by: 정렬 필드 (인덱스 필드)
+            after: (필드, 값) - 필드 값이 이보다 큰 문서만
+            between: (필드, 하한, 상한) - 양 끝 포함, None인 경계는 제한 없음
+            **filters: 필드=값 일치 조건
+        """
+        where, params = self._where(collection, filters, after, between)
+        sql = f"SELECT data FROM {collection}{where}"
+        if order_by:
+            self._check_field(collection, order_by)
+            sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [json.loads(row[0]) for row in self._connect().execute(sql, params)]
+
+    def all(self, collection: str) -> List[Dict]:
+        """컬렉션 전체 (삽입 순서)"""
+        return [doc for _, doc in self.items(collection)]
+
+    def items(self, collection: str) -> List[Tuple[str, Dict]]:
+        """(키, 문서) 전체 (삽입 순서)"""
+        self._schema(collection)
+        rows = self._connect().execute(f"SELECT key, data FROM {collection} ORDER BY rowid")
+        return [(row[0], json.loads(row[1])) for row in rows]
+
+    def _check_field(self, collection: str, field: str):
+        _, fields = self._schema(collection)
+        if field not in fields:
+            raise KeyError(f"{collection}: 인덱스 필드가 아님: {field}")
+
+    def _where(self, collection: str, filters: Dict[str, Any],
+               after: Optional[Tuple[str, Any]] = None,
+               between: Optional[Tuple[str, Any, Any]] = None) -> Tuple[str, List]:
+        self._schema(collection)
+        clauses, params = [], []
+        for field, value in filters.items():
+            self._check_field(collection, field)
+            if value is None:
+                clauses.append(f"{field} IS NULL")
+            else:
+                clauses.append(f"{field} = ?")
+                params.append(_column_value(value))
+        if after is not None:
+            field, value = after
+            self._check_field(collection, field)
+            clauses.append(f"{field} > ?")
+            params.append(_column_value(value))
+        if between is not None:
+            field, low, high = between
+            self._check_field(collection, field)
+            if low is not None:
+                clauses.append(f"{field} >= ?")
+                params.append(_column_value(low))
+            if high is not None:
+                clauses.append(f"{field} <= ?")
+                params.append(_column_value(high))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    # ------------------------------------------------------------------
+    # 로그 (추가 전용)
+    # ------------------------------------------------------------------
+    def append_log(self, stream: str, entry: Dict):
+        with self.transaction() as conn:
+            conn.execute("INSERT INTO logs (stream, data) VALUES (?, ?)",
+                         (stream, _dumps(entry)))
+
+    def read_log(self, stream: str, limit: Optional[int] = None) -> List[Dict]:
+        """스트림 로그 (오래된 순, limit이 있으면 최근 limit개)"""
+        conn = self._connect()
+        if limit is None:
+            rows = conn.execute("SELECT data FROM logs WHERE stream = ? ORDER BY seq", (stream,))
+            return [json.loads(row[0]) for row in rows]
+        rows = conn.execute(
+            "SELECT data FROM logs WHERE stream = ? ORDER BY seq DESC LIMIT ?", (stream, int(limit))
+        ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    # ------------------------------------------------------------------
+    # 기존 JSON 가져오기
+    # ------------------------------------------------------------------
+    def import_legacy(self, source: str, path: Path, importer: Callable[[Any], None],
+                      loader: Optional[Callable[[Path], Any]] = None) -> bool:
+        """
+        기존 JSON 파일을 최초 1회 가져오기
+
+        Args:
+            source: 가져오기 식별자 (같은 식별자는 다시 가져오지 않음)
+            path: JSON 파일 경로
+            importer: 로드된 JSON을 받아 저장소에 기록하는 함수 (같은 트랜잭션에서 실행)
+            loader: 파일 로드 함수 (기본: JSON, JSONL 등은 별도 지정)
+
+        Returns:
+            이번 호출에서 가져왔는지 여부
+        """
+        path = Path(path)
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM imports WHERE source = ?", (source,)).fetchone():
+            return False
+
+        data = None
+        if path.exists():
+            try:
+                data = (loader or _load_json)(path)
+            except Exception as e:
+                # 손상된 파일은 가져오지 않고 남겨 둠 (복구 후 다시 가져오기 가능)
+                print(f"[WARN] 기존 상태 파일 로드 실패 ({path}): {e}")
+                return False
+
+        with self.transaction() as conn:
+            # 다른 워커가 먼저 가져왔는지 쓰기 잠금 안에서 다시 확인
+            if conn.execute("SELECT 1 FROM imports WHERE source = ?", (source,)).fetchone():
+                return False
+            if data is not None:
+                importer(data)
+            conn.execute("INSERT INTO imports (source, imported_at) VALUES (?, datetime('now'))", (source,))
+        imported = data is not None
+        if imported:
+            print(f"[INFO] 기존 상태 파일을 저장소로 가져왔습니다: {path} → {self.path}")
+        return imported
+
+
+_STORES: Dict[str, StateStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_state_store(path) -> StateStore:
+    """경로별 공유 저장소 (같은 프로세스에서는 스키마 초기화를 한 번만 수행)"""
+    key = str(Path(path).resolve())
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = StateStore(key)
+            _STORES[key] = store
+        return store
+
+
+def store_path_for(legacy_file) -> Path:
+    """기존 JSON 파일과 같은 디렉토리의 저장소 경로"""
+    return Path(legacy_file).parent / STORE_FILENAME
@@ -0,0 +1,227 @@
+# core_pipeline/statistics_service.py
+# -*- coding: utf-8 -*-
+"""
+Statistics Service
+대시보드용 온톨로지/데이터 통계 카운터 유지
+
+매 요청마다 to_json()으로 전체 그래프를 직렬화하거나 load_all()로 모든 테이블을
+다시 읽지 않고, 카운터를 유지하며 변경분만 반영합니다.
+- 그래프: 변경 이력(record_graph_change)이 있으면 해당 트리플만 가감,
+  그래프 교체 등 추적되지 않은 변경이면 트리플 1회 순회로 재집계
+- 테이블: 로더 데이터 버전이 바뀐 테이블(재로드)만 다시 집계
+"""
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from rdflib import RDF, RDFS, OWL, URIRef, Literal, BNode
+    RDFLIB_AVAILABLE = True
+except ImportError:
+    RDFLIB_AVAILABLE = False
+
+THREAT_TABLE = "위협상황"
+THREAT_STATUS_COLUMN = "상태"
+RESOLVED_THREAT_STATES = {"resolved", "종료", "해제"}
+
+
+def _localname(uri) -> str:
+    text = str(uri)
+    if '#' in text:
+        return text.split('#')[-1]
+    return text.rstrip('/').split('/')[-1]
+
+
+if RDFLIB_AVAILABLE:
+    SCHEMA_PREDICATES = {RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, RDFS.range}
+    SCHEMA_TYPES = {OWL.Class, RDFS.Class, OWL.ObjectProperty, OWL.DatatypeProperty,
+                    OWL.AnnotationProperty, RDF.Property, OWL.Ontology}
+    # 인스턴스 타입이지만 클래스별 집계에서는 제외
+    GENERIC_TYPES = {OWL.NamedIndividual, OWL.Thing, RDFS.Resource}
+else:
+    SCHEMA_PREDICATES = set()
+    SCHEMA_TYPES = set()
+    GENERIC_TYPES = set()
+
+
+class GraphStatistics:
+    """트리플 단위로 가감 가능한 그래프 카운터"""
+
+    CATEGORIES = ("instance_type", "labels", "relationships", "literals", "schema", "other")
+
+    def __init__(self):
+        self.total_triples = 0
+        self.categories = Counter()
+        self.class_counts = Counter()
+        self.relation_counts = Counter()
+
+    def clear(self):
+        self.total_triples = 0
+        self.categories.clear()
+        self.class_counts.clear()
+        self.relation_counts.clear()
+
+    def apply(self, triple, delta: int):
+        """트리플 1개 추가(+1)/삭제(-1) 반영"""
+        s, p, o = triple[:3]
+        self.total_triples += delta
+
+        if p == RDF.type:
+            if o in SCHEMA_TYPES:
+                self._bump(self.categories, "schema", delta)
+            else:
+                self._bump(self.categories, "instance_type", delta)
+                if o not in GENERIC_TYPES:
+                    self._bump(self.class_counts, _localname(o), delta)
+        elif p == RDFS.label:
+            self._bump(self.categories, "labels", delta)
+        elif p in SCHEMA_PREDICATES:
+            self._bump(self.categories, "schema", delta)
+        elif isinstance(o, Literal):
+            self._bump(self.categories, "literals", delta)
+        elif isinstance(o, URIRef) and not isinstance(s, BNode):
+            self._bump(self.categories, "relationships", delta)
+            self._bump(self.relation_counts, _localname(p), delta)
+        else:
+            self._bump(self.categories, "other", delta)
+
+    @staticmethod
+    def _bump(counter: Counter, key, delta: int):
+        value = counter[key] + delta
+        if value > 0:
+            counter[key] = value
+        else:
+            counter.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "total_triples": self.total_triples,
+            "triples_by_category": {name: self.categories.get(name, 0) for name in self.CATEGORIES},
+            "instances": sum(self.class_counts.values()),
+            "instances_by_class": dict(self.class_counts.most_common()),
+            "relations_by_type": dict(self.relation_counts.most_common()),
+        }
+
+
+class StatisticsService:
+    """
+    온톨로지 그래프/데이터 테이블 통계 서비스
+
+    조회 시 그래프 버전과 테이블 데이터 버전만 확인하고, 바뀐 부분만 반영한 뒤
+    유지 중인 카운터를 반환합니다.
+    """
+
+    def __init__(self, ontology_manager, data_manager):
+        self.ontology_manager = ontology_manager
+        self.data_manager = data_manager
+        self._graph_stats = GraphStatistics()
+        self._graph = None
+        self._graph_version: Optional[int] = None
+        self._table_counts: Dict[str, Dict[str, Any]] = {}  # 테이블명 → {"version", "rows", "active"}
+        self._lock = threading.RLock()
+        self.last_sync: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # 그래프
+    # ------------------------------------------------------------------
+    def sync_graph(self) -> Dict[str, Any]:
+        """
+        그래프 카운터를 현재 그래프에 맞춤
+
+        Returns:
+            {"mode": "none"/"incremental"/"full", "changes": 반영한 트리플 수, "version"}
+        """
+        om = self.ontology_manager
+        graph = getattr(om, "graph", None)
+        if not RDFLIB_AVAILABLE or graph is None:
+            return {}
+
+        with self._lock:
+            version = om.get_graph_version() if hasattr(om, "get_graph_version") else None
+            if graph is self._graph and version is not None and version == self._graph_version:
+                return {"mode": "none", "changes": 0, "version": version}
+
+            entries = None
+            if (graph is self._graph and self._graph_version is not None
+                    and hasattr(om, "get_graph_change_entries")):
+                entries = om.get_graph_change_entries(self._graph_version)
+
+            if entries is None:
+                self._graph_stats.clear()
+                for triple in graph:
+                    self._graph_stats.apply(triple, 1)
+                self.last_sync = {"mode": "full", "changes": self._graph_stats.total_triples, "version": version}
+            else:
+                changes = 0
+                for entry in entries:
+                    for triple in entry["removed"]:
+                        self._graph_stats.apply(triple, -1)
+                    for triple in entry["added"]:
+                        self._graph_stats.apply(triple, 1)
+                    changes += len(entry["removed"]) + len(entry["added"])
+                self.last_sync = {"mode": "incremental", "changes": changes, "version": version}
+
+            self._graph = graph
+            self._graph_version = version
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"그래프 통계 동기화: {self.last_sync}")
+            return self.last_sync
+
+    def get_ontology_stats(self) -> Dict[str, Any]:
+        """온톨로지 통계 (트리플/카테고리/클래스별 인스턴스/관계 유형별 수)"""
+        with self._lock:
+            self.sync_graph()
+            stats = self._graph_stats.snapshot()
+            stats["graph_version"] = self._graph_version
+            return stats
+
+    # ------------------------------------------------------------------
+    # 데이터 테이블
+    # ------------------------------------------------------------------
+    def _table_entry(self, name: str) -> Optional[Dict[str, Any]]:
+        """테이블 집계 (데이터 버전이 바뀐 경우에만 재계산)"""
+        version = self.data_manager.get_table_version(name)
+        if version is None:
+            return None
+        entry = self._table_counts.get(name)
+        if entry is not None and entry["version"] == version:
+            return entry
+
+        entry = {"version": version, "rows": self.data_manager.get_table_row_count(name) or 0}
+        if name == THREAT_TABLE:
+            entry["active"] = self._count_active_threats(entry["rows"])
+        self._table_counts[name] = entry
+        return entry
+
+    def _count_active_threats(self, rows: int) -> int:
+        try:
+            df = self.data_manager.load_table(THREAT_TABLE)
+        except Exception as e:
+            logger.warning(f"{THREAT_TABLE} 로드 실패: {e}")
+            return rows
+        if THREAT_STATUS_COLUMN not in df.columns:
+            return len(df)
+        states = df[THREAT_STATUS_COLUMN].astype(str).str.strip().str.lower()
+        return int((~states.isin(RESOLVED_THREAT_STATES)).sum())
+
+    def get_table_stats(self) -> Dict[str, int]:
+        """테이블별 행 수"""
+        with self._lock:
+            counts = {}
+            for name in self.data_manager.list_tables():
+                entry = self._table_entry(name)
+                if entry is not None:
+                    counts[name] = entry["rows"]
+            return counts
+
+    def get_threat_stats(self) -> Dict[str, int]:
+        """위협 수 (전체/미해결)"""
+        with self._lock:
+            entry = self._table_entry(THREAT_TABLE)
+            if entry is None:
+                return {"total": 0, "active": 0}
+            return {"total": entry["rows"], "active": entry.get("active", entry["rows"])}
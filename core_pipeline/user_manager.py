@@ -3,39 +3,39 @@
 """
 사용자 관리 시스템
 """
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List
 import hashlib
 
+from core_pipeline.state_store import get_state_store, store_path_for
+
+
+def _public(user: Dict) -> Dict:
+    """비밀번호 해시를 제외한 사용자 정보"""
+    user_copy = user.copy()
+    user_copy.pop("password_hash", None)
+    return user_copy
+
 
 class UserManager:
-    """사용자 관리 클래스"""
+    """사용자 관리 클래스 (상태 저장소의 users 컬렉션 사용)"""
     
-    def __init__(self, users_file: str = "data/collaboration/users.json"):
+    def __init__(self, users_file: str = "data/collaboration/users.json", store=None):
         self.users_file = Path(users_file)
-        self.users_file.parent.mkdir(parents=True, exist_ok=True)
-        self.users = self._load_users()
+        self.store = store or get_state_store(store_path_for(self.users_file))
+        self.store.import_legacy(f"users:{self.users_file.name}", self.users_file, self._import_users)
     
-    def _load_users(self) -> List[Dict]:
-        """사용자 목록 로드"""
-        if self.users_file.exists():
-            try:
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[WARN] 사용자 파일 로드 실패: {e}")
-                return []
-        return []
+    def _import_users(self, users: List[Dict]):
+        """기존 users.json 가져오기"""
+        for user in users:
+            if user.get("user_id"):
+                self.store.put("users", user)
     
-    def _save_users(self):
-        """사용자 목록 저장"""
-        try:
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(self.users, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[ERROR] 사용자 파일 저장 실패: {e}")
+    @property
+    def users(self) -> List[Dict]:
+        """전체 사용자 목록 (조회용 스냅샷)"""
+        return self.store.all("users")
     
     def _hash_password(self, password: str) -> str:
         """비밀번호 해싱 (간단한 해싱, 파일럿 단계)"""
@@ -47,16 +47,14 @@ class UserManager:
         """사용자 인증"""
         password_hash = self._hash_password(password)
         
-        for user in self.users:
-            if user.get("username") == username and user.get("password_hash") == password_hash:
+        for user in self.store.find("users", username=username):
+            if user.get("password_hash") == password_hash:
                 # 마지막 로그인 시간 업데이트
                 user["last_login"] = datetime.now().isoformat()
-                self._save_users()
+                self.store.put("users", user)
                 
                 # 비밀번호 해시는 반환하지 않음
-                user_copy = user.copy()
-                user_copy.pop("password_hash", None)
-                return user_copy
+                return _public(user)
         
         return None
     
@@ -69,88 +67,64 @@ class UserManager:
         is_super_user: bool = False
     ) -> Dict:
         """사용자 생성"""
-        # 중복 확인
-        for user in self.users:
-            if user.get("username") == username:
+        # 중복 확인과 ID 부여를 한 트랜잭션에서 수행 (다른 워커와 경합 방지)
+        with self.store.transaction():
+            if self.store.count("users", username=username):
                 raise ValueError(f"사용자명 '{username}'이 이미 존재합니다.")
-        
-        user_id = f"USER{len(self.users) + 1:03d}"
-        new_user = {
-            "user_id": user_id,
-            "username": username,
-            "password_hash": self._hash_password(password),
-            "role": role,
-            "department": department,
-            "is_super_user": is_super_user,
-            "created_at": datetime.now().isoformat(),
-            "last_login": None
-        }
-        
-        self.users.append(new_user)
-        self._save_users()
+            
+            sequence = self.store.count("users") + 1
+            while self.store.exists("users", f"USER{sequence:03d}"):
+                sequence += 1
+            new_user = {
+                "user_id": f"USER{sequence:03d}",
+                "username": username,
+                "password_hash": self._hash_password(password),
+                "role": role,
+                "department": department,
+                "is_super_user": is_super_user,
+                "created_at": datetime.now().isoformat(),
+                "last_login": None
+            }
+            self.store.put("users", new_user)
         
         # 비밀번호 해시는 반환하지 않음
-        user_copy = new_user.copy()
-        user_copy.pop("password_hash", None)
-        return user_copy
+        return _public(new_user)
     
     def get_user(self, user_id: str) -> Optional[Dict]:
         """사용자 조회"""
-        for user in self.users:
-            if user.get("user_id") == user_id:
-                user_copy = user.copy()
-                user_copy.pop("password_hash", None)
-                return user_copy
-        return None
+        user = self.store.get("users", user_id)
+        return _public(user) if user else None
     
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """사용자명으로 사용자 조회"""
-        for user in self.users:
-            if user.get("username") == username:
-                user_copy = user.copy()
-                user_copy.pop("password_hash", None)
-                return user_copy
-        return None
+        users = self.store.find("users", username=username, limit=1)
+        return _public(users[0]) if users else None
     
     def get_users_by_role(self, role: str) -> List[Dict]:
         """역할별 사용자 조회"""
-        users = []
-        for user in self.users:
-            if user.get("role") == role:
-                user_copy = user.copy()
-                user_copy.pop("password_hash", None)
-                users.append(user_copy)
-        return users
+        return [_public(user) for user in self.store.find("users", role=role)]
     
     def update_user(self, user_id: str, **kwargs) -> bool:
         """사용자 정보 업데이트"""
-        for user in self.users:
-            if user.get("user_id") == user_id:
-                # 비밀번호는 별도 처리
-                if "password" in kwargs:
-                    user["password_hash"] = self._hash_password(kwargs.pop("password"))
-                
-                # 나머지 필드 업데이트
-                for key, value in kwargs.items():
-                    if key != "password_hash":  # 해시는 직접 수정 불가
-                        user[key] = value
-                
-                self._save_users()
-                return True
-        return False
+        def apply(user: Dict):
+            # 비밀번호는 별도 처리
+            if "password" in kwargs:
+                user["password_hash"] = self._hash_password(kwargs["password"])
+            
+            # 나머지 필드 업데이트 (사용자 ID는 키이므로 변경 불가)
+            for key, value in kwargs.items():
+                if key not in ("password", "password_hash", "user_id"):  # 해시는 직접 수정 불가
+                    user[key] = value
+        
+        return self.store.update("users", user_id, apply) is not None
     
     def delete_user(self, user_id: str) -> bool:
         """사용자 삭제"""
-        for i, user in enumerate(self.users):
-            if user.get("user_id") == user_id:
-                self.users.pop(i)
-                self._save_users()
-                return True
-        return False
+        return self.store.delete("users", user_id)
     
     def initialize_default_users(self):
         """기본 사용자 초기화 (파일럿 테스트용)"""
-        if len(self.users) > 0:
+        if self.store.count("users") > 0:
             return  # 이미 사용자가 있으면 초기화하지 않음
         
         default_users = [
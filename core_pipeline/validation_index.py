@@ -0,0 +1,179 @@
+# core_pipeline/validation_index.py
+# -*- coding: utf-8 -*-
+"""
+Validation Index
+온톨로지 검증용 그래프 인덱스 (단일 순회 구축 + 변경분 갱신)
+
+클래스별 인스턴스 수, 고립 노드, 미정의 참조(dangling)를
+검사마다 SPARQL/전체 트리플 리스트로 다시 계산하지 않고 유지합니다.
+- 최초(또는 추적되지 않은 변경 시) 그래프를 한 번 순회하여 구축
+- 이후에는 record_graph_change 변경 이력의 트리플만 반영
+"""
+import threading
+import weakref
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Set
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from rdflib import RDF, URIRef, Literal
+    RDFLIB_AVAILABLE = True
+except ImportError:
+    RDFLIB_AVAILABLE = False
+
+
+class GraphValidationIndex:
+    """
+    노드 차수/타입/관계 카운터 기반 검증 인덱스
+
+    - 고립 노드: 어떤 트리플의 목적어도 아니고, 주어로는 rdf:type만 가진 URI 노드
+    - 미정의 참조: 온톨로지 관계의 목적어로 쓰이지만 주어로 기술된 적 없는 URI 노드
+    """
+
+    def __init__(self, ontology_manager):
+        self.ontology_manager = ontology_manager
+        self.namespace = str(getattr(ontology_manager, "ns", "") or "")
+        self.type_counts: Counter = Counter()
+        self.predicate_counts: Counter = Counter()
+        self.orphans: Set = set()
+        self.dangling: Set = set()
+        self._out = Counter()            # 노드 → 주어로 쓰인 트리플 수
+        self._out_non_type = Counter()   # 노드 → rdf:type 이외 트리플 수
+        self._in = Counter()             # 노드 → 목적어로 쓰인 트리플 수
+        self._in_relation = Counter()    # 노드 → 온톨로지 관계의 목적어로 쓰인 수
+        self._graph = None
+        self._version: Optional[int] = None
+        self._lock = threading.RLock()
+        self.last_sync: Dict[str, Any] = {}
+
+    def is_relation(self, p, o) -> bool:
+        """미정의 참조 판정 대상 관계 (온톨로지 네임스페이스 프리디케이트 → URI)"""
+        return isinstance(o, URIRef) and p != RDF.type and str(p).startswith(self.namespace)
+
+    def _clear(self):
+        for counter in (self.type_counts, self.predicate_counts, self._out, self._out_non_type,
+                        self._in, self._in_relation):
+            counter.clear()
+        self.orphans.clear()
+        self.dangling.clear()
+
+    @staticmethod
+    def _bump(counter: Counter, key, delta: int) -> int:
+        value = counter[key] + delta
+        if value > 0:
+            counter[key] = value
+        else:
+            counter.pop(key, None)
+            value = 0
+        return value
+
+    def _apply(self, triple, delta: int, touched: Set):
+        s, p, o = triple[:3]
+        self._bump(self.predicate_counts, p, delta)
+        self._bump(self._out, s, delta)
+        touched.add(s)
+        if p == RDF.type:
+            self._bump(self.type_counts, o, delta)
+        else:
+            self._bump(self._out_non_type, s, delta)
+        if isinstance(o, Literal):
+            return
+        self._bump(self._in, o, delta)
+        touched.add(o)
+        if self.is_relation(p, o):
+            self._bump(self._in_relation, o, delta)
+
+    def _refresh_nodes(self, nodes: Iterable):
+        for node in nodes:
+            if not isinstance(node, URIRef):
+                continue
+            if self._out.get(node) and not self._out_non_type.get(node) and not self._in.get(node):
+                self.orphans.add(node)
+            else:
+                self.orphans.discard(node)
+            if self._in_relation.get(node) and not self._out.get(node):
+                self.dangling.add(node)
+            else:
+                self.dangling.discard(node)
+
+    def sync(self) -> Dict[str, Any]:
+        """
+        인덱스를 현재 그래프에 맞춤
+
+        Returns:
+            {"mode": "none"/"incremental"/"full", "changes", "version",
+             "since"(이전 동기화 버전), "touched"(갱신된 노드 집합, 전체 구축이면 None)}
+        """
+        om = self.ontology_manager
+        graph = getattr(om, "graph", None)
+        if not RDFLIB_AVAILABLE or graph is None:
+            return {}
+
+        with self._lock:
+            version = om.get_graph_version() if hasattr(om, "get_graph_version") else None
+            if graph is self._graph and version is not None and version == self._version:
+                return {"mode": "none", "changes": 0, "version": version, "since": version, "touched": set()}
+
+            entries = None
+            if graph is self._graph and self._version is not None and hasattr(om, "get_graph_change_entries"):
+                entries = om.get_graph_change_entries(self._version)
+
+            touched: Set = set()
+            if entries is None:
+                self._clear()
+                changes = 0
+                for triple in graph:
+                    self._apply(triple, 1, touched)
+                    changes += 1
+                self._refresh_nodes(touched)
+                self.last_sync = {"mode": "full", "changes": changes, "version": version,
+                                  "since": None, "touched": None}
+            else:
+                changes = 0
+                for entry in entries:
+                    for triple in entry["removed"]:
+                        self._apply(triple, -1, touched)
+                    for triple in entry["added"]:
+                        self._apply(triple, 1, touched)
+                    changes += len(entry["removed"]) + len(entry["added"])
+                self._refresh_nodes(touched)
+                self.last_sync = {"mode": "incremental", "changes": changes, "version": version,
+                                  "since": self._version, "touched": touched}
+
+            self._graph = graph
+            self._version = version
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"검증 인덱스 동기화: mode={self.last_sync['mode']}, changes={changes}")
+            return self.last_sync
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def count_instances(self, class_uri) -> int:
+        return self.type_counts.get(class_uri, 0)
+
+    def count_predicate(self, predicate) -> int:
+        return self.predicate_counts.get(predicate, 0)
+
+    def is_defined(self, node) -> bool:
+        """노드가 주어로 기술되어 있는지 (미정의 참조가 아닌지)"""
+        return bool(self._out.get(node))
+
+
+_INDEXES = weakref.WeakKeyDictionary()
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_validation_index(ontology_manager) -> GraphValidationIndex:
+    """온톨로지 매니저별 공유 검증 인덱스 (동기화된 상태로 반환)"""
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(ontology_manager)
+        if index is None:
+            index = GraphValidationIndex(ontology_manager)
+            _INDEXES[ontology_manager] = index
+    index.sync()
+    return index
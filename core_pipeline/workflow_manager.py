@@ -3,39 +3,41 @@
 """
 워크플로우 관리 시스템
 """
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional, List
 
+from core_pipeline.state_store import get_state_store, store_path_for
+
 
 class WorkflowManager:
-    """워크플로우 관리 클래스"""
+    """워크플로우 관리 클래스 (상태 저장소의 approval_requests 컬렉션 사용)"""
     
-    def __init__(self, requests_file: str = "data/collaboration/approval_requests.json", realtime_collaboration=None):
+    def __init__(self, requests_file: str = "data/collaboration/approval_requests.json",
+                 realtime_collaboration=None, store=None):
         self.requests_file = Path(requests_file)
-        self.requests_file.parent.mkdir(parents=True, exist_ok=True)
         self.realtime_collaboration = realtime_collaboration
-        self.requests = self._load_requests()
+        self.store = store or get_state_store(store_path_for(self.requests_file))
+        self.store.import_legacy(f"approval_requests:{self.requests_file.name}", self.requests_file,
+                                 self._import_requests)
+    
+    def _import_requests(self, requests: List[Dict]):
+        """기존 approval_requests.json 가져오기"""
+        for request in requests:
+            if request.get("request_id"):
+                self.store.insert_unique("approval_requests", request)
     
-    def _load_requests(self) -> List[Dict]:
-        """승인 요청 목록 로드"""
-        if self.requests_file.exists():
-            try:
-                with open(self.requests_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[WARN] 승인 요청 파일 로드 실패: {e}")
-                return []
-        return []
+    @property
+    def requests(self) -> List[Dict]:
+        """전체 승인 요청 목록 (조회용 스냅샷)"""
+        return self.store.all("approval_requests")
     
-    def _save_requests(self):
-        """승인 요청 목록 저장"""
-        try:
-            with open(self.requests_file, 'w', encoding='utf-8') as f:
-                json.dump(self.requests, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[ERROR] 승인 요청 파일 저장 실패: {e}")
+    def _update_request(self, request_id: str, mutate) -> Dict:
+        """승인 요청 조회-수정-저장 (한 트랜잭션)"""
+        request = self.store.update("approval_requests", request_id, mutate)
+        if request is None:
+            raise ValueError(f"Request {request_id} not found")
+        return request
     
     def create_approval_request(
         self,
@@ -44,18 +46,16 @@ class WorkflowManager:
         approver_id: str = None
     ) -> str:
         """승인 요청 생성 (자동 알림 전송)"""
-        request_id = f"REQ_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
         # approver_id가 없으면 지휘관 역할의 사용자 찾기
         if not approver_id and self.realtime_collaboration:
             from core_pipeline.user_manager import UserManager
-            user_manager = UserManager()
+            user_manager = UserManager(store=self.store)
             commanders = user_manager.get_users_by_role("commander")
             if commanders:
                 approver_id = commanders[0].get("user_id")
         
         request = {
-            "request_id": request_id,
+            "request_id": f"REQ_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
             "recommendation_id": recommendation.get("recommendation_id") or f"REC_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
             "requester_id": requester_id,
             "approver_id": approver_id,
@@ -66,8 +66,8 @@ class WorkflowManager:
             "review_comments": []
         }
         
-        self.requests.append(request)
-        self._save_requests()
+        # 같은 초에 생성된 요청은 접미사로 구분
+        request_id = self.store.insert_unique("approval_requests", request)
         
         # 자동 알림 전송: 지휘관 역할의 사용자에게
         if self.realtime_collaboration:
@@ -85,17 +85,13 @@ class WorkflowManager:
     
     def get_request(self, request_id: str) -> Optional[Dict]:
         """승인 요청 조회"""
-        for request in self.requests:
-            if request.get("request_id") == request_id:
-                return request
-        return None
+        return self.store.get("approval_requests", request_id)
     
     def get_request_by_recommendation(self, recommendation_id: str) -> Optional[Dict]:
         """추천 ID로 승인 요청 조회"""
-        for request in self.requests:
-            if request.get("recommendation_id") == recommendation_id:
-                return request
-        return None
+        requests = self.store.find("approval_requests", order_by="created_at",
+                                   recommendation_id=recommendation_id, limit=1)
+        return requests[0] if requests else None
     
     def add_review_comment(
         self,
@@ -105,10 +101,6 @@ class WorkflowManager:
         rating: int = 3  # 1-5
     ):
         """검토 의견 추가 (자동 알림 전송)"""
-        request = self.get_request(request_id)
-        if not request:
-            raise ValueError(f"Request {request_id} not found")
-        
         # 의견 추가
         review_comment = {
             "reviewer_id": reviewer_id,
@@ -117,14 +109,12 @@ class WorkflowManager:
             "created_at": datetime.now().isoformat()
         }
         
-        if "review_comments" not in request:
-            request["review_comments"] = []
-        request["review_comments"].append(review_comment)
-        
-        if request["status"] == "pending_review":
-            request["status"] = "under_review"
+        def apply(request: Dict):
+            request.setdefault("review_comments", []).append(review_comment)
+            if request["status"] == "pending_review":
+                request["status"] = "under_review"
         
-        self._save_requests()
+        request = self._update_request(request_id, apply)
         
         # 자동 알림 전송: 요청자에게
         if self.realtime_collaboration:
@@ -145,17 +135,14 @@ class WorkflowManager:
         comments: str = None
     ):
         """방책 승인 (자동 알림 전송)"""
-        request = self.get_request(request_id)
-        if not request:
-            raise ValueError(f"Request {request_id} not found")
-        
-        request["status"] = "approved"
-        request["approved_at"] = datetime.now().isoformat()
-        request["approver_id"] = approver_id
-        if comments:
-            request["approver_comments"] = comments
+        def apply(request: Dict):
+            request["status"] = "approved"
+            request["approved_at"] = datetime.now().isoformat()
+            request["approver_id"] = approver_id
+            if comments:
+                request["approver_comments"] = comments
         
-        self._save_requests()
+        request = self._update_request(request_id, apply)
         
         # 자동 알림 전송: 요청자에게
         if self.realtime_collaboration:
@@ -177,16 +164,13 @@ class WorkflowManager:
         reason: str
     ):
         """방책 반려 (자동 알림 전송)"""
-        request = self.get_request(request_id)
-        if not request:
-            raise ValueError(f"Request {request_id} not found")
+        def apply(request: Dict):
+            request["status"] = "rejected"
+            request["rejected_at"] = datetime.now().isoformat()
+            request["approver_id"] = approver_id
+            request["rejection_reason"] = reason
         
-        request["status"] = "rejected"
-        request["rejected_at"] = datetime.now().isoformat()
-        request["approver_id"] = approver_id
-        request["rejection_reason"] = reason
-        
-        self._save_requests()
+        request = self._update_request(request_id, apply)
         
         # 자동 알림 전송: 요청자에게
         if self.realtime_collaboration:
@@ -208,16 +192,13 @@ class WorkflowManager:
         modification_request: str
     ):
         """수정 요청"""
-        request = self.get_request(request_id)
-        if not request:
-            raise ValueError(f"Request {request_id} not found")
-        
-        request["status"] = "pending_modification"
-        request["modification_request"] = modification_request
-        request["modification_requested_at"] = datetime.now().isoformat()
-        request["modification_requester_id"] = approver_id
+        def apply(request: Dict):
+            request["status"] = "pending_modification"
+            request["modification_request"] = modification_request
+            request["modification_requested_at"] = datetime.now().isoformat()
+            request["modification_requester_id"] = approver_id
         
-        self._save_requests()
+        request = self._update_request(request_id, apply)
         
         # 자동 알림 전송
         if self.realtime_collaboration:
@@ -232,15 +213,18 @@ class WorkflowManager:
     
     def get_requests_by_user(self, user_id: str, role: str = None) -> List[Dict]:
         """사용자별 승인 요청 조회"""
-        result = []
-        for request in self.requests:
-            if role == "commander" and request.get("approver_id") == user_id:
-                result.append(request)
-            elif role == "planner" and request.get("requester_id") == user_id:
-                result.append(request)
-            elif not role:
-                if request.get("requester_id") == user_id or request.get("approver_id") == user_id:
-                    result.append(request)
+        if role == "commander":
+            result = self.store.find("approval_requests", approver_id=user_id)
+        elif role == "planner":
+            result = self.store.find("approval_requests", requester_id=user_id)
+        elif not role:
+            # 요청자/승인자 인덱스 각각 조회 후 병합
+            merged = {r["request_id"]: r for r in self.store.find("approval_requests", requester_id=user_id)}
+            for r in self.store.find("approval_requests", approver_id=user_id):
+                merged.setdefault(r["request_id"], r)
+            result = list(merged.values())
+        else:
+            result = []
         return sorted(result, key=lambda x: x.get("created_at", ""), reverse=True)
     
     def create_approval_request_as_role(
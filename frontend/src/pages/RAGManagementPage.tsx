@@ -103,7 +103,7 @@ export default function RAGManagementPage() {
     };
 
     const handleReindex = async () => {
-        if (!window.confirm('전체 인덱스를 재구성하시겠습니까? 문서 수에 따라 시간이 걸릴 수 있습니다.')) return;
+        if (!window.confirm('인덱스를 갱신하시겠습니까? 신규/변경된 문서만 다시 색인합니다.')) return;
 
         setReindexing(true);
         setError(null);
@@ -112,12 +112,30 @@ export default function RAGManagementPage() {
                 method: 'POST'
             });
             const data = await res.json();
-            if (res.ok) {
+            if (!res.ok) {
+                setError(data.detail || '인덱스 재구축 실패');
+                return;
+            }
+            if (data.status === 'no_documents') {
+                alert('인덱싱할 문서가 없습니다.');
+                return;
+            }
+
+            // 재색인은 백그라운드 작업으로 실행되므로 완료될 때까지 상태 조회
+            let job = data;
+            while (job.status === 'started' || job.status === 'running') {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                const statusRes = await fetch(`http://${window.location.hostname}:8000/api/v1/rag/reindex/status`);
+                job = await statusRes.json();
+            }
+
+            if (job.status === 'completed') {
                 await fetchStatus();
                 await fetchDocuments();
-                alert(`인덱스 재구축 완료: 총 ${data.total_chunks} 청크 생성`);
+                const result = job.result || {};
+                alert(`인덱스 갱신 완료 (${result.mode === 'full' ? '전체' : '증분'}): 신규 ${result.added}, 변경 ${result.modified}, 삭제 ${result.deleted}, 총 ${result.total_chunks} 청크`);
             } else {
-                setError(data.detail || '인덱스 재구축 실패');
+                setError(job.error || '인덱스 재구축 실패');
             }
         } catch (err) {
             setError('인덱싱 과정에서 오류가 발생했습니다.');
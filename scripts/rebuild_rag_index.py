@@ -13,6 +13,7 @@ sys.path.insert(0, str(project_root))
 
 from core_pipeline.orchestrator import Orchestrator
 from core_pipeline.rag_manager import RAGManager
+from core_pipeline.rag_manifest import list_documents, sync_documents
 import yaml
 
 def load_config():
@@ -57,76 +58,29 @@ def rebuild_rag_index():
         return False
     
     # 문서 파일 목록 확인
-    doc_files = list(rag_docs_path.glob("*.txt")) + list(rag_docs_path.glob("*.md"))
+    doc_files = list_documents(rag_docs_path)
     if not doc_files:
         print(f"[ERROR] RAG 문서가 없습니다: {rag_docs_path}")
         return False
     
-    print(f"\n[2/3] 문서 로드 중... ({len(doc_files)}개 파일)")
-    docs = []
-    doc_names = []
-    for doc_file in sorted(doc_files):
-        try:
-            with open(doc_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if content.strip():
-                    docs.append(content)
-                    doc_names.append(doc_file.name)
-                    print(f"  ✓ {doc_file.name}")
-        except Exception as e:
-            print(f"  ✗ {doc_file.name}: {e}")
+    print(f"\n[2/3] 문서 확인... ({len(doc_files)}개 파일)")
+    for doc_file in doc_files:
+        print(f"  ✓ {doc_file.name}")
     
-    if not docs:
-        print("[ERROR] 로드할 문서가 없습니다.")
-        return False
-    
-    # 🔥 개선: 청킹 및 인덱스 구축 (교리 문서는 전용 청킹 사용)
-    print(f"\n[3/3] 인덱스 구축 중... ({len(docs)}개 문서)")
+    # 🔥 개선: 문서 → 청크 → 임베딩 배치 단위로 스트리밍 색인 (교리 문서는 전용 청킹 사용)
+    print(f"\n[3/3] 인덱스 구축 중... ({len(doc_files)}개 문서)")
     try:
-        # 교리 문서와 일반 문서 분리
-        doctrine_docs = []
-        doctrine_names = []
-        normal_docs = []
-        normal_names = []
-        
-        for doc, name in zip(docs, doc_names):
-            if name and name.startswith("DOCTRINE-") and name.endswith(".md"):
-                doctrine_docs.append(doc)
-                doctrine_names.append(name)
-            else:
-                normal_docs.append(doc)
-                normal_names.append(name)
-        
-        all_chunks = []
-        
-        # 교리 문서는 전용 청킹 함수 사용
-        if doctrine_docs:
-            print(f"  📚 교리 문서 청킹 중... ({len(doctrine_docs)}개)")
-            doctrine_chunks = rag_manager.chunk_doctrine_documents(doctrine_docs, doc_names=doctrine_names)
-            all_chunks.extend(doctrine_chunks)
-            print(f"  ✓ 교리 문서 청크 생성 완료: {len(doctrine_chunks)}개 청크")
-        
-        # 일반 문서는 기본 청킹 함수 사용
-        if normal_docs:
-            print(f"  📄 일반 문서 청킹 중... ({len(normal_docs)}개)")
-            normal_chunks = rag_manager.chunk_documents(normal_docs, doc_names=normal_names)
-            all_chunks.extend(normal_chunks)
-            print(f"  ✓ 일반 문서 청크 생성 완료: {len(normal_chunks)}개 청크")
-        
-        print(f"  ✓ 총 청크 생성 완료: {len(all_chunks)}개 청크")
-        
-        rag_manager.build_index(all_chunks, use_faiss=True)
-        print(f"  ✓ FAISS 인덱스 구축 완료")
-        
-        # 인덱스 저장
-        rag_manager.save_index()
-        print(f"  ✓ 인덱스 저장 완료")
+        stats = sync_documents(rag_manager, rag_docs_path, force_full=True)
+        if not stats["total_chunks"]:
+            print("[ERROR] 로드할 문서가 없습니다.")
+            return False
+        print(f"  ✓ 인덱스 구축 및 저장 완료")
         
         print("\n" + "=" * 60)
         print("✅ RAG 인덱스 재구축 완료!")
         print("=" * 60)
-        print(f"  - 문서 수: {len(docs)}개 (교리: {len(doctrine_docs)}개, 일반: {len(normal_docs)}개)")
-        print(f"  - 청크 수: {len(all_chunks)}개")
+        print(f"  - 문서 수: {stats['added']}개 (교리: {stats['doctrine_docs']}개, 일반: {stats['general_docs']}개)")
+        print(f"  - 청크 수: {stats['total_chunks']}개")
         if rag_manager.faiss_index:
             print(f"  - FAISS 인덱스 크기: {rag_manager.faiss_index.ntotal}개 벡터")
         return True
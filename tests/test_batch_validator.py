@@ -0,0 +1,63 @@
+# tests/test_batch_validator.py
+# -*- coding: utf-8 -*-
+"""
+BatchValidator 회귀 테스트
+- 노드 존재를 검증 인덱스로 판정하는지 (미정의 참조는 실패)
+- 증분 검증이 인덱스 동기화에서 갱신된 노드에 걸린 관계만 다시 검증하는지
+"""
+import os
+import sys
+
+from rdflib import Graph, Namespace, RDF
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_pipeline.batch_validator import BatchValidator
+
+NS = Namespace("http://coa-agent-platform.org/ontology#")
+RULES = ["노드 존재 확인", "중복 관계 점검"]
+
+
+class _TrackedOntology:
+    """변경 이력을 기록하는 최소 온톨로지 매니저"""
+
+    def __init__(self):
+        self.graph = Graph()
+        self.ns = NS
+        self.version = 0
+        self.log = []
+
+    def add(self, *triples):
+        for triple in triples:
+            self.graph.add(triple)
+        self.version += 1
+        self.log.append({"version": self.version, "added": list(triples), "removed": []})
+
+    def get_graph_version(self) -> int:
+        return self.version
+
+    def get_graph_change_entries(self, since_version: int):
+        return [entry for entry in self.log if entry["version"] > since_version]
+
+
+def test_incremental_validation_revalidates_touched_nodes_only():
+    om = _TrackedOntology()
+    om.add((NS.Unit1, RDF.type, NS.Unit), (NS.Unit1, NS.locatedIn, NS.Cell1),
+           (NS.Cell1, RDF.type, NS.Cell), (NS.Unit2, RDF.type, NS.Unit))
+    validator = BatchValidator(om)
+
+    full = validator.validate("전체 관계", RULES)
+    assert (full["mode"], full["total"], full["passed"]) == ("full", 1, 1)
+
+    om.add((NS.Unit2, NS.locatedIn, NS.Cell9))
+    result = validator.validate("전체 관계", RULES, incremental=True)
+
+    assert result["mode"] == "incremental"
+    assert result["revalidated"] == 1
+    assert (result["total"], result["passed"], result["failed"]) == (2, 1, 1)
+    assert result["failed_relationships"] == [
+        {"source": str(NS.Unit2), "target": str(NS.Cell9), "relation": "locatedIn"}
+    ]
+
+    unchanged = validator.validate("전체 관계", RULES, incremental=True)
+    assert (unchanged["revalidated"], unchanged["total"]) == (0, 2)
@@ -0,0 +1,121 @@
+# tests/test_layered_graph.py
+# -*- coding: utf-8 -*-
+"""
+LayeredGraph 회귀 테스트
+- add()가 오버레이에 기록되는지 (rdflib Graph.__init__의 base 초기화와 충돌하지 않는지)
+- generate_reasoned_graph 결과에 전술 규칙 추론 트리플이 포함되는지
+"""
+import os
+import sys
+
+import pytest
+from rdflib import Graph, Literal, Namespace, RDF
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_pipeline.layered_graph import LayeredGraph
+
+NS = Namespace("http://coa-agent-platform.org/ontology#")
+
+TACTICAL_RULE = """PREFIX ns: <http://coa-agent-platform.org/ontology#>
+
+CONSTRUCT {
+    ?unit ns:hasAdvantage "Mountain_Infantry_Advantage" .
+} WHERE {
+    ?unit ns:locatedIn ?cell .
+    ?cell ns:지형유형 ?terrain .
+    FILTER(CONTAINS(LCASE(STR(?terrain)), "산악"))
+    ?unit ns:병종 ?type .
+    FILTER(CONTAINS(LCASE(STR(?type)), "보병"))
+}
+"""
+
+
+def _base_graph() -> Graph:
+    graph = Graph()
+    graph.bind("ns", NS)
+    graph.add((NS.Unit1, RDF.type, NS.Unit))
+    graph.add((NS.Unit1, NS.locatedIn, NS.Cell1))
+    graph.add((NS.Unit1, NS["병종"], Literal("보병")))
+    graph.add((NS.Cell1, NS["지형유형"], Literal("산악")))
+    return graph
+
+
+def test_add_writes_to_overlay_only():
+    base = _base_graph()
+    layered = LayeredGraph(base)
+
+    new_triple = (NS.Unit1, NS.hasAdvantage, Literal("X"))
+    layered.add(new_triple)
+    layered.add((NS.Unit1, RDF.type, NS.Unit))  # 기본 그래프에 이미 있는 트리플
+
+    assert new_triple in layered.overlay
+    assert new_triple in layered
+    assert new_triple not in base
+    assert len(layered.overlay) == 1
+    assert len(layered) == len(base) + 1
+
+
+def test_query_over_layers():
+    layered = LayeredGraph(_base_graph())
+    layered.add((NS.Unit1, NS.hasAdvantage, Literal("X")))
+
+    rows = list(layered.query(
+        "PREFIX ns: <http://coa-agent-platform.org/ontology#> "
+        "SELECT ?adv WHERE { ns:Unit1 ns:locatedIn ?cell . ns:Unit1 ns:hasAdvantage ?adv }"
+    ))
+    assert [str(row[0]) for row in rows] == ["X"]
+
+
+def _manager(tmp_path, **config):
+    from collections import deque
+    from core_pipeline.ontology_manager_enhanced import EnhancedOntologyManager
+
+    (tmp_path / "tactical_rules.sparql").write_text(TACTICAL_RULE, encoding="utf-8")
+    manager = EnhancedOntologyManager.__new__(EnhancedOntologyManager)
+    manager.graph = _base_graph()
+    manager.ns = NS
+    manager.config = config
+    manager.ontology_path = str(tmp_path)
+    manager._graph_version = 0
+    manager._graph_signature = None
+    manager._graph_change_log = deque(maxlen=100)
+    manager._graph_change_log_floor = 0
+    manager._incremental_inference = None
+    return manager
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+def test_reasoned_graph_contains_tactical_inferences(tmp_path, incremental):
+    manager = _manager(tmp_path, enable_incremental_inference=incremental)
+
+    reasoned = manager.generate_reasoned_graph(enable_semantic_inference=False,
+                                               run_tactical_rules=True,
+                                               run_owl_reasoner=False)
+
+    inferred = (NS.Unit1, NS.hasAdvantage, Literal("Mountain_Infantry_Advantage"))
+    assert reasoned is not None
+    assert inferred in reasoned
+    assert inferred in reasoned.overlay
+    assert inferred not in manager.graph
+    assert (manager._incremental_inference is not None) == incremental
+
+
+def test_reasoned_graph_reuses_incremental_overlay(tmp_path):
+    manager = _manager(tmp_path, incremental_inference_rebuild_ratio=1.0)
+    manager.update_incremental_inference()
+
+    # 증분 추론기에 반영된 변경분이 다음 추론 그래프에 그대로 나타나는지
+    new_facts = [(NS.Unit2, NS.locatedIn, NS.Cell1), (NS.Unit2, NS["병종"], Literal("기계화보병"))]
+    for triple in new_facts:
+        manager.graph.add(triple)
+    manager.record_graph_change(added=new_facts)
+    stats = manager.update_incremental_inference()
+    assert stats["mode"] == "incremental"
+
+    reasoned = manager.generate_reasoned_graph(enable_semantic_inference=False,
+                                               run_tactical_rules=True,
+                                               run_owl_reasoner=False)
+
+    for unit in (NS.Unit1, NS.Unit2):
+        assert (unit, NS.hasAdvantage, Literal("Mountain_Infantry_Advantage")) in reasoned.overlay
@@ -0,0 +1,67 @@
+# tests/test_rag_index_rebuild.py
+# -*- coding: utf-8 -*-
+"""
+RAGManager 전체 재구축 회귀 테스트
+- 재구축 중 검색이 디스크의 이전 인덱스를 다시 로드해 새 인덱스에 섞지 않는지
+- 재구축 중 검색은 이전 인덱스를, 완료 후에는 새 인덱스를 보는지
+"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_pipeline.rag_manager import RAGManager
+
+
+def _blocking_chunks(texts, started: threading.Event, release: threading.Event):
+    for i, text in enumerate(texts):
+        if i == 0:
+            started.set()
+            release.wait(5)
+        yield {"text": text}
+
+
+def _rebuild_in_background(rag, texts):
+    started, release = threading.Event(), threading.Event()
+    thread = threading.Thread(
+        target=rag.build_index,
+        args=(_blocking_chunks(texts, started, release),),
+        kwargs={"use_faiss": False},
+        daemon=True
+    )
+    thread.start()
+    assert started.wait(5)
+    return thread, release
+
+
+def test_rebuild_from_empty_does_not_reload_disk_index(tmp_path):
+    old = RAGManager({"embedding_path": str(tmp_path)})
+    old.build_index([{"text": f"old chunk {i}"} for i in range(5)], use_faiss=False)
+    old.save_index()
+
+    rag = RAGManager({"embedding_path": str(tmp_path)})
+    rag.ingest_batch_size = 1
+    thread, release = _rebuild_in_background(rag, [f"new chunk {i}" for i in range(3)])
+
+    rag.retrieve("chunk", top_k=10)
+    release.set()
+    thread.join(5)
+
+    assert [chunk["text"] for chunk in rag.chunks] == ["new chunk 0", "new chunk 1", "new chunk 2"]
+    assert sorted(rag.index) == [0, 1, 2]
+
+
+def test_search_sees_previous_index_until_swap(tmp_path):
+    rag = RAGManager({"embedding_path": str(tmp_path)})
+    rag.ingest_batch_size = 1
+    rag.build_index([{"text": "산악 보병 방어"}], use_faiss=False)
+
+    thread, release = _rebuild_in_background(rag, ["기갑 역습", "기갑 돌파"])
+    during = [r["text"] for r in rag.retrieve("보병", top_k=5)]
+    release.set()
+    thread.join(5)
+    after = [r["text"] for r in rag.retrieve("기갑", top_k=5)]
+
+    assert during == ["산악 보병 방어"]
+    assert sorted(after) == ["기갑 돌파", "기갑 역습"]
@@ -0,0 +1,52 @@
+# tests/test_recommendation_dependency.py
+# -*- coding: utf-8 -*-
+"""
+RecommendationDependencyGraph 자원 의존성 회귀 테스트
+- 부가 표기가 붙은 필요자원도 자원 ID로 정확히 조회되는지
+- 이름이 겹치는 다른 자원(RES1 / RES10 / RES1_B)을 잘못 매칭하지 않는지
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_pipeline.recommendation_dependency import ENTITY_RESOURCE, RecommendationDependencyGraph
+
+
+def _recommendation(coa_id: str, required_resources: str) -> dict:
+    return {
+        "coa_id": coa_id,
+        "score": 0.5,
+        "required_resources": required_resources,
+        "score_breakdown": {
+            "resources": 0.8,
+            "reasoning": [{"factor": "resources", "weight": 0.5}]
+        }
+    }
+
+
+def _graph() -> RecommendationDependencyGraph:
+    graph = RecommendationDependencyGraph()
+    graph.register_result({
+        "situation_id": "S1",
+        "recommendations": [
+            _recommendation("COA1", "RES1(필수), RES2"),
+            _recommendation("COA2", "RES10, RES1_B")
+        ]
+    })
+    return graph
+
+
+def test_resource_lookup_is_exact_after_normalization():
+    graph = _graph()
+
+    assert graph.affected(ENTITY_RESOURCE, "RES1") == [("S1", "COA1")]
+    assert graph.affected(ENTITY_RESOURCE, "RES1 (필수)") == [("S1", "COA1")]
+    assert graph.affected(ENTITY_RESOURCE, "RES10") == [("S1", "COA2")]
+
+
+def test_resource_update_only_changes_matching_resource():
+    updates = _graph().apply_resource_update("RES1", 0)["recommendations"]
+
+    assert [u["coa_id"] for u in updates] == ["COA1"]
+    assert updates[0]["changed_factors"]["resources"] == {"old": 0.8, "new": 0.4}
@@ -0,0 +1,29 @@
+# tests/test_relationship_chain.py
+# -*- coding: utf-8 -*-
+"""
+RelationshipChain 경로 탐색 회귀 테스트
+- 목표 노드가 그래프에 있어도 로컬 이름 포함 매칭 노드까지 목표로 찾는지
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rdflib import Graph, Namespace
+
+from core_pipeline.relationship_chain import ONTOLOGY_NS, RelationshipChain
+
+NS = Namespace(ONTOLOGY_NS)
+
+
+def test_find_path_keeps_local_name_matched_targets():
+    graph = Graph()
+    graph.add((NS.THR1, NS.relatedTo, NS.A))
+    graph.add((NS.A, NS.relatedTo, NS.COA_1_B))
+    graph.add((NS.THR1, NS.locatedIn, NS.B))
+    graph.add((NS.B, NS.relatedTo, NS.COA_1))
+
+    chains = RelationshipChain({"chain_cache_enabled": False}).find_path(graph, "THR1", "COA_1")
+    ends = sorted(chain["path"][-1] for chain in chains)
+
+    assert ends == [str(NS.COA_1), str(NS.COA_1_B)]
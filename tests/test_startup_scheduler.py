@@ -0,0 +1,62 @@
+# tests/test_startup_scheduler.py
+# -*- coding: utf-8 -*-
+"""
+StartupScheduler 지연 단계 회귀 테스트
+- 지연 단계 함수가 자기 자신을 다시 ensure해도 교착되지 않는지
+- RAG 인덱스 지연 단계 실행 중 is_available()/retrieve_batch() 재진입 후 검색이 가능한지
+"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_pipeline.rag_manager import RAGManager
+from core_pipeline.startup_scheduler import STAGE_READY, StartupScheduler
+
+
+def _run_with_timeout(fn, timeout: float = 5.0):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", fn()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "호출이 제한 시간 내에 끝나지 않음 (교착)"
+    return result.get("value")
+
+
+def test_ensure_reentry_from_running_stage_returns():
+    scheduler = StartupScheduler()
+    seen = []
+
+    def stage():
+        seen.append(scheduler.ensure("lazy"))
+
+    scheduler.add_stage("lazy", stage, lazy=True)
+
+    assert _run_with_timeout(lambda: scheduler.ensure("lazy")) is True
+    assert seen == [False]
+    assert scheduler.get_status()["lazy"]["status"] == STAGE_READY
+
+
+def test_lazy_rag_index_reentry_does_not_hang():
+    rag = RAGManager({})
+    scheduler = StartupScheduler()
+    calls = []
+
+    def prepare_rag_index():
+        rag.build_index([{"text": "산악 지형 보병 방어 사례"}, {"text": "기갑 역습 사례"}], use_faiss=False)
+        # 과거 성공 사례 사전 계산처럼 단계 내부에서 RAG를 다시 사용
+        calls.append(rag.is_available())
+        calls.append(rag.retrieve_batch(["보병 방어"], top_k=1))
+
+    scheduler.add_stage("rag_index", prepare_rag_index, lazy=True)
+    rag.lazy_loader = lambda: scheduler.ensure("rag_index")
+
+    results = _run_with_timeout(lambda: rag.retrieve("보병 방어", top_k=1))
+
+    assert scheduler.get_status()["rag_index"]["status"] == STAGE_READY
+    assert rag.lazy_loader is None
+    assert len(calls) == 2
+    assert results and "보병" in results[0]["text"]
+    # 이후 검색도 대기 없이 수행
+    assert _run_with_timeout(lambda: rag.retrieve("기갑 역습", top_k=1))